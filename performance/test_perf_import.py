@@ -0,0 +1,59 @@
+# -*- coding: UTF-8 -*-
+#
+# Benchmark of the import time of psydac and of its low-level modules, which
+# must not load the symbolic stack (SymPy, SymPDE) used by psydac.api.
+#
+# The time budget (in seconds) can be changed with the environment variable
+# PSYDAC_IMPORT_BUDGET.
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+IMPORT_BUDGET = float(os.environ.get('PSYDAC_IMPORT_BUDGET', 2.0))
+
+SCRIPT = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+print(t1 - t0, *(m in sys.modules for m in ('sympy', 'sympde')))
+"""
+
+#==============================================================================
+def import_time(module, nruns=3):
+    """
+    Best time (in seconds) of several imports of a module, each one in a new
+    Python interpreter, and flags telling if SymPy and SymPDE were loaded.
+    """
+    timings = []
+    for _ in range(nruns):
+        out = subprocess.run([sys.executable, '-c', SCRIPT.format(module=module)],
+                             capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(out[0]))
+    return min(timings), out[1] == 'True', out[2] == 'True'
+
+#==============================================================================
+@pytest.mark.parametrize('module', ['psydac',
+                                    'psydac.core.bsplines',
+                                    'psydac.ddm.cart',
+                                    'psydac.linalg.stencil',
+                                    'psydac.linalg.solvers',
+                                    'psydac.fem.tensor'])
+def test_perf_import(module):
+
+    timing, sympy_loaded, sympde_loaded = import_time(module)
+    print('import {}: {:.3f} s'.format(module, timing))
+
+    assert not sympy_loaded
+    assert not sympde_loaded
+    assert timing < IMPORT_BUDGET
+
+#==============================================================================
+if __name__ == '__main__':
+    for module in ['psydac', 'psydac.core.bsplines', 'psydac.ddm.cart',
+                   'psydac.linalg.stencil', 'psydac.linalg.solvers', 'psydac.fem.tensor',
+                   'psydac.api.discretization']:
+        print('import {:30s} {:.3f} s'.format(module, import_time(module)[0]))
@@ -1,15 +1,14 @@
 # -*- coding: UTF-8 -*-
-__all__     = ['__version__', 'api', 'cad', 'core', 'ddm', 'feec', 'fem',
-               'linalg', 'mapping', 'utilities']
+from psydac.utilities.lazy_import import attach
 
 from psydac.version import __version__
 
-from psydac import api
-from psydac import cad
-from psydac import core
-from psydac import ddm
-from psydac import feec
-from psydac import fem
-from psydac import linalg
-from psydac import mapping
-from psydac import utilities
+__all__     = ['__version__', 'api', 'cad', 'core', 'ddm', 'feec', 'fem',
+               'linalg', 'mapping', 'utilities']
+
+# The subpackages are imported on first access (PEP 562), so that a script
+# which only needs e.g. psydac.linalg does not load the symbolic stack
+# (SymPy, SymPDE) used by psydac.api
+_submodules = {'api', 'cad', 'core', 'ddm', 'feec', 'fem', 'linalg', 'mapping',
+               'utilities'}
+__getattr__, __dir__ = attach(__name__, _submodules)
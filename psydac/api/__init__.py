@@ -1,13 +1,7 @@
 # -*- coding: UTF-8 -*-
+from psydac.utilities.lazy_import import attach
 
-from psydac.api import ast
-from psydac.api import basic
-from psydac.api import discretization
-from psydac.api import essential_bc
-from psydac.api import fem
-from psydac.api import glt
-from psydac.api import grid
-from psydac.api import printing
-from psydac.api import settings
-from psydac.api import utilities
-
+# The submodules are imported on first access (PEP 562)
+_submodules = {'ast', 'basic', 'cache', 'discretization', 'essential_bc', 'fem', 'glt', 'kronecker',
+               'grid', 'precompiled', 'printing', 'settings', 'utilities'}
+__getattr__, __dir__ = attach(__name__, _submodules)
@@ -8,7 +8,11 @@
 import sys
 import os
 import importlib
+import importlib.util
+import multiprocessing
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from mpi4py import MPI
 
 from psydac.api.ast.fem         import AST
@@ -17,7 +21,164 @@ from psydac.api.printing.pycode import pycode
 from psydac.api.settings        import PSYDAC_BACKENDS, PSYDAC_DEFAULT_FOLDER
 from psydac.api.utilities       import mkdir_p, touch_init_file, random_string, write_code
 
-__all__ = ('BasicCodeGen', 'BasicDiscrete')
+__all__ = ('BasicCodeGen', 'BasicDiscrete', 'deferred_compilation')
+
+# Code generators whose compilation is deferred (see `deferred_compilation`)
+_deferred_codegens = None
+
+#==============================================================================
+@contextmanager
+def deferred_compilation(max_workers=None):
+    """
+    Context manager which defers the compilation of the kernels generated by
+    the discrete objects created in its body, and compiles all of them
+    concurrently on exit. The kernels cannot be used before then.
+
+    With a Pyccel backend, the modules are distributed over the processes of
+    the MPI communicator (if all the objects share the same one), and all the
+    processes then load all the compiled modules. In the serial case, the
+    modules are compiled in a pool of worker processes.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of worker processes used for compiling in the serial case
+        (default: number of CPUs).
+
+    """
+    global _deferred_codegens
+
+    # Nested contexts: the outermost one compiles everything
+    if _deferred_codegens is not None:
+        yield
+        return
+
+    _deferred_codegens = []
+    try:
+        yield
+        codegens = _deferred_codegens
+    finally:
+        _deferred_codegens = None
+
+    compile_many(codegens, max_workers=max_workers)
+
+#==============================================================================
+def compile_many(codegens, max_workers=None):
+    """
+    Compile the generated modules of several code generators, which were
+    created in the body of `deferred_compilation`, and bind their functions.
+
+    Parameters
+    ----------
+    codegens : list of BasicCodeGen
+        The code generators.
+
+    max_workers : int, optional
+        Number of worker processes used for compiling in the serial case
+        (default: number of CPUs).
+
+    """
+    # The function of a discrete object may have been replaced after the
+    # code generation (e.g. if the process does not own its boundary)
+    def bind(c, package):
+        if c._func is None:
+            c._func = getattr(package, c._func_name)
+
+    pyccel_codegens = [c for c in codegens if c.backend['name'] == 'pyccel']
+    other_codegens  = [c for c in codegens if c.backend['name'] != 'pyccel']
+
+    # Pure Python modules are only imported
+    for c in other_codegens:
+        if c.comm is not None and c.comm.size > 1: c.comm.Barrier()
+        bind(c, _import_generated_module(c.folder, c.dependencies_modname))
+
+    if not pyccel_codegens:
+        return
+
+    # Communicator shared by all the code generators (if any)
+    comms = [c.comm for c in pyccel_codegens if c.comm is not None and c.comm.size > 1]
+    comm  = comms[0] if comms else None
+    if not all(ci is comm for ci in comms) or len(comms) not in (0, len(pyccel_codegens)):
+        # Different communicators: compile each module on the root of its own
+        for c in pyccel_codegens:
+            if c.comm is not None and c.comm.size > 1: c.comm.Barrier()
+            bind(c, c._compile_pyccel(_import_generated_module(c.folder, c.dependencies_modname)))
+        return
+
+    # Wait for the root processes to write all the modules
+    if comm is not None:
+        comm.Barrier()
+
+    # Each process compiles a share of the modules
+    if comm is None:
+        mine = pyccel_codegens
+    else:
+        mine = pyccel_codegens[comm.rank::comm.size]
+
+    # In the serial case, the modules are compiled in a pool of processes.
+    # These are not used under MPI, as they would initialize MPI again.
+    jobs = [(c.folder, c.dependencies_modname, c.backend) for c in mine]
+    if comm is None and len(jobs) > 1 and max_workers != 1:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            filenames = list(executor.map(_pyccelize_module, *zip(*jobs)))
+    else:
+        filenames = [_pyccelize_module(*job) for job in jobs]
+
+    filenames = {c.dependencies_modname: f for c, f in zip(mine, filenames)}
+    if comm is not None:
+        for d in comm.allgather(filenames):
+            filenames.update(d)
+
+    # Load the compiled modules and bind the functions
+    for c in pyccel_codegens:
+        bind(c, _load_extension_module(filenames[c.dependencies_modname]))
+
+#==============================================================================
+def _import_generated_module(folder, module_name):
+    sys.path.append(folder)
+    package = importlib.import_module(module_name)
+    sys.path.remove(folder)
+    return package
+
+#==============================================================================
+def _pyccelize(mod, backend, comm=None, verbose=False):
+    """ Convert a Python module to Fortran with Pyccel, and compile it. """
+
+    # ... convert python to fortran using pyccel
+    compiler       = backend['compiler']
+    fflags         = backend['flags']
+    accelerators   = ["openmp"] if backend["openmp"] else []
+    _PYCCEL_FOLDER = backend['folder']
+
+    from pyccel.epyccel import epyccel
+    fmod = epyccel(mod,
+                   accelerators = accelerators,
+                   compiler    = compiler,
+                   fflags      = fflags,
+                   comm        = comm,
+                   bcast       = True,
+                   folder      = _PYCCEL_FOLDER,
+                   verbose     = verbose)
+
+    return fmod
+
+#==============================================================================
+def _pyccelize_module(folder, module_name, backend):
+    """ Compile a generated module, and return the path of the extension module. """
+    package = _import_generated_module(folder, module_name)
+    return os.path.abspath(_pyccelize(package, backend).__file__)
+
+#==============================================================================
+def _load_extension_module(filename):
+    name   = os.path.basename(filename).split('.')[0]
+    if name in sys.modules:
+        return sys.modules[name]
+    spec   = importlib.util.spec_from_file_location(name, filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
 
 #==============================================================================
 # TODO have it as abstract class
@@ -145,6 +306,11 @@ class BasicCodeGen:
         if ast:
             self._save_code(self._generate_code(), backend=self.backend['name'])
 
+        # The compilation may be deferred, see `deferred_compilation`
+        if _deferred_codegens is not None:
+            _deferred_codegens.append(self)
+            return
+
         if comm is not None and comm.size>1: comm.Barrier()
         # compile code
         self._compile()
@@ -252,31 +418,11 @@ class BasicCodeGen:
         raise NotImplementedError('Pythran is not available')
 
     def _compile_pyccel(self, mod, verbose=False):
-
-        # ... convert python to fortran using pyccel
-        compiler       = self.backend['compiler']
-        fflags         = self.backend['flags']
-        accelerators   = ["openmp"] if self.backend["openmp"] else []
-        _PYCCEL_FOLDER = self.backend['folder']
-
-        from pyccel.epyccel import epyccel
-        fmod = epyccel(mod,
-                       accelerators = accelerators,
-                       compiler    = compiler,
-                       fflags      = fflags,
-                       comm        = self.comm,
-                       bcast       = True,
-                       folder      = _PYCCEL_FOLDER,
-                       verbose     = verbose)
-
-        return fmod
+        return _pyccelize(mod, self.backend, comm=self.comm, verbose=verbose)
 
     def _compile(self):
 
-        module_name = self.dependencies_modname
-        sys.path.append(self.folder)
-        package = importlib.import_module( module_name )
-        sys.path.remove(self.folder)
+        package = _import_generated_module(self.folder, self.dependencies_modname)
 
         if self.backend['name'] == 'pyccel':
             package = self._compile_pyccel(package)
@@ -0,0 +1,237 @@
+# coding: utf-8
+#
+# Persistent cache of the assembled operators on disk.
+#
+# An operator is stored in a directory named after its key, which is a hash of
+# everything that determines its entries: the symbolic form, the discrete
+# spaces (degrees, knots, quadrature), the mapping, the domain decomposition
+# and the values of the free arguments. Each process stores the local data of
+# each stencil matrix in its own .npy file, which is memory-mapped when the
+# operator is loaded, and the cache is only valid for the same number of
+# processes.
+
+import os
+import json
+import hashlib
+
+import numpy as np
+
+from psydac.linalg.stencil import StencilVector, StencilMatrix, StencilInterfaceMatrix
+from psydac.linalg.block   import BlockVector, BlockLinearOperator
+from psydac.linalg.kron    import KroneckerStencilMatrix, KroneckerStencilMatrixSum
+from psydac.fem.basic      import FemField
+from psydac.api.utilities  import mkdir_p
+
+__all__ = ('OperatorCache', 'space_signature', 'mapping_signature', 'argument_signature', 'form_signature')
+
+#==============================================================================
+def _array_hash(a):
+    return hashlib.sha256(np.ascontiguousarray(a).tobytes()).hexdigest()
+
+#==============================================================================
+def space_signature(V):
+    """
+    Signature of a discrete space: degrees, knots, periodicity, multiplicity,
+    basis and number of quadrature points along each direction, and the local
+    part of the Cartesian decomposition of its coefficients.
+    """
+    if V.is_product:
+        return tuple(space_signature(Vi) for Vi in V.spaces)
+
+    W = V.vector_space
+    splines = tuple((s.degree, _array_hash(s.knots), s.periodic, s.multiplicity, s.basis) for s in V.spaces)
+    decomposition = (W.npts, W.starts, W.ends, W.pads, W.shifts)
+    return (splines, tuple(V.nquads), decomposition, str(W.dtype))
+
+#==============================================================================
+def mapping_signature(mapping):
+    """
+    Signature of a mapping: the local coefficients of a spline mapping, or the
+    expressions of an analytical mapping.
+    """
+    if mapping is None:
+        return None
+    elif isinstance(mapping, (tuple, list)):
+        return tuple(mapping_signature(m) for m in mapping)
+    elif hasattr(mapping, 'fields'):
+        return tuple(argument_signature(f) for f in mapping.fields)
+    else:
+        return (str(mapping), str(mapping.expressions), str(mapping.constants))
+
+#==============================================================================
+def argument_signature(v):
+    """
+    Signature of a free argument of a form: the local coefficients of a field,
+    or the representation of a constant.
+    """
+    if isinstance(v, FemField):
+        v = v.coeffs
+    if isinstance(v, BlockVector):
+        return tuple(argument_signature(b) for b in v.blocks)
+    elif isinstance(v, StencilVector):
+        return _array_hash(v.toarray_local())
+    else:
+        return repr(v)
+
+#==============================================================================
+def form_signature(expr, domain_h, spaces, symbolic_mapping=None):
+    """
+    Signature of a discrete form: its symbolic expression, the signatures of its
+    discrete spaces and of the mappings of the discrete domain.
+    """
+    return (str(expr),
+            tuple(space_signature(V) for V in spaces),
+            mapping_signature(list(domain_h.mappings.values())),
+            mapping_signature(symbolic_mapping))
+
+#==============================================================================
+def _local_arrays(operator, name):
+    """ Local data arrays of the stencil matrices of an operator, with their names.
+    """
+    if isinstance(operator, (StencilMatrix, StencilInterfaceMatrix)):
+        yield name, operator._data
+    elif isinstance(operator, BlockLinearOperator):
+        for (i, j), block in sorted(operator._blocks.items()):
+            yield from _local_arrays(block, '{}_{}_{}'.format(name, i, j))
+    elif isinstance(operator, KroneckerStencilMatrix):
+        for k, A in enumerate(operator.mats):
+            yield from _local_arrays(A, '{}_k{}'.format(name, k))
+    elif isinstance(operator, KroneckerStencilMatrixSum):
+        for t, A in enumerate(operator.terms):
+            yield from _local_arrays(A, '{}_t{}'.format(name, t))
+    else:
+        raise TypeError('Cannot cache an operator of type {}'.format(type(operator).__name__))
+
+#==============================================================================
+class OperatorCache:
+    """
+    Persistent, MPI-aware cache of assembled operators on disk.
+
+    The operators are StencilMatrix, StencilInterfaceMatrix, BlockLinearOperator,
+    KroneckerStencilMatrix and KroneckerStencilMatrixSum objects (or any
+    combination of them). Each process stores the local data of the stencil
+    matrices in .npy files: the operator is loaded in place into an operator
+    of the same structure, reading its data from memory-mapped files.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the cache, which is created if needed.
+
+    comm : mpi4py.MPI.Comm, optional
+        The communicator of the processes which share the operators.
+
+    Examples
+    --------
+    >>> cache = OperatorCache('matrices', comm=comm)
+    >>> key   = cache.key(space_signature(V), 'mass')
+    >>> if key in cache:
+    ...     cache.load(key, M)
+    ... else:
+    ...     cache.save(key, assemble_mass_matrix(M))
+    """
+    def __init__(self, path, comm=None):
+        self._path = os.path.abspath(path)
+        self._comm = comm
+        self._rank = comm.rank if comm is not None else 0
+        self._size = comm.size if comm is not None else 1
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def comm(self):
+        return self._comm
+
+    #--------------------------------------------------------------------------
+    def key(self, *items):
+        """
+        Key of an operator, as a hash of the given items (whose representation must
+        be deterministic) on all the processes. This is a collective operation.
+        """
+        local = hashlib.sha256(repr(items).encode()).hexdigest()
+        if self._comm is not None:
+            local = ''.join(self._comm.allgather(local))
+        return hashlib.sha256('{}:{}'.format(self._size, local).encode()).hexdigest()[:32]
+
+    def _folder(self, key):
+        return os.path.join(self._path, key)
+
+    def _filename(self, key, name):
+        return os.path.join(self._folder(key), '{}.{}.npy'.format(name, self._rank))
+
+    def __contains__(self, key):
+        """
+        Whether the operator is in the cache. This is a collective operation:
+        the file system is only checked by the first process, so that all the
+        processes get the same answer.
+        """
+        found = self._rank == 0 and os.path.exists(os.path.join(self._folder(key), 'meta.json'))
+        if self._comm is not None:
+            found = self._comm.bcast(found, root=0)
+        return found
+
+    #--------------------------------------------------------------------------
+    def save(self, key, operator):
+        """
+        Store the local data of an operator. This is a collective operation: the
+        operator is only available in the cache once all the processes have
+        written their data.
+        """
+        folder = self._folder(key)
+        mkdir_p(folder)
+
+        names = []
+        for name, data in _local_arrays(operator, 'op'):
+            np.save(self._filename(key, name), data)
+            names.append(name)
+
+        if self._comm is not None:
+            self._comm.Barrier()
+
+        # The metadata file marks the completion of the writing
+        if self._rank == 0:
+            tmp = os.path.join(folder, 'meta.json.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({'nprocs': self._size, 'type': type(operator).__name__, 'arrays': names}, f)
+            os.replace(tmp, os.path.join(folder, 'meta.json'))
+
+        if self._comm is not None:
+            self._comm.Barrier()
+
+    #--------------------------------------------------------------------------
+    def load(self, key, out):
+        """
+        Load an operator from the cache into an operator of the same structure,
+        e.g. the matrix which is filled by the assembly.
+
+        Parameters
+        ----------
+        key : str
+            The key of the operator.
+
+        out : StencilMatrix | BlockLinearOperator | KroneckerStencilMatrix | KroneckerStencilMatrixSum
+            The operator whose data is overwritten.
+
+        Returns
+        -------
+        out
+            The operator loaded from the cache.
+        """
+        if key not in self:
+            raise KeyError('No operator with key {} in {}'.format(key, self._path))
+
+        with open(os.path.join(self._folder(key), 'meta.json')) as f:
+            meta = json.load(f)
+
+        if meta['nprocs'] != self._size:
+            raise ValueError('The operator was stored by {} processes, not {}'.format(meta['nprocs'], self._size))
+
+        for name, data in _local_arrays(out, 'op'):
+            stored = np.load(self._filename(key, name), mmap_mode='r')
+            if stored.shape != data.shape or stored.dtype != data.dtype:
+                raise ValueError('The operator {} does not have the structure of the stored one'.format(name))
+            data[...] = stored
+
+        return out
@@ -25,6 +25,7 @@ from sympde.topology import H1SpaceType, HcurlSpaceType, HdivSpaceType, L2SpaceT
 
 from gelato.expr import GltExpr as sym_GltExpr
 
+from psydac.api.basic        import deferred_compilation
 from psydac.api.fem          import DiscreteBilinearForm
 from psydac.api.fem          import DiscreteLinearForm
 from psydac.api.fem          import DiscreteFunctional
@@ -45,6 +46,7 @@ from psydac.linalg.block     import BlockVectorSpace
 
 __all__ = (
     'discretize',
+    'discretize_many',
     'discretize_derham',
     'reduce_space_degrees',
     'discretize_space',
@@ -532,3 +534,35 @@ def discretize(a, *args, **kwargs):
 
     else:
         raise NotImplementedError('given {}'.format(type(a)))
+
+#==============================================================================
+def discretize_many(items, *, max_workers=None, **kwargs):
+    """
+    Discretize several objects (typically bilinear and linear forms), and
+    compile all of their kernels concurrently once the code of all of them
+    has been generated.
+
+    Parameters
+    ----------
+    items : list of tuple
+        The positional arguments of each call to `discretize`, e.g.
+        [(a, domain_h, [Vh, Vh]), (l, domain_h, Vh)].
+
+    max_workers : int, optional
+        Number of worker processes used for compiling in the serial case
+        (default: number of CPUs). Under MPI, the modules are compiled by the
+        processes of the communicator.
+
+    **kwargs
+        Keyword arguments passed to every call to `discretize` (e.g. backend).
+        Different keyword arguments can be used by calling `discretize` in the
+        body of the context manager `psydac.api.basic.deferred_compilation`.
+
+    Returns
+    -------
+    list
+        The discrete objects, in the same order as the items.
+
+    """
+    with deferred_compilation(max_workers=max_workers):
+        return [discretize(*item, **kwargs) for item in items]
@@ -6,11 +6,16 @@ from psydac.feec.derivatives       import ScalarCurl_2D, VectorCurl_2D, Curl_3D
 from psydac.feec.derivatives       import Divergence_2D, Divergence_3D
 from psydac.feec.global_projectors import Projector_H1, Projector_Hcurl, Projector_H1vec
 from psydac.feec.global_projectors import Projector_Hdiv, Projector_L2
+from psydac.feec.local_projectors  import LocalProjector_H1, LocalProjector_Hcurl, LocalProjector_H1vec
+from psydac.feec.local_projectors  import LocalProjector_Hdiv, LocalProjector_L2
 from psydac.feec.pull_push         import pull_1d_h1, pull_1d_l2
 from psydac.feec.pull_push         import pull_2d_h1, pull_2d_hcurl, pull_2d_hdiv, pull_2d_l2, pull_2d_h1vec
 from psydac.feec.pull_push         import pull_3d_h1, pull_3d_hcurl, pull_3d_hdiv, pull_3d_l2, pull_3d_h1vec
+from psydac.api.kronecker          import vector_space_1d, assemble_matrix_1d
 from psydac.fem.basic              import FemSpace
 from psydac.fem.vector             import VectorFemSpace
+from psydac.linalg.block           import BlockLinearOperator
+from psydac.linalg.preconditioners import KroneckerMassPreconditioner
 
 __all__ = ('DiscreteDerham',)
 
@@ -161,6 +166,55 @@ class DiscreteDerham(BasicDiscrete):
         """
         return tuple(V.diff for V in self.spaces[:-1])
 
+    #--------------------------------------------------------------------------
+    def mass_preconditioners(self, mass_matrices=None):
+        """Approximate inverses of the mass matrices of the De Rham sequence, to be
+        used as preconditioners of the iterative solvers.
+
+        Each (component of a) space gets a KroneckerMassPreconditioner, built
+        from the 1D mass matrices of the logical domain. If the mass matrices
+        are given, the preconditioners are scaled by their diagonals, which
+        accounts for the Jacobian of the mapping. Vector-valued spaces get a
+        block-diagonal preconditioner.
+
+        Parameters
+        ----------
+        mass_matrices : list of (StencilMatrix | BlockLinearOperator | None), optional
+            The mass matrices of the spaces of the sequence, as assembled from
+            the discrete bilinear forms. A None entry gives the exact inverse of
+            the mass matrix on the logical domain.
+
+        Returns
+        -------
+        P0, ..., Pn : KroneckerMassPreconditioner | BlockLinearOperator
+            The preconditioners of the mass matrices of the spaces V0, ..., Vn.
+        """
+        if mass_matrices is None:
+            mass_matrices = [None] * len(self.spaces)
+        assert len(mass_matrices) == len(self.spaces)
+
+        preconditioners = []
+        for V, M in zip(self.spaces, mass_matrices):
+            is_vector  = isinstance(V, VectorFemSpace)
+            components = V.spaces if is_vector else [V]
+            blocks     = {}
+            for k, Vk in enumerate(components):
+                W    = Vk.vector_space
+                mats = []
+                for d, Vkd in enumerate(Vk.spaces):
+                    assert Vkd.multiplicity == 1
+                    Wd = vector_space_1d(W, d)
+                    mats.append(assemble_matrix_1d(Vkd, Vkd, Wd, Wd, Vkd.degree, Vk.nquads[d], 0, 0))
+                Mk = (M[k, k] if is_vector else M) if M is not None else None
+                blocks[k, k] = KroneckerMassPreconditioner(W, mats, Mk)
+
+            if is_vector:
+                preconditioners.append(BlockLinearOperator(V.vector_space, V.vector_space, blocks=blocks))
+            else:
+                preconditioners.append(blocks[0, 0])
+
+        return tuple(preconditioners)
+
     #--------------------------------------------------------------------------
     def projectors(self, *, kind='global', nquads=None):
         """Projectors mapping callable functions of the physical coordinates to a 
@@ -169,9 +223,11 @@ class DiscreteDerham(BasicDiscrete):
         Parameters
         ----------
         kind : str
-            Type of the projection : at the moment, only global is accepted and
-            returns geometric commuting projectors based on interpolation/histopolation 
-            for the De Rham sequence (GlobalProjector objects).
+            Type of the projection : 'global' returns geometric commuting projectors
+            based on interpolation/histopolation for the De Rham sequence
+            (GlobalProjector objects), 'local' returns commuting projectors based on
+            local dual functionals (LocalProjector objects), which do not require
+            the solution of any linear system.
 
         nquads : list(int) | tuple(int)
             Number of quadrature points along each direction, to be used in Gauss
@@ -185,12 +241,18 @@ class DiscreteDerham(BasicDiscrete):
             returns a FemField belonging to the i-th space of the De Rham sequence
         """
 
-        if not (kind == 'global'):
-            raise NotImplementedError('only global projectors are available')
+        projector_classes = {
+            'global': (Projector_H1, Projector_Hcurl, Projector_Hdiv, Projector_L2, Projector_H1vec),
+            'local' : (LocalProjector_H1, LocalProjector_Hcurl, LocalProjector_Hdiv, LocalProjector_L2, LocalProjector_H1vec),
+        }
+        if kind not in projector_classes:
+            raise NotImplementedError('only global and local projectors are available')
+
+        PH1, PHcurl, PHdiv, PL2, PH1vec = projector_classes[kind]
 
         if self.dim == 1:
-            P0 = Projector_H1(self.V0)
-            P1 = Projector_L2(self.V1, nquads)
+            P0 = PH1(self.V0)
+            P1 = PL2(self.V1, nquads)
             if self.mapping:
                 P0_m = lambda f: P0(pull_1d_h1(f, self.callable_mapping))
                 P1_m = lambda f: P1(pull_1d_l2(f, self.callable_mapping))
@@ -198,19 +260,19 @@ class DiscreteDerham(BasicDiscrete):
             return P0, P1
 
         elif self.dim == 2:
-            P0 = Projector_H1(self.V0)
-            P2 = Projector_L2(self.V2, nquads)
+            P0 = PH1(self.V0)
+            P2 = PL2(self.V2, nquads)
 
             kind = self.V1.symbolic_space.kind.name
             if kind == 'hcurl':
-                P1 = Projector_Hcurl(self.V1, nquads)
+                P1 = PHcurl(self.V1, nquads)
             elif kind == 'hdiv':
-                P1 = Projector_Hdiv(self.V1, nquads)
+                P1 = PHdiv(self.V1, nquads)
             else:
                 raise TypeError('projector of space type {} is not available'.format(kind))
 
             if self.has_vec : 
-                Pvec = Projector_H1vec(self.H1vec, nquads)
+                Pvec = PH1vec(self.H1vec, nquads)
 
             if self.mapping:
                 P0_m = lambda f: P0(pull_2d_h1(f, self.callable_mapping))
@@ -231,12 +293,12 @@ class DiscreteDerham(BasicDiscrete):
                 return P0, P1, P2
 
         elif self.dim == 3:
-            P0 = Projector_H1   (self.V0)
-            P1 = Projector_Hcurl(self.V1, nquads)
-            P2 = Projector_Hdiv (self.V2, nquads)
-            P3 = Projector_L2   (self.V3, nquads)
+            P0 = PH1   (self.V0)
+            P1 = PHcurl(self.V1, nquads)
+            P2 = PHdiv (self.V2, nquads)
+            P3 = PL2   (self.V3, nquads)
             if self.has_vec : 
-                Pvec = Projector_H1vec(self.H1vec)
+                Pvec = PH1vec(self.H1vec)
             if self.mapping:
                 P0_m = lambda f: P0(pull_3d_h1   (f, self.callable_mapping))
                 P1_m = lambda f: P1(pull_3d_hcurl(f, self.callable_mapping))
@@ -4,7 +4,7 @@
 #         nderiv has not been changed. shall we add nquads too?
 
 import numpy as np
-from sympy import ImmutableDenseMatrix, Matrix
+from sympy import ImmutableDenseMatrix, Matrix, lambdify
 
 from sympde.expr          import BilinearForm as sym_BilinearForm
 from sympde.expr          import LinearForm as sym_LinearForm
@@ -19,13 +19,18 @@ from sympde.calculus.core import PlusInterfaceOperator
 
 from psydac.api.basic        import BasicDiscrete
 from psydac.api.basic        import random_string
+from psydac.api.cache        import OperatorCache, form_signature, argument_signature
 from psydac.api.grid         import QuadratureGrid, BasisValues
+from psydac.api.kronecker    import derivative_terms, kronecker_terms, vector_space_1d, assemble_matrix_1d
+from psydac.api.precompiled  import quadrature_values, stencil_offsets, assemble_term
 from psydac.api.utilities    import flatten
 from psydac.linalg.stencil   import StencilVector, StencilMatrix, StencilInterfaceMatrix
 from psydac.linalg.basic     import ComposedLinearOperator
 from psydac.linalg.block     import BlockVectorSpace, BlockVector, BlockLinearOperator
+from psydac.linalg.kron      import KroneckerStencilMatrix, KroneckerStencilMatrixSum
 from psydac.cad.geometry     import Geometry
 from psydac.mapping.discrete import NurbsMapping
+from psydac.fem.tensor       import TensorFemSpace
 from psydac.fem.vector       import ProductFemSpace, VectorFemSpace
 from psydac.fem.basic        import FemField
 from psydac.fem.projectors   import knot_insertion_projection_operator
@@ -35,6 +40,7 @@ from psydac.ddm.cart         import InterfaceCartDecomposition
 __all__ = ('collect_spaces', 'compute_diag_len', 'get_nquads',
            'construct_test_space_arguments', 'construct_trial_space_arguments', 
            'construct_quad_grids_arguments', 'reset_arrays', 'do_nothing', 'extract_stencil_mats', 
+           'uniform_assembly_elements',
            'DiscreteBilinearForm', 'DiscreteFunctional', 'DiscreteLinearForm', 'DiscreteSumForm'
 )
 
@@ -157,6 +163,83 @@ def extract_stencil_mats(mats):
         elif isinstance(M, ComposedLinearOperator):
             new_mats += [i for i in M.multiplicants if isinstance(i, (StencilInterfaceMatrix, StencilMatrix))]
     return new_mats
+
+def uniform_assembly_elements(test_spaces, trial_spaces, blocks):
+    """
+    Select the elements visited by the assembly of a bilinear form whose element matrices
+    only depend on the basis values on the element (constant coefficients, no mapping).
+
+    Along each direction, two elements with the same knot patterns for the test and trial
+    spaces (and the same shift between their spans) contribute the same values to the
+    matrix rows which they support. Hence all the rows supported by such regular elements
+    only are equal to the first one of them, and the elements which only contribute to
+    these rows do not need to be visited: these rows are copied instead.
+    This requires the basis tables of the quadrature grids to be compressed, which is the
+    case on uniform grids.
+
+    Parameters
+    ----------
+    test_spaces : list of TensorFemSpace
+        The components of the test space.
+
+    trial_spaces : list of TensorFemSpace
+        The components of the trial space.
+
+    blocks : list of tuple
+        The (test, trial) components of each block of the matrix.
+
+    Returns
+    -------
+    elements : list of numpy.ndarray
+        The local indices of the elements to be visited along each direction.
+
+    rows : list of list
+        For each block and each direction, the local index of the reference row and the
+        array of local indices of the rows which are equal to it (the reference row is None
+        if there is none).
+
+    """
+    ldim   = test_spaces[0].ldim
+    needed = [np.zeros(g.num_elements, dtype=bool) for g in test_spaces[0].quad_grids()]
+    rows   = [[None]*ldim for _ in blocks]
+
+    for d in range(ldim):
+        for k, (k1, k2) in enumerate(blocks):
+            Vt = test_spaces[k1]
+            Vs = trial_spaces[k2]
+            gt = Vt.quad_grids()[d]
+            gs = Vs.quad_grids()[d]
+            p  = Vt.spaces[d].degree
+
+            # Local index of the last row supported by each element
+            spans = gt.spans - Vt.vector_space.starts[d]
+
+            # The regular elements have the most frequent pattern
+            keys = np.stack([gt.basis_index, gs.basis_index, gt.spans - gs.spans], axis=1)
+            _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+            regular = inverse.ravel() == counts.argmax()
+
+            # Rows supported by p+1 local elements, all regular
+            first   = spans.min() - p
+            support = spans[:, None] - p + np.arange(p + 1) - first
+            count   = np.zeros(spans.max() + 1 - first, dtype=int)
+            other   = np.zeros(spans.max() + 1 - first, dtype=bool)
+            np.add.at(count, support, 1)
+            np.logical_or.at(other, support, ~regular[:, None])
+            interior = np.flatnonzero((count == p + 1) & ~other)
+
+            if len(interior) == 0:
+                needed[d][:] = True
+                continue
+
+            r    = interior[0]
+            skip = np.isin(support, interior).all(axis=1) & ~((support[:, 0] <= r) & (r <= support[:, -1]))
+            needed[d] |= ~skip
+            rows[k][d] = (r + first, interior[1:] + first)
+
+    elements = [np.flatnonzero(n) for n in needed]
+    return elements, rows
+
 #==============================================================================
 class DiscreteBilinearForm(BasicDiscrete):
     """ Class that represents the concept of a discrete bi-linear form.
@@ -205,10 +288,20 @@ class DiscreteBilinearForm(BasicDiscrete):
     symbolic_mapping: Sympde.topology.Mapping
         The symbolic mapping which defines the physical domain of the bi-linear form.
 
+    precompiled: bool
+        If True, and if the form has no mapping and no fields, the matrix is assembled
+        with the precompiled kernels of psydac.core.assembly_kernels, and no code is
+        generated for the form (see `assemble_precompiled`). Other forms are not affected.
+
+    cache: str | OperatorCache
+        The on-disk cache (or its directory) from which `assemble` loads the matrix
+        if it has already been assembled with the same spaces, mapping, domain
+        decomposition and free arguments, or else where it stores the matrix.
+
     """
     def __init__(self, expr, kernel_expr, domain_h, spaces, *, matrix=None, update_ghost_regions=True,
                        nquads=None, backend=None, linalg_backend=None, assembly_backend=None,
-                       symbolic_mapping=None):
+                       symbolic_mapping=None, precompiled=False, cache=None):
 
         if not isinstance(expr, sym_BilinearForm):
             raise TypeError('> Expecting a symbolic BilinearForm')
@@ -227,6 +320,15 @@ class DiscreteBilinearForm(BasicDiscrete):
         self._target = kernel_expr.target
         self._domain = domain_h.domain
         self._matrix = matrix
+        self._kronecker_terms   = None
+        self._precompiled_terms = None
+        self._uniform_args      = None
+        self._uniform_rows      = ()
+
+        if cache is not None and not isinstance(cache, OperatorCache):
+            cache = OperatorCache(cache, comm=domain_h.comm)
+        self._cache = cache
+        self._cache_signature = form_signature(expr, domain_h, spaces, symbolic_mapping) if cache else None
 
         domain = self.domain
         target = self.target
@@ -351,11 +453,37 @@ class DiscreteBilinearForm(BasicDiscrete):
         assembly_backend = backend or assembly_backend
         linalg_backend   = backend or linalg_backend
 
-        # BasicDiscrete generates the assembly code and sets the following attributes that are used afterwards:
-        # self._func, self._free_args, self._max_nderiv and self._backend
-        BasicDiscrete.__init__(self, expr, kernel_expr, comm=comm, root=0, discrete_space=discrete_space,
-                       nquads=nquads, is_rational_mapping=is_rational_mapping, mapping=symbolic_mapping,
-                       mapping_space=mapping_space, num_threads=self._num_threads,backend=assembly_backend)
+        coordinates = domain.coordinates if domain.dim > 1 else (domain.coordinates,)
+        is_simple   = (len(domain) == 1 and not isinstance(target, (Boundary, Interface))
+                       and mapping is None and symbolic_mapping is None and not expr.fields)
+
+        # A form written as a sum of terms c(x) * D^a(u) * D^b(v) can be assembled
+        # with the precompiled kernels, in which case no code is generated
+        if precompiled and is_simple and self._num_threads == 1:
+            self._expr        = expr
+            self._test_space  = test_space
+            self._trial_space = trial_space
+            self._precompiled_terms = self.construct_precompiled_terms()
+
+        if self._precompiled_terms is None:
+            # BasicDiscrete generates the assembly code and sets the following attributes that are used afterwards:
+            # self._func, self._free_args, self._max_nderiv and self._backend
+            BasicDiscrete.__init__(self, expr, kernel_expr, comm=comm, root=0, discrete_space=discrete_space,
+                           nquads=nquads, is_rational_mapping=is_rational_mapping, mapping=symbolic_mapping,
+                           mapping_space=mapping_space, num_threads=self._num_threads,backend=assembly_backend)
+        else:
+            constants = set().union(*(c.free_symbols for terms in self._precompiled_terms.values()
+                                                     for c in terms.values())) - set(coordinates)
+            orders    = [o for terms in self._precompiled_terms.values() for key in terms for o in key]
+            self._expr       = expr
+            self._comm       = comm
+            self._root       = 0
+            self._tag        = None
+            self._ast        = None
+            self._func       = None
+            self._backend    = assembly_backend
+            self._free_args  = tuple(sorted(str(c) for c in constants))
+            self._max_nderiv = max((max(o) for o in orders), default=0)
 
         #...
         if isinstance(target, (Boundary, Interface)):
@@ -399,12 +527,32 @@ class DiscreteBilinearForm(BasicDiscrete):
             trial_grid = QuadratureGrid(trial_space)
             self._grid = (test_grid,)
         #...
-        self._test_basis  = BasisValues( test_space, nderiv = self.max_nderiv, trial=False, grid= test_grid)
-        self._trial_basis = BasisValues(trial_space, nderiv = self.max_nderiv, trial=True , grid=trial_grid)
+        # The basis values on all the elements are only computed if needed
+        self._test_space  = test_space
+        self._trial_space = trial_space
+        self._test_grid   = test_grid
+        self._trial_grid  = trial_grid
+        self._test_basis  = None
+        self._trial_basis = None
 
         self.allocate_matrices(linalg_backend)
-        with_openmp = (assembly_backend['name'] == 'pyccel' and assembly_backend['openmp']) if assembly_backend else False
-        self._args , self._threads_args = self.construct_arguments(with_openmp=with_openmp)
+        self._with_openmp  = (assembly_backend['name'] == 'pyccel' and assembly_backend['openmp']) if assembly_backend else False
+        self._args         = None
+        self._threads_args = ()
+
+        # On uniform grids, the interior rows of a matrix with constant coefficients and
+        # without mapping are equal: only the elements close to the boundaries are visited
+        if (is_simple and self._num_threads == 1 and self._precompiled_terms is None
+            and not set(coordinates) & kernel_expr.expr.free_symbols):
+            self._uniform_args, self._uniform_rows = self.construct_uniform_arguments()
+
+        if self._uniform_args is None and self._precompiled_terms is None:
+            self._args, self._threads_args = self.construct_arguments(with_openmp=self._with_openmp)
+
+        # Without mapping and fields, a form with separable coefficients can also be assembled
+        # as a sum of Kronecker products of 1D matrices (see assemble_kronecker)
+        if is_simple:
+            self._kronecker_terms = self.construct_kronecker_terms()
 
     @property
     def domain(self):
@@ -424,24 +572,62 @@ class DiscreteBilinearForm(BasicDiscrete):
 
     @property
     def test_basis(self):
+        if self._test_basis is None:
+            self._test_basis = BasisValues(self._test_space, nderiv=self.max_nderiv, trial=False, grid=self._test_grid)
         return self._test_basis
 
     @property
     def trial_basis(self):
+        if self._trial_basis is None:
+            self._trial_basis = BasisValues(self._trial_space, nderiv=self.max_nderiv, trial=True, grid=self._trial_grid)
         return self._trial_basis
 
     @property
     def global_matrices(self):
         return self._global_matrices
 
+    @property
+    def is_separable(self):
+        """ True if the matrix can be assembled as a sum of Kronecker products of 1D matrices.
+        """
+        return self._kronecker_terms is not None
+
+    @property
+    def is_precompiled(self):
+        """ True if the matrix is assembled with the precompiled kernels (see `assemble_precompiled`).
+        """
+        return self._precompiled_terms is not None
+
     @property
     def args(self):
+        if self._args is None:
+            self._args, self._threads_args = self.construct_arguments(with_openmp=self._with_openmp)
         return self._args
 
+    @property
+    def cache(self):
+        """ The on-disk cache of the matrix, or None.
+        """
+        return self._cache
+
+    def cache_key(self, **kwargs):
+        """ Key of the matrix in the cache, for the given free arguments.
+        """
+        return self._cache.key(self._cache_signature,
+                               tuple((key, argument_signature(kwargs[key])) for key in self._free_args))
+
     def assemble(self, *, reset=True, **kwargs):
         """
         This method assembles the left hand side Matrix by calling the private method `self._func` with proper arguments.
 
+        If the form has an operator cache, the matrix is loaded from the cache if it
+        has already been stored there, otherwise it is assembled and stored (this is
+        only the case if the matrix is reset).
+
+        If the matrix is reset and the form has constant coefficients on a uniform grid
+        without mapping, only the elements close to the boundaries of the local domain
+        are visited and the interior rows are copied (see `uniform_assembly_elements`).
+
         In the complex case, this function returns the matrix conjugate. This comes from the fact that the
         problem `a(u,v)=b(v)` is discretized as `A @ conj(U) = B` due to the antilinearity of `a` in the first variable.
         Thus, to obtain `U`, the assemble function returns `conj(A)`.
@@ -450,6 +636,34 @@ class DiscreteBilinearForm(BasicDiscrete):
         For now, since the dot product does not compute the conjugate in the complex case. We do not use the conjugate in the assemble function.
         It should work if the complex only comes from the `rhs` in the linear form.
         """
+        if reset and self._cache is not None:
+            key = self.cache_key(**kwargs)
+            if key in self._cache:
+                self._cache.load(key, self._matrix)
+                self._matrix.ghost_regions_in_sync = False
+                return self._matrix
+
+            matrix = self._assemble(reset=reset, **kwargs)
+            self._cache.save(key, matrix)
+            return matrix
+
+        return self._assemble(reset=reset, **kwargs)
+
+    def _assemble(self, *, reset=True, **kwargs):
+
+        if self._precompiled_terms is not None:
+            return self.assemble_precompiled(reset=reset, **kwargs)
+
+        if reset and self._uniform_args is not None:
+            consts = tuple(kwargs[key] for key in self._free_args)
+            reset_arrays(*self.global_matrices)
+            self._func(*self._uniform_args, *consts)
+            self.replicate_rows()
+            if self._matrix and self._update_ghost_regions:
+                self._matrix.exchange_assembly_data()
+
+            if self._matrix: self._matrix.ghost_regions_in_sync = False
+            return self._matrix
 
         if self._free_args:
             basis   = []
@@ -486,7 +700,7 @@ class DiscreteBilinearForm(BasicDiscrete):
             args = (*self.args, *basis, *spans, *degrees, *pads, *coeffs, *consts)
 
         else:
-            args = self._args
+            args = self.args
 
 #        args = args + self._element_loop_starts + self._element_loop_ends
 
@@ -503,6 +717,101 @@ class DiscreteBilinearForm(BasicDiscrete):
         if self._matrix: self._matrix.ghost_regions_in_sync = False
         return self._matrix
 
+    def assemble_precompiled(self, *, reset=True, **kwargs):
+        """
+        Assemble the matrix with the precompiled kernels of psydac.core.assembly_kernels:
+        the coefficient of each term c(x) * D^a(u) * D^b(v) of the integrand is evaluated
+        at the quadrature points, and the term is added to the matrix by the generic
+        kernel of the right dimension. This requires `is_precompiled` to be True.
+        """
+        if not self.is_precompiled:
+            raise ValueError('> The bilinear form cannot be assembled with the precompiled kernels')
+
+        domain      = self.domain
+        coordinates = domain.coordinates if domain.dim > 1 else (domain.coordinates,)
+        constants   = {key: kwargs[key] for key in self._free_args}
+        points      = self.grid[0].points
+
+        test_space   = self._test_space
+        trial_space  = self._trial_space
+        test_spaces  = test_space.spaces  if isinstance( test_space, VectorFemSpace) else [test_space]
+        trial_spaces = trial_space.spaces if isinstance(trial_space, VectorFemSpace) else [trial_space]
+        test_basis   = self.test_basis
+        trial_basis  = self.trial_basis
+        is_block     = isinstance(self.kernel_expr.expr, (ImmutableDenseMatrix, Matrix))
+
+        if reset:
+            reset_arrays(*self.global_matrices)
+
+        for (k1, k2), terms in self._precompiled_terms.items():
+            M = self._matrix[k1, k2] if is_block else self._matrix
+            rows, diags = stencil_offsets(M, test_basis.spans[k1], trial_basis.spans[k2],
+                                          test_spaces[k1].degree, trial_spaces[k2].degree)
+
+            for (test_orders, trial_orders), c in terms.items():
+                c = c.subs({s: constants[s.name] for s in c.free_symbols if s.name in constants})
+                coeffs = quadrature_values(c, coordinates, points, M.dtype)
+                assemble_term(M, test_basis.basis[k1], trial_basis.basis[k2],
+                              rows, diags, test_orders, trial_orders, coeffs)
+
+        if self._update_ghost_regions:
+            self._matrix.exchange_assembly_data()
+
+        self._matrix.ghost_regions_in_sync = False
+        return self._matrix
+
+    def assemble_kronecker(self, **kwargs):
+        """
+        Assemble the matrix of a separable form (see `is_separable`) as a Kronecker
+        product of 1D stencil matrices, or as a sum of such products, without visiting
+        the elements of the tensor-product grid. The 1D matrices are global in each
+        process, hence they can be factorized directly by a KroneckerLinearSolver.
+
+        Returns
+        -------
+        KroneckerStencilMatrix | KroneckerStencilMatrixSum | BlockLinearOperator
+            The matrix, whose blocks are of the first two types in the vector case.
+            Its `tostencil` method (blockwise in the vector case) gives the matrix
+            returned by `assemble`.
+        """
+        if not self.is_separable:
+            raise ValueError('> The bilinear form is not separable')
+
+        test_space   = self._test_space
+        trial_space  = self._trial_space
+        test_spaces  = test_space.spaces  if isinstance( test_space, VectorFemSpace) else [test_space]
+        trial_spaces = trial_space.spaces if isinstance(trial_space, VectorFemSpace) else [trial_space]
+
+        domain      = self.domain
+        coordinates = domain.coordinates if domain.dim > 1 else (domain.coordinates,)
+
+        blocks = {}
+        for (k1, k2), terms in self._kronecker_terms.items():
+            Vt = test_spaces[k1]
+            Vs = trial_spaces[k2]
+            V  = Vs.vector_space
+            W  = Vt.vector_space
+            Vd = [vector_space_1d(V, d) for d in range(V.ndim)]
+            Wd = [vector_space_1d(W, d) for d in range(W.ndim)]
+            pads = [max(pt, ps) for pt, ps in zip(Vt.degree, Vs.degree)]
+
+            mats = []
+            for c, functions, test_orders, trial_orders in terms:
+                c = c.subs({s: kwargs[s.name] for s in c.free_symbols})
+                factors = []
+                for d, (f, b, a) in enumerate(zip(functions, test_orders, trial_orders)):
+                    f = lambdify(coordinates[d], f) if f.free_symbols else None
+                    factors.append(assemble_matrix_1d(Vs.spaces[d], Vt.spaces[d], Vd[d], Wd[d],
+                                                      pads[d], Vt.nquads[d], a, b, f))
+                factors[0] *= complex(c) if W.dtype == complex else float(c)
+                mats.append(KroneckerStencilMatrix(V, W, *factors))
+
+            blocks[k1, k2] = mats[0] if len(mats) == 1 else KroneckerStencilMatrixSum(V, W, *mats)
+
+        if isinstance(self.kernel_expr.expr, (ImmutableDenseMatrix, Matrix)):
+            return BlockLinearOperator(trial_space.vector_space, test_space.vector_space, blocks=blocks)
+        return blocks[0, 0]
+
     def get_space_indices_from_target(self, domain, target):
         if domain.mapping:
             domain = domain.logical_domain
@@ -647,6 +956,146 @@ class DiscreteBilinearForm(BasicDiscrete):
 
         return args, threads_args
 
+    def construct_uniform_arguments(self):
+        """
+        Collect the arguments of the assembly method restricted to the elements selected by
+        `uniform_assembly_elements`, if all the quadrature grids are uniform.
+
+        Returns
+        -------
+        args: tuple
+         The arguments passed to the assembly method, or None if the grids are not uniform.
+
+        rows: tuple
+          For each matrix block, the data array and the rows to be copied along each direction.
+
+        """
+        test_space  = self._test_space
+        trial_space = self._trial_space
+
+        test_spaces  = test_space.spaces  if isinstance( test_space, VectorFemSpace) else [test_space]
+        trial_spaces = trial_space.spaces if isinstance(trial_space, VectorFemSpace) else [trial_space]
+
+        spaces = [*test_spaces, *trial_spaces]
+        if not all(isinstance(V, TensorFemSpace) for V in spaces):
+            return None, ()
+
+        if not all(g.compressed and W.multiplicity == 1 for V in spaces for g, W in zip(V.quad_grids(), V.spaces)):
+            return None, ()
+
+        expr = self.kernel_expr.expr
+        if isinstance(expr, (ImmutableDenseMatrix, Matrix)):
+            blocks   = [(k1, k2) for k1 in range(expr.shape[0]) for k2 in range(expr.shape[1]) if not expr[k1, k2].is_zero]
+            matrices = [self._matrix[k1, k2] for k1, k2 in blocks]
+        else:
+            blocks   = [(0, 0)]
+            matrices = [self._matrix]
+
+        elements, rows = uniform_assembly_elements(test_spaces, trial_spaces, blocks)
+
+        test_basis  = BasisValues( test_space, nderiv=self.max_nderiv, trial=False, grid=self._test_grid , elements=elements)
+        trial_basis = BasisValues(trial_space, nderiv=self.max_nderiv, trial=True , grid=self._trial_grid, elements=elements)
+
+        test_basis, test_degrees, spans, pads = construct_test_space_arguments(test_basis)
+        trial_basis, trial_degrees, pads      = construct_trial_space_arguments(trial_basis)
+
+        points       = [x[e] for x, e in zip(self.grid[0].points, elements)]
+        n_elements   = [len(e) for e in elements]
+        quad_degrees = flatten(self.grid[0].nquads)
+        pads         = test_space.vector_space.pads
+
+        args = (*test_basis, *trial_basis, *spans, *points, *test_degrees, *trial_degrees,
+                *n_elements, *quad_degrees, *pads, *self._global_matrices)
+
+        args = tuple(np.int64(a) if isinstance(a, int) else a for a in args)
+        rows = tuple((M, r) for M, r in zip(matrices, rows) if any(ri is not None for ri in r))
+
+        return args, rows
+
+    def construct_kronecker_terms(self):
+        """
+        Write the integrand of each block of the matrix as a sum of separable terms
+        (see `kronecker_terms`).
+
+        Returns
+        -------
+        terms : dict | None
+          The separable terms of each non-zero block, or None if the form is not separable.
+
+        """
+        return self._construct_block_terms(kronecker_terms)
+
+    def construct_precompiled_terms(self):
+        """
+        Write the integrand of each block of the matrix as a sum of terms
+        c(x) * D^a(u) * D^b(v) (see `derivative_terms`).
+
+        Returns
+        -------
+        terms : dict | None
+          The terms of each non-zero block, or None if the form cannot be assembled
+          with the precompiled kernels.
+
+        """
+        split = lambda expr, test, trial, coordinates: derivative_terms(expr, test, trial, len(coordinates))
+        return self._construct_block_terms(split)
+
+    def _construct_block_terms(self, split):
+        """ Apply split(expr, test, trial, coordinates) to the integrand of each block.
+        """
+        test_space  = self._test_space
+        trial_space = self._trial_space
+
+        test_spaces  = test_space.spaces  if isinstance( test_space, VectorFemSpace) else [test_space]
+        trial_spaces = trial_space.spaces if isinstance(trial_space, VectorFemSpace) else [trial_space]
+
+        spaces = [*test_spaces, *trial_spaces]
+        if not all(isinstance(V, TensorFemSpace) and all(W.multiplicity == 1 for W in V.spaces) for V in spaces):
+            return None
+
+        tests  = self.expr.test_functions
+        trials = self.expr.trial_functions
+        if len(tests) > 1 or len(trials) > 1:
+            return None
+
+        test,  = tests
+        trial, = trials
+
+        domain      = self.domain
+        coordinates = domain.coordinates if domain.dim > 1 else (domain.coordinates,)
+
+        tests  = [test [k] for k in range(len( test_spaces))] if isinstance( test_space, VectorFemSpace) else [test]
+        trials = [trial[k] for k in range(len(trial_spaces))] if isinstance(trial_space, VectorFemSpace) else [trial]
+
+        expr = self.kernel_expr.expr
+        if isinstance(expr, (ImmutableDenseMatrix, Matrix)):
+            blocks = {(k1, k2): split(expr[k1, k2], tests[k1], trials[k2], coordinates)
+                      for k1 in range(expr.shape[0]) for k2 in range(expr.shape[1]) if not expr[k1, k2].is_zero}
+        else:
+            blocks = {(0, 0): split(expr, test, trial, coordinates)}
+
+        if any(terms is None for terms in blocks.values()):
+            return None
+
+        return blocks
+
+    def replicate_rows(self):
+        """
+        Copy the reference rows of the matrix blocks after an assembly restricted to the
+        elements selected by `uniform_assembly_elements`, one direction after the other.
+        """
+        for M, rows in self._uniform_rows:
+            data   = M._data
+            starts = [m*p for p, m in zip(M.codomain.pads, M.codomain.shifts)]
+            for d, (s, r) in enumerate(zip(starts, rows)):
+                if r is None or len(r[1]) == 0:
+                    continue
+                src = [slice(None)] * data.ndim
+                dst = [slice(None)] * data.ndim
+                src[d] = slice(s + r[0], s + r[0] + 1)
+                dst[d] = s + r[1]
+                data[tuple(dst)] = data[tuple(src)]
+
     def allocate_matrices(self, backend=None):
         """
         Allocate the global matrices used in the assembly method.
@@ -663,8 +1112,8 @@ class DiscreteBilinearForm(BasicDiscrete):
 
         expr            = self.kernel_expr.expr
         target          = self.kernel_expr.target
-        test_degree     = np.array(self.test_basis.space.degree)
-        trial_degree    = np.array(self.trial_basis.space.degree)
+        test_degree     = np.array(self._test_space.degree)
+        trial_degree    = np.array(self._trial_space.degree)
         test_space      = self.spaces[1].vector_space
         trial_space     = self.spaces[0].vector_space
         test_fem_space  = self.spaces[1]
@@ -1582,6 +2031,13 @@ class DiscreteSumForm(BasicDiscrete):
         backend = kwargs.pop('backend', None)
         self._backend = backend
 
+        # The matrix of a sum of bilinear forms is cached as a whole
+        cache = kwargs.pop('cache', None)
+        if cache is not None and not isinstance(cache, OperatorCache):
+            cache = OperatorCache(cache, comm=args[0].comm)
+        self._cache = cache
+        self._cache_signature = form_signature(a, args[0], args[1], kwargs.get('symbolic_mapping')) if cache else None
+
         folder = kwargs.get('folder', None)
         self._folder = self._initialize_folder(folder)
 
@@ -1645,13 +2101,39 @@ class DiscreteSumForm(BasicDiscrete):
     def is_functional(self):
         return self._is_functional
 
+    @property
+    def cache(self):
+        return self._cache
+
+    def cache_key(self, **kwargs):
+        return self._cache.key(self._cache_signature,
+                               tuple((key, argument_signature(kwargs[key])) for key in sorted(self._free_args)))
+
     def assemble(self, *, reset=True, **kwargs):
+        if reset and self._cache is not None and isinstance(self._expr, sym_BilinearForm):
+            key = self.cache_key(**kwargs)
+            if key in self._cache:
+                self._cache.load(key, self._operator)
+                self._operator.ghost_regions_in_sync = False
+                return self._operator
+
+            operator = self._assemble(reset=reset, **kwargs)
+            self._cache.save(key, operator)
+            return operator
+
+        return self._assemble(reset=reset, **kwargs)
+
+    def _assemble(self, *, reset=True, **kwargs):
         if not self.is_functional:
             if reset :
                 reset_arrays(*[i for M in self.forms for i in M.global_matrices])
 
-            for form in self.forms:
-                form.assemble(reset=False, **kwargs)
+            # A bilinear form assembled on a uniform grid copies some rows of its matrices,
+            # hence it must be assembled before the other forms which share these matrices
+            uniform = [reset and isinstance(form, DiscreteBilinearForm) and form._uniform_args is not None
+                       for form in self.forms]
+            for form, u in sorted(zip(self.forms, uniform), key=lambda fu: not fu[1]):
+                form.assemble(reset=u, **kwargs)
             self._operator.exchange_assembly_data()
             return self._operator
         else:
@@ -157,6 +157,11 @@ class BasisValues():
     grid : QuadratureGrid, optional
         needed for the basis values on the boundary to indicate the boundary over an axis.
 
+    elements : list, optional
+        local indices of the elements (one array per direction) on which the basis values are
+        needed. By default all the local elements are used. When the quadrature grids of V only
+        store the distinct basis tables (uniform grids), the values are read from these tables.
+
     Attributes
     ----------
     basis : list
@@ -165,10 +170,11 @@ class BasisValues():
         The spans of the basis functions.
 
     """
-    def __init__( self, V, nderiv , trial=False, grid=None):
+    def __init__( self, V, nderiv , trial=False, grid=None, elements=None):
 
         self._space = V
         assert grid is not None
+        assert elements is None or grid.axis is None
         if isinstance(V, (ProductFemSpace, VectorFemSpace)):
             starts = V.vector_space.starts
             V      = V.spaces
@@ -180,14 +186,18 @@ class BasisValues():
         basis = []
 
         weights = grid.weights
+        if elements is None:
+            elements = [slice(None)]*len(weights)
+
         for si,Vi in zip(starts,V):
             quad_grids  = Vi.quad_grids()
             spans_i     = []
             basis_i     = []
 
-            for sij,g,w,p,vij in zip(si, quad_grids, weights, Vi.vector_space.pads, Vi.spaces):
-                sp = g.spans-sij
-                bs = g.basis[:,:,:nderiv+1,:].copy()
+            for sij,g,w,el in zip(si, quad_grids, weights, elements):
+                sp = g.spans[el]-sij
+                bs = g.basis_table[g.basis_index[el]][:,:,:nderiv+1,:].copy()
+                w  = w[el]
 
                 if not trial:
                     bs  = bs.copy()
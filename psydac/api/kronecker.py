@@ -0,0 +1,218 @@
+# coding: utf-8
+#
+# Kronecker-structured assembly of separable bilinear forms on Cartesian grids.
+#
+# A bilinear form without mapping whose integrand is a sum of terms of the form
+#
+#     c * f_1(x_1) * ... * f_n(x_n) * D^a(u) * D^b(v),
+#
+# where D^a and D^b are partial derivatives in the logical coordinates, has a
+# matrix equal to the sum over the terms of the Kronecker products of 1D
+# matrices, one for each direction, which are assembled here without
+# generating any code.
+
+import numpy as np
+from sympy import S, Add, Mul, expand, lambdify, separatevars
+
+from sympde.topology import dx1, dx2, dx3
+
+from psydac.ddm.cart       import DomainDecomposition, CartDecomposition
+from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix
+from psydac.fem.grid       import FemAssemblyGrid
+
+__all__ = ('derivative_terms', 'kronecker_terms', 'vector_space_1d', 'assemble_matrix_1d')
+
+_partial_derivatives = (dx1, dx2, dx3)
+
+#==============================================================================
+def _split_derivatives(expr, ndim):
+    """ Remove the partial derivatives applied to an expression, and count them.
+    """
+    orders = [0] * ndim
+    while isinstance(expr, _partial_derivatives):
+        orders[_partial_derivatives.index(type(expr))] += 1
+        expr = expr.args[0]
+    return expr, tuple(orders)
+
+#==============================================================================
+def derivative_terms(expr, test, trial, ndim):
+    """
+    Write the integrand of a bilinear form as a sum of terms c(x) * D^a(u) * D^b(v),
+    where D^a and D^b are partial derivatives in the logical coordinates.
+
+    Parameters
+    ----------
+    expr : sympy.Expr
+        The integrand, linear in the test and trial functions, written in the
+        logical coordinates.
+
+    test : sympy.Expr
+        The test function (or one of its components).
+
+    trial : sympy.Expr
+        The trial function (or one of its components).
+
+    ndim : int
+        Number of logical coordinates.
+
+    Returns
+    -------
+    terms : dict | None
+        The coefficient c of each pair of orders (b, a) of the partial
+        derivatives of the test and trial functions, or None if the integrand
+        is not of this form.
+
+    """
+    terms = {}
+    for term in Add.make_args(expand(expr)):
+        test_orders  = None
+        trial_orders = None
+        coefficient  = S.One
+        for factor in Mul.make_args(term):
+            f, orders = _split_derivatives(factor, ndim)
+            if f == test and test_orders is None:
+                test_orders = orders
+            elif f == trial and trial_orders is None:
+                trial_orders = orders
+            elif f is factor and not factor.has(test, trial):
+                coefficient = coefficient * factor
+            else:
+                return None
+
+        if test_orders is None or trial_orders is None:
+            return None
+
+        key = (test_orders, trial_orders)
+        terms[key] = terms.get(key, S.Zero) + coefficient
+
+    return {key: c for key, c in terms.items() if c != 0}
+
+#==============================================================================
+def kronecker_terms(expr, test, trial, coordinates):
+    """
+    Write the integrand of a bilinear form as a sum of separable terms.
+
+    Parameters
+    ----------
+    expr : sympy.Expr
+        The integrand, linear in the test and trial functions, written in the
+        logical coordinates.
+
+    test : sympy.Expr
+        The test function (or one of its components).
+
+    trial : sympy.Expr
+        The trial function (or one of its components).
+
+    coordinates : tuple of sympy.Symbol
+        The coordinates (x_1, ..., x_n).
+
+    Returns
+    -------
+    terms : list of tuple | None
+        For each term, the constant factor c, the list of the functions
+        (f_1, ..., f_n) of one coordinate, and the orders of the partial
+        derivatives of the test and trial functions along each direction.
+        None is returned if the integrand is not separable.
+
+    """
+    # Group the terms with the same derivatives of the test and trial functions
+    groups = derivative_terms(expr, test, trial, len(coordinates))
+    if groups is None:
+        return None
+
+    # Separate the variables in the coefficient of each group, or else in
+    # each one of its terms
+    terms = []
+    for (test_orders, trial_orders), coefficient in groups.items():
+        factors = [separatevars(coefficient, symbols=coordinates, dict=True)]
+        if factors[0] is None:
+            factors = [separatevars(c, symbols=coordinates, dict=True) for c in Add.make_args(expand(coefficient))]
+
+        for f in factors:
+            if f is None:
+                return None
+            functions = [f.get(x, 1) for x in coordinates]
+            terms.append((f['coeff'], functions, test_orders, trial_orders))
+
+    return terms
+
+#==============================================================================
+def vector_space_1d(V, axis):
+    """
+    Serial 1D vector space with the global size, padding and periodicity of a
+    multi-dimensional StencilVectorSpace along one direction.
+    """
+    n = V.npts[axis]
+    domain_1d = DomainDecomposition([V.cart.domain_decomposition.ncells[axis]], [V.periods[axis]])
+    cart_1d   = CartDecomposition(domain_1d, [n], [[0]], [[n-1]], [V.pads[axis]], [V.shifts[axis]])
+    return StencilVectorSpace(cart_1d, dtype=V.dtype)
+
+#==============================================================================
+def assemble_matrix_1d(trial, test, V, W, pads, nquads, trial_order, test_order, coefficient=None):
+    """
+    Assemble the 1D matrix with entries
+
+        A[i, j] = integral( f(x) * d^b(phi_i)(x) * d^a(psi_j)(x) dx ),
+
+    where (psi_j) and (phi_i) are the trial and test basis functions.
+
+    Parameters
+    ----------
+    trial : SplineSpace
+        The 1D trial space.
+
+    test : SplineSpace
+        The 1D test space.
+
+    V : StencilVectorSpace
+        The 1D domain of the matrix (coefficients of the trial space).
+
+    W : StencilVectorSpace
+        The 1D codomain of the matrix (coefficients of the test space).
+
+    pads : int
+        Number of diagonals of the matrix on each side of the main one.
+
+    nquads : int
+        Quadrature parameter of the FemAssemblyGrid, as in TensorFemSpace.nquads.
+
+    trial_order : int
+        The order a of the derivative of the trial functions.
+
+    test_order : int
+        The order b of the derivative of the test functions.
+
+    coefficient : callable, optional
+        The function f, evaluated on arrays (default: 1).
+
+    Returns
+    -------
+    A : StencilMatrix
+        The matrix, in stencil format.
+
+    """
+    gs = FemAssemblyGrid(trial, 0, trial.ncells-1, nquads=nquads, nderiv=trial_order)
+    gt = FemAssemblyGrid(test , 0, test .ncells-1, nquads=nquads, nderiv=test_order)
+
+    weights = gt.weights
+    if coefficient is not None:
+        weights = weights * coefficient(gt.points)
+
+    # Element matrices
+    bt = gt.basis[:, :, test_order, :] * weights[:, None, :]
+    bs = gs.basis[:, :, trial_order, :]
+    mats = np.einsum('eiq,ejq->eij', bt, bs)
+
+    # Rows and diagonals of the entries of the element matrices
+    rows = gt.spans[:, None] - test.degree + np.arange(test.degree + 1)
+    cols = gs.spans[:, None] - trial.degree + np.arange(trial.degree + 1)
+    rows, cols = np.broadcast_arrays(rows[:, :, None], cols[:, None, :])
+
+    A = StencilMatrix(V, W, pads=(pads,))
+    r = W.pads[0] * W.shifts[0]
+    np.add.at(A._data, (r + rows, pads + cols - rows), mats)
+
+    # Sum the contributions of the periodic ghost rows
+    A.exchange_assembly_data()
+    return A
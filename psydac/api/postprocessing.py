@@ -27,7 +27,7 @@ from psydac.fem.basic import FemSpace, FemField
 from psydac.utilities.vtk import writeParallelVTKUnstructuredGrid
 from psydac.core.bsplines import elevate_knots
 
-__all__ = ('get_grid_lines_2d', '_augment_space_degree_dict',
+__all__ = ('get_grid_lines_2d', 'memmap_dataset', '_augment_space_degree_dict',
            'OutputManager', 'PostProcessManager')
 #===============================================================================
 def get_grid_lines_2d(domain_h, V_h, *, refine=1):
@@ -105,6 +105,30 @@ def get_grid_lines_2d(domain_h, V_h, *, refine=1):
     return isolines_1, isolines_2
 
 
+# ===========================================================================
+def memmap_dataset(dset):
+    """
+    Read-only view of an HDF5 dataset as a memory-mapped array, which avoids
+    going through the HDF5 library (and its buffers) to read slices of it. This
+    is only possible for contiguous, uncompressed datasets in a file opened
+    in read-only mode, otherwise the dataset itself is returned.
+
+    Parameters
+    ----------
+    dset : h5py.Dataset
+        The dataset.
+
+    Returns
+    -------
+    numpy.memmap | h5py.Dataset
+        The memory-mapped array, or the dataset.
+    """
+    offset = dset.id.get_offset()
+    if offset is None or dset.chunks is not None or dset.file.mode != 'r' or dset.dtype.kind not in 'iufc':
+        return dset
+    return np.memmap(dset.file.filename, mode='r', dtype=dset.dtype, shape=dset.shape, offset=offset)
+
+
 # ===========================================================================
 class OutputManager:
     """A class meant to streamline the exportation of
@@ -1322,16 +1346,17 @@ class PostProcessManager:
         else:
             space = space
             field = field
+        # The local coefficients are copied from the file pages, without HDF5 buffers
         if isinstance(coeff, list): # Means vector field
             for i in range(len(coeff)):
                 V = space.spaces[i].vector_space
                 index_coeff = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
-                field.coeffs[i][index_coeff] = coeff[i][index_coeff]
+                field.coeffs[i][index_coeff] = memmap_dataset(coeff[i])[index_coeff]
                 field.coeffs[i].update_ghost_regions()
         else:
             V = space.vector_space
             index_coeff = tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))
-            field.coeffs[index_coeff] = coeff[index_coeff]
+            field.coeffs[index_coeff] = memmap_dataset(coeff)[index_coeff]
             field.coeffs.update_ghost_regions()
 
     def export_to_vtk(self,
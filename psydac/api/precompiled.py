@@ -0,0 +1,144 @@
+# coding: utf-8
+#
+# Assembly of bilinear forms with the generic kernels of
+# psydac.core.assembly_kernels, which are compiled once and for all.
+#
+# A bilinear form without mapping and fields whose integrand is a sum of terms
+#
+#     c(x) * D^a(u) * D^b(v),
+#
+# where D^a and D^b are partial derivatives in the logical coordinates, does not
+# need any generated code: each term is assembled by the same kernel, which is
+# given the values of c(x) at the quadrature points.
+
+import numpy as np
+from sympy import lambdify
+
+from psydac.core.assembly_kernels import assemble_matrix_1d, assemble_matrix_2d, assemble_matrix_3d
+
+__all__ = ('quadrature_values', 'stencil_offsets', 'assemble_term')
+
+_kernels = {1: assemble_matrix_1d, 2: assemble_matrix_2d, 3: assemble_matrix_3d}
+
+#==============================================================================
+def quadrature_values(coefficient, coordinates, points, dtype):
+    """
+    Values of a coefficient at the quadrature points of a tensor-product grid.
+
+    Parameters
+    ----------
+    coefficient : sympy.Expr
+        The coefficient, whose only free symbols are the coordinates.
+
+    coordinates : tuple of sympy.Symbol
+        The coordinates (x_1, ..., x_n).
+
+    points : list of numpy.ndarray
+        The quadrature points along each direction, with shape (ne_d, nq_d).
+
+    dtype : type
+        Data type of the values (float or complex).
+
+    Returns
+    -------
+    values : numpy.ndarray
+        The values c[e1, q1, e2, q2, ...], as a contiguous array.
+
+    """
+    ndim   = len(points)
+    shape  = tuple(n for p in points for n in p.shape)
+    values = np.empty(shape, dtype=dtype)
+
+    if coefficient.free_symbols:
+        f = lambdify(coordinates, coefficient)
+        x = []
+        for d, p in enumerate(points):
+            s = [1] * (2 * ndim)
+            s[2*d:2*d+2] = p.shape
+            x.append(p.reshape(s))
+        values[...] = f(*x)
+    else:
+        values[...] = dtype(coefficient)
+
+    return values
+
+#==============================================================================
+def stencil_offsets(M, test_spans, trial_spans, test_degree, trial_degree):
+    """
+    Rows and diagonals, in the local data array of a stencil matrix, of the
+    entries between the first test function and the first trial function which
+    are non-zero on each element.
+
+    Parameters
+    ----------
+    M : StencilMatrix
+        The matrix, whose domain and codomain have multiplicity 1.
+
+    test_spans : list of numpy.ndarray
+        The local spans of the test functions on the elements, along each direction.
+
+    trial_spans : list of numpy.ndarray
+        The local spans of the trial functions on the elements, along each direction.
+
+    test_degree : tuple of int
+        Degree of the test space along each direction.
+
+    trial_degree : tuple of int
+        Degree of the trial space along each direction.
+
+    Returns
+    -------
+    rows : list of numpy.ndarray
+        The rows along each direction, one per element.
+
+    diags : list of numpy.ndarray
+        The diagonals along each direction, one per element.
+
+    """
+    V = M.domain
+    W = M.codomain
+
+    rows  = []
+    diags = []
+    for d, (st, ss, pt, ps) in enumerate(zip(test_spans, trial_spans, test_degree, trial_degree)):
+        i = st - pt + W.starts[d]
+        j = ss - ps + V.starts[d]
+        rows .append(np.ascontiguousarray(i - W.starts[d] + W.pads[d] * W.shifts[d], dtype=np.int64))
+        diags.append(np.ascontiguousarray(M.pads[d] + j - i, dtype=np.int64))
+
+    return rows, diags
+
+#==============================================================================
+def assemble_term(M, test_basis, trial_basis, rows, diags, test_orders, trial_orders, coeffs):
+    """
+    Add the matrix of a term c(x) * D^a(u) * D^b(v) to the local data of a
+    stencil matrix, with the precompiled kernel of psydac.core.assembly_kernels.
+
+    Parameters
+    ----------
+    M : StencilMatrix
+        The matrix.
+
+    test_basis : list of numpy.ndarray
+        The values of the test functions and of their derivatives, multiplied by
+        the quadrature weights, with shape (ne_d, p_d+1, nderiv+1, nq_d).
+
+    trial_basis : list of numpy.ndarray
+        The values of the trial functions and of their derivatives.
+
+    rows, diags : list of numpy.ndarray
+        The offsets of the element matrices (see `stencil_offsets`).
+
+    test_orders : tuple of int
+        The orders b of the partial derivatives of the test functions.
+
+    trial_orders : tuple of int
+        The orders a of the partial derivatives of the trial functions.
+
+    coeffs : numpy.ndarray
+        The values of the coefficient c at the quadrature points (see `quadrature_values`).
+
+    """
+    bt = [np.ascontiguousarray(b[:, :, k, :]) for b, k in zip(test_basis, test_orders)]
+    bs = [np.ascontiguousarray(b[:, :, k, :]) for b, k in zip(trial_basis, trial_orders)]
+    _kernels[len(bt)](*bt, *bs, *rows, *diags, coeffs, M._data)
@@ -1,19 +1,24 @@
+import os
 import pytest
 import numpy as np
 from mpi4py import MPI
 from sympy import pi, sin, cos, tan, atan, atan2, exp, sinh, cosh, tanh, atanh, Tuple, I
 
 
-from sympde.topology import Line, Square
+from sympde.topology import Line, Square, Cube, Domain
 from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
-from sympde.topology import element_of, Derham
+from sympde.topology import element_of, Derham, CollelaMapping2D
 from sympde.core     import Constant
 from sympde.expr     import LinearForm, BilinearForm, Functional, Norm
 from sympde.expr     import integral
-from sympde.calculus import Inner
+from sympde.calculus import Inner, dot, grad, div, minus, plus
 
 from psydac.linalg.solvers     import inverse
-from psydac.api.discretization import discretize
+from psydac.linalg.block       import BlockLinearOperator
+from psydac.linalg.kron        import KroneckerLinearSolver
+from psydac.api.discretization import discretize, discretize_many
+from psydac.api.cache          import OperatorCache
+from psydac.api.fem            import reset_arrays
 from psydac.fem.basic          import FemField
 from psydac.api.settings       import PSYDAC_BACKENDS
 from psydac.linalg.utilities   import array_to_psydac
@@ -530,6 +535,469 @@ def test_assembly_no_synchr_args(backend):
     assert( abs(inte_lin) < 1.e-12)
     assert( abs(inte_norm) < 1.e-12)
 
+#==============================================================================
+def full_assembly(ah, **kwargs):
+    """ Assemble a discrete bilinear form visiting all the elements.
+    """
+    forms = ah.forms if hasattr(ah, 'forms') else [ah]
+    reset_arrays(*[M for a in forms for M in a.global_matrices])
+    return ah.assemble(reset=False, **kwargs).toarray()
+
+def check_uniform_assembly(a, domain_h, spaces, backend=None, **kwargs):
+
+    kwargs_h = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+    ah = discretize(a, domain_h, spaces, **kwargs_h)
+
+    # Only the elements close to the boundaries are visited
+    forms = ah.forms if hasattr(ah, 'forms') else [ah]
+    assert any(f._uniform_args is not None for f in forms)
+
+    A = ah.assemble(**kwargs).toarray()
+    assert np.allclose(A, full_assembly(ah, **kwargs), rtol=1e-13, atol=1e-13)
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('periodic', [True, False])
+def test_uniform_grid_assembly_scalar(dim, periodic, backend):
+
+    domain   = [Line, Square, Cube][dim-1]()
+    ncells   = [9, 8, 7][:dim]
+    degree   = [3, 2, 1][:dim]
+    domain_h = discretize(domain, ncells=ncells, periodic=[periodic]*dim)
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=degree)
+    u, v = [element_of(V, name=n) for n in 'uv']
+    c  = Constant(name='c', real=True)
+
+    a = BilinearForm((u, v), integral(domain, u*v + c*dot(grad(u), grad(v))))
+    check_uniform_assembly(a, domain_h, [Vh, Vh], backend, c=2.5)
+
+    # Sum of an interior and a boundary integral
+    if not periodic:
+        b = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v))) + integral(domain.boundary, u*v))
+        check_uniform_assembly(b, domain_h, [Vh, Vh], backend)
+
+@pytest.mark.parametrize('periodic', [True, False])
+def test_uniform_grid_assembly_derham(periodic, backend):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[8, 9], periodic=[periodic]*2)
+    derham   = Derham(domain, sequence=['h1', 'hdiv', 'l2'])
+    derham_h = discretize(derham, domain_h, degree=[2, 3])
+
+    V1, V2 = derham.V1, derham.V2
+    u, v = [element_of(V1, name=n) for n in 'uv']
+    p    = element_of(V2, name='p')
+
+    a = BilinearForm((u, v), integral(domain, dot(u, v) + div(u)*div(v)))
+    b = BilinearForm((u, p), integral(domain, div(u)*p))
+    check_uniform_assembly(a, domain_h, [derham_h.V1, derham_h.V1], backend)
+    check_uniform_assembly(b, domain_h, [derham_h.V1, derham_h.V2], backend)
+
+@pytest.mark.parallel
+@pytest.mark.parametrize('periodic', [True, False])
+def test_uniform_grid_assembly_parallel(periodic):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[10, 12], periodic=[periodic]*2, comm=MPI.COMM_WORLD)
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=[2, 3])
+    u, v = [element_of(V, name=n) for n in 'uv']
+
+    a = BilinearForm((u, v), integral(domain, u*v + dot(grad(u), grad(v))))
+    check_uniform_assembly(a, domain_h, [Vh, Vh])
+
+#==============================================================================
+def check_kronecker_assembly(a, domain_h, spaces, **kwargs):
+
+    ah = discretize(a, domain_h, spaces)
+    assert ah.is_separable
+
+    A = ah.assemble(**kwargs)
+    K = ah.assemble_kronecker(**kwargs)
+
+    # Compare the local rows of the stencil matrices
+    if isinstance(K, BlockLinearOperator):
+        S = BlockLinearOperator(K.domain, K.codomain, blocks={ij: K[ij].tostencil() for ij in K.nonzero_block_indices})
+    else:
+        S = K.tostencil()
+    assert np.allclose(S.toarray(), A.toarray(), rtol=1e-13, atol=1e-13)
+
+    x = A.domain.zeros()
+    for xi in (x.blocks if hasattr(x, 'blocks') else [x]):
+        xi._data[:] = np.random.default_rng(0).random(xi._data.shape)
+    x.update_ghost_regions()
+    assert np.allclose(K.dot(x).toarray(), A.dot(x).toarray(), rtol=1e-13, atol=1e-13)
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('periodic', [True, False])
+def test_kronecker_assembly_scalar(dim, periodic):
+
+    domain   = [Line, Square, Cube][dim-1]()
+    ncells   = [9, 8, 7][:dim]
+    degree   = [3, 2, 1][:dim]
+    domain_h = discretize(domain, ncells=ncells, periodic=[periodic]*dim)
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=degree)
+    u, v = [element_of(V, name=n) for n in 'uv']
+    c  = Constant(name='c', real=True)
+    x  = domain.coordinates if dim > 1 else (domain.coordinates,)
+
+    a = BilinearForm((u, v), integral(domain, u*v + c*dot(grad(u), grad(v))))
+    check_kronecker_assembly(a, domain_h, [Vh, Vh], c=2.5)
+
+    # Separable coefficients
+    f = (1 + x[0]**2) * sin(x[-1] + 1) + exp(x[0])
+    b = BilinearForm((u, v), integral(domain, f*u*v + x[0]*u.diff(x[-1])*v))
+    check_kronecker_assembly(b, domain_h, [Vh, Vh])
+
+    # Non-separable coefficient
+    if dim > 1:
+        c = BilinearForm((u, v), integral(domain, sin(x[0]*x[1])*u*v))
+        ch = discretize(c, domain_h, [Vh, Vh])
+        assert not ch.is_separable
+        with pytest.raises(ValueError):
+            ch.assemble_kronecker()
+
+@pytest.mark.parametrize('periodic', [True, False])
+def test_kronecker_assembly_derham(periodic):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[8, 9], periodic=[periodic]*2)
+    derham   = Derham(domain, sequence=['h1', 'hdiv', 'l2'])
+    derham_h = discretize(derham, domain_h, degree=[2, 3])
+
+    V1, V2 = derham.V1, derham.V2
+    u, v = [element_of(V1, name=n) for n in 'uv']
+    p    = element_of(V2, name='p')
+
+    a = BilinearForm((u, v), integral(domain, dot(u, v) + div(u)*div(v)))
+    b = BilinearForm((u, p), integral(domain, div(u)*p))
+    check_kronecker_assembly(a, domain_h, [derham_h.V1, derham_h.V1])
+    check_kronecker_assembly(b, domain_h, [derham_h.V1, derham_h.V2])
+
+def test_kronecker_assembly_solver():
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[8, 6], periodic=[True, False])
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=[3, 2])
+    u, v = [element_of(V, name=n) for n in 'uv']
+
+    ah = discretize(BilinearForm((u, v), integral(domain, u*v)), domain_h, [Vh, Vh])
+    M  = ah.assemble_kronecker()
+
+    # The 1D factors are factorized directly
+    M_inv = KroneckerLinearSolver(M.domain, M.codomain, M.mats)
+
+    b = Vh.vector_space.zeros()
+    b._data[:] = np.random.default_rng(0).random(b._data.shape)
+    b.update_ghost_regions()
+    x = M_inv.dot(b)
+    assert np.allclose(M.dot(x).toarray(), b.toarray(), rtol=1e-10, atol=1e-10)
+
+@pytest.mark.parallel
+@pytest.mark.parametrize('periodic', [True, False])
+def test_kronecker_assembly_parallel(periodic):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[10, 12], periodic=[periodic]*2, comm=MPI.COMM_WORLD)
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=[2, 3])
+    u, v = [element_of(V, name=n) for n in 'uv']
+    x1, x2 = domain.coordinates
+
+    a = BilinearForm((u, v), integral(domain, (1 + x1)*u*v + dot(grad(u), grad(v))))
+    check_kronecker_assembly(a, domain_h, [Vh, Vh])
+
+#==============================================================================
+def check_discretize_many(comm, **kwargs):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[6, 5], comm=comm)
+    x1, x2   = domain.coordinates
+
+    V1 = ScalarFunctionSpace('V1', domain)
+    V2 = VectorFunctionSpace('V2', domain)
+    Vh1, Vh2 = discretize_many([(V1, domain_h), (V2, domain_h)], degree=[2, 2])
+
+    u1, v1 = [element_of(V1, name=n) for n in ('u1', 'v1')]
+    u2, v2 = [element_of(V2, name=n) for n in ('u2', 'v2')]
+
+    a1 = BilinearForm((u1, v1), integral(domain, dot(grad(u1), grad(v1))))
+    a2 = BilinearForm((u2, v2), integral(domain, dot(u2, v2) + div(u2)*div(v2)))
+    b  = BilinearForm((u2, v1), integral(domain, x1 * u2[0] * v1))
+    l  = LinearForm(v1, integral(domain, sin(pi*x1) * v1))
+
+    # Generate all the kernels, then compile them together
+    forms  = [(a1, domain_h, [Vh1, Vh1]), (a2, domain_h, [Vh2, Vh2]),
+              (b , domain_h, [Vh2, Vh1]), (l , domain_h, Vh1)]
+    many   = discretize_many(forms, max_workers=2, **kwargs)
+    single = [discretize(*f, **kwargs) for f in forms]
+
+    for h1, h2 in zip(many, single):
+        assert h1.func is not None
+        assert np.allclose(h1.assemble().toarray(), h2.assemble().toarray(), rtol=1e-14, atol=1e-14)
+
+#==============================================================================
+def test_discretize_many(backend):
+
+    kwargs = {'backend': PSYDAC_BACKENDS[backend]} if backend else {}
+    check_discretize_many(None, **kwargs)
+
+#==============================================================================
+@pytest.mark.parallel
+def test_discretize_many_parallel():
+
+    check_discretize_many(MPI.COMM_WORLD, backend=PSYDAC_BACKENDS['pyccel-gcc'])
+
+#==============================================================================
+def check_precompiled_assembly(a, domain_h, spaces, **kwargs):
+
+    ah = discretize(a, domain_h, spaces, precompiled=True)
+    bh = discretize(a, domain_h, spaces)
+
+    # No code is generated for the form
+    assert ah.is_precompiled
+    assert ah.func is None
+
+    A = ah.assemble(**kwargs)
+    B = bh.assemble(**kwargs)
+    assert np.allclose(A.toarray(), B.toarray(), rtol=1e-13, atol=1e-13)
+
+    # Assemble again, without and with reset
+    assert np.allclose(ah.assemble(reset=False, **kwargs).toarray(), 2 * B.toarray(), rtol=1e-13, atol=1e-13)
+    assert np.allclose(ah.assemble(**kwargs).toarray(), B.toarray(), rtol=1e-13, atol=1e-13)
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('periodic', [True, False])
+def test_precompiled_assembly_scalar(dim, periodic):
+
+    domain   = [Line, Square, Cube][dim-1]()
+    ncells   = [9, 8, 5][:dim]
+    degree   = [3, 2, 1][:dim]
+    domain_h = discretize(domain, ncells=ncells, periodic=[periodic]*dim)
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=degree)
+    u, v = [element_of(V, name=n) for n in 'uv']
+    c  = Constant(name='c', real=True)
+    x  = domain.coordinates if dim > 1 else (domain.coordinates,)
+
+    a = BilinearForm((u, v), integral(domain, u*v + c*dot(grad(u), grad(v))))
+    check_precompiled_assembly(a, domain_h, [Vh, Vh], c=2.5)
+
+    # Variable, non-separable coefficients
+    f = exp(x[0] * x[-1]) + sin(x[0])
+    b = BilinearForm((u, v), integral(domain, f*u*v + x[0]*u.diff(x[-1])*v))
+    check_precompiled_assembly(b, domain_h, [Vh, Vh])
+
+def test_precompiled_assembly_derham():
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[8, 9], periodic=[True, False])
+    derham   = Derham(domain, sequence=['h1', 'hdiv', 'l2'])
+    derham_h = discretize(derham, domain_h, degree=[2, 3])
+
+    V1, V2 = derham.V1, derham.V2
+    x1, x2 = domain.coordinates
+    u, v = [element_of(V1, name=n) for n in 'uv']
+    p    = element_of(V2, name='p')
+
+    a = BilinearForm((u, v), integral(domain, (1 + x1*x2)*dot(u, v) + div(u)*div(v)))
+    b = BilinearForm((u, p), integral(domain, div(u)*p))
+    check_precompiled_assembly(a, domain_h, [derham_h.V1, derham_h.V1])
+    check_precompiled_assembly(b, domain_h, [derham_h.V1, derham_h.V2])
+
+def test_precompiled_assembly_complex():
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[6, 7])
+
+    V  = ScalarFunctionSpace('V', domain)
+    V.codomain_type = 'complex'
+    Vh = discretize(V, domain_h, degree=[2, 2])
+    u, v = [element_of(V, name=n) for n in 'uv']
+    c  = Constant(name='c', complex=True)
+
+    a = BilinearForm((u, v), integral(domain, c*u*v + dot(grad(u), grad(v))))
+    check_precompiled_assembly(a, domain_h, [Vh, Vh], c=1.0+2.0j)
+
+def test_precompiled_assembly_fallback():
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[4, 4])
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=[2, 2])
+    u, v, f = [element_of(V, name=n) for n in 'uvf']
+
+    # Forms with fields still use the generated code
+    a  = BilinearForm((u, v), integral(domain, f*u*v))
+    ah = discretize(a, domain_h, [Vh, Vh], precompiled=True)
+    assert not ah.is_precompiled
+    with pytest.raises(ValueError):
+        ah.assemble_precompiled()
+
+@pytest.mark.parallel
+@pytest.mark.parametrize('periodic', [True, False])
+def test_precompiled_assembly_parallel(periodic):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[10, 12], periodic=[periodic]*2, comm=MPI.COMM_WORLD)
+
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=[2, 3])
+    u, v = [element_of(V, name=n) for n in 'uv']
+    x1, x2 = domain.coordinates
+
+    a = BilinearForm((u, v), integral(domain, (1 + x1*x2)*u*v + dot(grad(u), grad(v))))
+    check_precompiled_assembly(a, domain_h, [Vh, Vh])
+
+#==============================================================================
+def check_cached_assembly(a, domain_h, spaces, path, **kwargs):
+
+    ah = discretize(a, domain_h, spaces, cache=path)
+    A  = ah.assemble(**kwargs).toarray()
+    key = ah.cache_key(**kwargs)
+    assert key in ah.cache
+
+    # A new discrete form finds the matrix in the cache, and does not assemble it
+    bh = discretize(a, domain_h, spaces, cache=path)
+    assert bh.cache_key(**kwargs) == key
+    bh._assemble = None
+    B = bh.assemble(**kwargs)
+    assert np.array_equal(B.toarray(), A)
+    return key
+
+def test_cached_assembly(tmp_path):
+
+    domain   = CollelaMapping2D('M', k1=1, k2=1, eps=0.1)(Square())
+    domain_h = discretize(domain, ncells=[6, 7], periodic=[True, False])
+    derham   = Derham(domain, sequence=['h1', 'hcurl', 'l2'])
+    derham_h = discretize(derham, domain_h, degree=[2, 2])
+
+    u, v = [element_of(derham.V0, name=n) for n in 'uv']
+    E, F = [element_of(derham.V1, name=n) for n in 'EF']
+    c    = Constant(name='c', real=True)
+
+    # Sum of a domain and a boundary integral
+    a = BilinearForm((u, v), integral(domain, c*u*v + dot(grad(u), grad(v))) + integral(domain.boundary, u*v))
+    b = BilinearForm((E, F), integral(domain, dot(E, F)))
+
+    ka = check_cached_assembly(a, domain_h, [derham_h.V0, derham_h.V0], tmp_path, c=2.0)
+    kb = check_cached_assembly(b, domain_h, [derham_h.V1, derham_h.V1], tmp_path)
+    assert ka != kb
+
+    # The free arguments and the mapping are part of the key
+    ah = discretize(a, domain_h, [derham_h.V0, derham_h.V0], cache=tmp_path)
+    assert ah.cache_key(c=3.0) != ka
+
+    domain2   = CollelaMapping2D('M', k1=1, k2=1, eps=0.2)(Square())
+    domain2_h = discretize(domain2, ncells=[6, 7], periodic=[True, False])
+    derham2_h = discretize(Derham(domain2, sequence=['h1', 'hcurl', 'l2']), domain2_h, degree=[2, 2])
+    b2h = discretize(b, domain2_h, [derham2_h.V1, derham2_h.V1], cache=tmp_path)
+    assert b2h.cache_key() != kb
+
+def test_operator_cache_kronecker(tmp_path):
+
+    domain   = Square()
+    domain_h = discretize(domain, ncells=[8, 6])
+    V  = ScalarFunctionSpace('V', domain)
+    Vh = discretize(V, domain_h, degree=[3, 2])
+    u, v = [element_of(V, name=n) for n in 'uv']
+
+    a  = BilinearForm((u, v), integral(domain, u*v + dot(grad(u), grad(v))))
+    ah = discretize(a, domain_h, [Vh, Vh])
+    K  = ah.assemble_kronecker()
+    A  = K.toarray()
+
+    cache = OperatorCache(tmp_path)
+    key   = cache.key('stiffness')
+    assert key not in cache
+    cache.save(key, K)
+    assert key in cache
+
+    for term in K.terms:
+        for M in term.mats:
+            M._data[...] = 0
+    cache.load(key, K)
+    assert np.array_equal(K.toarray(), A)
+
+    with pytest.raises(TypeError):
+        cache.save(cache.key('vector'), K.domain.zeros())
+
+@pytest.mark.parallel
+def test_cached_assembly_parallel(monkeypatch):
+
+    import shutil
+    import tempfile
+
+    comm = MPI.COMM_WORLD
+    path = comm.bcast(tempfile.mkdtemp() if comm.rank == 0 else None)
+
+    domain   = CollelaMapping2D('M', k1=1, k2=1, eps=0.1)(Square())
+    domain_h = discretize(domain, ncells=[8, 10], periodic=[True, False], comm=comm)
+    derham   = Derham(domain, sequence=['h1', 'hcurl', 'l2'])
+    derham_h = discretize(derham, domain_h, degree=[2, 3])
+
+    u, v = [element_of(derham.V0, name=n) for n in 'uv']
+    E, F = [element_of(derham.V1, name=n) for n in 'EF']
+
+    a = BilinearForm((u, v), integral(domain, u*v + dot(grad(u), grad(v))))
+    b = BilinearForm((E, F), integral(domain, dot(E, F)))
+    check_cached_assembly(a, domain_h, [derham_h.V0, derham_h.V0], path)
+    check_cached_assembly(b, domain_h, [derham_h.V1, derham_h.V1], path)
+
+    # All the processes load the matrix from the cache, even if the metadata
+    # file is not yet visible to some of them
+    bh = discretize(b, domain_h, [derham_h.V1, derham_h.V1], cache=path)
+    bh._assemble = None
+    with monkeypatch.context() as m:
+        if comm.rank != 0:
+            m.setattr(os.path, 'exists', lambda path: False)
+        B = bh.assemble()
+    assert np.array_equal(B.toarray(), discretize(b, domain_h, [derham_h.V1, derham_h.V1]).assemble().toarray())
+
+    comm.Barrier()
+    if comm.rank == 0:
+        shutil.rmtree(path)
+
+#==============================================================================
+@pytest.mark.parallel
+def test_interface_assembly_parallel():
+
+    A = Square('A', bounds1=(0, 0.5), bounds2=(0, 1))
+    B = Square('B', bounds1=(0.5, 1), bounds2=(0, 1))
+    domain = Domain.join([A, B], [((0, 0, 1), (1, 0, -1))], 'domain')
+
+    V = ScalarFunctionSpace('V', domain)
+    u, v = [element_of(V, name=n) for n in 'uv']
+
+    a = BilinearForm((u, v), integral(domain, u*v) + integral(domain.interfaces, plus(u)*minus(v) + minus(u)*plus(v)))
+    b = LinearForm(v, integral(domain.interfaces, plus(v) + minus(v)))
+
+    values = []
+    for comm in (MPI.COMM_WORLD, MPI.COMM_SELF):
+        domain_h = discretize(domain, ncells={'A': [8, 8], 'B': [8, 8]}, comm=comm)
+        Vh = discretize(V, domain_h, degree=[2, 2])
+        ah = discretize(a, domain_h, [Vh, Vh])
+
+        # Only the processes along the interface assemble the interface terms,
+        # the others do nothing
+        for form in ah.forms:
+            form.assemble()
+
+        M = ah.assemble()
+        f = discretize(b, domain_h, Vh).assemble()
+        values.append([M.dot(f).dot(f), f.dot(f)])
+
+    assert np.allclose(values[0], values[1], rtol=1e-12, atol=1e-12)
+
 #==============================================================================
 if __name__ == '__main__':
     test_field_and_constant(None)
@@ -22,7 +22,7 @@ from psydac.feec.pull_push import (push_2d_hcurl,
                                    push_3d_hdiv,
                                    push_3d_l2)
 
-from psydac.api.postprocessing import OutputManager, PostProcessManager
+from psydac.api.postprocessing import OutputManager, PostProcessManager, memmap_dataset
 
 # Get mesh_directory
 try:
@@ -286,6 +286,56 @@ def test_export_fields_serial(dtype):
     os.remove('test_export_fields_serial.yml')
     os.remove('test_export_fields_serial.h5')
 
+@pytest.mark.serial
+@pytest.mark.parametrize( 'dtype', ['float', 'complex'] )
+def test_load_fields_serial(dtype):
+    domain = Square('D')
+    A = ScalarFunctionSpace('A', domain, kind='H1')
+    A.codomain_type = dtype
+    B = VectorFunctionSpace('B', domain, kind=None)
+    B.codomain_type = dtype
+
+    domain_h = discretize(domain, ncells=[5, 6])
+
+    Ah = discretize(A, domain_h, degree=[3, 2])
+    Bh = discretize(B, domain_h, degree=[2, 2])
+
+    rng = np.random.default_rng(0)
+    uh  = FemField(Ah)
+    vh  = FemField(Bh)
+    for c in [uh.coeffs, *vh.coeffs]:
+        c._data[...] = rng.random(c._data.shape)
+        if dtype == 'complex':
+            c._data[...] += 1j * rng.random(c._data.shape)
+
+    Om = OutputManager('test_load_fields_serial.yml', 'test_load_fields_serial.h5')
+    Om.add_spaces(Ah=Ah, Bh=Bh)
+    Om.add_snapshot(0., 0)
+    Om.export_fields(uh=uh, vh=vh)
+    Om.close()
+
+    Pm = PostProcessManager(
+        domain=domain,
+        space_file='test_load_fields_serial.yml',
+        fields_file='test_load_fields_serial.h5'
+    )
+
+    # The datasets are read through memory maps
+    dset = Pm.fields_file['snapshot_0000']['D']['Ah']['uh']
+    view = memmap_dataset(dset)
+    assert isinstance(view, np.memmap)
+    assert np.array_equal(view, dset[...])
+
+    Pm.load_snapshot(0, 'uh', 'vh')
+    ul = Pm.fields['uh']
+    vl = Pm.fields['vh']
+    assert np.array_equal(ul.coeffs.toarray(), uh.coeffs.toarray())
+    assert np.array_equal(vl.coeffs.toarray(), vh.coeffs.toarray())
+
+    Pm.close()
+    os.remove('test_load_fields_serial.yml')
+    os.remove('test_load_fields_serial.h5')
+
 @pytest.mark.parallel
 def test_export_fields_parallel():
     comm = MPI.COMM_WORLD
@@ -1,8 +1,8 @@
 # coding = utf-8
+from psydac.utilities.lazy_import import attach
 
 __all__ = ['geometry']
 
-from psydac.cad import geometry
-from psydac.cad import cad
-from psydac.cad import gallery
-from psydac.cad import utils
+# The submodules are imported on first access (PEP 562)
+_submodules = {'geometry', 'cad', 'gallery', 'utils'}
+__getattr__, __dir__ = attach(__name__, _submodules)
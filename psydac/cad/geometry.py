@@ -230,7 +230,23 @@ class Geometry( object ):
             raise ValueError('> Only h5 files are supported')
         # ...
 
-        # read the topological domain
+        # ... read the metadata on one process only, and broadcast it: the
+        #     description of the patches, and the 1D spline spaces of each
+        #     patch (degree, periodicity, knots)
+        if comm is None or comm.rank == 0:
+            with h5py.File( filename, mode='r' ) as h5:
+                yml      = yaml.load( h5['geometry.yml'][()], Loader=yaml.SafeLoader )
+                patches  = [read_patch_spaces( h5[item['mapping_id']], yml['ldim'] )
+                            if item['type'] in ['SplineMapping', 'NurbsMapping'] else None
+                            for item in yml['patches']]
+        else:
+            yml = patches = None
+
+        if comm is not None and comm.size > 1:
+            yml, patches = comm.bcast( (yml, patches), root=0 )
+        # ...
+
+        # build the topological domain
         domain       = Domain.from_file(filename)
         connectivity = construct_connectivity(domain)
 
@@ -239,15 +255,6 @@ class Geometry( object ):
         else:
             interiors  = list(domain.interior.args)
 
-        if not(comm is None):
-            kwargs = dict( driver='mpio', comm=comm ) if comm.size > 1 else {}
-
-        else:
-            kwargs = {}
-
-        h5  = h5py.File( filename, mode='r', **kwargs )
-        yml = yaml.load( h5['geometry.yml'][()], Loader=yaml.SafeLoader )
-
         ldim = yml['ldim']
         pdim = yml['pdim']
 
@@ -255,8 +262,6 @@ class Geometry( object ):
 
         # ...
         if n_patches == 0:
-
-            h5.close()
             raise ValueError( "Input file contains no patches." )
         # ...
 
@@ -267,16 +272,9 @@ class Geometry( object ):
         spaces   = [None]*n_patches
         for i_patch in range( n_patches ):
 
-            item  = yml['patches'][i_patch]
-            patch_name = item['name']
-            mapping_id = item['mapping_id']
-            dtype = item['type']
-            patch = h5[mapping_id]
-            if dtype in ['SplineMapping', 'NurbsMapping']:
+            if patches[i_patch] is not None:
 
-                degree     = [int (p) for p in patch.attrs['degree'  ]]
-                periodic_i = [bool(b) for b in patch.attrs['periodic']]
-                knots      = [patch['knots_{}'.format(d)][:] for d in range( ldim )]
+                degree, periodic_i, knots = patches[i_patch]
                 space_i    = [SplineSpace( degree=p, knots=k, periodic=P )
                             for p,k,P in zip( degree, knots, periodic_i )]
 
@@ -309,6 +307,16 @@ class Geometry( object ):
         # ... construct interface spaces
         construct_interface_spaces(self._ddm, g_spaces, carts, interiors, connectivity)
 
+        # ... read the control points: each process only reads its local
+        #     block, with collective MPI-IO in the parallel case
+        if not(comm is None):
+            kwargs = dict( driver='mpio', comm=comm ) if comm.size > 1 else {}
+
+        else:
+            kwargs = {}
+
+        h5  = h5py.File( filename, mode='r', **kwargs )
+
         for i_patch in range( n_patches ):
 
             item  = yml['patches'][i_patch]
@@ -316,18 +324,17 @@ class Geometry( object ):
             mapping_id = item['mapping_id']
             dtype = item['type']
             patch = h5[mapping_id]
-            space_i = spaces[i_patch]
             if dtype in ['SplineMapping', 'NurbsMapping']:
                 tensor_space = g_spaces[interiors[i_patch]]
 
                 if dtype == 'SplineMapping':
                     mapping = SplineMapping.from_control_points( tensor_space,
-                                                                 patch['points'][..., :pdim] )
+                                                                 patch['points'], pdim=pdim )
 
                 elif dtype == 'NurbsMapping':
                     mapping = NurbsMapping.from_control_points_weights( tensor_space,
-                                                                        patch['points'][..., :pdim],
-                                                                        patch['weights'] )
+                                                                        patch['points'],
+                                                                        patch['weights'], pdim=pdim )
 
                 mapping.set_name( item['name'] )
                 mappings[patch_name] = mapping
@@ -495,6 +502,34 @@ class Geometry( object ):
         # Close HDF5 file
         h5.close()
 
+#==============================================================================
+def read_patch_spaces(patch, ldim):
+    """
+    Read the degree, the periodicity and the knot sequence along each
+    direction of a spline patch stored in a geometry file.
+
+    Parameters
+    ----------
+    patch : h5py.Group
+        Group of the geometry file which describes the patch mapping.
+
+    ldim : int
+        Number of logical dimensions.
+
+    Returns
+    -------
+    degree : list of int
+
+    periodic : list of bool
+
+    knots : list of numpy.ndarray
+
+    """
+    degree   = [int (p) for p in patch.attrs['degree'  ]]
+    periodic = [bool(b) for b in patch.attrs['periodic']]
+    knots    = [patch['knots_{}'.format(d)][:] for d in range( ldim )]
+    return degree, periodic, knots
+
 #==============================================================================
 def export_nurbs_to_hdf5(filename, nurbs, periodic=None, comm=None ):
 
@@ -262,6 +262,29 @@ def test_import_geopdes_to_nurbs(ncells, degree):
     if isinstance(mapping, NurbsMapping):
         assert np.allclose(L_shaped.weights.flatten(), mapping._weights_field.coeffs.toarray(), 1e-15, 1e-15)
 
+#==============================================================================
+@pytest.mark.parametrize( 'filename', ['identity_2d.h5', 'collela_3d.h5', 'circle.h5',
+                                       'multipatch/square.h5', 'multipatch/magnet.h5'] )
+def test_geometry_read(filename):
+
+    import h5py
+    import yaml
+
+    filename = os.path.join(base_dir, '..', '..', '..', 'mesh', filename)
+
+    with h5py.File(filename, mode='r') as h5:
+        geometry = yaml.load(h5['geometry.yml'][()], Loader=yaml.SafeLoader)
+        points   = [h5[item['mapping_id']]['points'][...] for item in geometry['patches']]
+
+    # The control points of each patch are read from the local block
+    geo  = Geometry(filename=filename)
+    assert str(geo.domain.interfaces) == str(Domain.from_file(filename).interfaces)
+    pdim = geometry['pdim']
+    for mapping, P in zip(geo.mappings.values(), points):
+        for d, field in enumerate(mapping._fields):
+            assert np.array_equal(field.coeffs.toarray().reshape(P.shape[:-1]), P[..., d])
+        assert len(mapping._fields) == pdim
+
 #==============================================================================
 @pytest.mark.xfail
 def test_geometry_1():
@@ -1,11 +1,7 @@
-from psydac.core import bsplines
+from psydac.utilities.lazy_import import attach
 
 __all__ = ['bsplines']
 
-try:
-    from psydac.core import bsp
-    from psydac.core import interface
-except ImportError:
-    pass
-else:
-    __all__.extend( ['bsp','interface'] )
+# The submodules are imported on first access (PEP 562)
+_submodules = {'bsplines'}
+__getattr__, __dir__ = attach(__name__, _submodules)
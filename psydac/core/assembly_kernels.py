@@ -0,0 +1,113 @@
+import numpy as np
+from pyccel.decorators import template
+
+#==============================================================================
+# Generic assembly of the matrix of a bilinear form with integrand
+#
+#     c(x) * D^a(u) * D^b(v),
+#
+# where D^a and D^b are partial derivatives in the logical coordinates, and c
+# is given by its values at the quadrature points, multiplied by the weights.
+#
+# For each element e along direction d, the arguments are:
+#   . test_basis_d [e, il, q] : derivative of order b_d of the test functions
+#   . trial_basis_d[e, jl, q] : derivative of order a_d of the trial functions
+#   . rows_d [e] : row (in the local data array) of the first test function
+#   . diags_d[e] : diagonal (in the local data array) of the entry between the
+#                  first test function and the first trial function
+#
+# The coefficients are stored as coeffs[e1, q1, e2, q2, ...], and the
+# contributions are added to the local data array of the stencil matrix.
+#==============================================================================
+@template(name='T', types=[float, complex])
+def assemble_matrix_1d(test_basis_1: 'float[:,:,:]', trial_basis_1: 'float[:,:,:]',
+                       rows_1: 'int64[:]', diags_1: 'int64[:]',
+                       coeffs: 'T[:,:]', mat: 'T[:,:]'):
+
+    ne1, nt1, nq1 = test_basis_1.shape
+    ns1 = trial_basis_1.shape[1]
+
+    for e1 in range(ne1):
+        for il1 in range(nt1):
+            for jl1 in range(ns1):
+                v = coeffs[0, 0] - coeffs[0, 0]
+                for q1 in range(nq1):
+                    v += test_basis_1[e1, il1, q1] * trial_basis_1[e1, jl1, q1] * coeffs[e1, q1]
+                mat[rows_1[e1] + il1, diags_1[e1] + jl1 - il1] += v
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def assemble_matrix_2d(test_basis_1: 'float[:,:,:]', test_basis_2: 'float[:,:,:]',
+                       trial_basis_1: 'float[:,:,:]', trial_basis_2: 'float[:,:,:]',
+                       rows_1: 'int64[:]', rows_2: 'int64[:]', diags_1: 'int64[:]', diags_2: 'int64[:]',
+                       coeffs: 'T[:,:,:,:]', mat: 'T[:,:,:,:]'):
+
+    ne1, nt1, nq1 = test_basis_1.shape
+    ne2, nt2, nq2 = test_basis_2.shape
+    ns1 = trial_basis_1.shape[1]
+    ns2 = trial_basis_2.shape[1]
+
+    # Partial sums over the quadrature points along the last direction
+    tmp = np.zeros_like(coeffs[0, :, 0, 0])
+
+    for e1 in range(ne1):
+        for e2 in range(ne2):
+            for il2 in range(nt2):
+                for jl2 in range(ns2):
+                    for q1 in range(nq1):
+                        tmp[q1] = coeffs[0, 0, 0, 0] - coeffs[0, 0, 0, 0]
+                        for q2 in range(nq2):
+                            tmp[q1] += test_basis_2[e2, il2, q2] * trial_basis_2[e2, jl2, q2] * coeffs[e1, q1, e2, q2]
+
+                    for il1 in range(nt1):
+                        for jl1 in range(ns1):
+                            v = coeffs[0, 0, 0, 0] - coeffs[0, 0, 0, 0]
+                            for q1 in range(nq1):
+                                v += test_basis_1[e1, il1, q1] * trial_basis_1[e1, jl1, q1] * tmp[q1]
+                            mat[rows_1[e1] + il1, rows_2[e2] + il2,
+                                diags_1[e1] + jl1 - il1, diags_2[e2] + jl2 - il2] += v
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def assemble_matrix_3d(test_basis_1: 'float[:,:,:]', test_basis_2: 'float[:,:,:]', test_basis_3: 'float[:,:,:]',
+                       trial_basis_1: 'float[:,:,:]', trial_basis_2: 'float[:,:,:]', trial_basis_3: 'float[:,:,:]',
+                       rows_1: 'int64[:]', rows_2: 'int64[:]', rows_3: 'int64[:]',
+                       diags_1: 'int64[:]', diags_2: 'int64[:]', diags_3: 'int64[:]',
+                       coeffs: 'T[:,:,:,:,:,:]', mat: 'T[:,:,:,:,:,:]'):
+
+    ne1, nt1, nq1 = test_basis_1.shape
+    ne2, nt2, nq2 = test_basis_2.shape
+    ne3, nt3, nq3 = test_basis_3.shape
+    ns1 = trial_basis_1.shape[1]
+    ns2 = trial_basis_2.shape[1]
+    ns3 = trial_basis_3.shape[1]
+
+    # Partial sums over the quadrature points along the last directions
+    tmp2 = np.zeros_like(coeffs[0, :, 0, :, 0, 0])
+    tmp1 = np.zeros_like(coeffs[0, :, 0, 0, 0, 0])
+
+    for e1 in range(ne1):
+        for e2 in range(ne2):
+            for e3 in range(ne3):
+                for il3 in range(nt3):
+                    for jl3 in range(ns3):
+                        for q1 in range(nq1):
+                            for q2 in range(nq2):
+                                tmp2[q1, q2] = coeffs[0, 0, 0, 0, 0, 0] - coeffs[0, 0, 0, 0, 0, 0]
+                                for q3 in range(nq3):
+                                    tmp2[q1, q2] += test_basis_3[e3, il3, q3] * trial_basis_3[e3, jl3, q3] * coeffs[e1, q1, e2, q2, e3, q3]
+
+                        for il2 in range(nt2):
+                            for jl2 in range(ns2):
+                                for q1 in range(nq1):
+                                    tmp1[q1] = coeffs[0, 0, 0, 0, 0, 0] - coeffs[0, 0, 0, 0, 0, 0]
+                                    for q2 in range(nq2):
+                                        tmp1[q1] += test_basis_2[e2, il2, q2] * trial_basis_2[e2, jl2, q2] * tmp2[q1, q2]
+
+                                for il1 in range(nt1):
+                                    for jl1 in range(ns1):
+                                        v = coeffs[0, 0, 0, 0, 0, 0] - coeffs[0, 0, 0, 0, 0, 0]
+                                        for q1 in range(nq1):
+                                            v += test_basis_1[e1, il1, q1] * trial_basis_1[e1, jl1, q1] * tmp1[q1]
+                                        mat[rows_1[e1] + il1, rows_2[e2] + il2, rows_3[e3] + il3,
+                                            diags_1[e1] + jl1 - il1, diags_2[e2] + jl2 - il2, diags_3[e3] + jl3 - il3] += v
@@ -15,6 +15,7 @@ References:
 
 """
 import numpy as np
+from scipy.sparse import csr_matrix
 
 from psydac.core.bsplines_kernels import (find_span_p,
                                           find_spans_p,
@@ -24,6 +25,8 @@ from psydac.core.bsplines_kernels import (find_span_p,
                                           basis_funs_all_ders_p,
                                           collocation_matrix_p,
                                           histopolation_matrix_p,
+                                          collocation_matrix_band_p,
+                                          histopolation_matrix_band_p,
                                           greville_p,
                                           breakpoints_p,
                                           elements_spans_p,
@@ -300,7 +303,7 @@ def basis_funs_all_ders(knots, degree, x, span, n, normalization='B', out=None):
     return out
 
 #==============================================================================
-def collocation_matrix(knots, degree, periodic, normalization, xgrid, out=None, multiplicity = 1):
+def collocation_matrix(knots, degree, periodic, normalization, xgrid, out=None, multiplicity = 1, sparse=False):
     """Computes the collocation matrix
 
     If called with normalization='M', this uses M-splines instead of B-splines.
@@ -330,9 +333,13 @@ def collocation_matrix(knots, degree, periodic, normalization, xgrid, out=None,
         Multiplicity of the knots in the knot sequence, we assume that the same 
         multiplicity applies to each interior knot.
 
+    sparse : bool, default=False
+        If True, return the matrix in CSR format. It is then assembled row by
+        row, in O(n*p) memory, and `out` cannot be given.
+
     Returns
     -------
-    colloc_matrix : ndarray of floats
+    colloc_matrix : ndarray of floats or scipy.sparse.csr_matrix
         Array containing the collocation matrix.
 
     Notes
@@ -342,6 +349,20 @@ def collocation_matrix(knots, degree, periodic, normalization, xgrid, out=None,
     """
     knots = np.ascontiguousarray(knots, dtype=float)
     xgrid = np.ascontiguousarray(xgrid, dtype=float)
+
+    if sparse:
+        assert out is None
+        nb = len(knots) - degree - 1
+        if periodic:
+            nb -= degree + 1 - int(multiplicity)
+
+        nx     = xgrid.shape[0]
+        first  = np.zeros(nx, dtype=int)
+        values = np.zeros((nx, degree + 1), dtype=float)
+        collocation_matrix_band_p(knots, degree, normalization == "M", xgrid, first, values)
+
+        return _compressed_rows_to_csr(first, values, (nx, nb), periodic)
+
     if out is None:
         nb = len(knots) - degree - 1
         if periodic:
@@ -358,7 +379,8 @@ def collocation_matrix(knots, degree, periodic, normalization, xgrid, out=None,
     return out
 
 #==============================================================================
-def histopolation_matrix(knots, degree, periodic, normalization, xgrid, multiplicity=1, check_boundary=True, out=None):
+def histopolation_matrix(knots, degree, periodic, normalization, xgrid, multiplicity=1, check_boundary=True, out=None,
+                         sparse=False):
     """Computes the histopolation matrix.
 
     If called with normalization='M', this uses M-splines instead of B-splines.
@@ -391,9 +413,13 @@ def histopolation_matrix(knots, degree, periodic, normalization, xgrid, multipli
         If provided, the result will be inserted into this array.
         It should be of the appropriate shape and dtype.
 
+    sparse : bool, default=False
+        If True, return the matrix in CSR format. It is then assembled row by
+        row, in O(n*p) memory, and `out` cannot be given.
+
     Returns
     -------
-    array
+    array or scipy.sparse.csr_matrix
         Histopolation matrix
 
     Notes
@@ -430,6 +456,11 @@ def histopolation_matrix(knots, degree, periodic, normalization, xgrid, multipli
 
     normalization = normalization == "M"
 
+    if sparse:
+        assert out is None
+        return _histopolation_matrix_csr(knots, degree, periodic, normalization, xgrid,
+                                         elevated_knots, int(multiplicity), check_boundary)
+
     if out is None:
         if periodic:
             out = np.zeros((len(xgrid), len(knots) - 2 * degree - 2 + multiplicity), dtype=float)
@@ -445,6 +476,70 @@ def histopolation_matrix(knots, degree, periodic, normalization, xgrid, multipli
     histopolation_matrix_p(knots, degree, periodic, normalization, xgrid, check_boundary, elevated_knots, out, multiplicity = multiplicity)
     return out
 
+#==============================================================================
+def _compressed_rows_to_csr(first, values, shape, periodic):
+    """
+    Build a CSR matrix from its non-zero entries values[i, :], which are
+    located in row i and columns first[i], first[i] + 1, .... In the periodic
+    case the rows and columns are wrapped around the shape of the matrix, and
+    the contributions to the same entry are summed.
+    """
+    nrows, ncols = values.shape
+    rows = np.repeat(np.arange(nrows), ncols)
+    cols = (first[:, None] + np.arange(ncols)).ravel()
+    data = values.ravel()
+
+    # Only keep the non-zero entries (the rows may be padded with zeros)
+    nonzero = (data != 0)
+    rows, cols, data = rows[nonzero], cols[nonzero], data[nonzero]
+
+    if periodic:
+        rows %= shape[0]
+        cols %= shape[1]
+
+    return csr_matrix((data, (rows, cols)), shape=shape)
+
+#==============================================================================
+def _histopolation_matrix_csr(knots, degree, periodic, normalization, xgrid, elevated_knots, multiplicity,
+                              check_boundary):
+    """
+    Compute the histopolation matrix in CSR format, see `histopolation_matrix`.
+    The arguments are assumed to be checked already.
+    """
+    nb = len(knots) - degree - 1
+    if periodic:
+        nb -= degree + 1 - multiplicity
+    nx = len(xgrid)
+
+    # In periodic case, make sure that evaluation points include domain boundaries
+    if periodic and check_boundary:
+        xmin = knots[degree]
+        xmax = knots[len(knots) - 1 - degree]
+        xgrid_new = np.concatenate(([xmin] if xgrid[0] > xmin else [], xgrid, [xmax] if xgrid[-1] < xmax else []))
+    else:
+        xgrid_new = xgrid
+
+    # NOTES:
+    #  . cannot use M-splines in analytical formula for histopolation matrix
+    #  . always use non-periodic splines to avoid circulant matrix structure
+    spans = find_spans(elevated_knots, degree + 1, xgrid_new)
+
+    # Number of columns and maximum number of non-zero entries per row
+    n = len(elevated_knots) - (degree + 1) - 2
+    width = max(np.max(np.minimum(spans[1:], n) - spans[:-1]) + degree + 1, 1)
+
+    first  = np.zeros(len(xgrid_new) - 1, dtype=int)
+    values = np.zeros((len(xgrid_new) - 1, width), dtype=float)
+    histopolation_matrix_band_p(knots, degree, normalization, elevated_knots, xgrid_new, spans, first, values)
+
+    # Periodic case: wrap around histopolation matrix
+    #  1. identify repeated basis functions (sum columns)
+    #  2. identify split interval (sum rows)
+    if periodic:
+        return _compressed_rows_to_csr(first, values, (nx, nb), periodic)
+    else:
+        return _compressed_rows_to_csr(first, values, (nx - 1, n), periodic)
+
 #==============================================================================
 def breakpoints(knots, degree, tol=1e-15, out=None):
     """
@@ -615,6 +615,143 @@ def histopolation_matrix_p(knots: 'float[:]', degree: int, periodic: bool, norma
                 out[i % nx, j % nb] += H[i, j]
 
 
+# =============================================================================
+def collocation_matrix_band_p(knots: 'float[:]', degree: int, normalization: bool, xgrid: 'float[:]',
+                              first: 'int[:]', values: 'float[:,:]'):
+    """
+    Compute the non-zero entries of the collocation matrix :math:`C_ij = B_j(x_i)`,
+    row by row, without storing the full matrix.
+
+    Row i of the matrix has its non-zero entries in columns first[i], ...,
+    first[i] + degree, where values[i, :] is stored. In the periodic case the
+    column indices must be wrapped around the number of basis functions.
+
+    If called with normalization=True, this uses M-splines instead of B-splines.
+
+    Parameters
+    ----------
+    knots : array_like
+        Knots sequence.
+
+    degree : int
+        Polynomial degree of spline space.
+
+    normalization : bool
+        Set to False for B-splines, and True for M-splines.
+
+    xgrid : array_like
+        Evaluation points.
+
+    first : array_like
+        Column index of the first non-zero entry of each row (output).
+
+    values : array_like
+        Non-zero entries of each row, of shape (len(xgrid), degree + 1) (output).
+    """
+    nx = len(xgrid)
+
+    spans = np.zeros(nx, dtype=int)
+    find_spans_p(knots, degree, xgrid, spans)
+    basis_funs_array_p(knots, degree, xgrid, spans, values)
+
+    for i in range(nx):
+        first[i] = spans[i] - degree
+
+    # Rescaling of B-splines, to get M-splines if needed
+    if normalization:
+        integrals = np.zeros(knots.shape[0] - degree - 1)
+        basis_integrals_p(knots, degree, integrals)
+        for i in range(nx):
+            for j in range(degree + 1):
+                values[i, j] = values[i, j] / integrals[first[i] + j]
+
+    # Mitigate round-off errors
+    for i in range(nx):
+        for j in range(degree + 1):
+            if abs(values[i, j]) < 1e-14:
+                values[i, j] = 0.0
+
+
+# =============================================================================
+def histopolation_matrix_band_p(knots: 'float[:]', degree: int, normalization: bool, elevated_knots: 'float[:]',
+                                xgrid: 'float[:]', spans: 'int[:]', first: 'int[:]', values: 'float[:,:]'):
+    """
+    Compute the non-zero entries of the (non-periodic) histopolation matrix
+    :math:`H_{ij} = \\int_{x_i}^{x_{i+1}}B_j(x)\\,dx`, row by row, without
+    storing the full matrix.
+
+    Row i of the matrix has its non-zero entries in columns first[i],
+    first[i] + 1, ..., which are stored in values[i, :].
+
+    If called with normalization=True, this uses M-splines instead of B-splines.
+
+    Parameters
+    ----------
+    knots : array_like
+        Knots sequence.
+
+    degree : int
+        Polynomial degree of spline space.
+
+    normalization : bool
+        Set to False for B-splines, and True for M-splines.
+
+    elevated_knots : array_like
+        Knots sequence of the spline space of degree p+1, see `elevate_knots`.
+
+    xgrid : array_like
+        Grid points.
+
+    spans : array_like
+        Knot span index of each grid point in `elevated_knots`.
+
+    first : array_like
+        Column index of the first non-zero entry of each row (output).
+
+    values : array_like
+        Non-zero entries of each row, of shape (len(xgrid) - 1, w), where w is
+        larger than the number of non-zero entries in any row (output).
+    """
+    nx = len(xgrid)
+
+    # Number of columns of the histopolation matrix
+    n = len(elevated_knots) - (degree + 1) - 2
+
+    # B-splines of degree p+1: colloc[i, k] := B_{spans[i] - p - 1 + k}(x_i)
+    colloc = np.zeros((nx, degree + 2))
+    basis_funs_array_p(elevated_knots, degree + 1, xgrid, spans, colloc)
+
+    integrals = np.zeros(knots.shape[0] - degree - 1)
+    if not normalization:
+        basis_integrals_p(knots, degree, integrals)
+
+    values[:, :] = 0.0
+
+    for i in range(nx - 1):
+        # Indices of first/last possibly non-zero elements in rows i, i+1 of collocation matrix
+        jstart = spans[i] - (degree + 1)
+        jend = min(spans[i + 1], n)
+        first[i] = jstart
+
+        # H[i, j-1] is the difference of the partial sums of rows i and i+1
+        for j in range(1 + jstart, jend + 1):
+            s = 0.0
+            for k in range(degree + 2):
+                if spans[i] - (degree + 1) + k < j:
+                    s += colloc[i, k]
+                if spans[i + 1] - (degree + 1) + k < j:
+                    s -= colloc[i + 1, k]
+
+            if not normalization:
+                s = s * integrals[j - 1]
+
+            # Mitigate round-off errors
+            if abs(s) < 1e-14:
+                s = 0.0
+
+            values[i, j - 1 - jstart] = s
+
+
 # =============================================================================
 def merge_sort(a: 'float[:]') -> 'float[:]':
     """Performs a 'in place' merge sort of the input list
@@ -57,8 +57,13 @@ def eval_fields_3d_no_weights(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int
     out_fields: ndarray of floats
         Evaluated fields, filled with the correct values by the function
     """
+
     arr_coeff_fields = np.zeros_like(glob_arr_coeff, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3, out_fields.shape[3]))
 
+    # Partial sums, contracted in the X1 direction and in the X1 and X2 directions
+    arr_fields_1 = np.zeros_like(glob_arr_coeff, shape=(k1, 1 + f_p2, 1 + f_p3, out_fields.shape[3]))
+    arr_fields_2 = np.zeros_like(glob_arr_coeff, shape=(k1, k2, 1 + f_p3, out_fields.shape[3]))
+
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
 
@@ -73,26 +78,32 @@ def eval_fields_3d_no_weights(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int
                                                               span_3 - f_p3:1 + span_3,
                                                               :]
 
-                for i_basis_1 in range(1 + f_p1):
-                    for i_basis_2 in range(1 + f_p2):
-                        for i_basis_3 in range(1 + f_p3):
-                            coeff_fields = arr_coeff_fields[i_basis_1, i_basis_2, i_basis_3, :]
+                arr_fields_1[:, :, :, :] = 0.0
+                arr_fields_2[:, :, :, :] = 0.0
 
-                            for i_quad_1 in range(k1):
-                                spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                for i_quad_1 in range(k1):
+                    for i_basis_1 in range(1 + f_p1):
+                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
 
-                                for i_quad_2 in range(k2):
-                                    spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                        arr_fields_1[i_quad_1, :, :, :] += spline_1 * arr_coeff_fields[i_basis_1, :, :, :]
 
-                                    for i_quad_3 in range(k3):
-                                        spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_basis_2 in range(1 + f_p2):
+                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
 
-                                        spline = spline_1 * spline_2 * spline_3
+                            arr_fields_2[i_quad_1, i_quad_2, :, :] += spline_2 * arr_fields_1[i_quad_1, i_basis_2, :, :]
 
-                                        out_fields[i_cell_1 * k1 + i_quad_1,
-                                                   i_cell_2 * k2 + i_quad_2,
-                                                   i_cell_3 * k3 + i_quad_3,
-                                                   :] += spline * coeff_fields
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            for i_basis_3 in range(1 + f_p3):
+                                spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
+
+                                out_fields[i_cell_1 * k1 + i_quad_1,
+                                           i_cell_2 * k2 + i_quad_2,
+                                           i_cell_3 * k3 + i_quad_3,
+                                           :] += spline_3 * arr_fields_2[i_quad_1, i_quad_2, i_basis_3, :]
 
 
 @template(name='T', types=['float[:,:,:]', 'complex[:,:,:]'])
@@ -134,8 +145,12 @@ def eval_fields_2d_no_weights(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int,
     out_fields: ndarray of floats
         Evaluated fields, filled with the correct values by the function
     """
+
     arr_coeff_fields = np.zeros_like(glob_arr_coeff, shape=(1 + f_p1, 1 + f_p2, out_fields.shape[2]))
 
+    # Partial sums, contracted in the X1 direction
+    arr_fields_1 = np.zeros_like(glob_arr_coeff, shape=(k1, 1 + f_p2, out_fields.shape[2]))
+
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
 
@@ -144,21 +159,23 @@ def eval_fields_2d_no_weights(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int,
             arr_coeff_fields[:, :, :] = glob_arr_coeff[span_1 - f_p1:1 + span_1,
                                                        span_2 - f_p2:1 + span_2,
                                                        :]
-            for i_basis_1 in range(1 + f_p1):
-                for i_basis_2 in range(1 + f_p2):
-                    coeff_fields = arr_coeff_fields[i_basis_1, i_basis_2, :]
 
-                    for i_quad_1 in range(k1):
-                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+            arr_fields_1[:, :, :] = 0.0
 
-                        for i_quad_2 in range(k2):
-                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+            for i_quad_1 in range(k1):
+                for i_basis_1 in range(1 + f_p1):
+                    spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
 
-                            spline = spline_1 * spline_2
+                    arr_fields_1[i_quad_1, :, :] += spline_1 * arr_coeff_fields[i_basis_1, :, :]
 
-                            out_fields[i_cell_1 * k1 + i_quad_1,
-                                       i_cell_2 * k2 + i_quad_2,
-                                       :] += spline * coeff_fields
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    for i_basis_2 in range(1 + f_p2):
+                        spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+
+                        out_fields[i_cell_1 * k1 + i_quad_1,
+                                   i_cell_2 * k2 + i_quad_2,
+                                   :] += spline_2 * arr_fields_1[i_quad_1, i_basis_2, :]
 
 
 # -----------------------------------------------------------------------------
@@ -373,9 +390,16 @@ def eval_fields_3d_weighted(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int,
     out_fields: ndarray of floats
         Evaluated fields, filled with the correct values by the function
     """
+
     arr_coeff_fields = np.zeros_like(glob_arr_coeff, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3, out_fields.shape[3]))
     arr_coeff_weights = np.zeros((1 + f_p1, 1 + f_p2, 1 + f_p3))
 
+    # Partial sums, contracted in the X1 direction and in the X1 and X2 directions
+    arr_fields_1 = np.zeros_like(glob_arr_coeff, shape=(k1, 1 + f_p2, 1 + f_p3, out_fields.shape[3]))
+    arr_fields_2 = np.zeros_like(glob_arr_coeff, shape=(k1, k2, 1 + f_p3, out_fields.shape[3]))
+    arr_weights_1 = np.zeros((k1, 1 + f_p2, 1 + f_p3))
+    arr_weights_2 = np.zeros((k1, k2, 1 + f_p3))
+
     arr_fields = np.zeros_like(glob_arr_coeff, shape=(k1, k2, k3, out_fields.shape[3]))
     arr_weights = np.zeros((k1, k2, k3))
 
@@ -397,30 +421,43 @@ def eval_fields_3d_weighted(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int,
                                                                 span_2 - f_p2:1 + span_2,
                                                                 span_3 - f_p3:1 + span_3]
 
+                for i_field in range(out_fields.shape[3]):
+                    arr_coeff_fields[:, :, :, i_field] *= arr_coeff_weights[:, :, :]
+
+                arr_fields_1[:, :, :, :] = 0.0
+                arr_fields_2[:, :, :, :] = 0.0
+                arr_weights_1[:, :, :] = 0.0
+                arr_weights_2[:, :, :] = 0.0
+
                 arr_fields[:, :, :, :] = 0.0
                 arr_weights[:, :, :] = 0.0
 
                 for i_quad_1 in range(k1):
-                    for i_quad_2 in range(k2):
-                        for i_quad_3 in range(k3):
-                            for i_basis_1 in range(1 + f_p1):
-                                spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                    for i_basis_1 in range(1 + f_p1):
+                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
 
-                                for i_basis_2 in range(1 + f_p2):
-                                    spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                        arr_fields_1[i_quad_1, :, :, :] += spline_1 * arr_coeff_fields[i_basis_1, :, :, :]
+                        arr_weights_1[i_quad_1, :, :] += spline_1 * arr_coeff_weights[i_basis_1, :, :]
 
-                                    for i_basis_3 in range(1 + f_p3):
-                                        spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_basis_2 in range(1 + f_p2):
+                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
 
-                                        spline = spline_1 * spline_2 * spline_3
+                            arr_fields_2[i_quad_1, i_quad_2, :, :] += spline_2 * arr_fields_1[i_quad_1, i_basis_2, :, :]
+                            arr_weights_2[i_quad_1, i_quad_2, :] += spline_2 * arr_weights_1[i_quad_1, i_basis_2, :]
 
-                                        coeff_fields = arr_coeff_fields[i_basis_1, i_basis_2, i_basis_3, :]
-                                        coeff_weight = arr_coeff_weights[i_basis_1, i_basis_2, i_basis_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            for i_basis_3 in range(1 + f_p3):
+                                spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
 
-                                        arr_fields[i_quad_1, i_quad_2, i_quad_3, :] += \
-                                            spline * coeff_fields * coeff_weight
+                                arr_fields[i_quad_1, i_quad_2, i_quad_3, :] += \
+                                    spline_3 * arr_fields_2[i_quad_1, i_quad_2, i_basis_3, :]
 
-                                        arr_weights[i_quad_1, i_quad_2, i_quad_3] += spline * coeff_weight
+                                arr_weights[i_quad_1, i_quad_2, i_quad_3] += \
+                                    spline_3 * arr_weights_2[i_quad_1, i_quad_2, i_basis_3]
 
                             fields = arr_fields[i_quad_1, i_quad_2, i_quad_3, :]
                             weight = arr_weights[i_quad_1, i_quad_2, i_quad_3]
@@ -473,9 +510,14 @@ def eval_fields_2d_weighted(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int, k
     out_fields: ndarray of float
         Evaluated fields, filled with the correct values by the function
     """
+
     arr_coeff_fields = np.zeros_like(global_arr_coeff, shape=(1 + f_p1, 1 + f_p2, out_fields.shape[2]))
     arr_coeff_weights = np.zeros((1 + f_p1, 1 + f_p2))
 
+    # Partial sums, contracted in the X1 direction
+    arr_fields_1 = np.zeros_like(global_arr_coeff, shape=(k1, 1 + f_p2, out_fields.shape[2]))
+    arr_weights_1 = np.zeros((k1, 1 + f_p2))
+
     arr_fields = np.zeros_like(global_arr_coeff, shape=(k1, k2, out_fields.shape[2]))
     arr_weights = np.zeros((k1, k2))
 
@@ -492,25 +534,29 @@ def eval_fields_2d_weighted(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int, k
             arr_coeff_weights[:, :] = global_arr_weights[span_1 - f_p1:1 + span_1,
                                                          span_2 - f_p2:1 + span_2]
 
+            for i_field in range(out_fields.shape[2]):
+                arr_coeff_fields[:, :, i_field] *= arr_coeff_weights[:, :]
+
+            arr_fields_1[:, :, :] = 0.0
+            arr_weights_1[:, :] = 0.0
+
             arr_fields[:, :, :] = 0.0
             arr_weights[:, :] = 0.0
 
             for i_quad_1 in range(k1):
-                for i_quad_2 in range(k2):
-                    for i_basis_1 in range(1 + f_p1):
-                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-
-                        for i_basis_2 in range(1 + f_p2):
-                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-
-                            spline = spline_1 * spline_2
+                for i_basis_1 in range(1 + f_p1):
+                    spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
 
-                            coeff_fields = arr_coeff_fields[i_basis_1, i_basis_2, :]
-                            coeff_weight = arr_coeff_weights[i_basis_1, i_basis_2]
+                    arr_fields_1[i_quad_1, :, :] += spline_1 * arr_coeff_fields[i_basis_1, :, :]
+                    arr_weights_1[i_quad_1, :] += spline_1 * arr_coeff_weights[i_basis_1, :]
 
-                            arr_fields[i_quad_1, i_quad_2, :] += spline * coeff_fields * coeff_weight
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    for i_basis_2 in range(1 + f_p2):
+                        spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
 
-                            arr_weights[i_quad_1, i_quad_2] += spline * coeff_weight
+                        arr_fields[i_quad_1, i_quad_2, :] += spline_2 * arr_fields_1[i_quad_1, i_basis_2, :]
+                        arr_weights[i_quad_1, i_quad_2] += spline_2 * arr_weights_1[i_quad_1, i_basis_2]
 
                     fields = arr_fields[i_quad_1, i_quad_2, :]
                     weight = arr_weights[i_quad_1, i_quad_2]
@@ -776,21 +822,20 @@ def eval_jac_det_3d(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int, f_p3: in
         Jacobian determinant on the grid.
     """
 
-    arr_coeffs_x = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
-    arr_coeffs_y = np.zeros_like(global_arr_coeff_y, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
-    arr_coeffs_z = np.zeros_like(global_arr_coeff_z, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
+    # Coefficients of the X1, X2 and X3 fields, stacked along the last axis
+    arr_coeffs = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3, 3))
 
-    arr_x_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
-    arr_x_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
-    arr_x_x3 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
+    # Partial sums, contracted in the X1 direction with the basis functions and their derivatives
+    arr_1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 1 + f_p3, 3))
+    arr_1_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 1 + f_p3, 3))
 
-    arr_y_x1 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
-    arr_y_x2 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
-    arr_y_x3 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
+    # Partial sums, contracted in the X1 and X2 directions
+    arr_2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
+    arr_2_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
+    arr_2_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
 
-    arr_z_x1 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
-    arr_z_x2 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
-    arr_z_x3 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
+    # Jacobian matrices at the evaluation points of one cell
+    arr_jacobians = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3, 3, 3))
 
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
@@ -801,84 +846,82 @@ def eval_jac_det_3d(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int, f_p3: in
             for i_cell_3 in range(nc3):
                 span_3 = global_spans_3[i_cell_3]
 
-                arr_x_x1[:, :, :] = 0.0
-                arr_x_x2[:, :, :] = 0.0
-                arr_x_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 0] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_y_x1[:, :, :] = 0.0
-                arr_y_x2[:, :, :] = 0.0
-                arr_y_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 1] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_z_x1[:, :, :] = 0.0
-                arr_z_x2[:, :, :] = 0.0
-                arr_z_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 2] = global_arr_coeff_z[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_coeffs_x[:, :, :] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
+                arr_1[:, :, :, :] = 0.0
+                arr_1_x1[:, :, :, :] = 0.0
 
-                arr_coeffs_y[:, :, :] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
+                arr_2[:, :, :, :] = 0.0
+                arr_2_x1[:, :, :, :] = 0.0
+                arr_2_x2[:, :, :, :] = 0.0
 
-                arr_coeffs_z[:, :, :] = global_arr_coeff_z[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
-                for i_quad_1 in range(k1):
-                    for i_quad_2 in range(k2):
-                        for i_quad_3 in range(k3):
-                            for i_basis_1 in range(1 + f_p1):
-                                spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-                                spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
+                arr_jacobians[:, :, :, :, :] = 0.0
 
-                                for i_basis_2 in range(1 + f_p2):
-                                    spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-                                    spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
+                for i_quad_1 in range(k1):
+                    for i_basis_1 in range(1 + f_p1):
+                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                        spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
 
-                                    for i_basis_3 in range(1 + f_p3):
-                                        spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
-                                        spline_x3 = global_basis_3[i_cell_3, i_basis_3, 1, i_quad_3]
+                        arr_1[i_quad_1, :, :, :] += spline_1 * arr_coeffs[i_basis_1, :, :, :]
+                        arr_1_x1[i_quad_1, :, :, :] += spline_x1 * arr_coeffs[i_basis_1, :, :, :]
 
-                                        mapping_x1 = spline_x1 * spline_2 * spline_3
-                                        mapping_x2 = spline_1 * spline_x2 * spline_3
-                                        mapping_x3 = spline_1 * spline_2 * spline_x3
-
-                                        coeff_x = arr_coeffs_x[i_basis_1, i_basis_2, i_basis_3]
-                                        coeff_y = arr_coeffs_y[i_basis_1, i_basis_2, i_basis_3]
-                                        coeff_z = arr_coeffs_z[i_basis_1, i_basis_2, i_basis_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_basis_2 in range(1 + f_p2):
+                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                            spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
 
-                                        arr_x_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_x
-                                        arr_x_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_x
-                                        arr_x_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_x
+                            arr_2[i_quad_1, i_quad_2, :, :] += spline_2 * arr_1[i_quad_1, i_basis_2, :, :]
+                            arr_2_x1[i_quad_1, i_quad_2, :, :] += spline_2 * arr_1_x1[i_quad_1, i_basis_2, :, :]
+                            arr_2_x2[i_quad_1, i_quad_2, :, :] += spline_x2 * arr_1[i_quad_1, i_basis_2, :, :]
 
-                                        arr_y_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_y
-                                        arr_y_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_y
-                                        arr_y_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_y
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            for i_basis_3 in range(1 + f_p3):
+                                spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
+                                spline_x3 = global_basis_3[i_cell_3, i_basis_3, 1, i_quad_3]
 
-                                        arr_z_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_z
-                                        arr_z_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_z
-                                        arr_z_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_z
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 0] += \
+                                    spline_3 * arr_2_x1[i_quad_1, i_quad_2, i_basis_3, :]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 1] += \
+                                    spline_3 * arr_2_x2[i_quad_1, i_quad_2, i_basis_3, :]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 2] += \
+                                    spline_x3 * arr_2[i_quad_1, i_quad_2, i_basis_3, :]
 
-                            x_x1 = arr_x_x1[i_quad_1, i_quad_2, i_quad_3]
-                            x_x2 = arr_x_x2[i_quad_1, i_quad_2, i_quad_3]
-                            x_x3 = arr_x_x3[i_quad_1, i_quad_2, i_quad_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            x_x1 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 0, 0]
+                            x_x2 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 0, 1]
+                            x_x3 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 0, 2]
 
-                            y_x1 = arr_y_x1[i_quad_1, i_quad_2, i_quad_3]
-                            y_x2 = arr_y_x2[i_quad_1, i_quad_2, i_quad_3]
-                            y_x3 = arr_y_x3[i_quad_1, i_quad_2, i_quad_3]
+                            y_x1 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 1, 0]
+                            y_x2 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 1, 1]
+                            y_x3 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 1, 2]
 
-                            z_x1 = arr_z_x1[i_quad_1, i_quad_2, i_quad_3]
-                            z_x2 = arr_z_x2[i_quad_1, i_quad_2, i_quad_3]
-                            z_x3 = arr_z_x3[i_quad_1, i_quad_2, i_quad_3]
+                            z_x1 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 2, 0]
+                            z_x2 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 2, 1]
+                            z_x3 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 2, 2]
 
                             jac_det[i_cell_1 * k1 + i_quad_1,
-                                       i_cell_2 * k2 + i_quad_2,
-                                       i_cell_3 * k3 + i_quad_3] = (+ x_x1 * y_x2 * z_x3
-                                                                    + x_x2 * y_x3 * z_x1
-                                                                    + x_x3 * y_x1 * z_x2
-                                                                    - x_x1 * y_x3 * z_x2
-                                                                    - x_x2 * y_x1 * z_x3
-                                                                    - x_x3 * y_x2 * z_x1)
+                                    i_cell_2 * k2 + i_quad_2,
+                                    i_cell_3 * k3 + i_quad_3] = (+ x_x1 * y_x2 * z_x3
+                                                                 + x_x2 * y_x3 * z_x1
+                                                                 + x_x3 * y_x1 * z_x2
+                                                                 - x_x1 * y_x3 * z_x2
+                                                                 - x_x2 * y_x1 * z_x3
+                                                                 - x_x3 * y_x2 * z_x1)
 
 
 @template(name='T', types=['float[:,:]', 'complex[:,:]'])
@@ -923,14 +966,15 @@ def eval_jac_det_2d(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int, k2: int,
         Jacobian determinant on the grid.
     """
 
-    arr_coeffs_x = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2))
-    arr_coeffs_y = np.zeros_like(global_arr_coeff_y, shape=(1 + f_p1, 1 + f_p2))
+    # Coefficients of the X1 and X2 fields, stacked along the last axis
+    arr_coeffs = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 2))
 
-    arr_x_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2))
-    arr_x_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2))
+    # Partial sums, contracted in the X1 direction with the basis functions and their derivatives
+    arr_1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 2))
+    arr_1_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 2))
 
-    arr_y_x1 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2))
-    arr_y_x2 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2))
+    # Jacobian matrices at the evaluation points of one cell
+    arr_jacobians = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 2, 2))
 
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
@@ -938,45 +982,41 @@ def eval_jac_det_2d(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int, k2: int,
         for i_cell_2 in range(nc2):
             span_2 = global_spans_2[i_cell_2]
 
-            arr_x_x1[:, :] = 0.0
-            arr_x_x2[:, :] = 0.0
+            arr_coeffs[:, :, 0] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
+                                                     span_2 - f_p2:1 + span_2]
 
-            arr_y_x1[:, :] = 0.0
-            arr_y_x2[:, :] = 0.0
+            arr_coeffs[:, :, 1] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
+                                                     span_2 - f_p2:1 + span_2]
 
-            arr_coeffs_x[:, :] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
-                                                    span_2 - f_p2:1 + span_2]
+            arr_1[:, :, :] = 0.0
+            arr_1_x1[:, :, :] = 0.0
 
-            arr_coeffs_y[:, :] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
-                                                    span_2 - f_p2:1 + span_2]
+            arr_jacobians[:, :, :, :] = 0.0
 
             for i_quad_1 in range(k1):
-                for i_quad_2 in range(k2):
-                    for i_basis_1 in range(1 + f_p1):
-                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-                        spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
-
-                        for i_basis_2 in range(1 + f_p2):
-                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-                            spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
-
-                            mapping_x1 = spline_x1 * spline_2
-                            mapping_x2 = spline_1 * spline_x2
+                for i_basis_1 in range(1 + f_p1):
+                    spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                    spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
 
-                            coeff_x = arr_coeffs_x[i_basis_1, i_basis_2]
-                            coeff_y = arr_coeffs_y[i_basis_1, i_basis_2]
+                    arr_1[i_quad_1, :, :] += spline_1 * arr_coeffs[i_basis_1, :, :]
+                    arr_1_x1[i_quad_1, :, :] += spline_x1 * arr_coeffs[i_basis_1, :, :]
 
-                            arr_x_x1[i_quad_1, i_quad_2] += mapping_x1 * coeff_x
-                            arr_x_x2[i_quad_1, i_quad_2] += mapping_x2 * coeff_x
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    for i_basis_2 in range(1 + f_p2):
+                        spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                        spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
 
-                            arr_y_x1[i_quad_1, i_quad_2] += mapping_x1 * coeff_y
-                            arr_y_x2[i_quad_1, i_quad_2] += mapping_x2 * coeff_y
+                        arr_jacobians[i_quad_1, i_quad_2, :, 0] += spline_2 * arr_1_x1[i_quad_1, i_basis_2, :]
+                        arr_jacobians[i_quad_1, i_quad_2, :, 1] += spline_x2 * arr_1[i_quad_1, i_basis_2, :]
 
-                    x_x1 = arr_x_x1[i_quad_1, i_quad_2]
-                    x_x2 = arr_x_x2[i_quad_1, i_quad_2]
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    x_x1 = arr_jacobians[i_quad_1, i_quad_2, 0, 0]
+                    x_x2 = arr_jacobians[i_quad_1, i_quad_2, 0, 1]
 
-                    y_x1 = arr_y_x1[i_quad_1, i_quad_2]
-                    y_x2 = arr_y_x2[i_quad_1, i_quad_2]
+                    y_x1 = arr_jacobians[i_quad_1, i_quad_2, 1, 0]
+                    y_x2 = arr_jacobians[i_quad_1, i_quad_2, 1, 1]
 
                     jac_det[i_cell_1 * k1 + i_quad_1,
                             i_cell_2 * k2 + i_quad_2] = (x_x1 * y_x2 - x_x2 * y_x1)
@@ -2010,21 +2050,20 @@ def eval_jacobians_3d(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int, f_p3:
         Jacobian matrix on the grid
     """
 
-    arr_coeffs_x = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
-    arr_coeffs_y = np.zeros_like(global_arr_coeff_y, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
-    arr_coeffs_z = np.zeros_like(global_arr_coeff_z, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
+    # Coefficients of the X1, X2 and X3 fields, stacked along the last axis
+    arr_coeffs = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3, 3))
 
-    arr_x_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
-    arr_x_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
-    arr_x_x3 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
+    # Partial sums, contracted in the X1 direction with the basis functions and their derivatives
+    arr_1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 1 + f_p3, 3))
+    arr_1_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 1 + f_p3, 3))
 
-    arr_y_x1 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
-    arr_y_x2 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
-    arr_y_x3 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
+    # Partial sums, contracted in the X1 and X2 directions
+    arr_2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
+    arr_2_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
+    arr_2_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
 
-    arr_z_x1 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
-    arr_z_x2 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
-    arr_z_x3 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
+    # Jacobian matrices at the evaluation points of one cell
+    arr_jacobians = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3, 3, 3))
 
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
@@ -2035,82 +2074,63 @@ def eval_jacobians_3d(nc1: int, nc2: int, nc3: int, f_p1: int, f_p2: int, f_p3:
             for i_cell_3 in range(nc3):
                 span_3 = global_spans_3[i_cell_3]
 
-                arr_x_x1[:, :, :] = 0.0
-                arr_x_x2[:, :, :] = 0.0
-                arr_x_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 0] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_y_x1[:, :, :] = 0.0
-                arr_y_x2[:, :, :] = 0.0
-                arr_y_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 1] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_z_x1[:, :, :] = 0.0
-                arr_z_x2[:, :, :] = 0.0
-                arr_z_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 2] = global_arr_coeff_z[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_coeffs_x[:, :, :] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
+                arr_1[:, :, :, :] = 0.0
+                arr_1_x1[:, :, :, :] = 0.0
 
-                arr_coeffs_y[:, :, :] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
+                arr_2[:, :, :, :] = 0.0
+                arr_2_x1[:, :, :, :] = 0.0
+                arr_2_x2[:, :, :, :] = 0.0
 
-                arr_coeffs_z[:, :, :] = global_arr_coeff_z[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
-                for i_quad_1 in range(k1):
-                    for i_quad_2 in range(k2):
-                        for i_quad_3 in range(k3):
-                            for i_basis_1 in range(1 + f_p1):
-                                spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-                                spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
+                arr_jacobians[:, :, :, :, :] = 0.0
 
-                                for i_basis_2 in range(1 + f_p2):
-                                    spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-                                    spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
-
-                                    for i_basis_3 in range(1 + f_p3):
-                                        spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
-                                        spline_x3 = global_basis_3[i_cell_3, i_basis_3, 1, i_quad_3]
-
-                                        mapping_x1 = spline_x1 * spline_2 * spline_3
-                                        mapping_x2 = spline_1 * spline_x2 * spline_3
-                                        mapping_x3 = spline_1 * spline_2 * spline_x3
+                for i_quad_1 in range(k1):
+                    for i_basis_1 in range(1 + f_p1):
+                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                        spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
 
-                                        coeff_x = arr_coeffs_x[i_basis_1, i_basis_2, i_basis_3]
-                                        coeff_y = arr_coeffs_y[i_basis_1, i_basis_2, i_basis_3]
-                                        coeff_z = arr_coeffs_z[i_basis_1, i_basis_2, i_basis_3]
+                        arr_1[i_quad_1, :, :, :] += spline_1 * arr_coeffs[i_basis_1, :, :, :]
+                        arr_1_x1[i_quad_1, :, :, :] += spline_x1 * arr_coeffs[i_basis_1, :, :, :]
 
-                                        arr_x_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_x
-                                        arr_x_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_x
-                                        arr_x_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_x
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_basis_2 in range(1 + f_p2):
+                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                            spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
 
-                                        arr_y_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_y
-                                        arr_y_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_y
-                                        arr_y_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_y
+                            arr_2[i_quad_1, i_quad_2, :, :] += spline_2 * arr_1[i_quad_1, i_basis_2, :, :]
+                            arr_2_x1[i_quad_1, i_quad_2, :, :] += spline_2 * arr_1_x1[i_quad_1, i_basis_2, :, :]
+                            arr_2_x2[i_quad_1, i_quad_2, :, :] += spline_x2 * arr_1[i_quad_1, i_basis_2, :, :]
 
-                                        arr_z_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_z
-                                        arr_z_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_z
-                                        arr_z_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_z
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            for i_basis_3 in range(1 + f_p3):
+                                spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
+                                spline_x3 = global_basis_3[i_cell_3, i_basis_3, 1, i_quad_3]
 
-                            x_x1 = arr_x_x1[i_quad_1, i_quad_2, i_quad_3]
-                            x_x2 = arr_x_x2[i_quad_1, i_quad_2, i_quad_3]
-                            x_x3 = arr_x_x3[i_quad_1, i_quad_2, i_quad_3]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 0] += \
+                                    spline_3 * arr_2_x1[i_quad_1, i_quad_2, i_basis_3, :]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 1] += \
+                                    spline_3 * arr_2_x2[i_quad_1, i_quad_2, i_basis_3, :]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 2] += \
+                                    spline_x3 * arr_2[i_quad_1, i_quad_2, i_basis_3, :]
 
-                            y_x1 = arr_y_x1[i_quad_1, i_quad_2, i_quad_3]
-                            y_x2 = arr_y_x2[i_quad_1, i_quad_2, i_quad_3]
-                            y_x3 = arr_y_x3[i_quad_1, i_quad_2, i_quad_3]
-
-                            z_x1 = arr_z_x1[i_quad_1, i_quad_2, i_quad_3]
-                            z_x2 = arr_z_x2[i_quad_1, i_quad_2, i_quad_3]
-                            z_x3 = arr_z_x3[i_quad_1, i_quad_2, i_quad_3]
-
-                            jacobians[i_cell_1 * k1 + i_quad_1,
-                                      i_cell_2 * k2 + i_quad_2,
-                                      i_cell_3 * k3 + i_quad_3,
-                                      :, :] = np.array([[x_x1, x_x2, x_x3],
-                                                        [y_x1, y_x2, y_x3],
-                                                        [z_x1, z_x2, z_x3]])
+                jacobians[i_cell_1 * k1:(i_cell_1 + 1) * k1,
+                          i_cell_2 * k2:(i_cell_2 + 1) * k2,
+                          i_cell_3 * k3:(i_cell_3 + 1) * k3,
+                          :, :] = arr_jacobians[:, :, :, :, :]
 
 
 @template(name='T', types=[float, complex])
@@ -2155,14 +2175,15 @@ def eval_jacobians_2d(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int, k2: int
         Jacobian matrix at every point of the grid
     """
 
-    arr_coeffs_x = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2))
-    arr_coeffs_y = np.zeros_like(global_arr_coeff_y, shape=(1 + f_p1, 1 + f_p2))
+    # Coefficients of the X1 and X2 fields, stacked along the last axis
+    arr_coeffs = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 2))
 
-    arr_x_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2))
-    arr_x_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2))
+    # Partial sums, contracted in the X1 direction with the basis functions and their derivatives
+    arr_1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 2))
+    arr_1_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 2))
 
-    arr_y_x1 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2))
-    arr_y_x2 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2))
+    # Jacobian matrices at the evaluation points of one cell
+    arr_jacobians = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 2, 2))
 
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
@@ -2170,50 +2191,37 @@ def eval_jacobians_2d(nc1: int, nc2: int, f_p1: int, f_p2: int, k1: int, k2: int
         for i_cell_2 in range(nc2):
             span_2 = global_spans_2[i_cell_2]
 
-            arr_x_x1[:, :] = 0.0
-            arr_x_x2[:, :] = 0.0
+            arr_coeffs[:, :, 0] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
+                                                     span_2 - f_p2:1 + span_2]
 
-            arr_y_x1[:, :] = 0.0
-            arr_y_x2[:, :] = 0.0
+            arr_coeffs[:, :, 1] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
+                                                     span_2 - f_p2:1 + span_2]
 
-            arr_coeffs_x[:, :] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
-                                                    span_2 - f_p2:1 + span_2]
+            arr_1[:, :, :] = 0.0
+            arr_1_x1[:, :, :] = 0.0
 
-            arr_coeffs_y[:, :] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
-                                                    span_2 - f_p2:1 + span_2]
+            arr_jacobians[:, :, :, :] = 0.0
 
             for i_quad_1 in range(k1):
-                for i_quad_2 in range(k2):
-                    for i_basis_1 in range(1 + f_p1):
-                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-                        spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
-
-                        for i_basis_2 in range(1 + f_p2):
-                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-                            spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
-
-                            mapping_x1 = spline_x1 * spline_2
-                            mapping_x2 = spline_1 * spline_x2
-
-                            coeff_x = arr_coeffs_x[i_basis_1, i_basis_2]
-                            coeff_y = arr_coeffs_y[i_basis_1, i_basis_2]
-
-                            arr_x_x1[i_quad_1, i_quad_2] += mapping_x1 * coeff_x
-                            arr_x_x2[i_quad_1, i_quad_2] += mapping_x2 * coeff_x
+                for i_basis_1 in range(1 + f_p1):
+                    spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                    spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
 
-                            arr_y_x1[i_quad_1, i_quad_2] += mapping_x1 * coeff_y
-                            arr_y_x2[i_quad_1, i_quad_2] += mapping_x2 * coeff_y
+                    arr_1[i_quad_1, :, :] += spline_1 * arr_coeffs[i_basis_1, :, :]
+                    arr_1_x1[i_quad_1, :, :] += spline_x1 * arr_coeffs[i_basis_1, :, :]
 
-                    x_x1 = arr_x_x1[i_quad_1, i_quad_2]
-                    x_x2 = arr_x_x2[i_quad_1, i_quad_2]
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    for i_basis_2 in range(1 + f_p2):
+                        spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                        spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
 
-                    y_x1 = arr_y_x1[i_quad_1, i_quad_2]
-                    y_x2 = arr_y_x2[i_quad_1, i_quad_2]
+                        arr_jacobians[i_quad_1, i_quad_2, :, 0] += spline_2 * arr_1_x1[i_quad_1, i_basis_2, :]
+                        arr_jacobians[i_quad_1, i_quad_2, :, 1] += spline_x2 * arr_1[i_quad_1, i_basis_2, :]
 
-                    jacobians[i_cell_1 * k1 + i_quad_1,
-                              i_cell_2 * k2 + i_quad_2,
-                              :, :] = np.array([[x_x1, x_x2],
-                                                [y_x1, y_x2]])
+            jacobians[i_cell_1 * k1:(i_cell_1 + 1) * k1,
+                      i_cell_2 * k2:(i_cell_2 + 1) * k2,
+                      :, :] = arr_jacobians[:, :, :, :]
 
 
 # -----------------------------------------------------------------------------
@@ -3242,21 +3250,20 @@ def eval_jacobians_inv_3d(nc1: int, nc2: int, nc3: int,  f_p1: int, f_p2: int,
         Inverse of the Jacobian matrix on the grid
     """
 
-    arr_coeffs_x = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
-    arr_coeffs_y = np.zeros_like(global_arr_coeff_y, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
-    arr_coeffs_z = np.zeros_like(global_arr_coeff_z, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3))
+    # Coefficients of the X1, X2 and X3 fields, stacked along the last axis
+    arr_coeffs = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 1 + f_p3, 3))
 
-    arr_x_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
-    arr_x_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
-    arr_x_x3 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3))
+    # Partial sums, contracted in the X1 direction with the basis functions and their derivatives
+    arr_1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 1 + f_p3, 3))
+    arr_1_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 1 + f_p3, 3))
 
-    arr_y_x1 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
-    arr_y_x2 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
-    arr_y_x3 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2, k3))
+    # Partial sums, contracted in the X1 and X2 directions
+    arr_2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
+    arr_2_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
+    arr_2_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 1 + f_p3, 3))
 
-    arr_z_x1 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
-    arr_z_x2 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
-    arr_z_x3 = np.zeros_like(global_arr_coeff_z, shape=(k1, k2, k3))
+    # Jacobian matrices at the evaluation points of one cell
+    arr_jacobians = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, k3, 3, 3))
 
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
@@ -3267,75 +3274,73 @@ def eval_jacobians_inv_3d(nc1: int, nc2: int, nc3: int,  f_p1: int, f_p2: int,
             for i_cell_3 in range(nc3):
                 span_3 = global_spans_3[i_cell_3]
 
-                arr_x_x1[:, :, :] = 0.0
-                arr_x_x2[:, :, :] = 0.0
-                arr_x_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 0] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_y_x1[:, :, :] = 0.0
-                arr_y_x2[:, :, :] = 0.0
-                arr_y_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 1] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_z_x1[:, :, :] = 0.0
-                arr_z_x2[:, :, :] = 0.0
-                arr_z_x3[:, :, :] = 0.0
+                arr_coeffs[:, :, :, 2] = global_arr_coeff_z[span_1 - f_p1:1 + span_1,
+                                                            span_2 - f_p2:1 + span_2,
+                                                            span_3 - f_p3:1 + span_3]
 
-                arr_coeffs_x[:, :, :] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
+                arr_1[:, :, :, :] = 0.0
+                arr_1_x1[:, :, :, :] = 0.0
 
-                arr_coeffs_y[:, :, :] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
+                arr_2[:, :, :, :] = 0.0
+                arr_2_x1[:, :, :, :] = 0.0
+                arr_2_x2[:, :, :, :] = 0.0
 
-                arr_coeffs_z[:, :, :] = global_arr_coeff_z[span_1 - f_p1:1 + span_1,
-                                                           span_2 - f_p2:1 + span_2,
-                                                           span_3 - f_p3:1 + span_3]
-                for i_quad_1 in range(k1):
-                    for i_quad_2 in range(k2):
-                        for i_quad_3 in range(k3):
-                            for i_basis_1 in range(1 + f_p1):
-                                spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-                                spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
+                arr_jacobians[:, :, :, :, :] = 0.0
 
-                                for i_basis_2 in range(1 + f_p2):
-                                    spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-                                    spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
-
-                                    for i_basis_3 in range(1 + f_p3):
-                                        spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
-                                        spline_x3 = global_basis_3[i_cell_3, i_basis_3, 1, i_quad_3]
+                for i_quad_1 in range(k1):
+                    for i_basis_1 in range(1 + f_p1):
+                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                        spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
 
-                                        mapping_x1 = spline_x1 * spline_2 * spline_3
-                                        mapping_x2 = spline_1 * spline_x2 * spline_3
-                                        mapping_x3 = spline_1 * spline_2 * spline_x3
+                        arr_1[i_quad_1, :, :, :] += spline_1 * arr_coeffs[i_basis_1, :, :, :]
+                        arr_1_x1[i_quad_1, :, :, :] += spline_x1 * arr_coeffs[i_basis_1, :, :, :]
 
-                                        coeff_x = arr_coeffs_x[i_basis_1, i_basis_2, i_basis_3]
-                                        coeff_y = arr_coeffs_y[i_basis_1, i_basis_2, i_basis_3]
-                                        coeff_z = arr_coeffs_z[i_basis_1, i_basis_2, i_basis_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_basis_2 in range(1 + f_p2):
+                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                            spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
 
-                                        arr_x_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_x
-                                        arr_x_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_x
-                                        arr_x_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_x
+                            arr_2[i_quad_1, i_quad_2, :, :] += spline_2 * arr_1[i_quad_1, i_basis_2, :, :]
+                            arr_2_x1[i_quad_1, i_quad_2, :, :] += spline_2 * arr_1_x1[i_quad_1, i_basis_2, :, :]
+                            arr_2_x2[i_quad_1, i_quad_2, :, :] += spline_x2 * arr_1[i_quad_1, i_basis_2, :, :]
 
-                                        arr_y_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_y
-                                        arr_y_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_y
-                                        arr_y_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_y
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            for i_basis_3 in range(1 + f_p3):
+                                spline_3 = global_basis_3[i_cell_3, i_basis_3, 0, i_quad_3]
+                                spline_x3 = global_basis_3[i_cell_3, i_basis_3, 1, i_quad_3]
 
-                                        arr_z_x1[i_quad_1, i_quad_2, i_quad_3] += mapping_x1 * coeff_z
-                                        arr_z_x2[i_quad_1, i_quad_2, i_quad_3] += mapping_x2 * coeff_z
-                                        arr_z_x3[i_quad_1, i_quad_2, i_quad_3] += mapping_x3 * coeff_z
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 0] += \
+                                    spline_3 * arr_2_x1[i_quad_1, i_quad_2, i_basis_3, :]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 1] += \
+                                    spline_3 * arr_2_x2[i_quad_1, i_quad_2, i_basis_3, :]
+                                arr_jacobians[i_quad_1, i_quad_2, i_quad_3, :, 2] += \
+                                    spline_x3 * arr_2[i_quad_1, i_quad_2, i_basis_3, :]
 
-                            x_x1 = arr_x_x1[i_quad_1, i_quad_2, i_quad_3]
-                            x_x2 = arr_x_x2[i_quad_1, i_quad_2, i_quad_3]
-                            x_x3 = arr_x_x3[i_quad_1, i_quad_2, i_quad_3]
+                for i_quad_1 in range(k1):
+                    for i_quad_2 in range(k2):
+                        for i_quad_3 in range(k3):
+                            x_x1 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 0, 0]
+                            x_x2 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 0, 1]
+                            x_x3 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 0, 2]
 
-                            y_x1 = arr_y_x1[i_quad_1, i_quad_2, i_quad_3]
-                            y_x2 = arr_y_x2[i_quad_1, i_quad_2, i_quad_3]
-                            y_x3 = arr_y_x3[i_quad_1, i_quad_2, i_quad_3]
+                            y_x1 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 1, 0]
+                            y_x2 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 1, 1]
+                            y_x3 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 1, 2]
 
-                            z_x1 = arr_z_x1[i_quad_1, i_quad_2, i_quad_3]
-                            z_x2 = arr_z_x2[i_quad_1, i_quad_2, i_quad_3]
-                            z_x3 = arr_z_x3[i_quad_1, i_quad_2, i_quad_3]
+                            z_x1 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 2, 0]
+                            z_x2 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 2, 1]
+                            z_x3 = arr_jacobians[i_quad_1, i_quad_2, i_quad_3, 2, 2]
 
                             det = x_x1 * y_x2 * z_x3 + x_x2 * y_x3 * z_x1 + x_x3 * y_x1 * z_x2 \
                                   - x_x1 * y_x3 * z_x2 - x_x2 * y_x1 * z_x3 - x_x3 * y_x2 * z_x1
@@ -3402,14 +3407,15 @@ def eval_jacobians_inv_2d(nc1: int, nc2: int,  f_p1: int, f_p2: int, k1: int, k2
         Inverse of the Jacobian matrix at every point of the grid
     """
 
-    arr_coeffs_x = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2))
-    arr_coeffs_y = np.zeros_like(global_arr_coeff_y, shape=(1 + f_p1, 1 + f_p2))
+    # Coefficients of the X1 and X2 fields, stacked along the last axis
+    arr_coeffs = np.zeros_like(global_arr_coeff_x, shape=(1 + f_p1, 1 + f_p2, 2))
 
-    arr_x_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2))
-    arr_x_x2 = np.zeros_like(global_arr_coeff_x, shape=(k1, k2))
+    # Partial sums, contracted in the X1 direction with the basis functions and their derivatives
+    arr_1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 2))
+    arr_1_x1 = np.zeros_like(global_arr_coeff_x, shape=(k1, 1 + f_p2, 2))
 
-    arr_y_x1 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2))
-    arr_y_x2 = np.zeros_like(global_arr_coeff_y, shape=(k1, k2))
+    # Jacobian matrices at the evaluation points of one cell
+    arr_jacobians = np.zeros_like(global_arr_coeff_x, shape=(k1, k2, 2, 2))
 
     for i_cell_1 in range(nc1):
         span_1 = global_spans_1[i_cell_1]
@@ -3417,45 +3423,41 @@ def eval_jacobians_inv_2d(nc1: int, nc2: int,  f_p1: int, f_p2: int, k1: int, k2
         for i_cell_2 in range(nc2):
             span_2 = global_spans_2[i_cell_2]
 
-            arr_x_x1[:, :] = 0.0
-            arr_x_x2[:, :] = 0.0
+            arr_coeffs[:, :, 0] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
+                                                     span_2 - f_p2:1 + span_2]
 
-            arr_y_x1[:, :] = 0.0
-            arr_y_x2[:, :] = 0.0
+            arr_coeffs[:, :, 1] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
+                                                     span_2 - f_p2:1 + span_2]
 
-            arr_coeffs_x[:, :] = global_arr_coeff_x[span_1 - f_p1:1 + span_1,
-                                                    span_2 - f_p2:1 + span_2]
+            arr_1[:, :, :] = 0.0
+            arr_1_x1[:, :, :] = 0.0
 
-            arr_coeffs_y[:, :] = global_arr_coeff_y[span_1 - f_p1:1 + span_1,
-                                                    span_2 - f_p2:1 + span_2]
+            arr_jacobians[:, :, :, :] = 0.0
 
             for i_quad_1 in range(k1):
-                for i_quad_2 in range(k2):
-                    for i_basis_1 in range(1 + f_p1):
-                        spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
-                        spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
-
-                        for i_basis_2 in range(1 + f_p2):
-                            spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
-                            spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
-
-                            mapping_x1 = spline_x1 * spline_2
-                            mapping_x2 = spline_1 * spline_x2
+                for i_basis_1 in range(1 + f_p1):
+                    spline_1 = global_basis_1[i_cell_1, i_basis_1, 0, i_quad_1]
+                    spline_x1 = global_basis_1[i_cell_1, i_basis_1, 1, i_quad_1]
 
-                            coeff_x = arr_coeffs_x[i_basis_1, i_basis_2]
-                            coeff_y = arr_coeffs_y[i_basis_1, i_basis_2]
+                    arr_1[i_quad_1, :, :] += spline_1 * arr_coeffs[i_basis_1, :, :]
+                    arr_1_x1[i_quad_1, :, :] += spline_x1 * arr_coeffs[i_basis_1, :, :]
 
-                            arr_x_x1[i_quad_1, i_quad_2] += mapping_x1 * coeff_x
-                            arr_x_x2[i_quad_1, i_quad_2] += mapping_x2 * coeff_x
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    for i_basis_2 in range(1 + f_p2):
+                        spline_2 = global_basis_2[i_cell_2, i_basis_2, 0, i_quad_2]
+                        spline_x2 = global_basis_2[i_cell_2, i_basis_2, 1, i_quad_2]
 
-                            arr_y_x1[i_quad_1, i_quad_2] += mapping_x1 * coeff_y
-                            arr_y_x2[i_quad_1, i_quad_2] += mapping_x2 * coeff_y
+                        arr_jacobians[i_quad_1, i_quad_2, :, 0] += spline_2 * arr_1_x1[i_quad_1, i_basis_2, :]
+                        arr_jacobians[i_quad_1, i_quad_2, :, 1] += spline_x2 * arr_1[i_quad_1, i_basis_2, :]
 
-                    x_x1 = arr_x_x1[i_quad_1, i_quad_2]
-                    x_x2 = arr_x_x2[i_quad_1, i_quad_2]
+            for i_quad_1 in range(k1):
+                for i_quad_2 in range(k2):
+                    x_x1 = arr_jacobians[i_quad_1, i_quad_2, 0, 0]
+                    x_x2 = arr_jacobians[i_quad_1, i_quad_2, 0, 1]
 
-                    y_x1 = arr_y_x1[i_quad_1, i_quad_2]
-                    y_x2 = arr_y_x2[i_quad_1, i_quad_2]
+                    y_x1 = arr_jacobians[i_quad_1, i_quad_2, 1, 0]
+                    y_x2 = arr_jacobians[i_quad_1, i_quad_2, 1, 1]
 
                     det = x_x1 * y_x2 - x_x2 * y_x1
 
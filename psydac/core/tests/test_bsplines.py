@@ -149,6 +149,33 @@ def test_histopolation_matrix(lims, nc, p, periodic, tol=1e-13):
         assert abs( sum( col ) - 1.0 ) < tol
 #        assert (abs(col) > tol).sum() <= 2*p + 1
 
+#==============================================================================
+@pytest.mark.parametrize( 'nc', (10, 33) )
+@pytest.mark.parametrize( 'p' , (1,2,3,6) )
+@pytest.mark.parametrize( 'periodic' , (True, False) )
+@pytest.mark.parametrize( 'normalization' , ('B', 'M') )
+def test_sparse_matrices(nc, p, periodic, normalization, tol=1e-13):
+
+    breaks = random_grid(domain=[0,1], ncells=nc, random_fraction=0.3)
+    knots  = make_knots(breaks, p, periodic)
+
+    # Collocation matrix
+    xgrid  = greville(knots, p, periodic)
+    mat    = collocation_matrix(knots, p, periodic, normalization, xgrid)
+    spmat  = collocation_matrix(knots, p, periodic, normalization, xgrid, sparse=True)
+
+    assert spmat.shape == mat.shape
+    assert spmat.nnz <= (p + 1) * len(xgrid)
+    assert np.allclose(spmat.toarray(), mat, rtol=tol, atol=tol)
+
+    # Histopolation matrix
+    xgrid  = greville(elevate_knots(knots, p, periodic), p+1, periodic)
+    mat    = histopolation_matrix(knots, p, periodic, normalization, xgrid)
+    spmat  = histopolation_matrix(knots, p, periodic, normalization, xgrid, sparse=True)
+
+    assert spmat.shape == mat.shape
+    assert np.allclose(spmat.toarray(), mat, rtol=tol, atol=tol * nc)
+
 #==============================================================================
 @pytest.mark.parametrize("i_grid, expected", [([0.05, 0.15, 0.21, 0.05, 0.55],[0, 1, 2, 0, 5]),
                                               ([0.1, 0.1, 0.0, 0.4, 0.4, 0.9, 0.9], [0, 1, 0, 3, 4, 8, 9]),
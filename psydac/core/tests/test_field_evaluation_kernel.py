@@ -599,6 +599,60 @@ def test_irregular_evaluations(knots, ldim, degree, npts):
     assert np.allclose(out_field_w, f_direct_w, atol=ATOL, rtol=RTOL)
 
 
+@pytest.mark.parametrize('ldim', [2, 3])
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_regular_evaluations_multiple_fields(ldim, dtype):
+    # Compare the sum-factorized kernels with a direct evaluation of the
+    # tensor-product sums, for several fields at once
+    rng = np.random.default_rng(42)
+
+    ncells  = (3, 2, 4)[:ldim]
+    degree  = (2, 3, 1)[:ldim]
+    n_eval_points = (2, 3, 2)[:ldim]
+    nfields = 3
+
+    global_basis = [rng.random((nc, p + 1, 1, k)) for nc, p, k in zip(ncells, degree, n_eval_points)]
+    global_spans = [np.arange(nc) + p for nc, p in zip(ncells, degree)]
+
+    shape = tuple(nc + p for nc, p in zip(ncells, degree))
+    global_arr_field = rng.random(shape + (nfields,)).astype(dtype)
+    if dtype is complex:
+        global_arr_field += 1j * rng.random(shape + (nfields,))
+    global_arr_w = rng.random(shape) + 1.0
+
+    def direct(coeffs):
+        out = np.zeros(tuple(nc * k for nc, k in zip(ncells, n_eval_points)) + coeffs.shape[ldim:], dtype=coeffs.dtype)
+        for cell in it.product(*[range(nc) for nc in ncells]):
+            local  = coeffs[tuple(slice(i, i + p + 1) for i, p in zip(cell, degree))]
+            bases  = [b[i, :, 0, :] for b, i in zip(global_basis, cell)]
+            points = tuple(slice(i * k, (i + 1) * k) for i, k in zip(cell, n_eval_points))
+            if ldim == 2:
+                out[points] = np.einsum('ip,jq,ij...->pq...', *bases, local)
+            else:
+                out[points] = np.einsum('ip,jq,kr,ijk...->pqr...', *bases, local)
+        return out
+
+    out_field   = np.zeros(tuple(nc * k for nc, k in zip(ncells, n_eval_points)) + (nfields,), dtype=dtype)
+    out_field_w = np.zeros_like(out_field)
+
+    if ldim == 2:
+        eval_fields_2d_no_weights(*ncells, *degree, *n_eval_points, *global_basis,
+                                  *global_spans, global_arr_field, out_field)
+        eval_fields_2d_weighted(*ncells, *degree, *n_eval_points, *global_basis,
+                                *global_spans, global_arr_field, global_arr_w, out_field_w)
+    else:
+        eval_fields_3d_no_weights(*ncells, *degree, *n_eval_points, *global_basis,
+                                  *global_spans, global_arr_field, out_field)
+        eval_fields_3d_weighted(*ncells, *degree, *n_eval_points, *global_basis,
+                                *global_spans, global_arr_field, global_arr_w, out_field_w)
+
+    f_direct   = direct(global_arr_field)
+    f_direct_w = direct(global_arr_field * global_arr_w[..., None]) / direct(global_arr_w)[..., None]
+
+    assert np.allclose(out_field, f_direct, atol=ATOL, rtol=RTOL)
+    assert np.allclose(out_field_w, f_direct_w, atol=ATOL, rtol=RTOL)
+
+
 @pytest.mark.parametrize('jac_det, ldim, field_to_push', [(np.ones((5, 5)), 2, np.ones((5, 5, 1))),
                                                           (np.ones((5, 5, 5)), 3, np.ones((5, 5, 5, 1))),
                                                           (np.random.rand(5, 5), 2, np.random.rand(5, 5, 1)),
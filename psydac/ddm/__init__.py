@@ -1,3 +1,7 @@
+from psydac.utilities.lazy_import import attach
+
 __all__ = ['cart']
 
-from psydac.ddm import cart
+# The submodules are imported on first access (PEP 562)
+_submodules = {'cart', 'shared'}
+__getattr__, __dir__ = attach(__name__, _submodules)
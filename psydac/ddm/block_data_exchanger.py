@@ -0,0 +1,99 @@
+# coding: utf-8
+
+from itertools import product
+from mpi4py import MPI
+
+from .nonblocking_data_exchanger import NonBlockingCartDataExchanger
+
+__all__ = ('BlockCartDataExchanger',)
+
+#===============================================================================
+class BlockCartDataExchanger:
+    """
+    Type that takes care of updating, all at once, the ghost regions (padding)
+    of several multi-dimensional arrays distributed according to Cartesian
+    decompositions of the same domain decomposition (e.g. the components of a
+    vector field).
+
+    Since all the arrays have the same neighbours, the ghost regions of all of
+    them are exchanged with a single message per neighbour: the MPI subarray
+    datatypes of the arrays are combined into a struct datatype, which refers
+    to the absolute addresses of the arrays.
+
+    Parameters
+    ----------
+    exchangers : list of psydac.ddm.NonBlockingCartDataExchanger
+        The data exchangers of the single arrays.
+
+    """
+    def __init__( self, exchangers ):
+
+        assert len( exchangers ) > 0
+        assert all( isinstance( ex, NonBlockingCartDataExchanger ) for ex in exchangers )
+
+        domain_decomposition = exchangers[0]._cart.domain_decomposition
+        assert all( ex._cart.domain_decomposition is domain_decomposition for ex in exchangers )
+
+        self._exchangers = tuple( exchangers )
+        self._cart       = exchangers[0]._cart
+
+    #---------------------------------------------------------------------------
+    # Public interface
+    #---------------------------------------------------------------------------
+    def prepare_communications( self, arrays ):
+        """
+        Create the persistent requests for updating the ghost regions of the
+        given arrays, with one message per neighbour.
+
+        Parameters
+        ----------
+        arrays : list of numpy.ndarray
+            Arrays corresponding to the local subdomains, including padding,
+            in the same order as the data exchangers.
+
+        Returns
+        -------
+        requests : tuple of mpi4py.MPI.Prequest
+            The persistent requests.
+
+        datatypes : tuple of mpi4py.MPI.Datatype
+            The struct datatypes used by the requests, which must be freed
+            together with them.
+
+        """
+        assert len( arrays ) == len( self._exchangers )
+
+        cart      = self._cart
+        comm      = cart.comm_cart
+        addresses = [MPI.Get_address( a ) for a in arrays]
+        blocklens = [1] * len( arrays )
+
+        requests  = []
+        datatypes = []
+        for shift in product( [-1,0,1], repeat=cart.ndim ):
+            if all(s==0 for s in shift):
+                continue
+
+            info = cart.get_shift_info_non_blocking( shift )
+
+            recv_types = [ex.get_recv_type( shift ) for ex in self._exchangers]
+            if recv_types[0] != MPI.DATATYPE_NULL:
+                recv_typ = MPI.Datatype.Create_struct( blocklens, addresses, recv_types ).Commit()
+                requests .append( comm.Recv_init( (MPI.BOTTOM, 1, recv_typ), info['rank_source'], info['tag'] ) )
+                datatypes.append( recv_typ )
+
+            send_types = [ex.get_send_type( shift ) for ex in self._exchangers]
+            if send_types[0] != MPI.DATATYPE_NULL:
+                send_typ = MPI.Datatype.Create_struct( blocklens, addresses, send_types ).Commit()
+                requests .append( comm.Send_init( (MPI.BOTTOM, 1, send_typ), info['rank_dest'], info['tag'] ) )
+                datatypes.append( send_typ )
+
+        return tuple( requests ), tuple( datatypes )
+
+    # ...
+    def start_update_ghost_regions( self, requests ):
+        MPI.Prequest.Startall( requests )
+
+    # ...
+    def end_update_ghost_regions( self, requests ):
+        MPI.Prequest.Waitall( requests )
@@ -1,8 +1,6 @@
 import numpy    as np
 import numpy.ma as ma
 
-from sympy.ntheory import factorint
-
 __all__ = ('compute_dims', 'partition_procs_per_patch')
 
 #==============================================================================
@@ -155,6 +153,10 @@ def compute_dims_general( mpi_size, npts, mpi_dims_mask=None ):
         else:
             shape += [-1]
 
+    # SymPy is imported here, and not at module level, to keep it out of the
+    # import of psydac.ddm
+    from sympy import factorint
+
     f = factorint( mpi_size, multiple=True )
     f.sort( reverse=True )
 
@@ -180,6 +182,8 @@ def compute_dims_uniform( mpi_size, npts ):
 
     nprocs = [1]*len( npts )
 
+    from sympy import factorint
+
     mpi_factors   = factorint( int(mpi_size) )
     npts_factors  = [factorint( int(n) ) for n in npts]
 
@@ -0,0 +1,177 @@
+# coding: utf-8
+#
+# Node-local shared memory: the processes which run on the same node can
+# store read-only data only once, in an MPI-3 shared-memory window which is
+# allocated by the first process of the node.
+
+import numpy as np
+from mpi4py import MPI
+
+__all__ = ('node_communicator', 'allocate_shared', 'share_array', 'free_shared')
+
+# Key of the attribute which stores the node communicator (and the windows
+# allocated with it) on its parent
+_node_keyval = MPI.KEYVAL_INVALID
+
+#===============================================================================
+class _NodeMemory:
+    """
+    Node communicator of a parent communicator, and the shared-memory windows
+    which are allocated for the processes of the parent communicator.
+    """
+    def __init__(self, node):
+        self.node    = node
+        self.windows = []
+
+    def free(self):
+        for win in self.windows:
+            win.Free()
+        self.windows.clear()
+
+def _delete_node_memory(comm, keyval, memory):
+    # Called by MPI when the parent communicator is freed (collectively)
+    memory.free()
+    memory.node.Free()
+
+#===============================================================================
+def node_communicator(comm):
+    """
+    Communicator of the processes of `comm` which share the memory of the same
+    node, obtained with MPI.Comm.Split_type(COMM_TYPE_SHARED). It is only
+    created on the first call (a collective operation) for a given `comm`, and
+    stored as an attribute of `comm`: it is neither inherited by the duplicates
+    of `comm`, nor by a new communicator which reuses its handle once freed.
+    It is freed together with `comm`.
+
+    Parameters
+    ----------
+    comm : mpi4py.MPI.Comm
+        The parent communicator.
+
+    Returns
+    -------
+    mpi4py.MPI.Comm
+        The node communicator.
+
+    """
+    return _node_memory(comm).node
+
+def _node_memory(comm):
+    global _node_keyval
+    if _node_keyval == MPI.KEYVAL_INVALID:
+        _node_keyval = MPI.Comm.Create_keyval(delete_fn=_delete_node_memory)
+
+    memory = comm.Get_attr(_node_keyval)
+    if memory is None:
+        memory = _NodeMemory(comm.Split_type(MPI.COMM_TYPE_SHARED, key=comm.rank))
+        comm.Set_attr(_node_keyval, memory)
+    return memory
+
+#===============================================================================
+def allocate_shared(shape, dtype, comm, order='C'):
+    """
+    Allocate an array in an MPI-3 shared-memory window: all the processes of
+    `comm` which are on the same node get a view on the same memory, which is
+    allocated by the first process of the node. This is a collective operation.
+
+    The window is not freed when the array is garbage collected, but either
+    explicitly with free_shared(comm) or when `comm` is freed, and otherwise
+    by MPI_Finalize. Both are collective operations, after which the array
+    (and its views) must not be used any more.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the array.
+
+    dtype : type | str | numpy.dtype
+        Data type of the array.
+
+    comm : mpi4py.MPI.Comm | None
+        The communicator of the processes which share the array. If None, or if
+        there is only one process per node, a regular array is allocated.
+
+    order : {'C', 'F'}
+        Memory layout of the array, as in numpy.empty.
+
+    Returns
+    -------
+    numpy.ndarray
+        The array, which is not initialized.
+
+    """
+    dtype = np.dtype(dtype)
+    if comm is None or node_communicator(comm).size == 1:
+        return np.empty(shape, dtype=dtype, order=order)
+
+    memory = _node_memory(comm)
+    node   = memory.node
+    nbytes = int(np.prod(shape)) * dtype.itemsize if node.rank == 0 else 0
+    win    = MPI.Win.Allocate_shared(nbytes, dtype.itemsize, comm=node)
+    memory.windows.append(win)
+
+    buf, _ = win.Shared_query(0)
+    return np.ndarray(shape, dtype=dtype, buffer=buf, order=order)
+
+#===============================================================================
+def share_array(array, comm):
+    """
+    Read-only copy of an array in the shared memory of each node: only the
+    array of the first process of each node is read, hence the others can skip
+    its computation and pass None. The memory layout (C or Fortran) of the
+    array is preserved. This is a collective operation.
+
+    Parameters
+    ----------
+    array : numpy.ndarray | None
+        The array, which is only needed on the first process of each node.
+
+    comm : mpi4py.MPI.Comm | None
+        The communicator of the processes which share the array. If None, or if
+        there is only one process per node, the array is returned as is.
+
+    Returns
+    -------
+    numpy.ndarray
+        The shared array, which is read-only if it was copied.
+
+    """
+    if comm is None or node_communicator(comm).size == 1:
+        return array
+
+    node = node_communicator(comm)
+    if node.rank == 0:
+        order = 'F' if array.flags.f_contiguous and not array.flags.c_contiguous else 'C'
+        info  = (array.shape, array.dtype, order)
+    else:
+        info  = None
+    shape, dtype, order = node.bcast(info, root=0)
+
+    shared = allocate_shared(shape, dtype, comm, order=order)
+    if node.rank == 0:
+        shared[...] = array
+    node.Barrier()
+
+    shared.flags.writeable = False
+    return shared
+
+#===============================================================================
+def free_shared(comm):
+    """
+    Free the shared-memory windows of all the arrays which were allocated for
+    the processes of `comm` (see allocate_shared and share_array). This is a
+    collective operation, after which these arrays must not be used any more.
+
+    Parameters
+    ----------
+    comm : mpi4py.MPI.Comm | None
+        The communicator of the processes which share the arrays. If None,
+        nothing is done.
+
+    """
+    if comm is None or _node_keyval == MPI.KEYVAL_INVALID:
+        return
+
+    memory = comm.Get_attr(_node_keyval)
+    if memory is not None:
+        memory.free()
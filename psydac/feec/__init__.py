@@ -1,3 +1,7 @@
+from psydac.utilities.lazy_import import attach
+
 __all__ = ['derivatives']
 
-from psydac.feec import derivatives
+# The submodules are imported on first access (PEP 562)
+_submodules = {'derivatives'}
+__getattr__, __dir__ = attach(__name__, _submodules)
@@ -0,0 +1,65 @@
+from pyccel.decorators import template
+
+#==============================================================================
+# Fused application of up to three directional derivative operators, whose
+# results are summed into the same output array:
+#
+#     out[i] = sum_t signs[t] * (v_t[i + offsets[t]] - v_t[i]),
+#
+# where offsets[t] is +1 (or -1 if transposed) along the differentiation
+# direction of term t and 0 elsewhere. The index i runs over the local
+# indices of the output, which start at starts[d] and are counts[d] in number
+# along each direction d. The unused input arrays may be any array.
+#==============================================================================
+@template(name='T', types=[float, complex])
+def apply_derivatives_1d(v1: 'T[:]', v2: 'T[:]', v3: 'T[:]', out: 'T[:]',
+                         nterms: 'int64', offsets: 'int64[:,:]', signs: 'float[:]',
+                         starts: 'int64[:]', counts: 'int64[:]'):
+
+    s1 = starts[0]
+    n1 = counts[0]
+
+    for i1 in range(s1, s1 + n1):
+        out[i1] = signs[0] * (v1[i1 + offsets[0, 0]] - v1[i1])
+        if nterms > 1:
+            out[i1] += signs[1] * (v2[i1 + offsets[1, 0]] - v2[i1])
+        if nterms > 2:
+            out[i1] += signs[2] * (v3[i1 + offsets[2, 0]] - v3[i1])
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def apply_derivatives_2d(v1: 'T[:,:]', v2: 'T[:,:]', v3: 'T[:,:]', out: 'T[:,:]',
+                         nterms: 'int64', offsets: 'int64[:,:]', signs: 'float[:]',
+                         starts: 'int64[:]', counts: 'int64[:]'):
+
+    s1, s2 = starts[0], starts[1]
+    n1, n2 = counts[0], counts[1]
+
+    for i1 in range(s1, s1 + n1):
+        for i2 in range(s2, s2 + n2):
+            out[i1, i2] = signs[0] * (v1[i1 + offsets[0, 0], i2 + offsets[0, 1]] - v1[i1, i2])
+            if nterms > 1:
+                out[i1, i2] += signs[1] * (v2[i1 + offsets[1, 0], i2 + offsets[1, 1]] - v2[i1, i2])
+            if nterms > 2:
+                out[i1, i2] += signs[2] * (v3[i1 + offsets[2, 0], i2 + offsets[2, 1]] - v3[i1, i2])
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def apply_derivatives_3d(v1: 'T[:,:,:]', v2: 'T[:,:,:]', v3: 'T[:,:,:]', out: 'T[:,:,:]',
+                         nterms: 'int64', offsets: 'int64[:,:]', signs: 'float[:]',
+                         starts: 'int64[:]', counts: 'int64[:]'):
+
+    s1, s2, s3 = starts[0], starts[1], starts[2]
+    n1, n2, n3 = counts[0], counts[1], counts[2]
+
+    for i1 in range(s1, s1 + n1):
+        for i2 in range(s2, s2 + n2):
+            for i3 in range(s3, s3 + n3):
+                out[i1, i2, i3] = signs[0] * (v1[i1 + offsets[0, 0], i2 + offsets[0, 1], i3 + offsets[0, 2]]
+                                              - v1[i1, i2, i3])
+                if nterms > 1:
+                    out[i1, i2, i3] += signs[1] * (v2[i1 + offsets[1, 0], i2 + offsets[1, 1], i3 + offsets[1, 2]]
+                                                   - v2[i1, i2, i3])
+                if nterms > 2:
+                    out[i1, i2, i3] += signs[2] * (v3[i1 + offsets[2, 0], i2 + offsets[2, 1], i3 + offsets[2, 2]]
+                                                   - v3[i1, i2, i3])
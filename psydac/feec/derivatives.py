@@ -13,8 +13,11 @@ from psydac.fem.basic       import FemField, FemSpace
 from psydac.linalg.basic    import LinearOperator
 from psydac.ddm.cart        import DomainDecomposition, CartDecomposition
 
+from psydac.feec.derivative_kernels import apply_derivatives_1d, apply_derivatives_2d, apply_derivatives_3d
+
 __all__ = (
     'DirectionalDerivativeOperator',
+    'BlockDerivativeOperator',
     'DiffOperator',
     'Derivative_1D',
     'Gradient_2D',
@@ -248,7 +251,29 @@ class DirectionalDerivativeOperator(LinearOperator):
         # combine to Kronecker matrix
         mats = [M if i == self._diffdir else make_id(i) for i in range(self._domain.ndim)]
         return KroneckerStencilMatrix(self._domain, self._codomain, *mats)
-    
+
+    def tostencil(self):
+        """
+        Converts this KroneckerDerivativeOperator into a StencilMatrix, whose
+        pads are those of its band: 1 along the differentiation direction and
+        0 along the others.
+
+        Returns
+        -------
+        out : StencilMatrix
+            The resulting StencilMatrix.
+        """
+        K = self.tokronstencil().tostencil()
+
+        nd   = self._domain.ndim
+        pads = tuple(1 if i == self._diffdir else 0 for i in range(nd))
+        M    = StencilMatrix(self._domain, self._codomain, pads=pads)
+
+        # the other diagonals of K are zero
+        index = (slice(None),) * nd + tuple(slice(P - p, P + p + 1) for P, p in zip(K.pads, pads))
+        M._data[...] = K._data[index]
+        return M
+
     def transpose(self, conjugate=False):
         """
         Transposes this operator. Creates and returns a new object.
@@ -360,6 +385,95 @@ class DirectionalDerivativeOperator(LinearOperator):
         return DirectionalDerivativeOperator(self._spaceV, self._spaceW,
                 self._diffdir, negative=self._negative, transposed=self._transposed)
 
+#====================================================================================================
+class BlockDerivativeOperator(BlockLinearOperator):
+    """
+    Block linear operator whose blocks are directional derivative operators,
+    such as the discrete gradient, curl and divergence.
+
+    The `dot` method updates the ghost regions of the input vector at once (see
+    BlockVector.update_ghost_regions), then computes each block of the output in
+    a single pass over the input blocks, with the compiled kernels of
+    psydac.feec.derivative_kernels: no intermediate vectors are allocated. If some
+    blocks are not DirectionalDerivativeOperator objects, or if a block row has more
+    than three blocks, the generic BlockLinearOperator.dot is used instead.
+
+    Parameters
+    ----------
+    V1 : BlockVectorSpace | StencilVectorSpace
+        Domain of the operator.
+
+    V2 : BlockVectorSpace | StencilVectorSpace
+        Codomain of the operator.
+
+    blocks : dict | list | tuple
+        The blocks, as in BlockLinearOperator.
+
+    """
+    _kernels = {1: apply_derivatives_1d, 2: apply_derivatives_2d, 3: apply_derivatives_3d}
+
+    def __init__(self, V1, V2, blocks=None):
+        self._rows = None
+        super().__init__(V1, V2, blocks=blocks)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._rows = None
+
+    def _prepare_rows(self):
+        """
+        Collect the arguments of the kernels for each block row, or return an
+        empty tuple if the blocks cannot be applied by the kernels.
+        """
+        rows = []
+        for i in range(self.n_block_rows):
+            terms = sorted((j, L) for (k, j), L in self._blocks.items() if k == i)
+            if len(terms) > 3 or not all(isinstance(L, DirectionalDerivativeOperator) for _, L in terms):
+                return ()
+
+            W = self.codomain[i] if self.n_block_rows > 1 else self.codomain
+
+            offsets = np.zeros((3, W.ndim), dtype=np.int64)
+            signs   = np.zeros(3)
+            for t, (_, L) in enumerate(terms):
+                offsets[t, L._diffdir] = -1 if L._transposed else 1
+                signs  [t]             = -1. if L._negative else 1.
+
+            starts = np.array([p * m for p, m in zip(W.pads, W.shifts)], dtype=np.int64)
+            counts = np.array([e - s + 1 for s, e in zip(W.starts, W.ends)], dtype=np.int64)
+            rows.append((self._kernels[W.ndim], [j for j, _ in terms], offsets, signs, starts, counts))
+
+        return tuple(rows)
+
+    def dot(self, v, out=None):
+
+        if self._rows is None:
+            self._rows = self._prepare_rows()
+
+        if not self._rows:
+            return super().dot(v, out=out)
+
+        assert v.space is self.domain
+        if out is not None:
+            assert out.space is self.codomain
+        else:
+            out = self.codomain.zeros()
+
+        if not v.ghost_regions_in_sync:
+            v.update_ghost_regions()
+
+        for i, (kernel, cols, offsets, signs, starts, counts) in enumerate(self._rows):
+            out_i = out[i] if self.n_block_rows > 1 else out
+            if not cols:
+                out_i._data[...] = 0
+                continue
+            vs = [(v[j] if self.n_block_cols > 1 else v)._data for j in cols]
+            vs = vs + [vs[0]] * (3 - len(vs))
+            kernel(*vs, out_i._data, len(cols), offsets, signs, starts, counts)
+
+        out.ghost_regions_in_sync = False
+        return out
+
 #====================================================================================================
 class DiffOperator:
     def __init__(self, domain, codomain, matrix):
@@ -451,7 +565,7 @@ class Gradient_2D(DiffOperator):
         # Build Gradient matrix block by block
         blocks = [[DirectionalDerivativeOperator(B_B, M_B, 0)],
                   [DirectionalDerivativeOperator(B_B, B_M, 1)]]
-        matrix = BlockLinearOperator(H1.vector_space, Hcurl.vector_space, blocks=blocks)
+        matrix = BlockDerivativeOperator(H1.vector_space, Hcurl.vector_space, blocks=blocks)
 
         # Store data in object   
         super().__init__(H1, Hcurl, matrix)
@@ -494,7 +608,7 @@ class Gradient_3D(DiffOperator):
         blocks = [[DirectionalDerivativeOperator(B_B_B, M_B_B, 0)],
                   [DirectionalDerivativeOperator(B_B_B, B_M_B, 1)],
                   [DirectionalDerivativeOperator(B_B_B, B_B_M, 2)]]
-        matrix = BlockLinearOperator(H1.vector_space, Hcurl.vector_space, blocks=blocks)
+        matrix = BlockDerivativeOperator(H1.vector_space, Hcurl.vector_space, blocks=blocks)
 
         # Store data in object   
         super().__init__(H1, Hcurl, matrix)
@@ -533,7 +647,7 @@ class ScalarCurl_2D(DiffOperator):
         # Build Curl matrix block by block
         blocks = [[-DirectionalDerivativeOperator(M_B, M_M, 1),
                   DirectionalDerivativeOperator(B_M, M_M, 0)]]
-        matrix = BlockLinearOperator(Hcurl.vector_space, L2.vector_space, blocks=blocks)
+        matrix = BlockDerivativeOperator(Hcurl.vector_space, L2.vector_space, blocks=blocks)
 
         # Store data in object   
         super().__init__(Hcurl, L2, matrix)
@@ -573,7 +687,7 @@ class VectorCurl_2D(DiffOperator):
         # Build Curl matrix block by block
         blocks = [[DirectionalDerivativeOperator(B_B, B_M, 1)],
                   [-DirectionalDerivativeOperator(B_B, M_B, 0)]]
-        matrix = BlockLinearOperator(H1.vector_space, Hdiv.vector_space, blocks=blocks)
+        matrix = BlockDerivativeOperator(H1.vector_space, Hdiv.vector_space, blocks=blocks)
 
         # Store data in object   
         super().__init__(H1, Hdiv, matrix)
@@ -622,7 +736,7 @@ class Curl_3D(DiffOperator):
                   [ D(M_B_B, M_B_M, 2) ,        None,          -D(B_B_M, M_B_M, 0)],
                   [-D(M_B_B, M_M_B, 1) ,  D(B_M_B, M_M_B, 0) ,        None        ]]
 
-        matrix = BlockLinearOperator(Hcurl.vector_space, Hdiv.vector_space, blocks=blocks)
+        matrix = BlockDerivativeOperator(Hcurl.vector_space, Hdiv.vector_space, blocks=blocks)
         # ...
 
         # Store data in object        
@@ -662,7 +776,7 @@ class Divergence_2D(DiffOperator):
         # Build Divergence matrix block by block
         f = KroneckerStencilMatrix
         blocks = [[DirectionalDerivativeOperator(B_M, M_M, 0), DirectionalDerivativeOperator(M_B, M_M, 1)]]
-        matrix = BlockLinearOperator(Hdiv.vector_space, L2.vector_space, blocks=blocks) 
+        matrix = BlockDerivativeOperator(Hdiv.vector_space, L2.vector_space, blocks=blocks) 
 
         # Store data in object   
         super().__init__(Hdiv, L2, matrix)
@@ -704,7 +818,7 @@ class Divergence_3D(DiffOperator):
         blocks = [[DirectionalDerivativeOperator(B_M_M, M_M_M, 0),
                    DirectionalDerivativeOperator(M_B_M, M_M_M, 1),
                    DirectionalDerivativeOperator(M_M_B, M_M_M, 2)]]
-        matrix = BlockLinearOperator(Hdiv.vector_space, L2.vector_space, blocks=blocks) 
+        matrix = BlockDerivativeOperator(Hdiv.vector_space, L2.vector_space, blocks=blocks) 
 
         # Store data in object   
         super().__init__(Hdiv, L2, matrix)
@@ -51,9 +51,14 @@ class GlobalProjector(metaclass=ABCMeta):
         Number of quadrature points along each direction, to be used in Gauss
         quadrature rule for computing the (approximated) degrees of freedom.
         This parameter is ignored, if the projector only uses interpolation (and no histopolation).
+
+    shared : bool
+        If True, the factorizations of the 1D interpolation/histopolation matrices
+        are stored in the shared memory of each node (default: False).
+        See KroneckerLinearSolver.
     """
 
-    def __init__(self, space, nquads = None):
+    def __init__(self, space, nquads = None, *, shared=False):
         self._space = space
         self._rhs = space.vector_space.zeros()
 
@@ -148,15 +153,16 @@ class GlobalProjector(metaclass=ABCMeta):
                     # histopolation case
                     if quad_x[j] is None:
                         u, w = uw[j]
-                        global_quad_x, global_quad_w = quadrature_grid(V.histopolation_grid, u, w)
+                        # only the local cells of the histopolation grid are needed
+                        local_quad_x, local_quad_w = quadrature_grid(V.histopolation_grid[s:e+2], u, w)
                         #"roll" back points to the interval to ensure that the quadrature points are
                         #in the domain. Only usefull in the periodic case (else do nothing)
                         #if not used then you will have quadrature points outside of the domain which 
                         #might cause problem when your function is only defined inside the domain
 
-                        roll_edges(V.domain, global_quad_x) 
-                        quad_x[j] = global_quad_x[s:e+1]
-                        quad_w[j] = global_quad_w[s:e+1]
+                        roll_edges(V.domain, local_quad_x) 
+                        quad_x[j] = local_quad_x
+                        quad_w[j] = local_quad_w
                     local_x, local_w = quad_x[j], quad_w[j]
                     solvercells += [V._histopolator]
                 else:
@@ -169,7 +175,7 @@ class GlobalProjector(metaclass=ABCMeta):
             self._grid_x += [block_x]
             self._grid_w += [block_w]
 
-            solverblocks += [KroneckerLinearSolver(tensorspaces[i].vector_space, tensorspaces[i].vector_space, solvercells)]
+            solverblocks += [KroneckerLinearSolver(tensorspaces[i].vector_space, tensorspaces[i].vector_space, solvercells, shared=shared)]
 
             dataslice = tuple(slice(p*m, -p*m) for p, m in zip(tensorspaces[i].vector_space.pads,tensorspaces[i].vector_space.shifts))
             dofs[i] = rhsblocks[i]._data[dataslice]
@@ -0,0 +1,510 @@
+# -*- coding: UTF-8 -*-
+"""
+Local commuting projectors onto the spaces of a tensor-product de Rham sequence.
+
+Each spline coefficient is computed by a local dual functional: for the H1
+(B-spline) spaces, the coefficient of the basis function N_i is obtained by
+polynomial interpolation at p+1 points of a single cell of its support (in the
+spirit of the quasi-interpolants of de Boor and Fix). The histopolation-type
+functionals of the derivative spaces are derived from these ones, such that the
+projectors commute with the derivatives: for the coefficient j,
+
+    mu_j(g) = lambda_{j+1}(G) - lambda_j(G),   with   G(x) = int_c^x g,
+
+which only involves integrals of g over a few cells around the support of the
+j-th basis function, as lambda_j reproduces the constants. The functionals of
+the spaces in several dimensions are tensor products of the 1D ones.
+
+Contrary to the GlobalProjector objects, no linear system is solved: each
+process computes its own coefficients with the values of the function at points
+close to its subdomain, and only the ghost regions of the result are exchanged
+with the neighbouring processes.
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from psydac.core.bsplines         import basis_funs, basis_integrals
+from psydac.utilities.quadratures import gauss_legendre
+from psydac.fem.basic             import FemField
+from psydac.fem.splines           import SplineSpace
+from psydac.fem.tensor            import TensorFemSpace
+from psydac.fem.vector            import VectorFemSpace
+
+from abc import ABCMeta, abstractmethod
+
+__all__ = ('LocalProjector', 'LocalProjector_H1', 'LocalProjector_Hcurl', 'LocalProjector_Hdiv',
+           'LocalProjector_L2', 'LocalProjector_H1vec',
+           'interpolation_functionals', 'histopolation_functionals')
+
+#==============================================================================
+def _dual_functional(V, i):
+    """
+    Local dual functional of the i-th basis function of the spline space V:
+    returns the points x and the weights a such that lambda_i(f) = sum(a * f(x)).
+    In the periodic case any integer i is accepted, and the points of the
+    functional are shifted by the corresponding number of periods.
+    """
+    p = V.degree
+    t = V.knots
+    n = V.nbasis
+    a, b = V.domain
+
+    # In the periodic case, the basis function may appear several times in the
+    # extended knot sequence (with indices r = i mod n): all the copies are
+    # considered, as only the knot spans p <= k < len(t)-p-1 can be used
+    i0 = i % n if V.periodic else i
+    rs = range(i0, len(t) - p - 1, n) if V.periodic else [i0]
+
+    # The cell of the support of N_r which is the closest to its middle
+    d, k, r = min((abs(2 * (k - r) - p), k, r) for r in rs
+                  for k in range(max(r, p), min(r + p, len(t) - p - 2) + 1) if t[k+1] > t[k])
+
+    # Interpolation by the p+1 B-splines which do not vanish on the cell
+    x     = t[k] + (t[k+1] - t[k]) * np.arange(p + 1) / p
+    x[-1] = t[k+1]
+    C     = np.array([basis_funs(t, p, xq, k) for xq in x])
+    w     = np.linalg.inv(C)[r - k + p]
+
+    if V.basis == 'M':
+        w = w / V.scaling_array[i0]
+
+    return x + (i - r) // n * (b - a), w
+
+#==============================================================================
+def _sparse_functionals(rows, x, data, nrows, domain, periodic):
+    """
+    Matrix A and points y such that the coefficients are A @ f(y), given the
+    entries (rows, x, data) of the functionals of each coefficient, where x are
+    the points. The points are brought back into the domain in the periodic case.
+    """
+    a, b = domain
+    if periodic:
+        x = a + np.mod(x - a, b - a)
+
+    y, cols = np.unique(x, return_inverse=True)
+    A = coo_matrix((data, (rows, cols.ravel())), shape=(nrows, len(y))).tocsr()
+
+    return A, y
+
+#==============================================================================
+def interpolation_functionals(V, start, end):
+    """
+    Local dual functionals of the basis functions of an H1-conforming spline
+    space, which are computed by interpolation at p+1 points of a single cell.
+
+    Parameters
+    ----------
+    V : SplineSpace
+        The 1D spline space.
+
+    start, end : int
+        The indices of the first and of the last basis functions.
+
+    Returns
+    -------
+    A : scipy.sparse.csr_matrix
+        The matrix of the functionals, whose rows correspond to the basis
+        functions and whose columns correspond to the points x.
+
+    x : numpy.ndarray
+        The evaluation points, which lie in the domain.
+    """
+    assert isinstance(V, SplineSpace)
+    assert not any(V.dirichlet)
+
+    points, weights = zip(*[_dual_functional(V, i) for i in range(start, end + 1)])
+    rows = np.repeat(np.arange(len(points)), [len(x) for x in points])
+
+    return _sparse_functionals(rows, np.concatenate(points), np.concatenate(weights),
+                               len(points), V.domain, V.periodic)
+
+#==============================================================================
+def histopolation_functionals(W, start, end, nquad):
+    """
+    Local dual functionals of the basis functions of an L2-conforming spline
+    space W, obtained by the reduction of the degree of an H1-conforming space
+    V. They are derived from the interpolation functionals of V, such that the
+    derivative of the projection onto V is the projection onto W of the
+    derivative. The integrals are computed by Gauss-Legendre quadrature, over
+    sub-intervals which do not contain any breakpoint.
+
+    Parameters
+    ----------
+    W : SplineSpace
+        The 1D spline space, with degree p-1.
+
+    start, end : int
+        The indices of the first and of the last basis functions.
+
+    nquad : int
+        The number of quadrature points in each sub-interval.
+
+    Returns
+    -------
+    A : scipy.sparse.csr_matrix
+        The matrix of the functionals, whose rows correspond to the basis
+        functions and whose columns correspond to the points x.
+
+    x : numpy.ndarray
+        The quadrature points, which lie in the domain.
+    """
+    assert isinstance(W, SplineSpace)
+    assert not any(W.dirichlet)
+
+    a, b = W.domain
+    V = SplineSpace(degree=W.degree + 1, grid=W.breaks, multiplicity=W.parent_multiplicity,
+                    periodic=W.periodic)
+
+    # Scaling of the coefficients for a B-spline basis (the differences of the
+    # coefficients of V are the coefficients of its derivative in the M-splines)
+    if W.basis == 'M':
+        scaling = np.ones(len(W.knots) - W.degree - 1)
+    else:
+        scaling = 1 / basis_integrals(W.knots, W.degree)
+
+    # Points and weights of lambda_{j+1} - lambda_j
+    points  = []
+    weights = []
+    for j in range(start, end + 1):
+        x0, w0 = _dual_functional(V, j)
+        x1, w1 = _dual_functional(V, j + 1)
+        points .append(np.concatenate((x0, x1)))
+        weights.append(np.concatenate((-w0, w1)) * scaling[j % W.nbasis])
+
+    # Sub-intervals between all the points and the breakpoints, which are
+    # shared by the functionals
+    lo = min(x.min() for x in points)
+    hi = max(x.max() for x in points)
+    breaks = W.breaks
+    if W.periodic:
+        breaks = np.concatenate((breaks - (b - a), breaks, breaks + (b - a)))
+    edges = np.unique(np.concatenate(points + [breaks[(breaks > lo) & (breaks < hi)]]))
+    h     = np.diff(edges)
+
+    u, w = gauss_legendre(nquad - 1)
+    u, w = u[::-1], w[::-1]
+    xq = (edges[:-1, None] + (u[None, :] + 1) / 2 * h[:, None]).ravel()
+    wq = (w[None, :] / 2 * h[:, None])
+
+    # G(x_k) is the sum of the integrals over the sub-intervals left of x_k
+    rows = []
+    cols = []
+    data = []
+    for r, (x, c) in enumerate(zip(points, weights)):
+        m0, m1 = np.searchsorted(edges, [x.min(), x.max()])
+        beta = np.array([c[x >= e].sum() for e in edges[m0+1:m1+1]])
+        rows.append(np.full((m1 - m0) * nquad, r))
+        cols.append(np.arange(m0 * nquad, m1 * nquad))
+        data.append((wq[m0:m1] * beta[:, None]).ravel())
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+
+    return _sparse_functionals(rows, xq[cols], np.concatenate(data), len(points), W.domain, W.periodic)
+
+#==============================================================================
+class LocalProjector(metaclass=ABCMeta):
+    """
+    A local projector to some TensorFemSpace or VectorFemSpace object, whose
+    restriction to each direction is a 1D local projector based on dual
+    functionals: interpolation-type functionals for the spaces of H1 splines,
+    and histopolation-type functionals for the spaces of lower degree.
+
+    These projectors commute with the derivatives, as the GlobalProjector
+    objects, but they do not reproduce the same degrees of freedom. Applying
+    them requires no communication other than the update of the ghost regions.
+
+    This class can currently not be instantiated directly (use a subclass instead).
+
+    Parameters
+    ----------
+    space : VectorFemSpace | TensorFemSpace
+        Some finite element space, codomain of the projection operator. The
+        structure (where to use histopolation and where interpolation) is
+        given by a subclass of the LocalProjector class.
+
+    nquads : list(int) | tuple(int)
+        Number of quadrature points along each direction, to be used in Gauss
+        quadrature rule for computing the integrals of the histopolation-type
+        functionals. This parameter is ignored, if the projector only uses
+        interpolation (and no histopolation).
+    """
+
+    def __init__(self, space, nquads = None):
+        self._space = space
+
+        if isinstance(space, TensorFemSpace):
+            tensorspaces = [space]
+        elif isinstance(space, VectorFemSpace):
+            tensorspaces = space.spaces
+        else:
+            # no SplineSpace support for now
+            raise NotImplementedError()
+
+        self._dim    = tensorspaces[0].ldim
+        assert all([self._dim == tspace.ldim for tspace in tensorspaces])
+
+        self._blockcount = len(tensorspaces)
+
+        if nquads:
+            assert len(nquads) == self._dim
+        else:
+            nquads = tensorspaces[0].nquads
+
+        structure = self._structure(self._dim)
+        assert len(structure) == self._blockcount
+
+        # 1D functionals of each block, in each direction
+        self._grid_x = []
+        self._mats   = []
+        for tspace, block in zip(tensorspaces, structure):
+            assert len(block) == self._dim
+
+            V = tspace.vector_space
+            block_x    = []
+            block_mats = []
+            for V1, s, e, cell, k in zip(tspace.spaces, V.starts, V.ends, block, nquads):
+                if cell == 'I':
+                    A, x = interpolation_functionals(V1, s, e)
+                elif cell == 'H':
+                    A, x = histopolation_functionals(V1, s, e, k)
+                else:
+                    raise NotImplementedError('Invalid entry in structure array.')
+                block_x    += [x]
+                block_mats += [A]
+
+            self._grid_x += [block_x]
+            self._mats   += [block_mats]
+
+    @property
+    def space(self):
+        """
+        The space to which this Projector projects.
+        """
+        return self._space
+
+    @property
+    def dim(self):
+        """
+        The dimension of the underlying TensorFemSpaces.
+        """
+        return self._dim
+
+    @property
+    def blockcount(self):
+        """
+        The number of blocks. In case that self.space is a TensorFemSpace, this is 1,
+        otherwise it denotes the number of blocks in the VectorFemSpace.
+        """
+        return self._blockcount
+
+    @property
+    def grid_x(self):
+        """
+        The local evaluation points of the functionals, stored in a
+        two-dimensional array; the outer dimension denotes the block, the inner
+        the tensor space direction.
+        """
+        return self._grid_x
+
+    @property
+    def mats(self):
+        """
+        The matrices of the local 1D functionals, stored in a two-dimensional
+        array; the outer dimension denotes the block, the inner the tensor space
+        direction. The coefficients are the Kronecker product of these matrices
+        applied to the values of the function on the tensor grid of grid_x.
+        """
+        return self._mats
+
+    @abstractmethod
+    def _structure(self, dim):
+        """
+        Has to be implemented by a subclass. Returns a 2-dimensional array
+        which contains strings which either say 'I' or 'H', with the same
+        meaning as for the GlobalProjector.
+
+        Parameters
+        ----------
+        dim : int
+            The dimension of the underlying TensorFemSpaces.
+
+        Returns
+        -------
+        structure : array
+            The described structure matrix.
+        """
+        pass
+
+    def __call__(self, fun):
+        r"""
+        Project vector function onto the given finite element
+        space by the instance of this class. This happens in the logical domain $\hat{\Omega}$.
+
+        Parameters
+        ----------
+        fun : callable or list/tuple of callables
+            Scalar components of the real- or complex-valued vector function to be
+            projected, with arguments the coordinates (x_1, ..., x_N) of a
+            point in the logical domain.
+
+            $fun_i : \hat{\Omega} \mapsto \mathbb{R}$ with i = 1, ..., N.
+
+        Returns
+        -------
+        field : FemField
+            Field obtained by projection (element of the target space-conforming
+            finite element space). This is also a real- or complex-valued scalar/vector function
+            in the logical domain.
+        """
+        if self._blockcount > 1 or isinstance(fun, list) or isinstance(fun, tuple):
+            # (we also support 1-tuples as argument for scalar spaces)
+            assert self._blockcount == len(fun)
+        else:
+            fun = [fun]
+
+        coeffs = self._space.vector_space.zeros()
+        blocks = coeffs.blocks if self._blockcount > 1 else [coeffs]
+
+        for f, x, mats, c in zip(fun, self._grid_x, self._mats, blocks):
+            grid   = np.meshgrid(*x, indexing='ij', sparse=True)
+            values = np.vectorize(f, otypes=[c.space.dtype])(*grid)
+
+            # Apply the 1D functionals along each direction
+            for d, A in enumerate(mats):
+                values = np.moveaxis(values, d, 0)
+                shape  = values.shape
+                values = (A @ values.reshape(shape[0], -1)).reshape((A.shape[0],) + shape[1:])
+                values = np.moveaxis(values, 0, d)
+
+            V = c.space
+            c[tuple(slice(s, e + 1) for s, e in zip(V.starts, V.ends))] = values
+
+        coeffs.update_ghost_regions()
+
+        return FemField(self._space, coeffs=coeffs)
+
+#==============================================================================
+class LocalProjector_H1(LocalProjector):
+    """
+    Local projector from H1 to an H1-conforming finite element space
+    constructed with tensor-product B-splines in 1, 2 or 3 dimensions, based
+    on interpolation-type local functionals along each direction.
+
+    Parameters
+    ----------
+    H1 : TensorFemSpace
+        H1-conforming finite element space, codomain of the projection operator
+    """
+    def _structure(self, dim):
+        return [['I'] * dim]
+
+#==============================================================================
+class LocalProjector_Hcurl(LocalProjector):
+    """
+    Local projector from H(curl) to an H(curl)-conforming finite element space
+    constructed with tensor-product B- and M-splines in 2 or 3 dimensions.
+    Each component is projected with histopolation-type functionals along its
+    direction, and interpolation-type functionals along the other directions.
+
+    Parameters
+    ----------
+    Hcurl : VectorFemSpace
+        H(curl)-conforming finite element space, codomain of the projection
+        operator.
+
+    nquads : list(int) | tuple(int)
+        Number of quadrature points along each direction.
+    """
+    def _structure(self, dim):
+        if dim == 3:
+            return [
+                ['H', 'I', 'I'],
+                ['I', 'H', 'I'],
+                ['I', 'I', 'H']
+            ]
+        elif dim == 2:
+            return [
+                ['H', 'I'],
+                ['I', 'H']
+            ]
+        else:
+            raise NotImplementedError('The Hcurl projector is only available in 2D or 3D.')
+
+#==============================================================================
+class LocalProjector_Hdiv(LocalProjector):
+    """
+    Local projector from H(div) to an H(div)-conforming finite element space
+    constructed with tensor-product B- and M-splines in 2 or 3 dimensions.
+    Each component is projected with interpolation-type functionals along its
+    direction, and histopolation-type functionals along the other directions.
+
+    Parameters
+    ----------
+    Hdiv : VectorFemSpace
+        H(div)-conforming finite element space, codomain of the projection
+        operator.
+
+    nquads : list(int) | tuple(int)
+        Number of quadrature points along each direction.
+    """
+    def _structure(self, dim):
+        if dim == 3:
+            return [
+                ['I', 'H', 'H'],
+                ['H', 'I', 'H'],
+                ['H', 'H', 'I']
+            ]
+        elif dim == 2:
+            return [
+                ['I', 'H'],
+                ['H', 'I']
+            ]
+        else:
+            raise NotImplementedError('The Hdiv projector is only available in 2D or 3D.')
+
+#==============================================================================
+class LocalProjector_L2(LocalProjector):
+    """
+    Local projector from L2 to an L2-conforming finite element space
+    constructed with tensor-product M-splines in 1, 2 or 3 dimensions, based
+    on histopolation-type local functionals along each direction.
+
+    Parameters
+    ----------
+    L2 : TensorFemSpace
+        L2-conforming finite element space, codomain of the projection operator
+
+    nquads : list(int) | tuple(int)
+        Number of quadrature points along each direction.
+    """
+    def _structure(self, dim):
+        return [['H'] * dim]
+
+#==============================================================================
+class LocalProjector_H1vec(LocalProjector):
+    """
+    Local projector from H1^3 to an H1^3-conforming finite element space
+    constructed with tensor-product B-splines in 2 or 3 dimensions: each
+    component is projected with the H1 local projector.
+
+    Parameters
+    ----------
+    H1vec : VectorFemSpace
+        H1^3-conforming finite element space, codomain of the projection
+        operator.
+    """
+    def _structure(self, dim):
+        if dim == 3:
+            return [
+                ['I', 'I', 'I'],
+                ['I', 'I', 'I'],
+                ['I', 'I', 'I']
+            ]
+        elif dim == 2:
+            return [
+                ['I', 'I'],
+                ['I', 'I']
+            ]
+        else:
+            raise NotImplementedError('The H1vec projector is only available in 2D or 3D.')
@@ -6,8 +6,9 @@ from psydac.fem.basic        import FemField
 from psydac.fem.splines      import SplineSpace
 from psydac.fem.tensor       import TensorFemSpace
 from psydac.fem.vector       import VectorFemSpace
+from psydac.linalg.block     import BlockLinearOperator
 
-from psydac.feec.derivatives import DirectionalDerivativeOperator
+from psydac.feec.derivatives import DirectionalDerivativeOperator, BlockDerivativeOperator
 from psydac.feec.derivatives import Derivative_1D, Gradient_2D, Gradient_3D
 from psydac.feec.derivatives import ScalarCurl_2D, VectorCurl_2D, Curl_3D
 from psydac.feec.derivatives import Divergence_2D, Divergence_3D
@@ -117,6 +118,12 @@ def run_directional_derivative_operator(comm, domain, ncells, degree, periodic,
         if not diffop.domain.parallel:
             assert np.array_equal(diffop.toarray(), matrix.toarray())
 
+        # case three (bis): tostencil().dot(v), with the pads of the band
+        matrix = diffop.tostencil()
+        res3 = matrix.dot(v)
+        assert matrix.pads == tuple(1 if d == diffop._diffdir else 0 for d in range(diffop.domain.ndim))
+        assert np.allclose(ref._data[localslice], res3._data[localslice])
+
     # case four: tosparse().dot(v._data)
     res4 = diffop.tosparse(with_pads=True).dot(v._data.flatten())
     assert np.allclose(ref._data[localslice], res4.reshape(ref._data.shape)[localslice])
@@ -912,6 +919,71 @@ def test_Divergence_3D(domain, ncells, degree, periodic, seed, multiplicity):
     maxnorm_error = abs(vals_u3 - vals_div_u2).max()
     assert maxnorm_error / maxnorm_field <= 1e-14
 
+#==============================================================================
+def run_block_derivative_operators(comm, ncells, degree, periodic, seed):
+
+    np.random.seed(seed)
+
+    breaks = [np.linspace(0, 1, num=n+1) for n in ncells]
+    Ns = [SplineSpace(degree=d, grid=g, periodic=p, basis='B') for d, g, p in zip(degree, breaks, periodic)]
+
+    domain_decomposition = DomainDecomposition(ncells, periodic, comm=comm)
+    V0 = TensorFemSpace(domain_decomposition, *Ns)
+
+    if len(ncells) == 2:
+        V1 = VectorFemSpace(V0.reduce_degree(axes=[0], basis='M'), V0.reduce_degree(axes=[1], basis='M'))
+        V2 = V0.reduce_degree(axes=[0, 1], basis='M')
+        operators = [Gradient_2D(V0, V1), ScalarCurl_2D(V1, V2)]
+    else:
+        V1 = VectorFemSpace(*[V0.reduce_degree(axes=[d], basis='M') for d in range(3)])
+        V2 = VectorFemSpace(*[V0.reduce_degree(axes=[d for d in range(3) if d != k], basis='M') for k in range(3)])
+        V3 = V0.reduce_degree(axes=[0, 1, 2], basis='M')
+        operators = [Gradient_3D(V0, V1), Curl_3D(V1, V2), Divergence_3D(V2, V3)]
+
+    for op in operators:
+        A = op.matrix
+        B = BlockLinearOperator(A.domain, A.codomain, blocks=A.blocks)
+        assert isinstance(A, BlockDerivativeOperator)
+
+        v = A.domain.zeros()
+        for vi in (v.blocks if A.n_block_cols > 1 else [v]):
+            vi._data[:] = np.random.random(vi._data.shape)
+        v.ghost_regions_in_sync = False
+
+        # The fused kernels give the same result as the blocks applied one by one
+        r1 = A.dot(v)
+        r2 = B.dot(v)
+        assert np.allclose(r1.toarray(), r2.toarray(), rtol=1e-14, atol=1e-14)
+
+        # With an output vector, which is overwritten
+        out = A.codomain.zeros()
+        for oi in (out.blocks if A.n_block_rows > 1 else [out]):
+            oi._data[:] = 1.
+        r3 = A.dot(v, out=out)
+        assert r3 is out
+        assert np.allclose(r3.toarray(), r2.toarray(), rtol=1e-14, atol=1e-14)
+
+        # The transposed operator is a generic block operator
+        w = A.codomain.zeros()
+        assert np.allclose(A.T.dot(w).toarray(), 0)
+
+@pytest.mark.parametrize('ncells', [(6, 5, 4), (1, 4, 3)])
+@pytest.mark.parametrize('degree', [(2, 3, 1), (1, 1, 2)])
+@pytest.mark.parametrize('periodic', [(True, False, False), (False, True, True)])
+@pytest.mark.parametrize('ndim', [2, 3])
+def test_block_derivative_operators_ser(ncells, degree, periodic, ndim):
+    if any(p and n <= d for n, d, p in zip(ncells, degree, periodic)):
+        return
+    run_block_derivative_operators(None, ncells[:ndim], degree[:ndim], periodic[:ndim], seed=1)
+
+@pytest.mark.parametrize('ncells', [(10, 9, 8)])
+@pytest.mark.parametrize('degree', [(2, 3, 1)])
+@pytest.mark.parametrize('periodic', [(True, False, False), (False, True, True)])
+@pytest.mark.parametrize('ndim', [2, 3])
+@pytest.mark.parallel
+def test_block_derivative_operators_par(ncells, degree, periodic, ndim):
+    run_block_derivative_operators(MPI.COMM_WORLD, ncells[:ndim], degree[:ndim], periodic[:ndim], seed=3)
+
 #==============================================================================
 if __name__ == '__main__':
     
@@ -0,0 +1,175 @@
+import numpy as np
+import pytest
+from mpi4py import MPI
+
+from sympde.topology import Line, Square, Cube, Derham
+
+from psydac.api.discretization    import discretize
+from psydac.fem.basic             import FemField
+from psydac.feec.local_projectors import LocalProjector_H1, LocalProjector_L2
+from psydac.feec.local_projectors import LocalProjector_Hcurl, LocalProjector_Hdiv
+
+#==============================================================================
+def random_field(V, seed=0):
+    """ Random spline of the space V. """
+    c = V.vector_space.zeros()
+    rng = np.random.default_rng(seed)
+    for b in (c.blocks if V.is_product else [c]):
+        b._data[...] = rng.random(b._data.shape)
+    c.update_ghost_regions()
+    return FemField(V, coeffs=c)
+
+def local_arrays(x, y):
+    """ Coefficients of the vectors x and y at the local indices of x. """
+    xs = x.blocks if hasattr(x, 'blocks') else [x]
+    ys = y.blocks if hasattr(y, 'blocks') else [y]
+    local = [tuple(slice(s, e+1) for s, e in zip(b.space.starts, b.space.ends)) for b in xs]
+    return (np.concatenate([b[i].ravel() for b, i in zip(xs, local)]),
+            np.concatenate([b[i].ravel() for b, i in zip(ys, local)]))
+
+def discrete_derham(ncells, degree, periodic, multiplicity=None, comm=None):
+    dim    = len(ncells)
+    domain = [Line, Square, Cube][dim-1]('Omega')
+    derham = Derham(domain, ['H1', 'Hcurl', 'L2'] if dim == 2 else None)
+
+    domain_h = discretize(domain, ncells=ncells, periodic=periodic, comm=comm)
+    derham_h = discretize(derham, domain_h, degree=degree, multiplicity=multiplicity)
+    return derham_h
+
+#==============================================================================
+@pytest.mark.parametrize('degree', [1, 2, 3, 4])
+@pytest.mark.parametrize('periodic', [False, True])
+@pytest.mark.parametrize('multiplicity', [1, 2])
+def test_local_projectors_1d(degree, periodic, multiplicity):
+
+    multiplicity = min(multiplicity, degree)
+    derham_h = discrete_derham([11], [degree], [periodic], [multiplicity])
+    V0, V1   = derham_h.spaces
+    D0,      = derham_h.derivatives_as_matrices
+    P0, P1   = derham_h.projectors(kind='local', nquads=[8])
+
+    assert isinstance(P0, LocalProjector_H1)
+    assert isinstance(P1, LocalProjector_L2)
+
+    # The projectors reproduce the splines
+    u = random_field(V0)
+    v = random_field(V1)
+    assert np.allclose(P0(u).coeffs.toarray(), u.coeffs.toarray(), rtol=1e-12, atol=1e-12)
+    assert np.allclose(P1(v).coeffs.toarray(), v.coeffs.toarray(), rtol=1e-12, atol=1e-12)
+
+    # Commuting diagram: D0 P0 f = P1 f' (exact quadrature of the polynomial f')
+    if periodic:
+        f  = lambda x: np.sin(2*np.pi*x)
+        df = lambda x: 2*np.pi*np.cos(2*np.pi*x)
+    else:
+        f  = lambda x: x**(degree + 3) - x
+        df = lambda x: (degree + 3) * x**(degree + 2) - 1
+
+    u0 = P0(f)
+    u1 = P1(df)
+    tol = 1e-9 if periodic else 1e-11
+    assert np.allclose((D0 @ u0.coeffs).toarray(), u1.coeffs.toarray(), rtol=tol, atol=tol)
+
+    # Approximation of a smooth function
+    xgrid = np.linspace(0, 1, 41)
+    assert max(abs(u0(x) - f(x)) for x in xgrid) < 0.2 / 11**(degree - 1)
+
+#==============================================================================
+@pytest.mark.parametrize('degree', [[2, 3], [3, 1]])
+@pytest.mark.parametrize('periodic', [[False, True], [True, True]])
+def test_local_projectors_2d(degree, periodic):
+
+    derham_h = discrete_derham([8, 7], degree, periodic)
+    V0, V1, V2 = derham_h.spaces
+    grad, curl = derham_h.derivatives_as_matrices
+    P0, P1, P2 = derham_h.projectors(kind='local', nquads=[p + 6 for p in degree])
+
+    assert isinstance(P1, LocalProjector_Hcurl)
+
+    for V, P in zip(derham_h.spaces, (P0, P1, P2)):
+        u = random_field(V)
+        w = P(tuple(u.fields) if V.is_product else u)
+        assert np.allclose(w.coeffs.toarray(), u.coeffs.toarray(), rtol=1e-12, atol=1e-12)
+
+    # Commuting diagram with a periodic function
+    f    = lambda x, y: np.sin(2*np.pi*x) * np.cos(2*np.pi*y) + np.sin(2*np.pi*(x + y))
+    f_x  = lambda x, y: 2*np.pi * (np.cos(2*np.pi*x) * np.cos(2*np.pi*y) + np.cos(2*np.pi*(x + y)))
+    f_y  = lambda x, y: 2*np.pi * (-np.sin(2*np.pi*x) * np.sin(2*np.pi*y) + np.cos(2*np.pi*(x + y)))
+    g1   = lambda x, y: np.cos(2*np.pi*y) * x
+    g2   = lambda x, y: np.sin(2*np.pi*x) * np.cos(2*np.pi*y)
+    curl_g = lambda x, y: 2*np.pi*np.cos(2*np.pi*x) * np.cos(2*np.pi*y) + 2*np.pi*np.sin(2*np.pi*y) * x
+
+    u0 = P0(f)
+    u1 = P1((f_x, f_y))
+    assert np.allclose((grad @ u0.coeffs).toarray(), u1.coeffs.toarray(), rtol=1e-8, atol=1e-8)
+
+    if not periodic[0]:
+        v1 = P1((g1, g2))
+        v2 = P2(curl_g)
+        assert np.allclose((curl @ v1.coeffs).toarray(), v2.coeffs.toarray(), rtol=1e-8, atol=1e-8)
+
+#==============================================================================
+def test_local_projectors_3d():
+
+    derham_h = discrete_derham([5, 6, 5], [2, 3, 2], [True, False, True])
+    grad, curl, div = derham_h.derivatives_as_matrices
+    P0, P1, P2, P3  = derham_h.projectors(kind='local', nquads=[5, 6, 5])
+
+    assert isinstance(P2, LocalProjector_Hdiv)
+
+    # (the evaluation of the fields is slow: the other projectors are checked in 2D)
+    for V, P in zip(derham_h.spaces, (P0, P1)):
+        u = random_field(V)
+        w = P(tuple(u.fields) if V.is_product else u)
+        assert np.allclose(w.coeffs.toarray(), u.coeffs.toarray(), rtol=1e-12, atol=1e-12)
+
+    # Commuting diagram: curl P1 E = P2 curl E, with E = (0, 0, f(x, y))
+    f   = lambda x, y, z: np.sin(2*np.pi*x) * y**3
+    f_x = lambda x, y, z: 2*np.pi*np.cos(2*np.pi*x) * y**3
+    f_y = lambda x, y, z: 3*np.sin(2*np.pi*x) * y**2
+    zero = lambda x, y, z: 0.
+
+    e1 = P1((zero, zero, f))
+    b2 = P2((f_y, lambda x, y, z: -f_x(x, y, z), zero))
+    assert np.allclose((curl @ e1.coeffs).toarray(), b2.coeffs.toarray(), rtol=1e-8, atol=1e-8)
+
+    # Commuting diagram: div P2 B = P3 div B
+    b2 = P2((f, zero, zero))
+    b3 = P3(f_x)
+    assert np.allclose((div @ b2.coeffs).toarray(), b3.coeffs.toarray(), rtol=1e-8, atol=1e-8)
+
+#==============================================================================
+@pytest.mark.parallel
+@pytest.mark.parametrize('periodic', [[False, False], [True, False]])
+def test_local_projectors_parallel(periodic):
+
+    comm   = MPI.COMM_WORLD
+    degree = [3, 2]
+    nquads = [8, 7]
+
+    f  = lambda x, y: np.sin(2*np.pi*x) * np.exp(y)
+    fx = lambda x, y: 2*np.pi*np.cos(2*np.pi*x) * np.exp(y)
+    fy = lambda x, y: np.sin(2*np.pi*x) * np.exp(y)
+
+    # Serial projection on each process, used as the reference
+    derham_s = discrete_derham([12, 10], degree, periodic)
+    P0s, P1s, P2s = derham_s.projectors(kind='local', nquads=nquads)
+
+    derham_h = discrete_derham([12, 10], degree, periodic, comm=comm)
+    grad, curl = derham_h.derivatives_as_matrices
+    P0, P1, P2 = derham_h.projectors(kind='local', nquads=nquads)
+
+    u0 = P0(f)
+    u1 = P1((fx, fy))
+    assert u0.coeffs.ghost_regions_in_sync
+    assert np.allclose((grad @ u0.coeffs).toarray(), u1.coeffs.toarray(), rtol=1e-8, atol=1e-8)
+
+    for u, Ps, fun in [(u0, P0s, f), (u1, P1s, (fx, fy)), (P2(f), P2s, f)]:
+        x, y = local_arrays(u.coeffs, Ps(fun).coeffs)
+        assert np.allclose(x, y, rtol=1e-12, atol=1e-12)
+
+#==============================================================================
+if __name__ == '__main__':
+    test_local_projectors_1d(3, True, 1)
+    test_local_projectors_2d([2, 3], [False, True])
+    test_local_projectors_3d()
@@ -1,8 +1,6 @@
 # -*- coding: UTF-8 -*-
+from psydac.utilities.lazy_import import attach
 
-from psydac.fem import basic
-from psydac.fem import context
-from psydac.fem import splines
-from psydac.fem import tensor
-from psydac.fem import vector
-from psydac.fem import partitioning
+# The submodules are imported on first access (PEP 562)
+_submodules = {'basic', 'context', 'splines', 'tensor', 'vector', 'partitioning'}
+__getattr__, __dir__ = attach(__name__, _submodules)
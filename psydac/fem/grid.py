@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from psydac.core.bsplines         import elements_spans
+from psydac.core.bsplines         import find_spans
 from psydac.core.bsplines         import quadrature_grid
 from psydac.core.bsplines         import basis_ders_on_quad_grid
 from psydac.core.bsplines         import elevate_knots
@@ -43,14 +43,27 @@ class FemAssemblyGrid:
         Number of basis functions' derivatives to be precomputed at the Gauss
         points (default: 1).
 
+    compress : bool
+        If True, store only one copy of the basis table for each group of
+        elements with the same local knot pattern (e.g. all the elements of a
+        uniform periodic grid). The full table is then expanded on first
+        access to the `basis` property, and kept for later use: the assembly
+        methods read the compressed tables through `basis_table` and
+        `basis_index` instead (default: False).
+
+    Notes
+    -----
+    All the quadrature and basis tables are computed for the local elements
+    only, hence the setup cost and memory footprint do not depend on the
+    global size of the grid.
+
     """
-    def __init__( self, space, start, end, *, nquads=None, nderiv=1):
+    def __init__( self, space, start, end, *, nquads=None, nderiv=1, compress=False):
 
         assert nquads is not None
 
         T            = space.knots           # knots sequence
         degree       = space.degree          # spline degree
-        n            = space.nbasis          # total number of control points
         grid         = space.breaks          # breakpoints
         k            = nquads                # number of quadrature points
 
@@ -62,25 +75,30 @@ class FemAssemblyGrid:
         w = w[::-1]
 
         #-------------------------------------------
-        # GLOBAL GRID
+        # LOCAL GRID
         #-------------------------------------------
+        grid = grid[start:end+2]
 
         # Lists of quadrature coordinates and weights on each element
-        global_points, global_weights = quadrature_grid( grid, u, w )
-
-        # List of basis function values on each element
-        global_basis = basis_ders_on_quad_grid( T, degree, global_points, nderiv, space.basis )
+        points, weights = quadrature_grid( grid, u, w )
 
         # List of spans on each element
         # (Span is global index of last non-vanishing basis function)
+        spans = local_elements_spans( space, start, end )
+
+        # List of basis function values on each element, or table of the
+        # distinct values with the index of the table used by each element
+        if compress:
+            basis_index, representatives = _element_patterns( T, degree, spans )
+            basis_table = np.concatenate([basis_ders_on_quad_grid( T, degree,
+                    points[i:i+1], nderiv, space.basis, offset=start+i )
+                    for i in representatives])
+            basis = None
+        else:
+            basis_index = None
+            basis_table = None
+            basis = basis_ders_on_quad_grid( T, degree, points, nderiv, space.basis, offset=start )
 
-        global_spans = elements_spans( T, degree )
-
-        grid    = grid[start:end+2]
-        spans   = global_spans  [start:end+1].copy()
-        basis   = global_basis  [start:end+1].copy()
-        points  = global_points [start:end+1].copy()
-        weights = global_weights[start:end+1].copy()
         #-------------------------------------------
         # DATA STORAGE IN OBJECT
         #-------------------------------------------
@@ -89,6 +107,9 @@ class FemAssemblyGrid:
         self._num_quad_pts = len( u )
         self._spans        = spans
         self._basis        = basis
+        self._basis_table  = basis_table
+        self._basis_index  = basis_index
+        self._basis_full   = None
         self._points       = points
         self._weights      = weights
         self._indices      = tuple(range(start, end+1))
@@ -125,8 +146,38 @@ class FemAssemblyGrid:
     def basis( self ):
         """ Basis function values (and their derivatives) at each quadrature point.
         """
+        if self._basis is None:
+            # Expanded once, e.g. for the basis of the mapping in all the assemblers
+            if self._basis_full is None:
+                self._basis_full = self._basis_table[self._basis_index]
+            return self._basis_full
+        return self._basis
+
+    # ...
+    @property
+    def compressed( self ):
+        """ True if only the distinct basis tables are stored.
+        """
+        return self._basis is None
+
+    # ...
+    @property
+    def basis_table( self ):
+        """ Distinct basis tables, to be accessed through `basis_index`.
+        """
+        if self._basis is None:
+            return self._basis_table
         return self._basis
 
+    # ...
+    @property
+    def basis_index( self ):
+        """ Index in `basis_table` of the basis values on each element.
+        """
+        if self._basis is None:
+            return self._basis_index
+        return np.arange(self._num_elements)
+
     # ...
     @property
     def points( self ):
@@ -175,3 +226,51 @@ class FemAssemblyGrid:
         """ Local index of last element owned by process.
         """
         return self._local_element_end
+
+#==============================================================================
+def local_elements_spans(space, start, end):
+    """
+    Compute the index of the last non-vanishing spline on each element in the
+    range [start, end], without computing the spans on the whole grid.
+
+    Parameters
+    ----------
+    space : SplineSpace
+        1D finite element space.
+
+    start : int
+        Index of first element.
+
+    end : int
+        Index of last element.
+
+    Returns
+    -------
+    spans : numpy.ndarray (1D)
+        Equal to `elements_spans(space.knots, space.degree)[start:end+1]`.
+
+    """
+    # The span of an element is the span of its left breakpoint
+    return find_spans(space.knots, space.degree, space.breaks[start:end+1])
+
+#==============================================================================
+def _element_patterns(knots, degree, spans):
+    """
+    Group the elements which have the same knots around them, up to a
+    translation, and on which the basis functions therefore take the same
+    values at the quadrature points.
+
+    Returns the index of the group of each element, and the index of one
+    representative element for each group.
+
+    """
+    p      = degree
+    knots  = np.asarray(knots)
+    window = np.array([knots[s-p:s+p+2] - knots[s] for s in spans])
+    scale  = knots[-1] - knots[0]
+
+    # Round the relative positions of the knots to absorb round-off errors
+    keys = np.round(window / scale, 12)
+    _, representatives, index = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+
+    return index.ravel(), representatives
@@ -3,7 +3,6 @@ import os
 import numpy as np
 
 from mpi4py import MPI
-from sympde.topology import Interface
 
 from psydac.ddm.cart       import CartDecomposition, InterfaceCartDecomposition, create_interfaces_cart
 from psydac.core.bsplines  import elements_spans
@@ -89,6 +88,7 @@ def construct_connectivity(domain):
     else:
         interiors  = list(domain.interior.args)
         if interfaces:
+            from sympde.topology import Interface
             interfaces = [interfaces] if isinstance(interfaces, Interface) else list(interfaces.args)
 
     connectivity = {}
@@ -2,12 +2,10 @@
 # Copyright 2018 Ahmed Ratnani, Yaman Güçlü
 
 import numpy as np
-from scipy.sparse import csc_matrix, csr_matrix, dia_matrix
 
-from sympde.topology.space import BasicFunctionSpace
 
 from psydac.linalg.stencil        import StencilVectorSpace
-from psydac.linalg.direct_solvers import BandedSolver, SparseSolver
+from psydac.linalg.direct_solvers import banded_solver
 from psydac.fem.basic             import FemSpace, FemField
 from psydac.core.bsplines         import (
         find_span,
@@ -171,6 +169,9 @@ class SplineSpace( FemSpace ):
         for the calculation of a spline interpolant given the values at the
         Greville points.
 
+        The collocation matrix is stored in the attribute `imat`, as a
+        scipy.sparse CSR matrix (a dense array in earlier versions).
+
         """
         imat = collocation_matrix(
             knots    = self.knots,
@@ -178,23 +179,12 @@ class SplineSpace( FemSpace ):
             periodic = self.periodic,
             normalization = self.basis,
             xgrid    = self.greville,
-            multiplicity = self.multiplicity
+            multiplicity = self.multiplicity,
+            sparse   = True
         )
 
-        if self.periodic:
-            # Convert to CSC format and compute sparse LU decomposition
-            self._interpolator = SparseSolver( csc_matrix( imat ) )
-        else:
-            # Convert to LAPACK banded format (see DGBTRF function)
-            dmat = dia_matrix( imat )
-            l = abs( dmat.offsets.min() )
-            u =      dmat.offsets.max()
-            cmat = csr_matrix( dmat )
-            bmat = np.zeros( (1+u+2*l, cmat.shape[1]), dtype=dtype )
-            for i,j in zip( *cmat.nonzero() ):
-                bmat[u+l+i-j,j] = cmat[i,j]
-            self._interpolator = BandedSolver( u, l, bmat )
-            self.imat = imat
+        self._interpolator = banded_solver( imat, self.periodic, dtype )
+        self.imat = imat
 
         # Store flag
         self._interpolation_ready = True
@@ -206,6 +196,9 @@ class SplineSpace( FemSpace ):
         for the calculation of a spline interpolant given the integrals within
         the cells defined by the extended Greville points.
 
+        The histopolation matrix is stored in the attribute `hmat`, as a
+        scipy.sparse CSR matrix (a dense array in earlier versions).
+
         """
         imat = histopolation_matrix(
             knots    = self.knots,
@@ -213,23 +206,12 @@ class SplineSpace( FemSpace ):
             periodic = self.periodic,
             normalization = self.basis,
             xgrid    = self.ext_greville,
-            multiplicity = self._multiplicity
+            multiplicity = self._multiplicity,
+            sparse   = True
         )
 
-        self.hmat= imat
-        if self.periodic:
-            # Convert to CSC format and compute sparse LU decomposition
-            self._histopolator = SparseSolver( csc_matrix( imat ) )
-        else:
-            # Convert to LAPACK banded format (see DGBTRF function)
-            dmat = dia_matrix( imat )
-            l = abs( dmat.offsets.min() )
-            u =      dmat.offsets.max()
-            cmat = csr_matrix( dmat )
-            bmat = np.zeros( (1+u+2*l, cmat.shape[1]), dtype=dtype)
-            for i,j in zip( *cmat.nonzero() ):
-                bmat[u+l+i-j,j] = cmat[i,j]
-            self._histopolator = BandedSolver( u, l, bmat )
+        self._histopolator = banded_solver( imat, self.periodic, dtype )
+        self.hmat = imat
 
         # Store flag
         self._histopolation_ready = True
@@ -276,6 +258,7 @@ class SplineSpace( FemSpace ):
 
     @symbolic_space.setter
     def symbolic_space( self, symbolic_space ):
+        from sympde.topology.space import BasicFunctionSpace
         assert isinstance(symbolic_space, BasicFunctionSpace)
         self._symbolic_space = symbolic_space
 
@@ -379,6 +362,13 @@ class SplineSpace( FemSpace ):
         """
         return self._breaks
 
+    @property
+    def is_uniform( self ):
+        """ True if the breakpoints are equally spaced.
+        """
+        h = np.diff(self._breaks)
+        return bool(np.allclose(h, h[0], rtol=1e-12, atol=0))
+
     @property
     def domain( self ):
         """ Domain boundaries [a,b].
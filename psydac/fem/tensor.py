@@ -8,18 +8,17 @@ of compact support
 from mpi4py import MPI
 import numpy as np
 import itertools
-import h5py
 import os
 
-from types import MappingProxyType
+from types       import MappingProxyType
+from collections import OrderedDict
 
-from sympde.topology.space import BasicFunctionSpace
 
 from psydac.linalg.stencil   import StencilVectorSpace
-from psydac.linalg.kron      import kronecker_solve
+from psydac.linalg.kron      import kronecker_solve, KroneckerLinearSolver
 from psydac.fem.basic        import FemSpace, FemField
 from psydac.fem.splines      import SplineSpace
-from psydac.fem.grid         import FemAssemblyGrid
+from psydac.fem.grid         import FemAssemblyGrid, local_elements_spans
 from psydac.fem.partitioning import create_cart, partition_coefficients
 from psydac.ddm.cart         import DomainDecomposition
 
@@ -27,7 +26,6 @@ from psydac.core.bsplines  import (find_span,
                                    basis_funs,
                                    basis_funs_1st_der,
                                    basis_ders_on_quad_grid,
-                                   elements_spans,
                                    cell_index,
                                    basis_ders_on_irregular_grid)
 
@@ -40,7 +38,7 @@ from psydac.core.field_evaluation_kernels import (eval_fields_2d_no_weights,
                                                   eval_fields_3d_weighted,
                                                   eval_fields_3d_irregular_weighted)
 
-__all__ = ('TensorFemSpace',)
+__all__ = ('TensorFemSpace', 'EvaluationPlan')
 
 #===============================================================================
 class TensorFemSpace( FemSpace ):
@@ -102,14 +100,16 @@ class TensorFemSpace( FemSpace ):
         self._refined_space  = {}
         self._interfaces     = {}
         self._interfaces_readonly = MappingProxyType(self._interfaces)
+        self._evaluation_plans    = OrderedDict()
 
         if self._vector_space.parallel and self._vector_space.cart.is_comm_null:return
 
         starts = self._vector_space.cart.domain_decomposition.starts
         ends   = self._vector_space.cart.domain_decomposition.ends
 
-        # Compute extended 1D quadrature grids (local to process) along each direction
-        self._quad_grids = tuple({q: FemAssemblyGrid(V, s, e, nderiv=V.degree, nquads=q)}
+        # Compute extended 1D quadrature grids (local to process) along each direction.
+        # On uniform grids only the distinct basis tables are stored (see FemAssemblyGrid)
+        self._quad_grids = tuple({q: FemAssemblyGrid(V, s, e, nderiv=V.degree, nquads=q, compress=V.is_uniform)}
                                   for V, s, e, q in zip( self.spaces, starts, ends, self._nquads))
 
         # Determine portion of logical domain local to process
@@ -169,6 +169,7 @@ class TensorFemSpace( FemSpace ):
 
     @symbolic_space.setter
     def symbolic_space( self, symbolic_space ):
+        from sympde.topology.space import BasicFunctionSpace
         assert isinstance(symbolic_space, BasicFunctionSpace)
         self._symbolic_space = symbolic_space
 
@@ -301,7 +302,7 @@ class TensorFemSpace( FemSpace ):
 
             # Compute basis functions and spans
             global_basis_i = basis_ders_on_quad_grid(self.knots[i], self.degree[i], grid_local, der, self.spaces[i].basis, offset=starts[i])
-            global_spans_i = elements_spans(self.knots[i], self.degree[i])[slice(starts[i], ends[i] + 1)] - v.starts[i] + v.shifts[i] * v.pads[i]
+            global_spans_i = local_elements_spans(self.spaces[i], starts[i], ends[i]) - v.starts[i] + v.shifts[i] * v.pads[i]
 
             local_shape.append(grid_local.shape)
             global_basis.append(global_basis_i)
@@ -377,7 +378,7 @@ class TensorFemSpace( FemSpace ):
 
             # basis functions and spans
             global_basis_i = basis_ders_on_irregular_grid(self.knots[i], self.degree[i], grid_local_i, cell_index_i, der, self.spaces[i].basis)
-            global_spans_i = elements_spans(self.knots[i], self.degree[i])[slice(starts[i], ends[i] + 1)] - v.starts[i] + v.shifts[i] * v.pads[i]
+            global_spans_i = local_elements_spans(self.spaces[i], starts[i], ends[i]) - v.starts[i] + v.shifts[i] * v.pads[i]
 
             local_shape.append(len(grid_local_i))
             global_basis.append(global_basis_i)
@@ -388,6 +389,57 @@ class TensorFemSpace( FemSpace ):
 
         return self.degree, global_basis, global_spans, cell_indexes, local_shape
 
+    # ...
+    def get_evaluation_plan(self, grid, npts_per_cell=None, der=0, overlap=0):
+        """Get a plan for the evaluation of fields on a tensor grid.
+
+        The plans are cached: the most recently used ones are kept, and are
+        returned again when the same grid and parameters are requested.
+
+        Parameters
+        ----------
+        grid : List of ndarray
+            Grid on which to evaluate the fields, see `eval_fields`.
+
+        npts_per_cell: int or tuple of int or None, optional
+            Number of evaluation points in each cell, if the grid is given as
+            a list of 1D arrays but is regular.
+
+        der : int, default=0
+            Number of derivatives of the basis functions to pre-compute.
+
+        overlap : int
+            How much to overlap. Only used in the distributed context.
+
+        Returns
+        -------
+        EvaluationPlan
+            Plan for the evaluation of fields on the local part of the grid.
+        """
+        assert len(grid) == self.ldim
+        grid = [np.asarray(grid[i]) for i in range(self.ldim)]
+
+        if npts_per_cell is not None and grid[0].ndim == 1:
+            if isinstance(npts_per_cell, int):
+                npts_per_cell = (npts_per_cell,) * self.ldim
+            grid = [np.reshape(g, (len(b) - 1, n)) for g, b, n in zip(grid, self.breaks, npts_per_cell)]
+
+        key = (der, overlap, *((g.shape, g.dtype.str, g.tobytes()) for g in grid))
+
+        plan = self._evaluation_plans.get(key)
+        if plan is None:
+            plan = EvaluationPlan(self, grid, der=der, overlap=overlap)
+            self._evaluation_plans[key] = plan
+            if len(self._evaluation_plans) > self._evaluation_plans_maxsize:
+                self._evaluation_plans.popitem(last=False)
+        else:
+            self._evaluation_plans.move_to_end(key)
+
+        return plan
+
+    # Maximum number of evaluation plans kept in the cache of each space
+    _evaluation_plans_maxsize = 4
+
     # ...
     def eval_fields(self, grid, *fields, weights=None, npts_per_cell=None, overlap=0):
         """Evaluate one or several fields at the given location(s) grid.
@@ -414,6 +466,11 @@ class TensorFemSpace( FemSpace ):
         -------
         List of ndarray of floats
             List of the evaluated fields.
+
+        See Also
+        --------
+        get_evaluation_plan : cached evaluation plans, which can also write
+            the values of the fields into user-provided arrays.
         """
 
         assert all(f.space is self for f in fields)
@@ -442,21 +499,13 @@ class TensorFemSpace( FemSpace ):
 
         # Case 2. 1D array of coordinates and no npts_per_cell is given
         # -> grid is tensor-product, but npts_per_cell is not the same in each cell
-        elif grid[0].ndim == 1 and npts_per_cell is None:
-            out_fields = self.eval_fields_irregular_tensor_grid(grid, *fields, weights=weights, overlap=overlap)
-            return [np.ascontiguousarray(out_fields[..., i]) for i in range(len(fields))]
-
         # Case 3. 1D arrays of coordinates and npts_per_cell is a tuple or an integer
         # -> grid is tensor-product, and each cell has the same number of evaluation points
-        elif grid[0].ndim == 1 and npts_per_cell is not None:
-            if isinstance(npts_per_cell, int):
-                npts_per_cell = (npts_per_cell,) * self.ldim
-            for i in range(self.ldim):
-                ncells_i = len(self.breaks[i]) - 1
-                grid[i] = np.reshape(grid[i], newshape=(ncells_i, npts_per_cell[i]))
-            out_fields = self.eval_fields_regular_tensor_grid(grid, *fields, weights=weights, overlap=overlap)
-            # return a list
-            return [np.ascontiguousarray(out_fields[..., i]) for i in range(len(fields))]
+        elif grid[0].ndim == 1:
+            if self.ldim not in (2, 3):
+                raise NotImplementedError("1D not Implemented")
+            plan = self.get_evaluation_plan(grid, npts_per_cell=npts_per_cell, overlap=overlap)
+            return plan.evaluate(*fields, weights=weights)
 
         # Case 4. (self.ldim)D arrays of coordinates and no npts_per_cell
         # -> unstructured grid
@@ -497,51 +546,13 @@ class TensorFemSpace( FemSpace ):
         List of ndarray of float
             Values of the fields on the regular tensor grid
         """
-        degree, global_basis, global_spans, local_shape = self.preprocess_regular_tensor_grid(grid, der=0, overlap=overlap)
-        ncells = [local_shape[i][0] for i in range(self.ldim)]
-        n_eval_points = [local_shape[i][1] for i in range(self.ldim)]
-        out_fields = np.zeros((*(tuple(ncells[i] * n_eval_points[i] for i in range(self.ldim))), len(fields)), dtype=self.dtype)
-
-        glob_arr_coeffs = np.zeros(shape=(*fields[0].coeffs._data.shape, len(fields)), dtype=self.dtype)
-
-        for i in range(len(fields)):
-            glob_arr_coeffs[..., i] = fields[i].coeffs._data
-
-        if self.ldim == 2:
-            if weights is None:
-                eval_fields_2d_no_weights(ncells[0], ncells[1], degree[0], degree[1],
-                                          n_eval_points[0], n_eval_points[1], global_basis[0], global_basis[1],
-                                          global_spans[0], global_spans[1], glob_arr_coeffs, out_fields)
-            else:
-
-                global_weight_coeff = weights.coeffs._data
-
-                eval_fields_2d_weighted(ncells[0], ncells[1], degree[0], degree[1],
-                                        n_eval_points[0], n_eval_points[1], global_basis[0], global_basis[1],
-                                        global_spans[0], global_spans[1], glob_arr_coeffs, global_weight_coeff,
-                                        out_fields)
-
-        elif self.ldim == 3:
-            if weights is None:
-
-                eval_fields_3d_no_weights(ncells[0], ncells[1], ncells[2], degree[0],
-                                          degree[1], degree[2], n_eval_points[0], n_eval_points[1],
-                                          n_eval_points[2], global_basis[0], global_basis[1], global_basis[2],
-                                          global_spans[0], global_spans[1], global_spans[2], glob_arr_coeffs,
-                                          out_fields)
-
-            else:
-                global_weight_coeff = weights.coeffs._data
-
-                eval_fields_3d_weighted(ncells[0], ncells[1], ncells[2], degree[0],
-                                        degree[1], degree[2], n_eval_points[0], n_eval_points[1], n_eval_points[2],
-                                        global_basis[0], global_basis[1], global_basis[2], global_spans[0],
-                                        global_spans[1], global_spans[2], glob_arr_coeffs, global_weight_coeff,
-                                        out_fields)
-        else:
+        if self.ldim not in (2, 3):
             raise NotImplementedError("1D not Implemented")
 
-        return out_fields
+        plan = self.get_evaluation_plan(grid, overlap=overlap)
+        assert plan.regular
+
+        return self._eval_fields_stacked(plan, fields, weights)
 
 # ...
     def eval_fields_irregular_tensor_grid(self, grid, *fields, weights=None, overlap=0):
@@ -569,41 +580,30 @@ class TensorFemSpace( FemSpace ):
         List of ndarray of float
             Values of the fields on the regular tensor grid
         """
-        degree, global_basis, global_spans, cell_indexes, local_shape = \
-            self.preprocess_irregular_tensor_grid(grid, overlap=overlap)
-        out_fields = np.zeros(tuple(local_shape) + (len(fields),), dtype=self.dtype)
-
-        glob_arr_coeffs = np.zeros(shape=(*fields[0].coeffs._data.shape, len(fields)), dtype=self.dtype)
-
-        npoints = local_shape
-
-        for i in range(len(fields)):
-            glob_arr_coeffs[..., i] = fields[i].coeffs._data
-
-        if self.ldim == 2:
-            if weights is None:
-                eval_fields_2d_irregular_no_weights(*npoints, *degree, *cell_indexes, *global_basis,
-                                                    *global_spans, glob_arr_coeffs, out_fields)
-            else:
-
-                global_weight_coeff = weights.coeffs._data
-
-                eval_fields_2d_irregular_weighted(*npoints, *degree, *cell_indexes, *global_basis,
-                                                  *global_spans, glob_arr_coeffs, global_weight_coeff, out_fields)
+        if self.ldim not in (2, 3):
+            raise NotImplementedError("1D not Implemented")
 
-        elif self.ldim == 3:
-            if weights is None:
+        plan = self.get_evaluation_plan(grid, overlap=overlap)
+        assert not plan.regular
 
-                eval_fields_3d_irregular_no_weights(*npoints, *degree, *cell_indexes, *global_basis,
-                                                    *global_spans, glob_arr_coeffs, out_fields)
+        return self._eval_fields_stacked(plan, fields, weights)
 
-            else:
-                global_weight_coeff = weights.coeffs._data
+    # ...
+    def _eval_fields_stacked(self, plan, fields, weights):
+        """
+        Evaluate fields with the given plan, and return their values stacked
+        along the last axis of one array.
+        """
+        out_fields = np.zeros((*plan.shape, len(fields)), dtype=self.dtype)
 
-                eval_fields_3d_irregular_weighted(*npoints, *degree, *cell_indexes, *global_basis,
-                                                  *global_spans, glob_arr_coeffs, global_weight_coeff, out_fields)
+        if len(fields) == 1:
+            glob_arr_coeffs = fields[0].coeffs._data[..., None]
         else:
-            raise NotImplementedError("1D not Implemented")
+            glob_arr_coeffs = np.zeros(shape=(*fields[0].coeffs._data.shape, len(fields)), dtype=self.dtype)
+            for i in range(len(fields)):
+                glob_arr_coeffs[..., i] = fields[i].coeffs._data
+
+        plan._evaluate_stacked(glob_arr_coeffs, weights, out_fields)
 
         return out_fields
 
@@ -793,7 +793,7 @@ class TensorFemSpace( FemSpace ):
                 V = self.spaces[i]
                 s = self.starts[i]
                 e = self.ends  [i]
-                quad_grids_dict_i[nq] = FemAssemblyGrid(V, s, e, nderiv=V.degree, nquads=nq)
+                quad_grids_dict_i[nq] = FemAssemblyGrid(V, s, e, nderiv=V.degree, nquads=nq, compress=V.is_uniform)
             # Store the required FemAssemblyGrid in the list
             quad_grids[i] = quad_grids_dict_i[nq]
         # Return a tuple with the FemAssemblyGrid objects
@@ -885,6 +885,36 @@ class TensorFemSpace( FemSpace ):
             out     = field.coeffs,
         )
 
+    # ...
+    def compute_interpolants( self, values, fields ):
+        """
+        Compute several fields such that each one interpolates the corresponding
+        values at the Greville points. All the right-hand sides are solved with
+        the same Kronecker solver, whose setup and work arrays are shared.
+
+        Parameters
+        ----------
+        values : list of StencilVector
+            Function values at the n-dimensional tensor grid of Greville points,
+            one vector for each field.
+
+        fields : list of FemField
+            Input/output argument: tensor splines that have to interpolate the
+            given values.
+
+        """
+        assert len(values) == len(fields)
+        assert all(v.space is self.vector_space for v in values)
+        assert all(isinstance(f, FemField) and f.space is self for f in fields)
+
+        if not self._interpolation_ready:
+            self.init_interpolation()
+
+        V      = self.vector_space
+        solver = KroneckerLinearSolver(V, V, [Vi._interpolator for Vi in self.spaces])
+        for v, f in zip(values, fields):
+            solver.solve(v, out=f.coeffs)
+
     # ...
     def reduce_grid(self, axes=(), knots=()):
         """ 
@@ -971,6 +1001,7 @@ class TensorFemSpace( FemSpace ):
         if comm is not None:
             if comm.size > 1:
                 kwargs.update( driver='mpio', comm=comm )
+        import h5py
         h5 = h5py.File( filename, mode='w', **kwargs )
 
         # Add field coefficients as named datasets
@@ -1014,6 +1045,7 @@ class TensorFemSpace( FemSpace ):
         if comm is not None:
             if comm.size > 1:
                 kwargs.update( driver='mpio', comm=comm )
+        import h5py
         h5 = h5py.File( filename, mode='r', **kwargs )
 
         # Create fields and load their coefficients from HDF5 datasets
@@ -1245,3 +1277,177 @@ class TensorFemSpace( FemSpace ):
         dims = ', '.join(str(V.nbasis) for V in self.spaces)
         txt += '> nbasis :: ({dims})\n'.format(dims=dims)
         return txt
+
+#===============================================================================
+class EvaluationPlan:
+    """
+    Precomputed data needed to evaluate fields of a TensorFemSpace on a fixed
+    tensor grid: values of the non-vanishing basis functions at the grid
+    points, spans of the cells, and (for irregular grids) cell indexes.
+
+    A plan is meant to be reused: it evaluates fields directly from their
+    coefficient arrays, without stacking them, and can write the results into
+    buffers provided by the caller. Plans are usually obtained through
+    `TensorFemSpace.get_evaluation_plan`, which keeps the most recently used
+    ones in a cache.
+
+    Parameters
+    ----------
+    space : TensorFemSpace
+        Space of the fields to evaluate.
+
+    grid : List of ndarray
+        Grid on which to evaluate the fields. For a regular tensor grid, list
+        of 2D arrays of shape (ne_xi, nv_xi), with ne_xi the number of cells
+        and nv_xi the number of evaluation points per cell in direction xi.
+        For an irregular tensor grid, list of sorted 1D arrays.
+
+    der : int, default=0
+        Number of derivatives of the basis functions to pre-compute.
+
+    overlap : int, default=0
+        How much to overlap. Only used in the distributed context.
+    """
+    def __init__(self, space, grid, der=0, overlap=0):
+
+        assert isinstance(space, TensorFemSpace)
+        assert space.ldim in (2, 3)
+        assert len(grid) == space.ldim
+
+        grid = [np.asarray(g) for g in grid]
+        assert all(g.ndim == grid[0].ndim for g in grid)
+        assert grid[0].ndim in (1, 2)
+
+        self._space   = space
+        self._der     = der
+        self._overlap = overlap
+        self._regular = (grid[0].ndim == 2)
+
+        if self._regular:
+            degree, global_basis, global_spans, local_shape = \
+                space.preprocess_regular_tensor_grid(grid, der=der, overlap=overlap)
+            self._cell_indexes = None
+            self._npoints      = tuple(nc * nv for nc, nv in local_shape)
+            self._kernel_args  = (*(nc for nc, _ in local_shape), *degree,
+                                  *(nv for _, nv in local_shape), *global_basis, *global_spans)
+        else:
+            degree, global_basis, global_spans, cell_indexes, local_shape = \
+                space.preprocess_irregular_tensor_grid(grid, der=der, overlap=overlap)
+            self._cell_indexes = cell_indexes
+            self._npoints      = tuple(local_shape)
+            self._kernel_args  = (*local_shape, *degree, *cell_indexes, *global_basis, *global_spans)
+
+        self._global_basis = global_basis
+        self._global_spans = global_spans
+
+        if space.ldim == 2:
+            if self._regular:
+                self._kernels = (eval_fields_2d_no_weights, eval_fields_2d_weighted)
+            else:
+                self._kernels = (eval_fields_2d_irregular_no_weights, eval_fields_2d_irregular_weighted)
+        else:
+            if self._regular:
+                self._kernels = (eval_fields_3d_no_weights, eval_fields_3d_weighted)
+            else:
+                self._kernels = (eval_fields_3d_irregular_no_weights, eval_fields_3d_irregular_weighted)
+
+    #--------------------------------------------------------------------------
+    @property
+    def space(self):
+        """ Space of the fields evaluated by this plan. """
+        return self._space
+
+    @property
+    def regular(self):
+        """ True if the grid has the same number of points in every cell. """
+        return self._regular
+
+    @property
+    def der(self):
+        """ Number of pre-computed derivatives of the basis functions. """
+        return self._der
+
+    @property
+    def overlap(self):
+        return self._overlap
+
+    @property
+    def shape(self):
+        """ Shape of the array of values of one field on the local grid. """
+        return self._npoints
+
+    @property
+    def global_basis(self):
+        return self._global_basis
+
+    @property
+    def global_spans(self):
+        return self._global_spans
+
+    @property
+    def cell_indexes(self):
+        """ Local cell index of every grid point (None for a regular grid). """
+        return self._cell_indexes
+
+    #--------------------------------------------------------------------------
+    def evaluate(self, *fields, weights=None, out=None):
+        """
+        Evaluate one or several fields on the grid of the plan.
+
+        Parameters
+        ----------
+        *fields : tuple of psydac.fem.basic.FemField
+            Fields to evaluate.
+
+        weights : psydac.fem.basic.FemField or None, optional
+            Weights field.
+
+        out : list of ndarray or None, optional
+            Contiguous arrays of shape `self.shape`, one per field, where the
+            values of the fields are written. New arrays are allocated if not
+            given.
+
+        Returns
+        -------
+        List of ndarray
+            Values of the fields on the grid.
+        """
+        space = self._space
+        assert all(f.space is space for f in fields)
+        for f in fields:
+            if not f.coeffs.ghost_regions_in_sync:
+                f.coeffs.update_ghost_regions()
+
+        if weights is not None:
+            assert weights.space is space
+            if not weights.coeffs.ghost_regions_in_sync:
+                weights.coeffs.update_ghost_regions()
+
+        if out is None:
+            out = [np.zeros(self._npoints, dtype=space.dtype) for _ in fields]
+        else:
+            assert len(out) == len(fields)
+            for o in out:
+                assert o.shape == self._npoints
+                assert o.dtype == space.dtype
+                assert o.flags.c_contiguous
+                o[...] = 0
+
+        # A trailing axis of length 1 turns the arrays into (views of) the
+        # stacked arrays expected by the kernels, without copying any data
+        for f, o in zip(fields, out):
+            self._evaluate_stacked(f.coeffs._data[..., None], weights, o[..., None])
+
+        return out
+
+    #--------------------------------------------------------------------------
+    def _evaluate_stacked(self, glob_arr_coeffs, weights, out_fields):
+        """
+        Evaluate the fields whose coefficients are stacked along the last axis
+        of `glob_arr_coeffs`, adding the values to `out_fields`.
+        """
+        no_weights, weighted = self._kernels
+        if weights is None:
+            no_weights(*self._kernel_args, glob_arr_coeffs, out_fields)
+        else:
+            weighted(*self._kernel_args, glob_arr_coeffs, weights.coeffs._data, out_fields)
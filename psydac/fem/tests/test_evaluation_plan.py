@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+
+from sympde.topology import Square, Cube, ScalarFunctionSpace
+
+from psydac.api.discretization import discretize
+from psydac.fem.basic import FemField
+from psydac.fem.tensor import EvaluationPlan
+
+# Tolerance for testing float equality
+RTOL = 1e-14
+ATOL = 1e-13
+
+#==============================================================================
+def random_field(Vh, seed):
+    f = FemField(Vh)
+    rng = np.random.default_rng(seed)
+    f.coeffs._data[...] = rng.random(f.coeffs._data.shape)
+    f.coeffs.update_ghost_regions()
+    return f
+
+#==============================================================================
+@pytest.mark.parametrize('ldim', [2, 3])
+@pytest.mark.parametrize('npts_per_cell', [None, 2, 3])
+def test_evaluation_plan(ldim, npts_per_cell):
+
+    domain  = Square() if ldim == 2 else Cube()
+    ncells  = [4, 3, 2][:ldim]
+    degree  = [2, 3, 1][:ldim]
+    domainh = discretize(domain, ncells=ncells)
+    Vh      = discretize(ScalarFunctionSpace('V', domain), domainh, degree=degree)
+
+    f1 = random_field(Vh, 1)
+    f2 = random_field(Vh, 2)
+    w  = random_field(Vh, 3)
+    w.coeffs._data[...] += 1.0
+
+    if npts_per_cell is None:
+        grid = [np.sort(np.random.default_rng(d).random(5)) for d in range(ldim)]
+    else:
+        grid = [((np.arange(nc)[:, None] + np.linspace(0.1, 0.9, npts_per_cell)) / nc).ravel() for nc in ncells]
+
+    plan = Vh.get_evaluation_plan(grid, npts_per_cell=npts_per_cell)
+    assert isinstance(plan, EvaluationPlan)
+    assert plan.regular is (npts_per_cell is not None)
+    assert plan.shape == tuple(len(g) for g in grid)
+
+    # The plan is cached
+    assert Vh.get_evaluation_plan(grid, npts_per_cell=npts_per_cell) is plan
+    assert Vh.get_evaluation_plan(grid, npts_per_cell=npts_per_cell, der=1) is not plan
+
+    # Evaluation into user-provided buffers
+    out = [np.full(plan.shape, np.nan) for _ in range(2)]
+    res = plan.evaluate(f1, f2, out=out)
+    assert all(r is o for r, o in zip(res, out))
+
+    res_w = plan.evaluate(f1, f2, weights=w)
+
+    points = list(np.stack(np.meshgrid(*grid, indexing='ij'), axis=-1).reshape(-1, ldim))
+    for f, r, r_w in zip((f1, f2), res, res_w):
+        expected   = np.array([Vh.eval_field(f, *x) for x in points]).reshape(plan.shape)
+        expected_w = np.array([Vh.eval_field(f, *x, weights=w.coeffs) / Vh.eval_field(w, *x)
+                               for x in points]).reshape(plan.shape)
+        assert np.allclose(r, expected, rtol=RTOL, atol=ATOL)
+        assert np.allclose(r_w, expected_w, rtol=RTOL, atol=ATOL)
+
+    # The public evaluation method uses the plans and gives the same values
+    for r, v in zip(res, Vh.eval_fields(grid, f1, f2, npts_per_cell=npts_per_cell)):
+        assert np.allclose(r, v, rtol=RTOL, atol=ATOL)
+
+#==============================================================================
+def test_evaluation_plan_cache_size():
+
+    domain  = Square()
+    domainh = discretize(domain, ncells=[4, 4])
+    Vh      = discretize(ScalarFunctionSpace('V', domain), domainh, degree=[2, 2])
+
+    maxsize = Vh._evaluation_plans_maxsize
+    grids   = [[np.linspace(0, 1, n + 2)] * 2 for n in range(maxsize + 1)]
+    plans   = [Vh.get_evaluation_plan(grid) for grid in grids]
+
+    # The least recently used plan is discarded
+    assert Vh.get_evaluation_plan(grids[0]) is not plans[0]
+    assert Vh.get_evaluation_plan(grids[-1]) is plans[-1]
+    assert len(Vh._evaluation_plans) == maxsize
+
+#==============================================================================
+# SCRIPT FUNCTIONALITY
+#==============================================================================
+if __name__ == "__main__":
+    test_evaluation_plan(2, 3)
+    test_evaluation_plan_cache_size()
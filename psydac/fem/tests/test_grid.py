@@ -0,0 +1,58 @@
+import pytest
+import numpy as np
+
+from psydac.core.bsplines         import elements_spans
+from psydac.core.bsplines         import quadrature_grid
+from psydac.core.bsplines         import basis_ders_on_quad_grid
+from psydac.fem.splines           import SplineSpace
+from psydac.fem.grid              import FemAssemblyGrid
+from psydac.utilities.quadratures import gauss_legendre
+
+#==============================================================================
+@pytest.mark.parametrize('ncells', [1, 5, 16])
+@pytest.mark.parametrize('degree', [1, 2, 3])
+@pytest.mark.parametrize('periodic', [True, False])
+@pytest.mark.parametrize('basis', ['B', 'M'])
+@pytest.mark.parametrize('uniform', [True, False])
+@pytest.mark.parametrize('compress', [True, False])
+def test_fem_assembly_grid(ncells, degree, periodic, basis, uniform, compress):
+
+    if periodic and ncells < degree:
+        pytest.skip('Periodic spaces need at least as many cells as the degree')
+
+    grid = np.linspace(0, 1, ncells + 1)
+    if not uniform:
+        grid[1:-1] += np.random.default_rng(0).uniform(-0.3, 0.3, ncells - 1) / ncells
+
+    V      = SplineSpace(degree, grid=grid, periodic=periodic, basis=basis)
+    nquads = degree + 1
+
+    # Reference: tables computed on the whole grid
+    u, w = gauss_legendre(nquads)
+    global_points, global_weights = quadrature_grid(V.breaks, u[::-1], w[::-1])
+    global_basis = basis_ders_on_quad_grid(V.knots, degree, global_points, degree, basis)
+    global_spans = elements_spans(V.knots, degree)
+
+    for start, end in [(0, ncells-1), (0, ncells//2), (ncells//2, ncells-1)]:
+        g = FemAssemblyGrid(V, start, end, nquads=nquads, nderiv=degree, compress=compress)
+
+        assert g.num_elements == end - start + 1
+        assert g.compressed == compress
+        assert np.array_equal(g.spans, global_spans[start:end+1])
+        assert np.allclose(g.points , global_points [start:end+1], rtol=1e-15, atol=1e-15)
+        assert np.allclose(g.weights, global_weights[start:end+1], rtol=1e-15, atol=1e-15)
+        assert np.allclose(g.basis  , global_basis  [start:end+1], rtol=1e-12, atol=1e-12)
+        assert np.allclose(g.basis_table[g.basis_index], g.basis)
+
+        # The expanded table is computed only once
+        assert g.basis is g.basis
+
+        # All the elements of a uniform periodic grid share the same table
+        if compress and uniform and periodic:
+            assert len(g.basis_table) == 1
+
+#==============================================================================
+# SCRIPT FUNCTIONALITY
+#==============================================================================
+if __name__ == "__main__":
+    test_fem_assembly_grid(16, 3, False, 'B', True, True)
@@ -5,9 +5,6 @@ import numpy as np
 
 from functools import reduce
 
-from sympde.topology.space import BasicFunctionSpace
-from sympde.topology.datatype import H1SpaceType, HcurlSpaceType, HdivSpaceType, L2SpaceType, UndefinedSpaceType
-
 from psydac.linalg.basic   import Vector
 from psydac.linalg.stencil import StencilVectorSpace
 from psydac.linalg.block   import BlockVectorSpace
@@ -100,6 +97,7 @@ class VectorFemSpace( FemSpace ):
 
     @symbolic_space.setter
     def symbolic_space( self, symbolic_space ):
+        from sympde.topology.space import BasicFunctionSpace
         assert isinstance(symbolic_space, BasicFunctionSpace)
         self._symbolic_space = symbolic_space
 
@@ -436,6 +434,7 @@ class ProductFemSpace( FemSpace ):
 
     @symbolic_space.setter
     def symbolic_space( self, symbolic_space ):
+        from sympde.topology.space import BasicFunctionSpace
         assert isinstance(symbolic_space, BasicFunctionSpace)
         self._symbolic_space = symbolic_space
 
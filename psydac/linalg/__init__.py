@@ -1,8 +1,6 @@
-from psydac.linalg import basic
-from psydac.linalg import block
-from psydac.linalg import direct_solvers
-from psydac.linalg import solvers
-from psydac.linalg import stencil
-from psydac.linalg import kron
-from psydac.linalg import utilities
-from psydac.linalg import topetsc
+from psydac.utilities.lazy_import import attach
+
+# The submodules are imported on first access (PEP 562)
+_submodules = {'basic', 'block', 'direct_solvers', 'solvers', 'stencil', 'kron',
+               'fusion', 'preconditioners', 'storage', 'utilities', 'topetsc'}
+__getattr__, __dir__ = attach(__name__, _submodules)
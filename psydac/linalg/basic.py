@@ -7,7 +7,9 @@ provides the fundamental classes for linear algebra operations.
 
 """
 
+import warnings
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 
 import numpy as np
 from scipy.sparse import coo_matrix
@@ -16,6 +18,7 @@ from psydac.utilities.utils import is_real
 
 __all__ = (
     'VectorSpace',
+    'ScratchPool',
     'Vector',
     'LinearOperator',
     'ZeroOperator',
@@ -24,6 +27,7 @@ __all__ = (
     'SumLinearOperator',
     'ComposedLinearOperator',
     'PowerLinearOperator',
+    'AdjointLinearOperator',
     'InverseLinearOperator',
     'LinearSolver'
 )
@@ -70,6 +74,28 @@ class VectorSpace(ABC):
 
         """
 
+    def inner_products(self, vectors, v):
+        """
+        Evaluate the scalar products u.dot(v) of several vectors u with the
+        same vector v, all belonging to this space. Spaces distributed across
+        processes compute them with a single global reduction.
+
+        Parameters
+        ----------
+        vectors : list of Vector
+            The vectors u.
+
+        v : Vector
+            The vector v.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            The scalar products, one for each vector u.
+
+        """
+        return np.array([u.dot(v) for u in vectors], dtype=self.dtype)
+
     @abstractmethod
     def axpy(self, a, x, y):
         """
@@ -89,6 +115,94 @@ class VectorSpace(ABC):
             The vector modified by this function (incremented by a * x).
         """
 
+    @property
+    def scratch_pool(self):
+        """
+        Pool of scratch vectors of the space V, from which linear operators
+        borrow their temporaries instead of allocating new vectors.
+
+        """
+        pool = getattr(self, '_scratch_pool', None)
+        if pool is None:
+            pool = self._scratch_pool = ScratchPool(self)
+        return pool
+
+#===============================================================================
+class ScratchPool:
+    """
+    Bounded pool of scratch vectors belonging to the same vector space.
+
+    Temporaries are borrowed from the pool while an operator expression is
+    evaluated and given back afterwards, so that repeated evaluations do not
+    allocate new vectors. The vectors are handed out with undefined content.
+
+    Parameters
+    ----------
+    space : VectorSpace
+        Vector space to which all the vectors of the pool belong.
+
+    maxsize : int
+        Maximum number of idle vectors kept by the pool. A vector released to
+        a full pool is simply dropped.
+
+    """
+    def __init__(self, space, maxsize=8):
+
+        assert isinstance(space, VectorSpace)
+        assert isinstance(maxsize, int)
+        assert maxsize >= 0
+
+        self._space   = space
+        self._maxsize = maxsize
+        self._idle    = []
+
+    @property
+    def space(self):
+        """ Vector space to which the vectors of the pool belong. """
+        return self._space
+
+    @property
+    def maxsize(self):
+        """ Maximum number of idle vectors kept by the pool. """
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._idle)
+
+    def acquire(self):
+        """
+        Get a scratch vector, reusing an idle vector of the pool if available.
+
+        Returns
+        -------
+        v : Vector
+            Vector of the space, with undefined content.
+
+        """
+        if self._idle:
+            return self._idle.pop()
+        return self._space.zeros()
+
+    def release(self, *vectors):
+        """
+        Give back scratch vectors to the pool, which must not be used anymore
+        by the caller.
+
+        """
+        for v in vectors:
+            assert v.space is self._space
+            if len(self._idle) < self._maxsize and all(v is not w for w in self._idle):
+                self._idle.append(v)
+
+    @contextmanager
+    def borrow(self):
+        """ Context manager providing a scratch vector which is released on exit. """
+        v = self.acquire()
+        try:
+            yield v
+        finally:
+            self.release(v)
+
 #===============================================================================
 class Vector(ABC):
     """
@@ -359,7 +473,7 @@ class LinearOperator(ABC):
 
     def idot(self, v, out):
         """
-        Implements out += self @ v with a temporary.
+        Implements out += self @ v with a temporary from the scratch pool.
         Subclasses should provide an implementation without a temporary.
 
         """
@@ -367,7 +481,22 @@ class LinearOperator(ABC):
         assert v.space == self.domain
         assert isinstance(out, Vector)
         assert out.space == self.codomain
-        out += self.dot(v)
+        with self.codomain.scratch_pool.borrow() as tmp:
+            out += self.dot(v, out=tmp)
+
+    def tdot(self, v, out=None, *, conjugate=False):
+        """
+        Apply the transpose of the linear operator (or its Hermitian transpose
+        if conjugate is True) to the Vector v. Result is written to Vector out,
+        if provided.
+
+        Implemented by forming the transposed operator.
+        Subclasses should provide an implementation without a temporary.
+
+        """
+        assert isinstance(v, Vector)
+        assert v.space == self.codomain
+        return self.transpose(conjugate=conjugate).dot(v, out=out)
 
 #===============================================================================
 class ZeroOperator(LinearOperator):
@@ -440,6 +569,17 @@ class ZeroOperator(LinearOperator):
             out = self.codomain.zeros()
         return out
 
+    def tdot(self, v, out=None, *, conjugate=False):
+        assert isinstance(v, Vector)
+        assert v.space == self.codomain
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.domain
+            out *= 0
+        else:
+            out = self.domain.zeros()
+        return out
+
     def __neg__(self):
         return self
 
@@ -536,6 +676,9 @@ class IdentityOperator(LinearOperator):
         else:
             return v.copy()
 
+    def tdot(self, v, out=None, *, conjugate=False):
+        return self.dot(v, out=out)
+
     def __matmul__(self, B):
         assert isinstance(B, (LinearOperator, Vector))
         if isinstance(B, LinearOperator):
@@ -622,6 +765,13 @@ class ScaledLinearOperator(LinearOperator):
             out *= self._scalar
             return out
 
+    def tdot(self, v, out=None, *, conjugate=False):
+        assert isinstance(v, Vector)
+        assert v.space == self.codomain
+        out = self._operator.tdot(v, out=out, conjugate=conjugate)
+        out *= self._scalar
+        return out
+
 #===============================================================================
 class SumLinearOperator(LinearOperator):
     """
@@ -736,6 +886,21 @@ class SumLinearOperator(LinearOperator):
                 a.idot(v, out=out)
             return out
 
+    def tdot(self, v, out=None, *, conjugate=False):
+        """ Evaluates the transpose of the SumLinearOperator object at a vector v element of codomain. """
+        assert isinstance(v, Vector)
+        assert v.space == self.codomain
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.domain
+
+        out = self._addends[0].tdot(v, out=out, conjugate=conjugate)
+        with self.domain.scratch_pool.borrow() as tmp:
+            for a in self._addends[1:]:
+                a.tdot(v, out=tmp, conjugate=conjugate)
+                out += tmp
+        return out
+
 #===============================================================================
 class ComposedLinearOperator(LinearOperator):
     """
@@ -757,36 +922,42 @@ class ComposedLinearOperator(LinearOperator):
             assert args[i].domain == args[i+1].codomain
 
         multiplicants = ()
-        tmp_vectors = []
-        for a in args[:-1]:
+        for a in args:
             if isinstance(a, ComposedLinearOperator):
                 multiplicants = (*multiplicants, *a.multiplicants)
-                tmp_vectors.extend(a.tmp_vectors)
-                tmp_vectors.append(a.domain.zeros())
             else:
                 multiplicants = (*multiplicants, a)
-                tmp_vectors.append(a.domain.zeros())
-
-        last = args[-1]
-        if isinstance(last, ComposedLinearOperator):
-            multiplicants = (*multiplicants, *last.multiplicants)
-            tmp_vectors.extend(last.tmp_vectors)
-        else:
-            multiplicants = (*multiplicants, last)
 
         self._domain = domain
         self._codomain = codomain
         self._multiplicants = multiplicants
-        self._tmp_vectors = tuple(tmp_vectors)
+
+    @property
+    def tmp_spaces(self):
+        """
+        A tuple containing the spaces of the intermediate results of the `dot` method.
+        The storage vectors for these results are borrowed from the scratch pools of the spaces,
+        which avoids the creation of new vectors at each call of the `dot` method.
+
+        """
+        return tuple(a.domain for a in self._multiplicants[:-1])
 
     @property
     def tmp_vectors(self):
         """
-        A tuple containing the storage vectors that are repeatedly being used upon calling the `dot` method.
-        This avoids the creation of new vectors at each call of the `dot` method.
-        
+        A tuple containing one vector of each space in `tmp_spaces`.
+
+        .. deprecated::
+            The `dot` method no longer stores its intermediate results in these
+            vectors, see `tmp_spaces`.
+
         """
-        return self._tmp_vectors
+        warnings.warn('ComposedLinearOperator.tmp_vectors is deprecated, use tmp_spaces instead',
+                      DeprecationWarning, stacklevel=2)
+        tmp_vectors = getattr(self, '_tmp_vectors', None)
+        if tmp_vectors is None:
+            tmp_vectors = self._tmp_vectors = tuple(V.zeros() for V in self.tmp_spaces)
+        return tmp_vectors
 
     @property
     def domain(self):
@@ -820,14 +991,8 @@ class ComposedLinearOperator(LinearOperator):
         return coo_matrix(M)
 
     def transpose(self, conjugate=False):
-        t_multiplicants = ()
-        for a in self._multiplicants:
-            t_multiplicants = (a.transpose(conjugate=conjugate), *t_multiplicants)
-        new_dom = self.codomain
-        new_cod = self.domain
-        assert isinstance(new_dom, VectorSpace)
-        assert isinstance(new_cod, VectorSpace)
-        return ComposedLinearOperator(self.codomain, self.domain, *t_multiplicants)
+        # The multiplicants are transposed lazily whenever possible, see AdjointLinearOperator
+        return AdjointLinearOperator(self, conjugate=conjugate)
 
     def dot(self, v, out=None):
         assert isinstance(v, Vector)
@@ -836,20 +1001,51 @@ class ComposedLinearOperator(LinearOperator):
             assert isinstance(out, Vector)
             assert out.space == self.codomain
 
+        # Each intermediate result is given back to the scratch pool as soon as it has been used,
+        # or if an exception is raised
         x = v
-        for i in range(len(self._tmp_vectors)):
-            y = self._tmp_vectors[-1-i]
-            A = self._multiplicants[-1-i]
-            A.dot(x, out=y)
-            x = y
-
-        A = self._multiplicants[0]
+        try:
+            for A in self._multiplicants[:0:-1]:
+                y = A.codomain.scratch_pool.acquire()
+                try:
+                    A.dot(x, out=y)
+                except BaseException:
+                    y.space.scratch_pool.release(y)
+                    raise
+                if x is not v:
+                    x.space.scratch_pool.release(x)
+                x = y
+
+            return self._multiplicants[0].dot(x, out=out)
+        finally:
+            if x is not v:
+                x.space.scratch_pool.release(x)
+
+    def tdot(self, v, out=None, *, conjugate=False):
+        assert isinstance(v, Vector)
+        assert v.space == self.codomain
         if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.domain
 
-            A.dot(x, out=out)
-        else:
-            out = A.dot(x)
-        return out
+        # The multiplicants are traversed in reverse order
+        x = v
+        try:
+            for A in self._multiplicants[:-1]:
+                y = A.domain.scratch_pool.acquire()
+                try:
+                    A.tdot(x, out=y, conjugate=conjugate)
+                except BaseException:
+                    y.space.scratch_pool.release(y)
+                    raise
+                if x is not v:
+                    x.space.scratch_pool.release(x)
+                x = y
+
+            return self._multiplicants[-1].tdot(x, out=out, conjugate=conjugate)
+        finally:
+            if x is not v:
+                x.space.scratch_pool.release(x)
 
     def exchange_assembly_data(self):
         for op in self._multiplicants:
@@ -931,15 +1127,119 @@ class PowerLinearOperator(LinearOperator):
         if out is not None:
             assert isinstance(out, Vector)
             assert out.space == self.codomain
-            for i in range(self._factorial):
-                self._operator.dot(v, out=out)
-                v = out.copy()
         else:
-            out = v.copy()
-            for i in range(self._factorial):
-                out = self._operator.dot(out)
+            out = self.codomain.zeros()
+
+        # Alternate between out and a scratch vector, such that the last product is written to out
+        n = self._factorial
+        with self.domain.scratch_pool.borrow() as tmp:
+            x = v
+            for i in range(n):
+                y = out if (n - i) % 2 == 1 else tmp
+                self._operator.dot(x, out=y)
+                x = y
         return out
 
+#===============================================================================
+class AdjointLinearOperator(LinearOperator):
+    """
+    Hermitian transpose $A^H$ (or transpose $A^T$) of a linear operator $A$,
+    which is never formed explicitly.
+
+    The `dot` method applies the adjoint through the `tdot` method of $A$,
+    which computes the product with the transpose directly from the data of
+    $A$ (e.g. in a StencilMatrix).
+
+    Upon creation, the adjoint of a scaled, summed or composed operator is
+    distributed over its components. If $A$ does not provide its own `tdot`
+    method, or if it is a BlockLinearOperator with interface blocks, the
+    transposed operator is formed once and returned instead.
+
+    Parameters
+    ----------
+    A : psydac.linalg.basic.LinearOperator
+        The linear operator $A$ of which this object is the adjoint.
+
+    conjugate : bool
+        If True (default), represent the Hermitian transpose $A^H$;
+        otherwise represent the transpose $A^T$.
+
+    """
+    def __new__(cls, A, conjugate=True):
+
+        assert isinstance(A, LinearOperator)
+        assert isinstance(conjugate, bool)
+
+        from psydac.linalg.block   import BlockLinearOperator
+        from psydac.linalg.stencil import StencilInterfaceMatrix
+
+        if isinstance(A, AdjointLinearOperator) and A._conjugate == conjugate:
+            return A.operator
+        elif isinstance(A, ScaledLinearOperator):
+            At = AdjointLinearOperator(A.operator, conjugate=conjugate)
+            return ScaledLinearOperator(A.codomain, A.domain, A.scalar, At)
+        elif isinstance(A, SumLinearOperator):
+            addends = [AdjointLinearOperator(a, conjugate=conjugate) for a in A.addends]
+            return SumLinearOperator(A.codomain, A.domain, *addends)
+        elif isinstance(A, ComposedLinearOperator):
+            multiplicants = [AdjointLinearOperator(a, conjugate=conjugate) for a in reversed(A.multiplicants)]
+            return ComposedLinearOperator(A.codomain, A.domain, *multiplicants)
+        elif isinstance(A, (ZeroOperator, IdentityOperator)):
+            return A.transpose(conjugate=conjugate)
+        elif type(A).tdot is LinearOperator.tdot:
+            return A.transpose(conjugate=conjugate)
+        elif isinstance(A, BlockLinearOperator) and \
+                any(isinstance(b, StencilInterfaceMatrix) for row in A.blocks for b in row):
+            return A.transpose(conjugate=conjugate)
+        else:
+            return super().__new__(cls)
+
+    def __init__(self, A, conjugate=True):
+
+        self._operator  = A
+        self._conjugate = conjugate
+        self._domain    = A.codomain
+        self._codomain  = A.domain
+
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def codomain(self):
+        return self._codomain
+
+    @property
+    def dtype(self):
+        return self._operator.dtype
+
+    @property
+    def operator(self):
+        """ Returns the operator $A$ of which this object is the adjoint. """
+        return self._operator
+
+    def toarray(self):
+        out = self._operator.toarray().T
+        return out.conj() if self._conjugate else out
+
+    def tosparse(self):
+        out = self._operator.tosparse().T
+        return out.conj() if self._conjugate else out
+
+    def transpose(self, conjugate=False):
+        if conjugate == self._conjugate:
+            return self._operator
+        else:
+            return self._operator.transpose(conjugate=self._conjugate).transpose(conjugate=conjugate)
+
+    def dot(self, v, out=None):
+        assert isinstance(v, Vector)
+        assert v.space == self.domain
+        if out is not None:
+            assert isinstance(out, Vector)
+            assert out.space == self.codomain
+        return self._operator.tdot(v, out=out, conjugate=self._conjugate)
+
 #===============================================================================
 class InverseLinearOperator(LinearOperator):
     """
@@ -1111,3 +1411,20 @@ class LinearSolver(ABC):
     @property
     def T(self):
         return self.transpose()
+
+    def share(self, comm):
+        """
+        Store the read-only data of the solver (e.g. its factorization) in the
+        shared memory of each node, so that the processes of `comm` which run
+        on the same node use a single copy. This is a collective operation.
+        The shared memory is released with psydac.ddm.shared.free_shared(comm).
+
+        The default implementation does nothing: it is overridden by the
+        solvers whose data can be shared.
+
+        Returns
+        -------
+        LinearSolver
+            The solver itself.
+        """
+        return self
@@ -3,17 +3,23 @@
 # Copyright 2018 Jalal Lakhlili, Yaman Güçlü
 
 import numpy as np
+from mpi4py import MPI
 
 from types import MappingProxyType
 from scipy.sparse import bmat, lil_matrix
 
-from psydac.linalg.basic    import VectorSpace, Vector, LinearOperator
-from psydac.linalg.stencil  import StencilMatrix
-from psydac.ddm.cart        import InterfaceCartDecomposition
+from psydac.linalg.basic    import VectorSpace, Vector, LinearOperator, ComposedLinearOperator
+from psydac.linalg.stencil  import StencilVectorSpace, StencilMatrix
+from psydac.linalg.kernels.block_matvec_kernels import block_matvec_1d, block_matvec_2d, block_matvec_3d
+from psydac.ddm.cart        import CartDecomposition, InterfaceCartDecomposition, find_mpi_type
 from psydac.ddm.utilities   import get_data_exchanger
+from psydac.ddm.block_data_exchanger import BlockCartDataExchanger
 
 __all__ = ('BlockVectorSpace', 'BlockVector', 'BlockLinearOperator')
 
+# Precompiled matrix-vector products of stencil-matrix blocks, by dimension
+_block_matvec = (None, block_matvec_1d, block_matvec_2d, block_matvec_3d)
+
 #===============================================================================
 class BlockVectorSpace(VectorSpace):
     """
@@ -56,6 +62,16 @@ class BlockVectorSpace(VectorSpace):
         self._connectivity = connectivity or {}
         self._connectivity_readonly = MappingProxyType(self._connectivity)
 
+        # If all the blocks are distributed according to the same domain
+        # decomposition, their ghost regions are updated together with one
+        # message per neighbour
+        self._synchronizer = None
+        if all(isinstance(Vi, StencilVectorSpace) and Vi.parallel for Vi in spaces):
+            carts = [Vi.cart for Vi in spaces]
+            if all(isinstance(cart, CartDecomposition) and not cart.is_comm_null and
+                   cart.domain_decomposition is carts[0].domain_decomposition for cart in carts):
+                self._synchronizer = BlockCartDataExchanger([Vi._synchronizer for Vi in spaces])
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -114,6 +130,56 @@ class BlockVectorSpace(VectorSpace):
 
         x._sync = x._sync and y._sync
 
+    #...
+    def inner_products(self, vectors, v):
+        """
+        Evaluate the scalar products u.dot(v) of several vectors u with the
+        same vector v. If all the blocks are distributed over the same
+        communicator, the local contributions of all the blocks are summed
+        with a single global reduction.
+
+        """
+        assert isinstance(v, BlockVector)
+        assert v.space is self
+
+        comm = self._inner_products_comm
+        if comm is False:
+            return sum(Vi.inner_products([u.blocks[i] for u in vectors], v.blocks[i])
+                       for i, Vi in enumerate(self._spaces))
+
+        values = self._local_inner_products(vectors, v)
+        if comm is not None:
+            comm.Allreduce(MPI.IN_PLACE, (values, find_mpi_type(self.dtype)), op=MPI.SUM)
+        return values
+
+    #...
+    def _local_inner_products(self, vectors, v):
+        """ Contributions of the local data to the scalar products u.dot(v). """
+        return sum(Vi._local_inner_products([u.blocks[i] for u in vectors], v.blocks[i])
+                   for i, Vi in enumerate(self._spaces))
+
+    #...
+    @property
+    def _inner_products_comm(self):
+        """
+        Communicator shared by all the stencil blocks (None in the serial
+        case), or False if the blocks cannot be reduced together.
+
+        """
+        comms = []
+        for Vi in self._spaces:
+            if isinstance(Vi, BlockVectorSpace):
+                comm = Vi._inner_products_comm
+            elif isinstance(Vi, StencilVectorSpace):
+                comm = Vi.cart.global_comm if Vi.parallel else None
+            else:
+                comm = False
+            if comm is False:
+                return False
+            comms.append(comm)
+
+        return comms[0] if all(comm is comms[0] for comm in comms) else False
+
     #--------------------------------------
     # Other properties/methods
     #--------------------------------------
@@ -165,6 +231,13 @@ class BlockVector(Vector):
     """
     def __init__(self, V, blocks=None):
 
+        # Persistent communication requests of the fused update of the ghost
+        # regions, prepared on the first update for the current data arrays
+        # (set first, as __del__ reads them if the checks fail)
+        self._requests       = None
+        self._requests_types = None
+        self._requests_data  = None
+
         assert isinstance(V, BlockVectorSpace)
         self._space = V
 
@@ -228,6 +301,11 @@ class BlockVector(Vector):
             if len(self._data_exchangers.get((i, j), [])) == 0:
                 self._data_exchangers.pop((i, j), None)
 
+    #...
+    def __del__(self):
+        # Release memory of persistent MPI communication channels
+        self._free_requests()
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -352,14 +430,40 @@ class BlockVector(Vector):
 
         req = self.start_update_interface_ghost_regions()
 
-        for vi in self.blocks:
-            vi.update_ghost_regions()
+        synchronizer = self.space._synchronizer
+        if synchronizer is None:
+            for vi in self.blocks:
+                vi.update_ghost_regions()
+        else:
+            # The blocks (or their data arrays) may have been replaced
+            data = tuple(vi._data for vi in self.blocks)
+            if self._requests_data is None or any(a is not b for a, b in zip(data, self._requests_data)):
+                self._free_requests()
+                self._requests, self._requests_types = synchronizer.prepare_communications(data)
+                self._requests_data = data
+
+            synchronizer.start_update_ghost_regions(self._requests)
+            synchronizer.  end_update_ghost_regions(self._requests)
+
+            for vi in self.blocks:
+                vi._update_interface_data()
+                vi._sync = True
 
         self.end_update_interface_ghost_regions(req)
 
         # Flag ghost regions as up-to-date
         self._sync = True
 
+    def _free_requests(self):
+        if self._requests:
+            for request in self._requests:
+                request.Free()
+            for datatype in self._requests_types:
+                datatype.Free()
+        self._requests       = None
+        self._requests_types = None
+        self._requests_data  = None
+
     def start_update_interface_ghost_regions(self):
         self._collect_interface_buf()
         req = {}
@@ -516,8 +620,6 @@ class BlockLinearOperator(LinearOperator):
 
         self._args           = {}
         self._blocks_as_args = self._blocks
-        self._increment      = self._codomain.zeros()
-        self._args['inc']    = self._increment
         self._args['n_rows'] = self._nrows
         self._args['n_cols'] = self._ncols
         self._func           = self._dot
@@ -659,17 +761,128 @@ class BlockLinearOperator(LinearOperator):
 
     #...
     @staticmethod
-    def _dot(blocks, v, out, n_rows, n_cols, inc):
-
-        if n_rows == 1:
-            for (_, j), L0j in blocks.items():
-                out += L0j.dot(v[j], out=inc)
-        elif n_cols == 1:
-            for (i, _), Li0 in blocks.items():
-                out[i] += Li0.dot(v, out=inc[i])
+    def _dot(blocks, v, out, n_rows, n_cols):
+
+        # Storage vector for the contribution of each block
+        with out.space.scratch_pool.borrow() as inc:
+            if n_rows == 1:
+                for (_, j), L0j in blocks.items():
+                    out += L0j.dot(v[j], out=inc)
+            elif n_cols == 1:
+                for (i, _), Li0 in blocks.items():
+                    out[i] += Li0.dot(v, out=inc[i])
+            else:
+                for (i, j), Lij in blocks.items():
+                    out[i] += Lij.dot(v[j], out=inc[i])
+
+    # ...
+    def tdot(self, v, out=None, *, conjugate=False):
+        """
+        Apply the transpose of self (or its Hermitian transpose if conjugate
+        is True) to v, without forming the transposed BlockLinearOperator.
+
+        Parameters
+        ----------
+        v : Vector
+            Vector of the codomain of self.
+
+        out : Vector
+            Vector of the domain of self (optional).
+
+        conjugate : bool
+            True to multiply v by the Hermitian adjoint of self.
+
+        Returns
+        -------
+        out : Vector
+            Vector of the domain of self, contain the result of the product.
+        """
+        if self.n_block_rows == 1:
+            assert isinstance(v, Vector)
         else:
-            for (i, j), Lij in blocks.items():
-                out[i] += Lij.dot(v[j], out=inc[i])
+            assert isinstance(v, BlockVector)
+
+        assert v.space is self.codomain
+
+        if out is not None:
+            if self.n_block_cols == 1:
+                assert isinstance(out, Vector)
+            else:
+                assert isinstance(out, BlockVector)
+
+            assert out.space is self.domain
+            out *= 0.0
+        else:
+            out = self.domain.zeros()
+
+        n_rows = self.n_block_rows
+        n_cols = self.n_block_cols
+
+        # Storage vector for the contribution of each block
+        with self.domain.scratch_pool.borrow() as inc:
+            for (i, j), Lij in self._blocks.items():
+                vi   = v[i]   if n_rows > 1 else v
+                outj = out[j] if n_cols > 1 else out
+                incj = inc[j] if n_cols > 1 else inc
+                outj += Lij.tdot(vi, out=incj, conjugate=conjugate)
+
+        out.ghost_regions_in_sync = False
+        return out
+
+    # ...
+    def matmul(self, B):
+        """
+        Compute the product self @ B of two block operators whose blocks are
+        stencil matrices, see StencilMatrix.matmul.
+
+        Parameters
+        ----------
+        B : BlockLinearOperator
+            Right factor, whose codomain is the domain of self.
+
+        Returns
+        -------
+        BlockLinearOperator | StencilMatrix | ComposedLinearOperator
+            Product of self and B, a StencilMatrix if neither the domain of
+            B nor the codomain of self are BlockVectorSpaces. If the pads of
+            one block of the product exceed the pads of the vector spaces,
+            the ComposedLinearOperator `self @ B` is returned instead.
+        """
+        assert isinstance(B, BlockLinearOperator)
+        assert B.codomain is self.domain
+
+        U = B.domain
+        W = self.codomain
+
+        # Pairs of blocks contributing to each block of the product
+        pairs = {}
+        for (i, k), Aik in self._blocks.items():
+            for (l, j), Blj in B._blocks.items():
+                if k == l:
+                    pairs.setdefault((i, j), []).append((Aik, Blj))
+
+        block_pads = {}
+        for (i, j), ij_pairs in pairs.items():
+            if not all(isinstance(Aik, StencilMatrix) and isinstance(Bkj, StencilMatrix) for Aik, Bkj in ij_pairs):
+                raise NotImplementedError('Product of block operators only available for stencil matrix blocks')
+
+            pads = [Aik._matmul_pads(Bkj) for Aik, Bkj in ij_pairs]
+            if None in pads:
+                return ComposedLinearOperator(U, W, self, B)
+            block_pads[i, j] = tuple(max(p) for p in zip(*pads))
+
+        blocks = {}
+        for (i, j), ij_pairs in pairs.items():
+            Aik, Bkj = ij_pairs[0]
+            Cij = StencilMatrix(Bkj.domain, Aik.codomain, pads=block_pads[i, j], backend=Aik.backend)
+            for Aik, Bkj in ij_pairs:
+                Aik.matmul(Bkj, out=Cij, accumulate=True)
+            blocks[i, j] = Cij
+
+        if not (isinstance(U, BlockVectorSpace) or isinstance(W, BlockVectorSpace)):
+            return blocks.get((0, 0), StencilMatrix(U, W))
+
+        return BlockLinearOperator(U, W, blocks=blocks)
 
     # ...
     def transpose(self, conjugate=False, out=None):
@@ -1280,6 +1493,13 @@ class BlockLinearOperator(LinearOperator):
             c_starts       = None
             d_starts       = None
 
+        if ndim <= 3 and max(block_shape) <= 3 and \
+                all(b._ndim == ndim and isinstance(b, type(self._blocks[keys[0]])) for b in self._blocks.values()) and \
+                not (interface and any(tuple(b._permutation) != tuple(range(ndim)) for b in self._blocks.values())):
+            self._set_block_matvec(keys, interface)
+            self._backend = backend
+            return
+
         starts      = []
         nrows       = []
         nrows_extra = []
@@ -1413,3 +1633,32 @@ class BlockLinearOperator(LinearOperator):
 
         self._func    = func
         self._backend = backend
+
+    # ...
+    def _set_block_matvec(self, keys, interface):
+        """
+        Apply the operator with the precompiled kernels of block_matvec_kernels,
+        block by block: the first block of each row of blocks overwrites the
+        corresponding block of out, and the next ones are added to it.
+        """
+        kernel = _block_matvec[self._blocks[keys[0]]._ndim]
+        args   = [self._blocks[key]._block_matvec_args() for key in keys]
+        rows   = [i for i, _ in keys]
+        add    = [i in rows[:k] for k, i in enumerate(rows)]
+
+        if interface:
+            d_axis = self._blocks[keys[0]]._domain_axis
+            d_ext  = self._blocks[keys[0]]._domain_ext
+
+        def func(blocks, v, out):
+            if interface:
+                vs = [vi._interface_data[d_axis, d_ext] for vi in v.blocks] if isinstance(v, BlockVector) else [v._interface_data[d_axis, d_ext]]
+            else:
+                vs = [vi._data for vi in v.blocks] if isinstance(v, BlockVector) else [v._data]
+            outs = [outi._data for outi in out.blocks] if isinstance(out, BlockVector) else [out._data]
+            for (i, j), mat, args_k, add_k in zip(keys, blocks, args, add):
+                kernel(mat, vs[j], outs[i], **args_k, add=add_k)
+
+        self._blocks_as_args = [self._blocks[key]._data for key in keys]
+        self._args = {}
+        self._func = func
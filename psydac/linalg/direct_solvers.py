@@ -3,13 +3,15 @@
 
 from abc                 import abstractmethod
 import numpy               as np
+from scipy.linalg        import lu_factor, lu_solve
 from scipy.linalg.lapack import dgbtrf, dgbtrs, sgbtrf, sgbtrs, cgbtrf, cgbtrs, zgbtrf, zgbtrs
-from scipy.sparse        import spmatrix
+from scipy.sparse        import spmatrix, coo_matrix, csc_matrix
 from scipy.sparse.linalg import splu
 
 from psydac.linalg.basic    import LinearSolver
+from psydac.ddm.shared      import share_array
 
-__all__ = ('BandedSolver', 'SparseSolver')
+__all__ = ('BandedSolver', 'CyclicBandedSolver', 'SparseSolver', 'banded_solver')
 
 #===============================================================================
 class BandedSolver(LinearSolver):
@@ -57,6 +59,7 @@ class BandedSolver(LinearSolver):
 
         self._space = np.ndarray
         self._dtype = bmat.dtype
+        self._shared = False
 
     @property
     def finfo(self):
@@ -77,8 +80,9 @@ class BandedSolver(LinearSolver):
         cls = type(self)
         obj = super().__new__(cls)
 
-        obj._u = self._l
-        obj._l = self._u
+        # the LU factorization of A is reused, with ?GBTRS solving A^T x = b
+        obj._u = self._u
+        obj._l = self._l
         obj._bmat = self._bmat
         obj._ipiv = self._ipiv
         obj._finfo = self._finfo
@@ -88,9 +92,21 @@ class BandedSolver(LinearSolver):
         obj._space = self._space
         obj._dtype = self._dtype
         obj._transposed = not self._transposed
+        obj._shared = self._shared
 
         return obj
 
+    def share(self, comm):
+        """
+        Store the LU factorization in the shared memory of each node: only the
+        one of the first process of each node is kept. The pivot indices stay
+        local, as the LAPACK solver (?GBTRS) may modify them temporarily.
+        """
+        if comm is not None and not self._shared:
+            self._bmat   = share_array(self._bmat, comm)
+            self._shared = True
+        return self
+
     #...
     def solve(self, rhs, out=None):
         """
@@ -132,6 +148,168 @@ class BandedSolver(LinearSolver):
 
         return out
 
+#===============================================================================
+class CyclicBandedSolver(LinearSolver):
+    """
+    Solve the equation Ax = b for x, assuming A is a cyclic banded matrix,
+    i.e. a banded matrix whose diagonals wrap around its corners, as obtained
+    from periodic splines.
+
+    The columns of A are first rotated so that its dominant diagonal becomes
+    the main one. The matrix is then split as A = B + K, where B is banded
+    and K only has non-zero entries in the top-right l x l and bottom-left
+    u x u corners. B is factorized with LAPACK (see DGBTRF), and the low-rank
+    correction K is taken into account with the Sherman-Morrison-Woodbury
+    formula.
+
+    Parameters
+    ----------
+    u : integer
+        Number of non-zero upper diagonals.
+
+    l : integer
+        Number of non-zero lower diagonals.
+
+    cbmat : nd-array
+        Cyclic banded matrix of size n, stored in an array of shape
+        (1+u+l, n) such that cbmat[u+i-j, j] = A[i, j], where i-j is taken
+        modulo n in the range [-u, l]. It is required that n > u + l.
+
+    """
+    def __init__(self, u, l, cbmat):
+
+        n = cbmat.shape[1]
+        assert cbmat.shape[0] == 1 + u + l
+        assert n > u + l
+
+        self._u     = u
+        self._l     = l
+        self._cbmat = cbmat
+        self._space = np.ndarray
+        self._dtype = cbmat.dtype
+
+        # Rotate the columns by s, where s = j - i on the dominant diagonal:
+        # we solve A' y = b with A'[i, j] = A[i, (j+s) % n], then x = roll(y, s)
+        k = np.argmax(np.sum(abs(cbmat), axis=1))
+        self._shift = u - k
+        cbmat = np.roll(cbmat, -self._shift, axis=1)
+        u, l  = k, l + u - k
+
+        # Banded part B of A (LAPACK format, with l additional rows for pivoting)
+        # and entries of A wrapped around the corners (row, column, value)
+        bmat = np.zeros((1 + u + 2 * l, n), dtype=cbmat.dtype)
+        bmat[l:, :] = cbmat
+        rows, cols, vals = [], [], []
+        for k in range(1 + u + l):
+            d = k - u
+            if d > 0:
+                j = np.arange(n - d, n)
+            elif d < 0:
+                j = np.arange(-d)
+            else:
+                continue
+            rows.append((j + d) % n)
+            cols.append(j)
+            vals.append(cbmat[k, j])
+            bmat[l + k, j] = 0
+
+        self._band_solver = BandedSolver(u, l, bmat)
+
+        # Rows of the corner entries: K = E_R Kr, with E_R the columns of the
+        # identity matrix with indices R = [0, ..., l-1, n-u, ..., n-1]
+        R    = np.concatenate((np.arange(l), np.arange(n - u, n)))
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+        rows = np.where(rows < l, rows, rows - (n - u) + l)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=int)
+        vals = np.concatenate(vals) if vals else np.zeros(0, dtype=cbmat.dtype)
+        self._kmat = coo_matrix((vals, (rows, cols)), shape=(u + l, n)).tocsr()
+
+        # Z = B^{-1} E_R (stored transposed, one row per column of E_R)
+        identity = np.zeros((u + l, n), dtype=cbmat.dtype)
+        identity[np.arange(u + l), R] = 1
+        self._zmat = self._band_solver.solve(identity)
+
+        # LU factorization of the capacitance matrix S = I + Kr Z
+        cmat = np.eye(u + l, dtype=cbmat.dtype) + self._kmat @ self._zmat.T
+        self._cmat_lu = lu_factor(cmat) if u + l > 0 else None
+        self._transposed = False
+        self._shared     = False
+
+    @property
+    def finfo(self):
+        return self._band_solver.finfo
+
+    @property
+    def sinfo(self):
+        return self._band_solver.sinfo
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def space(self):
+        return self._space
+
+    def transpose(self):
+        # A^T = P B^T + P Kr^T E_R^T, with P the rotation of the columns: the
+        # factorization of B and the matrices of the Woodbury correction are
+        # reused (see solve)
+        obj = super().__new__(type(self))
+        obj.__dict__.update(self.__dict__)
+        obj._band_solver = self._band_solver.transpose()
+        obj._transposed  = not self._transposed
+        return obj
+
+    def share(self, comm):
+        """
+        Store the LU factorization of the banded part, and the matrix Z of the
+        Woodbury correction, in the shared memory of each node: only the ones
+        of the first process of each node are kept. The capacitance matrix is
+        small and stays local. The transposed solver uses the same memory.
+        """
+        if comm is not None and not self._shared:
+            self._band_solver.share(comm)
+            self._zmat   = share_array(self._zmat, comm)
+            self._shared = True
+        return self
+
+    #...
+    def solve(self, rhs, out=None):
+        """
+        Solves for the given right-hand side.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            The right-hand sides to solve for. The vectors are assumed to be given in C-contiguous order,
+            i.e. if multiple right-hand sides are given, then rhs is a two-dimensional array with the 0-th
+            index denoting the number of the right-hand side, and the 1-st index denoting the element inside
+            a right-hand side.
+
+        out : ndarray | NoneType
+            Output vector. If given, it has to have the same shape and datatype as rhs.
+        """
+        if self._transposed:
+            # A'^T x = roll(b, -s), with the Woodbury correction applied first:
+            # x = B^{-T} (b' - Kr^T S^{-T} Z b')
+            b = np.roll(rhs, -self._shift, axis=-1) if self._shift != 0 else rhs
+            if self._cmat_lu is not None:
+                t = lu_solve(self._cmat_lu, self._zmat @ b.T, trans=1)
+                b = b - (self._kmat.T @ t).T
+            return self._band_solver.solve(b, out=out)
+
+        y = self._band_solver.solve(rhs, out=out)
+
+        # Woodbury correction: x = y - Z S^{-1} Kr y
+        if self._cmat_lu is not None:
+            t  = lu_solve(self._cmat_lu, self._kmat @ y.T)
+            y -= t.T @ self._zmat
+
+        if self._shift != 0:
+            y[...] = np.roll(y, self._shift, axis=-1)
+
+        return y
+
 #===============================================================================
 class SparseSolver (LinearSolver):
     """
@@ -199,3 +377,56 @@ class SparseSolver (LinearSolver):
             out[:] = self._splu.solve(rhs.T, trans='T' if transposed else 'N').T
 
         return out
+
+#===============================================================================
+def banded_solver( mat, periodic, dtype=float ):
+    """
+    Factorize a square banded matrix, whose diagonals wrap around the corners
+    in the periodic case.
+
+    Parameters
+    ----------
+    mat : scipy.sparse.spmatrix
+        Banded (or cyclic banded) matrix, e.g. a collocation or histopolation
+        matrix in sparse format.
+
+    periodic : bool
+        True if the diagonals of the matrix wrap around its corners.
+
+    dtype : data-type
+        Data type of the factorized matrix.
+
+    Returns
+    -------
+    BandedSolver | CyclicBandedSolver | SparseSolver
+        Direct solver for the linear systems with matrix `mat`.
+
+    """
+    mat = mat.tocoo()
+    n   = mat.shape[0]
+    assert mat.shape == (n, n)
+
+    # Offsets of the diagonals, taken in [-n//2, n - n//2) in the periodic case
+    offsets = mat.col - mat.row
+    if periodic:
+        offsets = (offsets + n // 2) % n - n // 2
+
+    l = max(-offsets.min(initial=0), 0)
+    u = max( offsets.max(initial=0), 0)
+
+    if not periodic:
+        # Convert to LAPACK banded format (see DGBTRF function)
+        bmat = np.zeros( (1+u+2*l, n), dtype=dtype )
+        bmat[u+l-offsets, mat.col] = mat.data
+        return BandedSolver( u, l, bmat )
+
+    if n > u + l:
+        # Cyclic banded format: cbmat[u+i-j, j] = mat[i, j]
+        cbmat = np.zeros( (1+u+l, n), dtype=dtype )
+        cbmat[u-offsets, mat.col] = mat.data
+        solver = CyclicBandedSolver( u, l, cbmat )
+        if solver.finfo == 0:
+            return solver
+
+    # Small matrices, or banded part singular: compute sparse LU decomposition
+    return SparseSolver( csc_matrix( mat ) )
@@ -0,0 +1,417 @@
+# coding: utf-8
+"""
+Fusion of linear operator expressions built from stencil matrices.
+
+An expression such as `M1 + dt * D.T @ M2 @ D` is normally applied node by
+node, with a separate matrix-vector product, ghost-region exchange and
+vector update for each term. The optimization pass implemented here analyses
+the expression tree and merges all the StencilMatrix terms of a sum which act
+between the same spaces into one precomputed StencilMatrix, folding the
+scalar coefficients (and multiples of the identity) into its entries.
+Products of stencil matrices are formed explicitly whenever the pads of the
+result, i.e. the sum of the pads of the factors, fit in the pads of the vector
+spaces.
+
+Block operators whose blocks are stencil matrices, e.g. the mass matrices of
+the vector-valued spaces of a de Rham sequence, are fused blockwise. The
+operators which can be converted to a StencilMatrix (with a `tostencil`
+method, such as the directional derivatives of the discrete gradient, curl
+and divergence, or Kronecker products) are converted when they are part of a
+larger expression.
+
+"""
+
+from psydac.linalg.basic   import (LinearOperator, ZeroOperator, IdentityOperator,
+        ScaledLinearOperator, SumLinearOperator, ComposedLinearOperator,
+        PowerLinearOperator, AdjointLinearOperator)
+from psydac.linalg.stencil import StencilVectorSpace, StencilMatrix
+from psydac.linalg.block   import BlockVectorSpace, BlockLinearOperator
+
+__all__ = ('FusedLinearOperator', 'fuse')
+
+#===============================================================================
+def fuse(A):
+    """
+    Optimize the evaluation of a linear operator expression, by merging its
+    StencilMatrix terms.
+
+    Parameters
+    ----------
+    A : LinearOperator
+        Expression of linear operators (sums, scalings, compositions).
+
+    Returns
+    -------
+    FusedLinearOperator
+        Operator equivalent to A, which applies the fused expression.
+
+    """
+    if isinstance(A, FusedLinearOperator):
+        return A
+    return FusedLinearOperator(A)
+
+#===============================================================================
+class FusedLinearOperator(LinearOperator):
+    """
+    Linear operator expression whose StencilMatrix terms are merged into
+    precomputed stencil matrices.
+
+    The fused operator is computed on first use and cached. It is computed
+    again whenever one of the stencil matrices of the expression has been
+    modified through its public interface (item assignment, in-place
+    arithmetic, copy, assembly). After writing directly to the `_data` array
+    of a matrix, set its `ghost_regions_in_sync` property to False to signal
+    the change.
+
+    Parameters
+    ----------
+    A : LinearOperator
+        Expression to be fused.
+
+    """
+    def __init__(self, A):
+
+        assert isinstance(A, LinearOperator)
+
+        self._expression = A
+        self._leaves     = tuple({id(M): M for M in _stencil_leaves(A)}.values())
+        self._versions   = None
+        self._operator   = None
+
+    @property
+    def domain(self):
+        return self._expression.domain
+
+    @property
+    def codomain(self):
+        return self._expression.codomain
+
+    @property
+    def dtype(self):
+        return self._expression.dtype
+
+    @property
+    def expression(self):
+        """ The original expression of linear operators. """
+        return self._expression
+
+    @property
+    def operator(self):
+        """
+        The fused operator, computed again if any stencil matrix of the
+        expression has been modified.
+
+        """
+        versions = tuple(M._version for M in self._leaves)
+        if versions != self._versions:
+            # A single operator (e.g. a derivative) is applied as it is
+            A = self._expression
+            self._operator = _fuse(A)[0] if _is_expression(A) else A
+            self._versions = versions
+        return self._operator
+
+    def toarray(self):
+        return self.tosparse().toarray()
+
+    def tosparse(self):
+        return self.operator.tosparse()
+
+    def transpose(self, conjugate=False):
+        return FusedLinearOperator(self._expression.transpose(conjugate=conjugate))
+
+    def dot(self, v, out=None):
+        return self.operator.dot(v, out=out)
+
+    def idot(self, v, out):
+        self.operator.idot(v, out)
+
+    def tdot(self, v, out=None, *, conjugate=False):
+        return self.operator.tdot(v, out=out, conjugate=conjugate)
+
+#===============================================================================
+def _stencil_leaves(A):
+    """ Iterate over the stencil matrices on which the expression A depends. """
+    if isinstance(A, StencilMatrix):
+        yield A
+    elif isinstance(A, FusedLinearOperator):
+        yield from _stencil_leaves(A.expression)
+    elif isinstance(A, (ScaledLinearOperator, PowerLinearOperator, AdjointLinearOperator)):
+        yield from _stencil_leaves(A.operator)
+    elif isinstance(A, SumLinearOperator):
+        for a in A.addends:
+            yield from _stencil_leaves(a)
+    elif isinstance(A, ComposedLinearOperator):
+        for a in A.multiplicants:
+            yield from _stencil_leaves(a)
+    elif isinstance(A, BlockLinearOperator):
+        for a in A._blocks.values():
+            yield from _stencil_leaves(a)
+
+#===============================================================================
+def _is_expression(A):
+    """ Determine whether A is an expression of other linear operators. """
+    return isinstance(A, (FusedLinearOperator, ScaledLinearOperator, SumLinearOperator,
+        ComposedLinearOperator, PowerLinearOperator, AdjointLinearOperator))
+
+#===============================================================================
+def _stencil_blocks(A):
+    """
+    Blocks of the operator A as a dict {(i, j): StencilMatrix}, or None if A
+    is neither a StencilMatrix nor a block operator of stencil matrices.
+
+    """
+    if isinstance(A, StencilMatrix):
+        return {(0, 0): A}
+    elif isinstance(A, BlockLinearOperator) and all(isinstance(b, StencilMatrix) for b in A._blocks.values()):
+        return dict(A._blocks)
+    return None
+
+#===============================================================================
+def _from_blocks(V, W, blocks):
+    """
+    Operator from V to W with the given stencil-matrix blocks: a StencilMatrix
+    if neither V nor W are BlockVectorSpaces, else a BlockLinearOperator.
+
+    """
+    if not (isinstance(V, BlockVectorSpace) or isinstance(W, BlockVectorSpace)):
+        return blocks.get((0, 0), StencilMatrix(V, W))
+    return BlockLinearOperator(V, W, blocks=blocks)
+
+#===============================================================================
+def _matmul(A, B):
+    """
+    Product A @ B of two operators with stencil-matrix blocks, see
+    BlockLinearOperator.matmul and StencilMatrix.matmul.
+
+    """
+    if isinstance(A, StencilMatrix) and isinstance(B, StencilMatrix):
+        return A.matmul(B)
+    if isinstance(A, BlockLinearOperator) and isinstance(B, BlockLinearOperator):
+        return A.matmul(B)
+
+    # One of the factors is a single stencil matrix
+    blocks = {}
+    for (i, k), Aik in _stencil_blocks(A).items():
+        for (l, j), Blj in _stencil_blocks(B).items():
+            if k == l:
+                blocks[i, j] = Aik.matmul(Blj)
+    return _from_blocks(B.domain, A.codomain, blocks)
+
+#===============================================================================
+def _linear_terms(A, c):
+    """
+    Expand the expression c * A into a list of terms (c_i, A_i, owned_i),
+    where no A_i is a sum or a scaled operator. The flag owned_i is True if
+    A_i is a StencilMatrix (or a block operator of stencil matrices) created by
+    the fusion pass, which can therefore be modified in place.
+
+    """
+    if isinstance(A, FusedLinearOperator):
+        return _linear_terms(A.expression, c)
+
+    elif isinstance(A, ScaledLinearOperator):
+        return _linear_terms(A.operator, c * A.scalar)
+
+    elif isinstance(A, SumLinearOperator):
+        return [t for a in A.addends for t in _linear_terms(a, c)]
+
+    elif isinstance(A, ZeroOperator):
+        return []
+
+    elif isinstance(A, AdjointLinearOperator):
+        # Merging the transposed matrix is cheaper than applying it lazily
+        F, _ = _fuse(A.operator)
+        if _stencil_blocks(F) is None:
+            return [(c, A, False)]
+        return [(c, F.transpose(conjugate=A._conjugate), True)]
+
+    elif isinstance(A, BlockLinearOperator):
+        # Fuse each block: e.g. the derivatives are converted to stencil matrices
+        blocks = {ij: _fuse(b, as_stencil=True) for ij, b in A._blocks.items()}
+        if all(F is b for (F, _), b in zip(blocks.values(), A._blocks.values())):
+            return [(c, A, False)]
+        if not all(isinstance(F, StencilMatrix) for F, _ in blocks.values()):
+            return [(c, A, False)]
+        owned = all(owned for _, owned in blocks.values())
+        return [(c, BlockLinearOperator(A.domain, A.codomain, blocks={ij: F for ij, (F, _) in blocks.items()}), owned)]
+
+    elif not isinstance(A, StencilMatrix) and hasattr(A, 'tostencil') and \
+            isinstance(A.domain, StencilVectorSpace) and isinstance(A.codomain, StencilVectorSpace):
+        return [(c, A.tostencil(), True)]
+
+    elif isinstance(A, ComposedLinearOperator):
+        factors = [_fuse(A.multiplicants[0])]
+        for F, owned in map(_fuse, A.multiplicants[1:]):
+            G, _ = factors[-1]
+            if _can_multiply(G, F):
+                factors[-1] = (_matmul(G, F), True)
+            else:
+                factors.append((F, owned))
+
+        # All factors were multiplied into one stencil matrix
+        if len(factors) == 1:
+            return [(c, *factors[0])]
+
+        ops = [F for F, _ in factors]
+
+        # Fold the scalar coefficient into the first stencil matrix
+        if c != 1:
+            for i, (F, owned) in enumerate(factors):
+                if _stencil_blocks(F) is not None:
+                    if owned:
+                        F *= c
+                    else:
+                        ops[i] = F * c
+                    c = 1
+                    break
+
+        return [(c, ComposedLinearOperator(A.domain, A.codomain, *ops), False)]
+
+    else:
+        return [(c, A, False)]
+
+#===============================================================================
+def _can_multiply(A, B):
+    """
+    Determine whether the product A @ B of two operators can be formed as a
+    StencilMatrix (or as a block operator of stencil matrices), i.e. if its
+    pads fit in the pads of the vector spaces.
+
+    """
+    blocks_A = _stencil_blocks(A)
+    blocks_B = _stencil_blocks(B)
+    if blocks_A is None or blocks_B is None:
+        return False
+
+    try:
+        return all(Aik._matmul_pads(Blj) is not None
+                   for (i, k), Aik in blocks_A.items()
+                   for (l, j), Blj in blocks_B.items() if k == l)
+    except NotImplementedError:
+        return False
+
+#===============================================================================
+def _merge(terms):
+    """
+    Merge terms (c_i, M_i, owned_i) with stencil matrices M_i acting between
+    the same spaces into a single StencilMatrix, whose pads are the largest
+    ones of the M_i.
+
+    """
+    c0, M0, owned0 = terms[0]
+    if len(terms) == 1 and c0 == 1:
+        return M0, owned0
+
+    nd   = M0.domain.ndim
+    pads = tuple(max(p) for p in zip(*(M.pads for _, M, _ in terms)))
+
+    if tuple(M0.pads) == pads:
+        if owned0:
+            F = M0
+            if c0 != 1:
+                F *= c0
+        else:
+            F = M0 * c0
+        others = terms[1:]
+    else:
+        F = StencilMatrix(M0.domain, M0.codomain, pads=pads, backend=M0.backend)
+        others = terms
+
+    # The diagonals of a matrix with smaller pads are centered in the band of F
+    for c, M, _ in others:
+        index = tuple(slice(None) for _ in range(nd)) + \
+                tuple(slice(P - p, P - p + n) for P, p, n in zip(pads, M.pads, M._data.shape[nd:]))
+        F._data[index] += c * M._data
+
+    F.ghost_regions_in_sync = False
+    return F, True
+
+#===============================================================================
+def _merge_blocks(terms):
+    """
+    Merge terms (c_i, B_i, owned_i) with block operators B_i of stencil
+    matrices acting between the same spaces, block by block (see _merge).
+
+    """
+    c0, B0, owned0 = terms[0]
+    if len(terms) == 1 and c0 == 1:
+        return B0, owned0
+
+    keys   = {ij: None for _, B, _ in terms for ij in B._blocks}
+    blocks = {}
+    owned  = True
+    for ij in keys:
+        F, owned_ij = _merge([(c, B._blocks[ij], o) for c, B, o in terms if ij in B._blocks])
+        if not owned_ij:
+            F = F.copy()
+        blocks[ij] = F
+
+    return BlockLinearOperator(B0.domain, B0.codomain, blocks=blocks), owned
+
+#===============================================================================
+def _add_identity(F, c):
+    """ Add c times the identity to the square StencilMatrix F, in place. """
+    nd = F.domain.ndim
+    F[(slice(None),) * nd + (0,) * nd] += c
+    F.ghost_regions_in_sync = False
+
+#===============================================================================
+def _fuse(A, as_stencil=False):
+    """
+    Get an operator equivalent to A, where the StencilMatrix terms sharing the
+    same domain and codomain are merged, together with a flag which is True if
+    this operator is a StencilMatrix (or a block operator of stencil matrices)
+    created by the fusion pass. If as_stencil is True, multiples of the
+    identity are converted to diagonal stencil matrices even if they are not
+    merged with other terms (e.g. for the blocks of a block operator).
+
+    """
+    terms = _linear_terms(A, 1)
+
+    groups     = {}
+    identities = []
+    others     = []
+    for c, B, owned in terms:
+        if _stencil_blocks(B) is not None:
+            groups.setdefault((id(B.domain), id(B.codomain)), []).append((c, B, owned))
+        elif isinstance(B, IdentityOperator) and isinstance(B.domain, (StencilVectorSpace, BlockVectorSpace)):
+            identities.append((c, B))
+        else:
+            others.append((c, B))
+
+    merged = {key: (_merge if isinstance(group[0][1], StencilMatrix) else _merge_blocks)(group)
+              for key, group in groups.items()}
+
+    # Multiples of the identity are added to the main diagonal of a square matrix
+    for c, I in identities:
+        key = (id(I.domain), id(I.domain))
+        if key in merged and isinstance(I.domain, StencilVectorSpace):
+            F, owned = merged[key]
+            if not owned:
+                F = F.copy()
+            _add_identity(F, c)
+            merged[key] = (F, True)
+        elif key in merged and all(isinstance(Vi, StencilVectorSpace) for Vi in I.domain.spaces):
+            F, owned = merged[key]
+            blocks = {ij: (b if owned else b.copy()) for ij, b in F._blocks.items()}
+            for i, Vi in enumerate(I.domain.spaces):
+                if (i, i) not in blocks:
+                    blocks[i, i] = StencilMatrix(Vi, Vi, pads=(0,) * Vi.ndim)
+                _add_identity(blocks[i, i], c)
+            merged[key] = (BlockLinearOperator(F.domain, F.codomain, blocks=blocks), True)
+        elif as_stencil and isinstance(I.domain, StencilVectorSpace):
+            F = StencilMatrix(I.domain, I.domain, pads=(0,) * I.domain.ndim)
+            _add_identity(F, c)
+            merged[key] = (F, True)
+        else:
+            others.append((c, I))
+
+    ops = [F for F, _ in merged.values()]
+    ops += [B if c == 1 else ScaledLinearOperator(B.domain, B.codomain, c, B) for c, B in others]
+
+    if len(ops) == 0:
+        return ZeroOperator(A.domain, A.codomain), False
+    elif len(ops) == 1:
+        return ops[0], (len(merged) == 1 and list(merged.values())[0][1])
+    else:
+        return SumLinearOperator(A.domain, A.codomain, *ops), False
@@ -0,0 +1,214 @@
+from pyccel.decorators import template
+
+# Product out = M @ x of a stencil matrix M, or out += M @ x if add is True, for
+# the blocks of a BlockLinearOperator and for the StencilMatrix and
+# StencilInterfaceMatrix objects with a backend. The arguments are those of the
+# kernels in matvec_kernels.py, and for an interface matrix:
+# - flip[i] = -1 if the axis i of x is reversed, 1 otherwise;
+# - c_start[i] is the offset of the rows of out along axis i.
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def block_matvec_1d(mat: 'T[:,:]', x: 'T[:]', out: 'T[:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                    dm: 'int64[:]', cm: 'int64[:]', pad_imp: 'int64[:]', ndiags: 'int64[:]', gpads: 'int64[:]',
+                    flip: 'int64[:]', c_start: 'int64[:]', add: 'bool'):
+
+    #$omp parallel default(private) shared(mat,x,out) firstprivate(starts,nrows,nrows_extra,dm,cm,pad_imp,ndiags,gpads,flip,c_start,add)
+    pxm1 = gpads[0] * cm[0]
+    pom1 = pxm1 + c_start[0]
+    xf1  = flip[0]
+    xo1  = x.shape[0] - 1 if flip[0] == -1 else 0
+
+    start_impact1 = starts[0] % dm[0]
+
+    v = mat[0, 0] - mat[0, 0] + x[0] - x[0]
+
+    #$omp for schedule(static)
+    for i1 in range(nrows[0]):
+        v *= 0
+        x_min1 = pad_imp[0] + (i1 + start_impact1) // cm[0] * dm[0]
+        for k1 in range(ndiags[0]):
+            v += mat[pxm1 + i1, k1] * x[xo1 + xf1 * (x_min1 + k1)]
+        if add:
+            out[pom1 + i1] += v
+        else:
+            out[pom1 + i1] = v
+
+    #$omp for schedule(static)
+    for i1 in range(nrows_extra[0]):
+        v *= 0
+        x_min1 = pad_imp[0] + (i1 + nrows[0] + start_impact1) // cm[0] * dm[0]
+        for k1 in range(ndiags[0] - i1 - 1):
+            v += mat[pxm1 + nrows[0] + i1, k1] * x[xo1 + xf1 * (x_min1 + k1)]
+        if add:
+            out[pom1 + nrows[0] + i1] += v
+        else:
+            out[pom1 + nrows[0] + i1] = v
+    #$omp end parallel
+    return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def block_matvec_2d(mat: 'T[:,:,:,:]', x: 'T[:,:]', out: 'T[:,:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                    dm: 'int64[:]', cm: 'int64[:]', pad_imp: 'int64[:]', ndiags: 'int64[:]', gpads: 'int64[:]',
+                    flip: 'int64[:]', c_start: 'int64[:]', add: 'bool'):
+
+    #$omp parallel default(private) shared(mat,x,out) firstprivate(starts,nrows,nrows_extra,dm,cm,pad_imp,ndiags,gpads,flip,c_start,add)
+    pxm1 = gpads[0] * cm[0]
+    pom1 = pxm1 + c_start[0]
+    xf1  = flip[0]
+    xo1  = x.shape[0] - 1 if flip[0] == -1 else 0
+    pxm2 = gpads[1] * cm[1]
+    pom2 = pxm2 + c_start[1]
+    xf2  = flip[1]
+    xo2  = x.shape[1] - 1 if flip[1] == -1 else 0
+
+    start_impact1 = starts[0] % dm[0]
+    start_impact2 = starts[1] % dm[1]
+
+    v = mat[0, 0, 0, 0] - mat[0, 0, 0, 0] + x[0, 0] - x[0, 0]
+
+    #$omp for schedule(static) collapse(2)
+    for i1 in range(nrows[0]):
+        for i2 in range(nrows[1]):
+            v *= 0
+            x_min1 = pad_imp[0] + (i1 + start_impact1) // cm[0] * dm[0]
+            x_min2 = pad_imp[1] + (i2 + start_impact2) // cm[1] * dm[1]
+            for k1 in range(ndiags[0]):
+                for k2 in range(ndiags[1]):
+                    v += mat[pxm1 + i1, pxm2 + i2, k1, k2] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2)]
+            if add:
+                out[pom1 + i1, pom2 + i2] += v
+            else:
+                out[pom1 + i1, pom2 + i2] = v
+
+    # Extra rows along the first axis
+    #$omp for schedule(static) collapse(2)
+    for i1 in range(nrows_extra[0]):
+        for i2 in range(nrows[1]):
+            v *= 0
+            x_min1 = pad_imp[0] + (i1 + nrows[0] + start_impact1) // cm[0] * dm[0]
+            x_min2 = pad_imp[1] + (i2 + start_impact2) // cm[1] * dm[1]
+            for k1 in range(ndiags[0] - i1 - 1):
+                for k2 in range(ndiags[1]):
+                    v += mat[pxm1 + nrows[0] + i1, pxm2 + i2, k1, k2] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2)]
+            if add:
+                out[pom1 + nrows[0] + i1, pom2 + i2] += v
+            else:
+                out[pom1 + nrows[0] + i1, pom2 + i2] = v
+
+    # Extra rows along the second axis
+    #$omp for schedule(static) collapse(2)
+    for i1 in range(nrows[0] + nrows_extra[0]):
+        for i2 in range(nrows_extra[1]):
+            v *= 0
+            x_min1 = pad_imp[0] + (i1 + start_impact1) // cm[0] * dm[0]
+            x_min2 = pad_imp[1] + (i2 + nrows[1] + start_impact2) // cm[1] * dm[1]
+            for k1 in range(ndiags[0] - max(0, i1 + 1 - nrows[0])):
+                for k2 in range(ndiags[1] - i2 - 1):
+                    v += mat[pxm1 + i1, pxm2 + nrows[1] + i2, k1, k2] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2)]
+            if add:
+                out[pom1 + i1, pom2 + nrows[1] + i2] += v
+            else:
+                out[pom1 + i1, pom2 + nrows[1] + i2] = v
+    #$omp end parallel
+    return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def block_matvec_3d(mat: 'T[:,:,:,:,:,:]', x: 'T[:,:,:]', out: 'T[:,:,:]', starts: 'int64[:]', nrows: 'int64[:]', nrows_extra: 'int64[:]',
+                    dm: 'int64[:]', cm: 'int64[:]', pad_imp: 'int64[:]', ndiags: 'int64[:]', gpads: 'int64[:]',
+                    flip: 'int64[:]', c_start: 'int64[:]', add: 'bool'):
+
+    #$omp parallel default(private) shared(mat,x,out) firstprivate(starts,nrows,nrows_extra,dm,cm,pad_imp,ndiags,gpads,flip,c_start,add)
+    pxm1 = gpads[0] * cm[0]
+    pom1 = pxm1 + c_start[0]
+    xf1  = flip[0]
+    xo1  = x.shape[0] - 1 if flip[0] == -1 else 0
+    pxm2 = gpads[1] * cm[1]
+    pom2 = pxm2 + c_start[1]
+    xf2  = flip[1]
+    xo2  = x.shape[1] - 1 if flip[1] == -1 else 0
+    pxm3 = gpads[2] * cm[2]
+    pom3 = pxm3 + c_start[2]
+    xf3  = flip[2]
+    xo3  = x.shape[2] - 1 if flip[2] == -1 else 0
+
+    start_impact1 = starts[0] % dm[0]
+    start_impact2 = starts[1] % dm[1]
+    start_impact3 = starts[2] % dm[2]
+
+    v = mat[0, 0, 0, 0, 0, 0] - mat[0, 0, 0, 0, 0, 0] + x[0, 0, 0] - x[0, 0, 0]
+
+    #$omp for schedule(static) collapse(3)
+    for i1 in range(nrows[0]):
+        for i2 in range(nrows[1]):
+            for i3 in range(nrows[2]):
+                v *= 0
+                x_min1 = pad_imp[0] + (i1 + start_impact1) // cm[0] * dm[0]
+                x_min2 = pad_imp[1] + (i2 + start_impact2) // cm[1] * dm[1]
+                x_min3 = pad_imp[2] + (i3 + start_impact3) // cm[2] * dm[2]
+                for k1 in range(ndiags[0]):
+                    for k2 in range(ndiags[1]):
+                        for k3 in range(ndiags[2]):
+                            v += mat[pxm1 + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2), xo3 + xf3 * (x_min3 + k3)]
+                if add:
+                    out[pom1 + i1, pom2 + i2, pom3 + i3] += v
+                else:
+                    out[pom1 + i1, pom2 + i2, pom3 + i3] = v
+
+    # Extra rows along the first axis
+    #$omp for schedule(static) collapse(3)
+    for i1 in range(nrows_extra[0]):
+        for i2 in range(nrows[1]):
+            for i3 in range(nrows[2]):
+                v *= 0
+                x_min1 = pad_imp[0] + (i1 + nrows[0] + start_impact1) // cm[0] * dm[0]
+                x_min2 = pad_imp[1] + (i2 + start_impact2) // cm[1] * dm[1]
+                x_min3 = pad_imp[2] + (i3 + start_impact3) // cm[2] * dm[2]
+                for k1 in range(ndiags[0] - i1 - 1):
+                    for k2 in range(ndiags[1]):
+                        for k3 in range(ndiags[2]):
+                            v += mat[pxm1 + nrows[0] + i1, pxm2 + i2, pxm3 + i3, k1, k2, k3] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2), xo3 + xf3 * (x_min3 + k3)]
+                if add:
+                    out[pom1 + nrows[0] + i1, pom2 + i2, pom3 + i3] += v
+                else:
+                    out[pom1 + nrows[0] + i1, pom2 + i2, pom3 + i3] = v
+
+    # Extra rows along the second axis
+    #$omp for schedule(static) collapse(3)
+    for i1 in range(nrows[0] + nrows_extra[0]):
+        for i2 in range(nrows_extra[1]):
+            for i3 in range(nrows[2]):
+                v *= 0
+                x_min1 = pad_imp[0] + (i1 + start_impact1) // cm[0] * dm[0]
+                x_min2 = pad_imp[1] + (i2 + nrows[1] + start_impact2) // cm[1] * dm[1]
+                x_min3 = pad_imp[2] + (i3 + start_impact3) // cm[2] * dm[2]
+                for k1 in range(ndiags[0] - max(0, i1 + 1 - nrows[0])):
+                    for k2 in range(ndiags[1] - i2 - 1):
+                        for k3 in range(ndiags[2]):
+                            v += mat[pxm1 + i1, pxm2 + nrows[1] + i2, pxm3 + i3, k1, k2, k3] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2), xo3 + xf3 * (x_min3 + k3)]
+                if add:
+                    out[pom1 + i1, pom2 + nrows[1] + i2, pom3 + i3] += v
+                else:
+                    out[pom1 + i1, pom2 + nrows[1] + i2, pom3 + i3] = v
+
+    # Extra rows along the third axis
+    #$omp for schedule(static) collapse(3)
+    for i1 in range(nrows[0] + nrows_extra[0]):
+        for i2 in range(nrows[1] + nrows_extra[1]):
+            for i3 in range(nrows_extra[2]):
+                v *= 0
+                x_min1 = pad_imp[0] + (i1 + start_impact1) // cm[0] * dm[0]
+                x_min2 = pad_imp[1] + (i2 + start_impact2) // cm[1] * dm[1]
+                x_min3 = pad_imp[2] + (i3 + nrows[2] + start_impact3) // cm[2] * dm[2]
+                for k1 in range(ndiags[0] - max(0, i1 + 1 - nrows[0])):
+                    for k2 in range(ndiags[1] - max(0, i2 + 1 - nrows[1])):
+                        for k3 in range(ndiags[2] - i3 - 1):
+                            v += mat[pxm1 + i1, pxm2 + i2, pxm3 + nrows[2] + i3, k1, k2, k3] * x[xo1 + xf1 * (x_min1 + k1), xo2 + xf2 * (x_min2 + k2), xo3 + xf3 * (x_min3 + k3)]
+                if add:
+                    out[pom1 + i1, pom2 + i2, pom3 + nrows[2] + i3] += v
+                else:
+                    out[pom1 + i1, pom2 + i2, pom3 + nrows[2] + i3] = v
+    #$omp end parallel
+    return
@@ -0,0 +1,113 @@
+from pyccel.decorators import template
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def sor_sweep_1d(mat: 'T[:,:]', b: 'T[:]', x: 'T[:]', counts: 'int64[:]', pads: 'int64[:]',
+                 gpads: 'int64[:]', omega: 'float', forward: 'bool'):
+    """
+    Kernel for one (forward or backward) SOR sweep over the local rows of a
+    square stencil matrix (case of 1D arrays). Only the entries of the local
+    block of the matrix are used: the ghost regions of x are ignored.
+
+    Parameters
+    ----------
+    mat : 2D NumPy array
+        Data of the stencil matrix.
+
+    b, x : 1D NumPy array
+        Data of the right-hand side and of the solution, updated in place.
+
+    counts : 1D NumPy array
+        Number of local rows along each direction.
+
+    pads : 1D NumPy array
+        Padding of the matrix (number of diagonals on each side of the main one).
+
+    gpads : 1D NumPy array
+        Number of ghost cells of the arrays.
+
+    omega : float
+        Relaxation parameter (1 for Gauss-Seidel).
+
+    forward : bool
+        If True the rows are visited in increasing order, otherwise in decreasing order.
+    """
+    n1 = counts[0]
+    p1 = pads[0]
+    g1 = gpads[0]
+
+    f1 = 0
+    s1 = 1
+    if not forward:
+        f1 = n1 - 1
+        s1 = -1
+
+    for l1 in range(n1):
+        i1 = f1 + s1 * l1
+        v  = b[g1 + i1]
+        for k1 in range(max(0, p1 - i1), min(2 * p1 + 1, n1 - i1 + p1)):
+            v -= mat[g1 + i1, k1] * x[g1 + i1 + k1 - p1]
+        d = mat[g1 + i1, p1]
+        x[g1 + i1] += omega * v / d
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def sor_sweep_2d(mat: 'T[:,:,:,:]', b: 'T[:,:]', x: 'T[:,:]', counts: 'int64[:]', pads: 'int64[:]',
+                 gpads: 'int64[:]', omega: 'float', forward: 'bool'):
+    """
+    Kernel for one (forward or backward) SOR sweep over the local rows of a
+    square stencil matrix (case of 2D arrays). See sor_sweep_1d.
+    """
+    n1, n2 = counts[0], counts[1]
+    p1, p2 = pads[0], pads[1]
+    g1, g2 = gpads[0], gpads[1]
+
+    f1, f2 = 0, 0
+    s1 = 1
+    if not forward:
+        f1, f2 = n1 - 1, n2 - 1
+        s1 = -1
+
+    for l1 in range(n1):
+        i1 = f1 + s1 * l1
+        for l2 in range(n2):
+            i2 = f2 + s1 * l2
+            v  = b[g1 + i1, g2 + i2]
+            for k1 in range(max(0, p1 - i1), min(2 * p1 + 1, n1 - i1 + p1)):
+                for k2 in range(max(0, p2 - i2), min(2 * p2 + 1, n2 - i2 + p2)):
+                    v -= mat[g1 + i1, g2 + i2, k1, k2] * x[g1 + i1 + k1 - p1, g2 + i2 + k2 - p2]
+            d = mat[g1 + i1, g2 + i2, p1, p2]
+            x[g1 + i1, g2 + i2] += omega * v / d
+
+#==============================================================================
+@template(name='T', types=[float, complex])
+def sor_sweep_3d(mat: 'T[:,:,:,:,:,:]', b: 'T[:,:,:]', x: 'T[:,:,:]', counts: 'int64[:]', pads: 'int64[:]',
+                 gpads: 'int64[:]', omega: 'float', forward: 'bool'):
+    """
+    Kernel for one (forward or backward) SOR sweep over the local rows of a
+    square stencil matrix (case of 3D arrays). See sor_sweep_1d.
+    """
+    n1, n2, n3 = counts[0], counts[1], counts[2]
+    p1, p2, p3 = pads[0], pads[1], pads[2]
+    g1, g2, g3 = gpads[0], gpads[1], gpads[2]
+
+    f1, f2, f3 = 0, 0, 0
+    s1 = 1
+    if not forward:
+        f1, f2, f3 = n1 - 1, n2 - 1, n3 - 1
+        s1 = -1
+
+    for l1 in range(n1):
+        i1 = f1 + s1 * l1
+        for l2 in range(n2):
+            i2 = f2 + s1 * l2
+            for l3 in range(n3):
+                i3 = f3 + s1 * l3
+                v  = b[g1 + i1, g2 + i2, g3 + i3]
+                for k1 in range(max(0, p1 - i1), min(2 * p1 + 1, n1 - i1 + p1)):
+                    for k2 in range(max(0, p2 - i2), min(2 * p2 + 1, n2 - i2 + p2)):
+                        for k3 in range(max(0, p3 - i3), min(2 * p3 + 1, n3 - i3 + p3)):
+                            v -= mat[g1 + i1, g2 + i2, g3 + i3, k1, k2, k3] \
+                               * x[g1 + i1 + k1 - p1, g2 + i2 + k2 - p2, g3 + i3 + k3 - p3]
+                d = mat[g1 + i1, g2 + i2, g3 + i3, p1, p2, p3]
+                x[g1 + i1, g2 + i2, g3 + i3] += omega * v / d
@@ -0,0 +1,97 @@
+from pyccel.decorators import template
+
+# The pads pc of the product C = A @ B may differ from pa + pb: the products of
+# diagonals of A and B which contribute outside of the band of C are skipped.
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def matmul_1d(A  : "T[:,:]",
+              B  : "T[:,:]",
+              C  : "T[:,:]",
+              nr : "int64[:]",
+              gw : "int64[:]",
+              gv : "int64[:]",
+              pa : "int64[:]",
+              pb : "int64[:]",
+              pc : "int64[:]",
+              mlo: "int64[:]",
+              mhi: "int64[:]"):
+
+    #$omp parallel default(private) shared(A,B,C) firstprivate(nr,gw,gv,pa,pb,pc,mlo,mhi)
+    d1 = pc[0] - pa[0] - pb[0]
+    #$omp for schedule(static) collapse(1)
+    for i1 in range(nr[0]):
+        for ka1 in range(2*pa[0]+1):
+            m1 = i1 + ka1 - pa[0]
+            if m1 >= mlo[0] and m1 < mhi[0]:
+                for kb1 in range(max(0, -d1-ka1), min(2*pb[0]+1, 2*pc[0]+1-d1-ka1)):
+                    C[gw[0]+i1, d1+ka1+kb1] += A[gw[0]+i1, ka1] * B[gv[0]+m1, kb1]
+    #$omp end parallel
+    return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def matmul_2d(A  : "T[:,:,:,:]",
+              B  : "T[:,:,:,:]",
+              C  : "T[:,:,:,:]",
+              nr : "int64[:]",
+              gw : "int64[:]",
+              gv : "int64[:]",
+              pa : "int64[:]",
+              pb : "int64[:]",
+              pc : "int64[:]",
+              mlo: "int64[:]",
+              mhi: "int64[:]"):
+
+    #$omp parallel default(private) shared(A,B,C) firstprivate(nr,gw,gv,pa,pb,pc,mlo,mhi)
+    d1 = pc[0] - pa[0] - pb[0]
+    d2 = pc[1] - pa[1] - pb[1]
+    #$omp for schedule(static) collapse(2)
+    for i1 in range(nr[0]):
+        for i2 in range(nr[1]):
+            for ka1 in range(2*pa[0]+1):
+                for ka2 in range(2*pa[1]+1):
+                    m1 = i1 + ka1 - pa[0]
+                    m2 = i2 + ka2 - pa[1]
+                    if m1 >= mlo[0] and m1 < mhi[0] and m2 >= mlo[1] and m2 < mhi[1]:
+                        for kb1 in range(max(0, -d1-ka1), min(2*pb[0]+1, 2*pc[0]+1-d1-ka1)):
+                            for kb2 in range(max(0, -d2-ka2), min(2*pb[1]+1, 2*pc[1]+1-d2-ka2)):
+                                C[gw[0]+i1, gw[1]+i2, d1+ka1+kb1, d2+ka2+kb2] += A[gw[0]+i1, gw[1]+i2, ka1, ka2] * B[gv[0]+m1, gv[1]+m2, kb1, kb2]
+    #$omp end parallel
+    return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def matmul_3d(A  : "T[:,:,:,:,:,:]",
+              B  : "T[:,:,:,:,:,:]",
+              C  : "T[:,:,:,:,:,:]",
+              nr : "int64[:]",
+              gw : "int64[:]",
+              gv : "int64[:]",
+              pa : "int64[:]",
+              pb : "int64[:]",
+              pc : "int64[:]",
+              mlo: "int64[:]",
+              mhi: "int64[:]"):
+
+    #$omp parallel default(private) shared(A,B,C) firstprivate(nr,gw,gv,pa,pb,pc,mlo,mhi)
+    d1 = pc[0] - pa[0] - pb[0]
+    d2 = pc[1] - pa[1] - pb[1]
+    d3 = pc[2] - pa[2] - pb[2]
+    #$omp for schedule(static) collapse(3)
+    for i1 in range(nr[0]):
+        for i2 in range(nr[1]):
+            for i3 in range(nr[2]):
+                for ka1 in range(2*pa[0]+1):
+                    for ka2 in range(2*pa[1]+1):
+                        for ka3 in range(2*pa[2]+1):
+                            m1 = i1 + ka1 - pa[0]
+                            m2 = i2 + ka2 - pa[1]
+                            m3 = i3 + ka3 - pa[2]
+                            if m1 >= mlo[0] and m1 < mhi[0] and m2 >= mlo[1] and m2 < mhi[1] and m3 >= mlo[2] and m3 < mhi[2]:
+                                for kb1 in range(max(0, -d1-ka1), min(2*pb[0]+1, 2*pc[0]+1-d1-ka1)):
+                                    for kb2 in range(max(0, -d2-ka2), min(2*pb[1]+1, 2*pc[1]+1-d2-ka2)):
+                                        for kb3 in range(max(0, -d3-ka3), min(2*pb[2]+1, 2*pc[2]+1-d3-ka3)):
+                                            C[gw[0]+i1, gw[1]+i2, gw[2]+i3, d1+ka1+kb1, d2+ka2+kb2, d3+ka3+kb3] += A[gw[0]+i1, gw[1]+i2, gw[2]+i3, ka1, ka2, ka3] * B[gv[0]+m1, gv[1]+m2, gv[2]+m3, kb1, kb2, kb3]
+    #$omp end parallel
+    return
@@ -14,9 +14,10 @@ def transpose_1d(M  : "T[:,:]",
                  ndT: "int64[:]",
                  si : "int64[:]",
                  sk : "int64[:]",
-                 sl : "int64[:]"):
+                 sl : "int64[:]",
+                 conjugate : "bool"):
 
-    #$omp parallel default(private) shared(Mt,M) firstprivate( n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl)
+    #$omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,conjugate)
     d1 = gp[0] - p[0]
     e1 = nd[0] - sl[0]
     #$omp for schedule(static) collapse(1)
@@ -30,7 +31,10 @@ def transpose_1d(M  : "T[:,:]",
             k1 = sk[0] + x1 % dm[0] - dm[0] * (l1 // cm[0])
 
             if k1 < ndT[0] and k1 > -1 and l1  < e1 and i1 < nc[0]:
-                Mt[j1, l1 + sl[0]] = M[i1, k1]
+                if conjugate:
+                    Mt[j1, l1 + sl[0]] = M[i1, k1].conjugate()
+                else:
+                    Mt[j1, l1 + sl[0]] = M[i1, k1]
     #$omp end parallel
     return
 
@@ -48,9 +52,10 @@ def transpose_2d(M  : "T[:,:,:,:]",
                  ndT: "int64[:]",
                  si : "int64[:]",
                  sk : "int64[:]",
-                 sl : "int64[:]"):
+                 sl : "int64[:]",
+                 conjugate : "bool"):
 
-    #$omp parallel default(private) shared(Mt,M) firstprivate( n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl)
+    #$omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,conjugate)
     d1 = gp[0] - p[0]
     d2 = gp[1] - p[1]
 
@@ -74,7 +79,10 @@ def transpose_2d(M  : "T[:,:,:,:]",
                     k2 = sk[1] + x2%dm[1]-dm[1]*(l2//cm[1])
 
                     if k1<ndT[0] and k1>-1 and k2<ndT[1] and k2>-1 and l1<e1 and l2<e2 and i1<nc[0] and i2<nc[1]:
-                        Mt[j1,j2, l1 + sl[0],l2 + sl[1]] = M[i1,i2, k1,k2]
+                        if conjugate:
+                            Mt[j1,j2, l1 + sl[0],l2 + sl[1]] = M[i1,i2, k1,k2].conjugate()
+                        else:
+                            Mt[j1,j2, l1 + sl[0],l2 + sl[1]] = M[i1,i2, k1,k2]
     #$omp end parallel
     return
 
@@ -92,9 +100,10 @@ def transpose_3d(M  : "T[:,:,:,:,:,:]",
                  ndT: "int64[:]",
                  si : "int64[:]",
                  sk : "int64[:]",
-                 sl : "int64[:]"):
+                 sl : "int64[:]",
+                 conjugate : "bool"):
 
-    #$omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl)
+    #$omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,conjugate)
     d1 = gp[0] - p[0]
     d2 = gp[1] - p[1]
     d3 = gp[2] - p[2]
@@ -126,7 +135,10 @@ def transpose_3d(M  : "T[:,:,:,:,:,:]",
 
                             if k1<ndT[0] and k1>-1 and k2<ndT[1] and k2>-1 and k3<ndT[2] and k3>-1\
                                 and l1<e1 and l2<e2 and l3<e3 and i1<nc[0] and i2<nc[1] and i3<nc[2]:
-                                Mt[j1,j2,j3, l1 + sl[0],l2 + sl[1],l3 + sl[2]] = M[i1,i2,i3, k1,k2,k3]
+                                if conjugate:
+                                    Mt[j1,j2,j3, l1 + sl[0],l2 + sl[1],l3 + sl[2]] = M[i1,i2,i3, k1,k2,k3].conjugate()
+                                else:
+                                    Mt[j1,j2,j3, l1 + sl[0],l2 + sl[1],l3 + sl[2]] = M[i1,i2,i3, k1,k2,k3]
     #$omp end parallel
     return
 
@@ -144,9 +156,10 @@ def interface_transpose_1d(M  : "T[:,:]",
                            ndT: "int64[:]",
                            si : "int64[:]",
                            sk : "int64[:]",
-                           sl : "int64[:]"):
+                           sl : "int64[:]",
+                           conjugate : "bool"):
 
-    #$ omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl)
+    #$ omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,conjugate)
     d1 = gp[0] - p [0]
     e1 = nd[0] - sl[0]
 
@@ -162,7 +175,10 @@ def interface_transpose_1d(M  : "T[:,:]",
                             k1 = sk[0] + x1%dm[0] - dm[0]*(l1//cm[0])
 
                             if k1<ndT[0] and k1>-1 and l1<e1 and i1<nc[0]:
-                                Mt[j1, l1+sl[0]] = M[i1, k1]
+                                if conjugate:
+                                    Mt[j1, l1+sl[0]] = M[i1, k1].conjugate()
+                                else:
+                                    Mt[j1, l1+sl[0]] = M[i1, k1]
 
     #$ omp end parallel
     return
@@ -181,9 +197,10 @@ def interface_transpose_2d(M  : "T[:,:,:,:]",
                            ndT: "int64[:]",
                            si : "int64[:]",
                            sk : "int64[:]",
-                           sl : "int64[:]"):
+                           sl : "int64[:]",
+                           conjugate : "bool"):
 
-    #$ omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl)
+    #$ omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,conjugate)
     d1 = gp[0] - p[0]
     d2 = gp[1] - p[1]
 
@@ -208,7 +225,10 @@ def interface_transpose_2d(M  : "T[:,:,:,:]",
 
                             if k1<ndT[0] and k1>-1 and k2<ndT[1] and k2>-1\
                               and l1<e1 and l2<e2 and i1<nc[0] and i2<nc[1]:
-                                Mt[j1,j2, l1+sl[0],l2+sl[1]] = M[i1,i2, k1,k2]
+                                if conjugate:
+                                    Mt[j1,j2, l1+sl[0],l2+sl[1]] = M[i1,i2, k1,k2].conjugate()
+                                else:
+                                    Mt[j1,j2, l1+sl[0],l2+sl[1]] = M[i1,i2, k1,k2]
 
     #$ omp end parallel
     return
@@ -227,9 +247,10 @@ def interface_transpose_3d(M  : "T[:,:,:,:,:,:]",
                            ndT: "int64[:]",
                            si : "int64[:]",
                            sk : "int64[:]",
-                           sl : "int64[:]"):
+                           sl : "int64[:]",
+                           conjugate : "bool"):
 
-    #$ omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl)
+    #$ omp parallel default(private) shared(Mt,M) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,conjugate)
     d1 = gp[0] - p[0]
     d2 = gp[1] - p[1]
     d3 = gp[2] - p[2]
@@ -261,7 +282,197 @@ def interface_transpose_3d(M  : "T[:,:,:,:,:,:]",
 
                             if k1<ndT[0] and k1>-1 and k2<ndT[1] and k2>-1 and k3<ndT[2] and k3>-1\
                               and l1<e1 and l2<e2 and l3<e3 and i1<nc[0] and i2<nc[1] and i3<nc[2]:
-                                Mt[j1,j2,j3, l1+sl[0],l2+sl[1],l3+sl[2]] = M[i1,i2,i3, k1,k2,k3]
+                                if conjugate:
+                                    Mt[j1,j2,j3, l1+sl[0],l2+sl[1],l3+sl[2]] = M[i1,i2,i3, k1,k2,k3].conjugate()
+                                else:
+                                    Mt[j1,j2,j3, l1+sl[0],l2+sl[1],l3+sl[2]] = M[i1,i2,i3, k1,k2,k3]
 
     #$ omp end parallel
     return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def transpose_matvec_1d(M  : "T[:,:]",
+                        x  : "T[:]",
+                        out: "T[:]",
+                        n  : "int64[:]",
+                        nc : "int64[:]",
+                        gp : "int64[:]",
+                        p  : "int64[:]",
+                        dm : "int64[:]",
+                        cm : "int64[:]",
+                        nd : "int64[:]",
+                        ndT: "int64[:]",
+                        si : "int64[:]",
+                        sk : "int64[:]",
+                        sl : "int64[:]",
+                        xm : "int64[:]",
+                        xs : "int64[:]",
+                        conjugate : "bool"):
+
+    #$omp parallel default(private) shared(out,M,x) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,xm,xs,conjugate)
+    d1 = gp[0] - p[0]
+    e1 = nd[0] - sl[0]
+
+    nx1 = x.shape[0]
+
+    v = M[0, 0] - M[0, 0] + x[0] - x[0]
+
+    #$omp for schedule(static) collapse(1)
+    for x1 in range(n[0]):
+
+        j1 = dm[0] * gp[0] + x1
+        y1 = xm[0] + sl[0] + (x1 + xs[0]) // dm[0] * cm[0]
+
+        v *= 0
+        for l1 in range(nd[0]):
+
+            i1 = si[0] + cm[0] * (x1 // dm[0]) + l1 + d1
+
+            k1 = sk[0] + x1 % dm[0] - dm[0] * (l1 // cm[0])
+
+            if k1 < ndT[0] and k1 > -1 and l1 < e1 and i1 < nc[0] and l1 + y1 < nx1:
+                if conjugate:
+                    v += M[i1, k1].conjugate() * x[l1 + y1]
+                else:
+                    v += M[i1, k1] * x[l1 + y1]
+
+        out[j1] = v
+    #$omp end parallel
+    return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def transpose_matvec_2d(M  : "T[:,:,:,:]",
+                        x  : "T[:,:]",
+                        out: "T[:,:]",
+                        n  : "int64[:]",
+                        nc : "int64[:]",
+                        gp : "int64[:]",
+                        p  : "int64[:]",
+                        dm : "int64[:]",
+                        cm : "int64[:]",
+                        nd : "int64[:]",
+                        ndT: "int64[:]",
+                        si : "int64[:]",
+                        sk : "int64[:]",
+                        sl : "int64[:]",
+                        xm : "int64[:]",
+                        xs : "int64[:]",
+                        conjugate : "bool"):
+
+    #$omp parallel default(private) shared(out,M,x) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,xm,xs,conjugate)
+    d1 = gp[0] - p[0]
+    d2 = gp[1] - p[1]
+
+    e1 = nd[0] - sl[0]
+    e2 = nd[1] - sl[1]
+
+    nx1 = x.shape[0]
+    nx2 = x.shape[1]
+
+    v = M[0, 0, 0, 0] - M[0, 0, 0, 0] + x[0, 0] - x[0, 0]
+
+    #$omp for schedule(static) collapse(2)
+    for x1 in range(n[0]):
+        for x2 in range(n[1]):
+
+            j1 = dm[0]*gp[0] + x1
+            j2 = dm[1]*gp[1] + x2
+
+            y1 = xm[0] + sl[0] + (x1 + xs[0])//dm[0]*cm[0]
+            y2 = xm[1] + sl[1] + (x2 + xs[1])//dm[1]*cm[1]
+
+            v *= 0
+            for l1 in range(nd[0]):
+                for l2 in range(nd[1]):
+
+                    i1 = si[0] + cm[0]*(x1//dm[0]) + l1 + d1
+                    i2 = si[1] + cm[1]*(x2//dm[1]) + l2 + d2
+
+                    k1 = sk[0] + x1%dm[0]-dm[0]*(l1//cm[0])
+                    k2 = sk[1] + x2%dm[1]-dm[1]*(l2//cm[1])
+
+                    if k1<ndT[0] and k1>-1 and k2<ndT[1] and k2>-1 and l1<e1 and l2<e2 and i1<nc[0] and i2<nc[1]\
+                        and l1+y1<nx1 and l2+y2<nx2:
+                        if conjugate:
+                            v += M[i1,i2, k1,k2].conjugate() * x[l1+y1, l2+y2]
+                        else:
+                            v += M[i1,i2, k1,k2] * x[l1+y1, l2+y2]
+
+            out[j1,j2] = v
+    #$omp end parallel
+    return
+
+#========================================================================================================
+@template(name='T', types=[float, complex])
+def transpose_matvec_3d(M  : "T[:,:,:,:,:,:]",
+                        x  : "T[:,:,:]",
+                        out: "T[:,:,:]",
+                        n  : "int64[:]",
+                        nc : "int64[:]",
+                        gp : "int64[:]",
+                        p  : "int64[:]",
+                        dm : "int64[:]",
+                        cm : "int64[:]",
+                        nd : "int64[:]",
+                        ndT: "int64[:]",
+                        si : "int64[:]",
+                        sk : "int64[:]",
+                        sl : "int64[:]",
+                        xm : "int64[:]",
+                        xs : "int64[:]",
+                        conjugate : "bool"):
+
+    #$omp parallel default(private) shared(out,M,x) firstprivate(n,nc,gp,p,dm,cm,nd,ndT,si,sk,sl,xm,xs,conjugate)
+    d1 = gp[0] - p[0]
+    d2 = gp[1] - p[1]
+    d3 = gp[2] - p[2]
+
+    e1 = nd[0] - sl[0]
+    e2 = nd[1] - sl[1]
+    e3 = nd[2] - sl[2]
+
+    nx1 = x.shape[0]
+    nx2 = x.shape[1]
+    nx3 = x.shape[2]
+
+    v = M[0, 0, 0, 0, 0, 0] - M[0, 0, 0, 0, 0, 0] + x[0, 0, 0] - x[0, 0, 0]
+
+    #$omp for schedule(static) collapse(3)
+    for x1 in range(n[0]):
+        for x2 in range(n[1]):
+            for x3 in range(n[2]):
+
+                j1 = dm[0]*gp[0] + x1
+                j2 = dm[1]*gp[1] + x2
+                j3 = dm[2]*gp[2] + x3
+
+                y1 = xm[0] + sl[0] + (x1 + xs[0])//dm[0]*cm[0]
+                y2 = xm[1] + sl[1] + (x2 + xs[1])//dm[1]*cm[1]
+                y3 = xm[2] + sl[2] + (x3 + xs[2])//dm[2]*cm[2]
+
+                v *= 0
+                for l1 in range(nd[0]):
+                    for l2 in range(nd[1]):
+                        for l3 in range(nd[2]):
+
+                            i1 = si[0] + cm[0]*(x1//dm[0]) + l1 + d1
+                            i2 = si[1] + cm[1]*(x2//dm[1]) + l2 + d2
+                            i3 = si[2] + cm[2]*(x3//dm[2]) + l3 + d3
+
+                            k1 = sk[0] + x1%dm[0]-dm[0]*(l1//cm[0])
+                            k2 = sk[1] + x2%dm[1]-dm[1]*(l2//cm[1])
+                            k3 = sk[2] + x3%dm[2]-dm[2]*(l3//cm[2])
+
+                            if k1<ndT[0] and k1>-1 and k2<ndT[1] and k2>-1 and k3<ndT[2] and k3>-1\
+                                and l1<e1 and l2<e2 and l3<e3 and i1<nc[0] and i2<nc[1] and i3<nc[2]\
+                                and l1+y1<nx1 and l2+y2<nx2 and l3+y3<nx3:
+                                if conjugate:
+                                    v += M[i1,i2,i3, k1,k2,k3].conjugate() * x[l1+y1, l2+y2, l3+y3]
+                                else:
+                                    v += M[i1,i2,i3, k1,k2,k3] * x[l1+y1, l2+y2, l3+y3]
+
+                out[j1,j2,j3] = v
+    #$omp end parallel
+    return
@@ -2,14 +2,19 @@
 from functools import reduce
 
 import numpy as np
+from scipy.linalg import eigh
 from scipy.sparse import kron
 from scipy.sparse import coo_matrix
 
 from psydac.linalg.basic   import LinearOperator, LinearSolver
 from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.direct_solvers import banded_solver
+from psydac.ddm.shared          import share_array
 
 __all__ = ('KroneckerStencilMatrix',
+           'KroneckerStencilMatrixSum',
            'KroneckerLinearSolver',
+           'FastDiagonalizationSolver',
            'KroneckerDenseMatrix',
            'kronecker_solve')
 
@@ -76,8 +81,6 @@ class KroneckerStencilMatrix(LinearOperator):
     # ...
     def dot(self, x, out=None):
 
-        dot = np.dot
-
         assert isinstance(x, StencilVector)
         assert x.space is self.domain
 
@@ -91,25 +94,37 @@ class KroneckerStencilMatrix(LinearOperator):
         else:
             out = StencilVector(self.codomain)
 
-        starts = self._codomain.starts
-        ends   = self._codomain.ends
-        pads   = self._codomain.pads
-
-        mats   = self.mats
-        
-        nrows  = tuple(e-s+1 for s,e in zip(starts, ends))
-        pnrows = tuple(2*p+1 for p in pads)
-        
-        for ii in np.ndindex(*nrows):
-            v = 0.
-            xx = tuple(i+p for i,p in zip(ii, pads))
-
-            for jj in np.ndindex(*pnrows):
-                i_mats = [mat._data[s, j] for s,j,mat in zip(xx, jj, mats)]
-                ii_jj = tuple(i+j for i,j in zip(ii, jj))
-                v += x._data[ii_jj] * np.prod(i_mats)
-
-            out._data[xx] = v
+        # Apply the 1D matrices one direction after the other: after step d the
+        # array only contains the local rows along the directions 0, ..., d,
+        # and still contains the ghost regions along the other directions
+        y = x._data
+        for d, (A, rows) in enumerate(zip(self.mats, self._factors())):
+            nrows = rows.shape[0]
+            pa    = A.pads[0]
+            shift = self.domain.pads[d] * self.domain.shifts[d] + self.codomain.starts[d] - self.domain.starts[d] - pa
+            shape = [1] * self.ndim
+            shape[d] = nrows
+
+            # Rectangular matrices: the band can reach beyond the ghost regions
+            # of x, where the entries of the matrix vanish
+            before = max(-shift, 0)
+            after  = max(shift + 2*pa + nrows - y.shape[d], 0)
+            if before or after:
+                width    = [(0, 0)] * self.ndim
+                width[d] = (before, after)
+                y        = np.pad(y, width)
+                shift   += before
+
+            z = 0
+            for k in range(2*pa + 1):
+                index    = [slice(None)] * self.ndim
+                index[d] = slice(shift + k, shift + k + nrows)
+                z = z + rows[:, k].reshape(shape) * y[tuple(index)]
+            y = z
+
+        index = tuple(slice(p*m, p*m + n) for p, m, n in zip(self.codomain.pads, self.codomain.shifts, y.shape))
+        out._data[...] = 0
+        out._data[index] = y
 
         # IMPORTANT: flag that ghost regions are not up-to-date
         out.ghost_regions_in_sync = False
@@ -147,77 +162,151 @@ class KroneckerStencilMatrix(LinearOperator):
         elements = [A[i,j] for A,i,j in zip(mats, rows, cols)]
         return np.prod(elements)
 
-    def tostencil(self):
+    def _factors(self):
+        """
+        Rows of the 1D matrices (in stencil format) which correspond to the
+        rows of the Kronecker product owned by the process.
+        """
+        factors = []
+        for A, s, e in zip(self.mats, self.codomain.starts, self.codomain.ends):
+            r = A.codomain.pads[0] * A.codomain.shifts[0]
+            factors.append(A._data[r+s:r+e+1])
+        return factors
 
-        mats  = self.mats
-        ssc   = self.codomain.starts
-        eec   = self.codomain.ends
-        ssd   = self.domain.starts
-        eed   = self.domain.ends
-        pads  = [A.pads[0] for A in self.mats]
-        xpads = self.domain.pads
+    def tostencil(self):
 
-        # Number of rows in matrix (along each dimension)
-        nrows       = [ed-s+1 for s,ed in zip(ssd, eed)]
-        nrows_extra = [0 if ec<=ed else ec-ed for ec,ed in zip(eec,eed)]
+        ndim = self.ndim
+        pads = [A.pads[0] for A in self.mats]
 
         # create the stencil matrix
-        M  = StencilMatrix(self.domain, self.codomain, pads=tuple(pads))
+        M = StencilMatrix(self.domain, self.codomain, pads=tuple(pads))
+
+        # Outer product of the local rows of the 1D matrices, with axes
+        # (row_1, ..., row_d, diag_1, ..., diag_d)
+        values = 1
+        for d, rows in enumerate(self._factors()):
+            shape = [1] * (2*ndim)
+            shape[d], shape[ndim+d] = rows.shape
+            values = values * rows.reshape(shape)
+
+        index = tuple(slice(p*m, p*m + n) for p, m, n in zip(self.codomain.pads, self.codomain.shifts, values.shape))
+        M._data[index] = values
+        return M
 
-        mats = [mat._data for mat in mats]
+    def tosparse(self):
+        return reduce(kron, (m.tosparse() for m in self.mats))
 
-        self._tostencil(M._data, mats, nrows, nrows_extra, pads, xpads)
-        return M
+    def toarray(self):
+        return self.tosparse().toarray()
 
-    @staticmethod
-    def _tostencil(M, mats, nrows, nrows_extra, pads, xpads):
+    def transpose(self, conjugate=False):
+        mats_tr = [Mi.transpose(conjugate=conjugate) for Mi in self.mats]
+        return KroneckerStencilMatrix(self.codomain, self.domain, *mats_tr)
 
-        ndiags = [2*p + 1 for p in pads]
-        diff   = [xp-p for xp,p in zip(xpads, pads)]
-        ndim   = len(nrows)
+#==============================================================================
+class KroneckerStencilMatrixSum(LinearOperator):
+    """
+    Sum of Kronecker products of 1D stencil matrices, e.g. the stiffness
+    matrix K1 x M2 + M1 x K2 of the Laplace operator on a Cartesian grid.
 
-        for xx in np.ndindex( *nrows ):
+    Parameters
+    ----------
+    V : StencilVectorSpace
+        The domain.
 
-            ii = tuple(xp + x for xp, x in zip(xpads, xx) )
+    W : StencilVectorSpace
+        The codomain.
 
-            for kk in np.ndindex( *ndiags ):
+    args : list of KroneckerStencilMatrix
+        Terms of the sum, from V to W.
 
-                values        = [mat[i,k] for mat,i,k in zip(mats, ii, kk)]
-                M[(*ii, *kk)] = np.prod(values)
-        
-        # handle partly-multiplied rows
-        new_nrows = nrows.copy()
-        for d,er in enumerate(nrows_extra):
-
-            rows = new_nrows.copy()
-            del rows[d]
-
-            for n in range(er):
-                for xx in np.ndindex(*rows):
-                    xx = list(xx)
-                    xx.insert(d, nrows[d]+n)
-
-                    ii     = tuple(x+xp for x,xp in zip(xx, xpads))
-                    ee     = [max(x-l+1,0) for x,l in zip(xx, nrows)]
-                    jj     = tuple( slice(x+d, x+d+2*p+1-e) for x,p,d,e in zip(xx, pads, diff, ee) )
-                    ndiags = [2*p + 1-e for p,e in zip(pads,ee)]
-                    kk     = [slice(None,diag) for diag in ndiags]
-                    ii_kk  = tuple( list(ii) + kk )
-
-                    for kk in np.ndindex( *ndiags ):
-                        values        = [mat[i,k] for mat,i,k in zip(mats, ii, kk)]
-                        M[(*ii, *kk)] = np.prod(values)
-            new_nrows[d] += er
+    """
+
+    def __init__(self, V, W, *args):
+
+        assert isinstance(V, StencilVectorSpace)
+        assert isinstance(W, StencilVectorSpace)
+        assert len(args) > 0
+
+        for A in args:
+            assert isinstance(A, KroneckerStencilMatrix)
+            assert A.domain is V
+            assert A.codomain is W
+
+        self._domain   = V
+        self._codomain = W
+        self._terms    = args
+
+    #--------------------------------------
+    # Abstract interface
+    #--------------------------------------
+    @property
+    def domain( self ):
+        return self._domain
+
+    # ...
+    @property
+    def codomain( self ):
+        return self._codomain
+
+    # ...
+    @property
+    def dtype( self ):
+        return self.domain.dtype
+
+    # ...
+    @property
+    def ndim( self ):
+        return self._domain.ndim
+
+    # ...
+    @property
+    def terms( self ):
+        return self._terms
+
+    # ...
+    def dot(self, x, out=None):
+        out = self._terms[0].dot(x, out=out)
+        for A in self._terms[1:]:
+            A.idot(x, out)
+        return out
+
+    # ...
+    def copy(self):
+        return KroneckerStencilMatrixSum(self.domain, self.codomain, *(A.copy() for A in self.terms))
+
+    # ...
+    def __neg__(self):
+        return KroneckerStencilMatrixSum(self.domain, self.codomain, *(-A for A in self.terms))
+
+    # ...
+    def __mul__(self, a):
+        return KroneckerStencilMatrixSum(self.domain, self.codomain, *(A * a for A in self.terms))
+
+    # ...
+    def __imul__(self, a):
+        for A in self.terms:
+            A *= a
+        return self
+
+    #--------------------------------------
+    # Other properties/methods
+    #--------------------------------------
+    def tostencil(self):
+        M = self._terms[0].tostencil()
+        for A in self._terms[1:]:
+            M += A.tostencil()
+        return M
 
     def tosparse(self):
-        return reduce(kron, (m.tosparse() for m in self.mats))
+        return sum(A.tosparse() for A in self.terms)
 
     def toarray(self):
         return self.tosparse().toarray()
 
     def transpose(self, conjugate=False):
-        mats_tr = [Mi.transpose(conjugate=conjugate) for Mi in self.mats]
-        return KroneckerStencilMatrix(self.codomain, self.domain, *mats_tr)
+        terms = [A.transpose(conjugate=conjugate) for A in self.terms]
+        return KroneckerStencilMatrixSum(self.codomain, self.domain, *terms)
 
 #==============================================================================
 class KroneckerDenseMatrix(LinearOperator):
@@ -386,8 +475,17 @@ class KroneckerLinearSolver(LinearOperator):
         The space x will live in; i.e. which gives us information about
         the distribution of the unknown vector x.
     
-    solvers : list of LinearSolver
-        The components of A in each dimension.
+    solvers : list of LinearSolver | StencilMatrix
+        The components of A in each dimension. The 1D stencil matrices, e.g.
+        the factors of a KroneckerStencilMatrix, are factorized here with a
+        banded (or cyclic banded) LU decomposition.
+
+    shared : bool
+        If True, the data of the 1D solvers (which is replicated on all the
+        processes) is stored in the shared memory of each node, see
+        LinearSolver.share. The shared memory is released collectively, with
+        psydac.ddm.shared.free_shared(V.cart.comm) or when this communicator
+        is freed (default: False).
     
     Attributes
     ----------
@@ -397,13 +495,20 @@ class KroneckerLinearSolver(LinearOperator):
     codomain : StencilVectorSpace
         The space of the unknown vector x.
     """
-    def __init__(self, V, W, solvers):
+    def __init__(self, V, W, solvers, *, shared=False):
         assert isinstance(V, StencilVectorSpace)
         assert isinstance(W, StencilVectorSpace)
         assert hasattr( solvers, '__iter__' )
+        solvers = [banded_solver(s.tosparse(), s.domain.periods[0], V.dtype) if isinstance(s, StencilMatrix) else s
+                   for s in solvers]
         for solver in solvers:
             assert isinstance(solver, LinearSolver)
 
+        # the 1D solvers are the same on all processes: one copy per node is enough
+        if shared and V.parallel and not V.cart.is_comm_null:
+            for solver in solvers:
+                solver.share(V.cart.comm)
+
         assert V.ndim == len(solvers)
         assert W.ndim == len(solvers)
         assert V.npts == W.npts
@@ -412,6 +517,7 @@ class KroneckerLinearSolver(LinearOperator):
         self._domain = V
         self._codomain = W
         self._solvers = solvers
+        self._shared = shared
         self._parallel = self._domain.parallel
         self._dtype = self._codomain._dtype
         if self._parallel:
@@ -532,8 +638,9 @@ class KroneckerLinearSolver(LinearOperator):
     def transpose(self, conjugate=False):
         new_domain = self._codomain
         new_codomain = self._domain
+        # the transposed 1D solvers use the same (possibly shared) memory
         new_solvers = [solver.transpose() for solver in self._solvers]
-        return KroneckerLinearSolver(new_domain, new_codomain, new_solvers)
+        return KroneckerLinearSolver(new_domain, new_codomain, new_solvers, shared=self._shared)
 
     def dot(self, v, out=None):
         return self.solve(v, out=out)
@@ -876,6 +983,221 @@ class KroneckerLinearSolver(LinearOperator):
             # blocked stripes -> parts of stripes
             self._comm.Alltoallv(targetargs, sourceargs)
 
+#==============================================================================
+class FastDiagonalizationSolver(LinearOperator):
+    """
+    Direct solver for Ax=b, where A is a sum of Kronecker products of 1D
+    symmetric (or Hermitian) matrices, e.g. the matrix
+
+        A = K1 x M2 x M3 + M1 x K2 x M3 + M1 x M2 x K3 + c M1 x M2 x M3
+
+    of the shifted Laplace operator on a Cartesian grid, where Mi and Ki are
+    the 1D mass and stiffness matrices.
+
+    In each direction the distinct 1D factors of the terms are diagonalized
+    simultaneously by the generalized eigenvalue problem Ki Ui = Mi Ui Li,
+    with Ui^H Mi Ui = I. Then A = (U1 x U2 x U3)^{-H} D (U1 x U2 x U3)^{-1}
+    with D diagonal, and the solution x = (U1 x U2 x U3) D^{-1} (U1 x U2 x U3)^H b
+    is computed by two Kronecker products of dense 1D matrices, which use the
+    same (distributed) passes as a KroneckerLinearSolver.
+
+    The solver is also a good preconditioner for the matrices of the same
+    problem on a mapped domain, or with variable coefficients.
+
+    Parameters
+    ----------
+    A : KroneckerStencilMatrix | KroneckerStencilMatrixSum
+        The matrix to invert. In each direction, the 1D factors of its terms
+        must be symmetric (or Hermitian) and at least one of them must be
+        positive definite. At most two of them can be linearly independent.
+
+    tol : float
+        Relative tolerance on the off-diagonal entries of the transformed
+        1D factors, above which a ValueError is raised (default: 1e-10).
+
+    shared : bool
+        If True, the dense 1D matrices, which are the same on all processes,
+        are stored in the shared memory of each node (default: False).
+        See KroneckerLinearSolver.
+
+    Attributes
+    ----------
+    domain : StencilVectorSpace
+        The space of the rhs vector b.
+
+    codomain : StencilVectorSpace
+        The space of the unknown vector x.
+    """
+    def __init__(self, A, tol=1e-10, *, shared=False):
+
+        assert isinstance(A, (KroneckerStencilMatrix, KroneckerStencilMatrixSum))
+        assert A.domain.npts == A.codomain.npts
+
+        terms = A.terms if isinstance(A, KroneckerStencilMatrixSum) else [A]
+
+        V = A.codomain
+        W = A.domain
+        self._domain   = V
+        self._codomain = W
+        self._matrix   = A
+        self._tol      = tol
+        self._shared   = shared
+
+        # Eigenvectors in each direction, and diagonal of the 1D factors of each term
+        eigenvectors = []
+        diagonals    = [[] for _ in terms]
+        for d in range(V.ndim):
+            U, values = self._diagonalize([B.mats[d].toarray() for B in terms], tol)
+            eigenvectors.append(U)
+            for diag, v in zip(diagonals, values):
+                diag.append(v)
+
+        # Local part of the diagonal matrix D
+        local = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+        D = 0
+        for diag in diagonals:
+            D = D + reduce(np.multiply.outer, [v[i] for v, i in zip(diag, local)])
+
+        self._slice    = local
+        self._inv_diag = 1 / D
+
+        # Passes (U1 x U2 x U3)^H and U1 x U2 x U3
+        self._forward  = KroneckerLinearSolver(V, V, [_DenseProductSolver(U.conj().T) for U in eigenvectors], shared=shared)
+        self._backward = KroneckerLinearSolver(V, W, [_DenseProductSolver(U) for U in eigenvectors], shared=shared)
+        self._eigenvectors = [solver._B for solver in self._backward.solvers]
+
+        # Work vector for the intermediate result D^{-1} (U1 x U2 x U3)^H b
+        self._work = StencilVector(V)
+
+    @staticmethod
+    def _diagonalize(mats, tol):
+        """
+        Diagonalize simultaneously the 1D matrices of one direction.
+
+        Returns
+        -------
+        U : ndarray
+            The generalized eigenvectors, with U^H M U = I.
+
+        values : list of ndarray
+            The diagonals of U^H B U for each matrix B.
+        """
+        # Distinct matrices
+        distinct = []
+        for B in mats:
+            if not any(B is C or np.array_equal(B, C) for C in distinct):
+                distinct.append(B)
+
+        for B in distinct:
+            if not np.allclose(B, B.conj().T, rtol=tol, atol=tol * abs(B).max()):
+                raise ValueError('The 1D factors must be symmetric (or Hermitian)')
+
+        # Best conditioned positive definite matrix
+        eigenvalues = [np.linalg.eigvalsh(B) for B in distinct]
+        conditions  = [w[0] / abs(w).max() if w[0] > 0 else 0 for w in eigenvalues]
+        if max(conditions) <= tol:
+            raise ValueError('No 1D factor is positive definite')
+        M = distinct[int(np.argmax(conditions))]
+
+        # The generalized eigenvectors of any other matrix (not proportional
+        # to M) must diagonalize all the matrices
+        for K in [B for B in distinct if B is not M] or [M]:
+            _, U = eigh(K, M)
+            values = []
+            for B in mats:
+                T = U.conj().T @ B @ U
+                v = np.diag(T).copy()
+                if abs(T - np.diag(v)).max() > tol * max(abs(v).max(), 1):
+                    break
+                values.append(v)
+            else:
+                return U, values
+
+        raise ValueError('The 1D factors cannot be diagonalized simultaneously')
+
+    @property
+    def domain(self):
+        return self._domain
+
+    @property
+    def codomain(self):
+        return self._codomain
+
+    @property
+    def dtype(self):
+        return self._domain.dtype
+
+    @property
+    def eigenvectors(self):
+        """
+        The generalized eigenvectors (U1, ..., Un) in each direction.
+        """
+        return tuple(self._eigenvectors)
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for FastDiagonalizationSolvers.')
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for FastDiagonalizationSolvers.')
+
+    def transpose(self, conjugate=False):
+        return FastDiagonalizationSolver(self._matrix.transpose(conjugate=conjugate), tol=self._tol, shared=self._shared)
+
+    def dot(self, v, out=None):
+        return self.solve(v, out=out)
+
+    def solve(self, rhs, out=None):
+        """
+        Solves Ax=b where A is a sum of Kronecker products.
+        """
+        assert rhs.space is self._domain
+
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self._codomain
+        else:
+            out = StencilVector(self._codomain)
+
+        # y = D^{-1} (U1 x U2 x U3)^H b
+        y = self._forward.solve(rhs, out=self._work)
+        y[self._slice] *= self._inv_diag
+
+        # x = (U1 x U2 x U3) y
+        return self._backward.solve(y, out=out)
+
+#==============================================================================
+class _DenseProductSolver(LinearSolver):
+    """
+    Linear solver whose matrix is the inverse of a dense matrix B: hence the
+    solution of the linear system is the product of B and the right-hand side.
+    Used as a 1D solver in the passes of a KroneckerLinearSolver.
+    """
+    def __init__(self, B):
+        self._B = B
+        self._shared = False
+
+    @property
+    def space(self):
+        return np.ndarray
+
+    def transpose(self):
+        obj = _DenseProductSolver(self._B.T)
+        obj._shared = self._shared
+        return obj
+
+    def share(self, comm):
+        if comm is not None and not self._shared:
+            self._B = share_array(self._B, comm)
+            self._shared = True
+        return self
+
+    def solve(self, rhs, out=None):
+        # The right-hand sides are the rows of rhs
+        if out is None:
+            return rhs @ self._B.T
+        out[:] = rhs @ self._B.T
+        return out
+
 #==============================================================================
 def kronecker_solve(solvers, rhs, out=None):
     """
@@ -0,0 +1,274 @@
+# coding: utf-8
+"""
+This module provides preconditioners for the iterative solvers of
+psydac.linalg.solvers (see the `pc` argument of PConjugateGradient,
+PBiConjugateGradientStabilized and GMRES).
+
+"""
+from functools import reduce
+
+import numpy as np
+
+from psydac.linalg.basic   import LinearOperator
+from psydac.linalg.stencil import StencilVector, StencilMatrix
+from psydac.linalg.block   import BlockLinearOperator
+from psydac.linalg.kron    import KroneckerLinearSolver
+
+from psydac.linalg.kernels.gauss_seidel_kernels import sor_sweep_1d, sor_sweep_2d, sor_sweep_3d
+
+__all__ = (
+    'jacobi',
+    'block_jacobi',
+    'GaussSeidel',
+    'KroneckerMassPreconditioner'
+)
+
+#===============================================================================
+def jacobi(A):
+    """
+    Point-Jacobi preconditioner: the inverse of the main diagonal of A.
+
+    Parameters
+    ----------
+    A : StencilMatrix | BlockLinearOperator
+        The matrix of the linear system.
+
+    Returns
+    -------
+    StencilDiagonalMatrix | BlockLinearOperator
+        The inverse of the diagonal of A.
+
+    """
+    assert isinstance(A, (StencilMatrix, BlockLinearOperator))
+    return A.diagonal(inverse=True)
+
+#===============================================================================
+def block_jacobi(A, pcs=None):
+    """
+    Block-Jacobi preconditioner: the block-diagonal operator whose diagonal
+    blocks are approximate inverses of the diagonal blocks of A, e.g. the
+    components of a vector-valued mass matrix.
+
+    Parameters
+    ----------
+    A : BlockLinearOperator
+        The matrix of the linear system, with square diagonal blocks.
+
+    pcs : list of LinearOperator, optional
+        The preconditioners of the diagonal blocks of A. A missing (None) entry
+        is replaced by the point-Jacobi preconditioner of the block (default).
+
+    Returns
+    -------
+    BlockLinearOperator
+        The block-diagonal preconditioner.
+
+    """
+    assert isinstance(A, BlockLinearOperator)
+    assert A.n_block_rows == A.n_block_cols
+
+    n   = A.n_block_rows
+    pcs = list(pcs) if pcs is not None else [None] * n
+    assert len(pcs) == n
+
+    blocks = {}
+    for i, pc in enumerate(pcs):
+        if pc is None:
+            pc = jacobi(A[i, i])
+        assert pc.domain is A.codomain[i]
+        assert pc.codomain is A.domain[i]
+        blocks[i, i] = pc
+
+    return BlockLinearOperator(A.codomain, A.domain, blocks=blocks)
+
+#===============================================================================
+class GaussSeidel(LinearOperator):
+    """
+    Gauss-Seidel, SOR or symmetric SOR (SSOR) preconditioner of a square
+    stencil matrix A.
+
+    Applying the preconditioner to r runs the given number of SOR sweeps
+    over the local rows of A, starting from zero, with the compiled kernels of
+    psydac.linalg.kernels.gauss_seidel_kernels. In the symmetric case each
+    forward sweep is followed by a backward sweep, hence the preconditioner is
+    symmetric if A is, and it can be used in the conjugate gradient method.
+
+    In parallel, and along periodic directions, the entries of A which couple
+    the local rows to the ghost regions are ignored: this is a block-Jacobi
+    method whose blocks (one per process) are relaxed by SOR.
+
+    Parameters
+    ----------
+    A : StencilMatrix
+        The matrix, whose domain is its codomain (with multiplicity 1).
+
+    omega : float
+        Relaxation parameter, in (0, 2) (default: 1, Gauss-Seidel).
+
+    symmetric : bool
+        If True (default), use symmetric sweeps (SSOR).
+
+    sweeps : int
+        Number of (symmetric) sweeps (default: 1).
+
+    """
+    _kernels = {1: sor_sweep_1d, 2: sor_sweep_2d, 3: sor_sweep_3d}
+
+    def __init__(self, A, *, omega=1.0, symmetric=True, sweeps=1):
+
+        assert isinstance(A, StencilMatrix)
+        assert A.domain is A.codomain
+        assert all(m == 1 for m in A.domain.shifts)
+        assert 0 < omega < 2
+        assert sweeps >= 1
+
+        V = A.domain
+        self._matrix    = A
+        self._omega     = float(omega)
+        self._symmetric = symmetric
+        self._sweeps    = sweeps
+        self._kernel    = self._kernels[V.ndim]
+        self._counts    = np.array([e - s + 1 for s, e in zip(V.starts, V.ends)], dtype=np.int64)
+        self._pads      = np.array(A.pads, dtype=np.int64)
+        self._gpads     = np.array(V.pads, dtype=np.int64)
+
+    @property
+    def domain(self):
+        return self._matrix.codomain
+
+    @property
+    def codomain(self):
+        return self._matrix.domain
+
+    @property
+    def dtype(self):
+        return self._matrix.dtype
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for GaussSeidel.')
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for GaussSeidel.')
+
+    def transpose(self, conjugate=False):
+        return GaussSeidel(self._matrix.transpose(conjugate=conjugate), omega=self._omega,
+                           symmetric=self._symmetric, sweeps=self._sweeps)
+
+    def dot(self, v, out=None):
+
+        assert isinstance(v, StencilVector)
+        assert v.space is self.domain
+
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self.codomain
+            assert out is not v
+        else:
+            out = self.codomain.zeros()
+
+        out._data[...] = 0
+
+        args = (self._matrix._data, v._data, out._data, self._counts, self._pads, self._gpads, self._omega)
+        for _ in range(self._sweeps):
+            self._kernel(*args, True)
+            if self._symmetric:
+                self._kernel(*args, False)
+
+        out.ghost_regions_in_sync = False
+        return out
+
+#===============================================================================
+class KroneckerMassPreconditioner(LinearOperator):
+    """
+    Approximate inverse of a mass matrix M on a mapped domain, built from the
+    Kronecker product M0 = M_1 x ... x M_n of the 1D mass matrices on the
+    logical domain:
+
+        P = D^{1/2} M0^{-1} D^{1/2},  with  D = diag(M0) / diag(M).
+
+    The 1D matrices are factorized by a KroneckerLinearSolver, and the
+    diagonal scaling D accounts for the Jacobian of the mapping (and for any
+    other weight in the mass matrix). Without the matrix M, P is the exact
+    inverse of M0.
+
+    Parameters
+    ----------
+    V : StencilVectorSpace
+        The space of the coefficients, domain and codomain of M.
+
+    mats : list of StencilMatrix
+        The 1D mass matrices on the logical domain, in each direction.
+
+    M : StencilMatrix, optional
+        The mass matrix, whose diagonal is used for the scaling.
+
+    shared : bool
+        If True, the factorizations of the 1D matrices are stored in the
+        shared memory of each node (default: False). See KroneckerLinearSolver.
+
+    """
+    def __init__(self, V, mats, M=None, *, shared=False):
+
+        assert V.ndim == len(mats)
+        assert all(isinstance(A, StencilMatrix) for A in mats)
+
+        self._space  = V
+        self._mats   = tuple(mats)
+        self._solver = KroneckerLinearSolver(V, V, mats, shared=shared)
+        self._slice  = tuple(slice(p*m, p*m + e - s + 1) for p, m, s, e in zip(V.pads, V.shifts, V.starts, V.ends))
+
+        if M is not None:
+            assert isinstance(M, StencilMatrix)
+            assert M.domain is V and M.codomain is V
+            local = [slice(s, e + 1) for s, e in zip(V.starts, V.ends)]
+            diag0 = reduce(np.multiply.outer, [A.diagonal()._data[i] for A, i in zip(mats, local)])
+            self._scaling = np.sqrt(diag0.real / M.diagonal()._data.real)
+        else:
+            self._scaling = None
+
+    @property
+    def domain(self):
+        return self._space
+
+    @property
+    def codomain(self):
+        return self._space
+
+    @property
+    def dtype(self):
+        return self._space.dtype
+
+    @property
+    def mats(self):
+        """ The 1D mass matrices on the logical domain. """
+        return self._mats
+
+    def toarray(self):
+        raise NotImplementedError('toarray() is not defined for KroneckerMassPreconditioner.')
+
+    def tosparse(self):
+        raise NotImplementedError('tosparse() is not defined for KroneckerMassPreconditioner.')
+
+    def transpose(self, conjugate=False):
+        # The 1D mass matrices are symmetric, and D is real
+        return self
+
+    def dot(self, v, out=None):
+
+        assert isinstance(v, StencilVector)
+        assert v.space is self.domain
+
+        if self._scaling is None:
+            return self._solver.solve(v, out=out)
+
+        with self._space.scratch_pool.borrow() as w:
+            w._data[self._slice] = v._data[self._slice] * self._scaling
+            out = self._solver.solve(w, out=out)
+
+        out._data[self._slice] *= self._scaling
+        out.ghost_regions_in_sync = False
+        return out
@@ -5,11 +5,13 @@ This module provides iterative solvers and preconditioners.
 """
 import numpy as np
 from math import sqrt
+from scipy.linalg.lapack import get_lapack_funcs
 
 from psydac.utilities.utils  import is_real
 from psydac.linalg.utilities import _sym_ortho
 from psydac.linalg.basic     import (Vector, LinearOperator,
-        InverseLinearOperator, IdentityOperator, ScaledLinearOperator)
+        InverseLinearOperator, IdentityOperator, ScaledLinearOperator,
+        AdjointLinearOperator)
 
 __all__ = (
     'inverse',
@@ -450,7 +452,7 @@ class BiConjugateGradient(InverseLinearOperator):
         
         super().__init__(A, **self._options)
         
-        self._Ah = A.H
+        self._Ah = AdjointLinearOperator(A)
         self._tmps = {key: self.domain.zeros() for key in ("v", "r", "p", "vs", "rs", "ps")}
         self._info = None
 
@@ -1436,7 +1438,7 @@ class LSMR(InverseLinearOperator):
         """
 
         A = self._A
-        At = A.H
+        At = AdjointLinearOperator(A)
         domain = self._domain
         codomain = self._codomain
         options = self._options
@@ -1686,12 +1688,18 @@ class LSMR(InverseLinearOperator):
 #===============================================================================
 class GMRES(InverseLinearOperator):
     """
-    Generalized Minimal Residual (GMRES).
-    
+    Restarted, flexible Generalized Minimal Residual (FGMRES(m)).
+
     A LinearOperator subclass. Objects of this class are meant to be created using :func:~`solvers.inverse`.
     The .dot (and also the .solve) function are based on the 
-    generalized minimal residual algorithm for solving linear system Ax=b.
-    Implementation from Wikipedia
+    generalized minimal residual algorithm for solving linear system Ax=b,
+    with right preconditioning and restarts.
+
+    The Krylov basis is orthonormalized by classical Gram-Schmidt with one
+    re-orthogonalization (CGS2): in parallel, each iteration needs two global
+    reductions, whatever the size of the basis. The preconditioned vectors
+    are stored as well (flexible variant), hence the preconditioner may
+    change between iterations, e.g. an inner iterative solver.
 
     Parameters
     ----------
@@ -1700,6 +1708,9 @@ class GMRES(InverseLinearOperator):
         can't be accessed, but A has 'shape' attribute and provides 'dot(p)'
         function (i.e. matrix-vector product A*p).
 
+    pc: psydac.linalg.basic.LinearOperator
+        Right preconditioner which should approximate the inverse of A (optional).
+
     x0 : psydac.linalg.basic.Vector
         First guess of solution for iterative solver (optional).
 
@@ -1709,6 +1720,11 @@ class GMRES(InverseLinearOperator):
     maxiter: int
         Maximum number of iterations.
 
+    restart : int
+        Maximum dimension m of the Krylov space, after which the solver is
+        restarted from the current solution (default: min(maxiter, 50)).
+        The memory footprint is m+1 vectors, or 2m+1 with a preconditioner.
+
     verbose : bool
         If True, L2-norm of residual r is printed at each iteration.
 
@@ -1719,24 +1735,46 @@ class GMRES(InverseLinearOperator):
     ----------
     [1] Y. Saad and M.H. Schultz, "GMRES: A generalized minimal residual algorithm for solving nonsymmetric linear systems", SIAM J. Sci. Stat. Comput., 7:856–869, 1986.
 
+    [2] Y. Saad, "A flexible inner-outer preconditioned GMRES algorithm", SIAM J. Sci. Comput., 14:461–469, 1993.
+
+    [3] L. Giraud, J. Langou and M. Rozloznik, "The loss of orthogonality in the Gram-Schmidt orthogonalization process", Comput. Math. Appl., 50:1069–1075, 2005.
+
     """
-    def __init__(self, A, *, x0=None, tol=1e-6, maxiter=100, verbose=False, recycle=False):
+    def __init__(self, A, *, pc=None, x0=None, tol=1e-6, maxiter=100, restart=None, verbose=False, recycle=False):
 
-        self._options = {"x0":x0, "tol":tol, "maxiter":maxiter, "verbose":verbose, "recycle":recycle}
+        if restart is None:
+            restart = min(maxiter, 50)
+        else:
+            assert isinstance(restart, int), "restart must be an int"
+            assert restart > 0, "restart must be positive"
+
+        self._options = {"x0":x0, "pc":pc, "tol":tol, "maxiter":maxiter, "restart":restart, "verbose":verbose, "recycle":recycle}
 
         super().__init__(A, **self._options)
 
+        if pc is None:
+            self._options['pc'] = IdentityOperator(self.domain)
+        else:
+            assert isinstance(pc, LinearOperator)
+
         self._tmps = {key: self.domain.zeros() for key in ("r", "p")}
 
         # Initialize upper Hessenberg matrix
-        self._H = np.zeros((self._options["maxiter"] + 1, self._options["maxiter"]), dtype=A.domain.dtype)
+        self._H = np.zeros((restart + 1, restart), dtype=A.domain.dtype)
         self._Q = []
+        self._Z = []
         self._info = None
 
+    def transpose(self, conjugate=False):
+        At      = self.linop.transpose(conjugate=conjugate)
+        options = self._options.copy()
+        pc      = options['pc']
+        options['pc'] = None if isinstance(pc, IdentityOperator) else pc.transpose(conjugate=conjugate)
+        return GMRES(At, **options)
+
     def solve(self, b, out=None):
         """
-        Generalized minimal residual algorithm for solving linear system Ax=b.
-        Implementation from Wikipedia.
+        Restarted, flexible generalized minimal residual algorithm for solving linear system Ax=b.
         Info can be accessed using get_info(), see :func:~`basic.InverseLinearOperator.get_info`.
 
         Parameters
@@ -1769,6 +1807,7 @@ class GMRES(InverseLinearOperator):
         x0 = options["x0"]
         tol = options["tol"]
         maxiter = options["maxiter"]
+        restart = options["restart"]
         verbose = options["verbose"]
         recycle = options["recycle"]
         
@@ -1786,24 +1825,10 @@ class GMRES(InverseLinearOperator):
         r = self._tmps["r"]
         p = self._tmps["p"]
 
-        # Internal objects of GMRES
-        self._H[:,:] = 0.
-        beta = []
-        sn = []
-        cn = []
-
         # First values
         A.dot( x , out=r)
         r -= b
-
         am = sqrt(r.dot(r).real)
-        beta.append(am)
-        r *= - 1 / am
-        
-        if len(self._Q) == 0:
-            self._Q.append(r)
-        else:
-            r.copy(out=self._Q[0])
 
         if verbose:
             print( "GMRES solver:" )
@@ -1813,35 +1838,57 @@ class GMRES(InverseLinearOperator):
             template = "| {:7d} | {:19.2e} |"
             print( template.format( 1, am ) )
 
-        # Iterate to convergence
-        for k in range(maxiter):
-            if am < tol:
-                break
+        # Restart cycles, until convergence
+        niter = 0
+        while am >= tol and niter < maxiter:
 
-            # run Arnoldi
-            self.arnoldi(k, p)
+            # Internal objects of GMRES
+            self._H[:,:] = 0.
+            beta = np.zeros(restart + 1, dtype=self._H.dtype)
+            beta[0] = am
+            sn = []
+            cn = []
 
-            # make the last diagonal entry in H equal to 0, so that H becomes upper triangular
-            self.apply_givens_rotation(k, sn, cn)
+            r *= - 1 / am
+            self._store(self._Q, 0, r)
 
-            # update the residual vector
-            beta.append(- sn[k] * beta[k])
-            beta[k] *= cn[k]
+            for k in range(min(restart, maxiter - niter)):
 
-            am = abs(beta[k+1])
-            if verbose:
-                print( template.format( k+2, am ) )
+                # run Arnoldi
+                self.arnoldi(k, p)
+
+                # make the last diagonal entry in H equal to 0, so that H becomes upper triangular
+                self.apply_givens_rotation(k, sn, cn)
+
+                # update the residual vector
+                beta[k+1] = - sn[k] * beta[k]
+                beta[k] *= np.conj(cn[k])
+
+                am = abs(beta[k+1])
+                niter += 1
+                if verbose:
+                    print( template.format( niter+1, am ) )
+
+                if am < tol:
+                    break
+
+            # calculate result
+            y = self.solve_triangular(self._H[:k+1, :k+1], beta[:k+1]) # system of upper triangular matrix
+
+            Z = self._Q if isinstance(options["pc"], IdentityOperator) else self._Z
+            for i in range(k+1):
+                x.mul_iadd(y[i], Z[i])
+
+            # True residual of the restarted system
+            A.dot( x , out=r)
+            r -= b
+            am = sqrt(r.dot(r).real)
 
         if verbose:
             print( "+---------+---------------------+")        
-        # calculate result
-        y = self.solve_triangular(self._H[:k, :k], beta[:k]) # system of upper triangular matrix
-
-        for i in range(k):
-            x.mul_iadd(y[i], self._Q[i])
 
         # Convergence information
-        self._info = {'niter': k+1, 'success': am < tol, 'res_norm': am }
+        self._info = {'niter': niter, 'success': am < tol, 'res_norm': am }
         
         if recycle:
             x.copy(out=self._options["x0"])
@@ -1849,33 +1896,58 @@ class GMRES(InverseLinearOperator):
         return x
     
     def solve_triangular(self, T, d):
-        # Backwards substitution. Assumes T is upper triangular
-        k = T.shape[0]
-        y = np.zeros((k,), dtype=self._A.domain.dtype)
-
-        for k1 in range(k):
-            temp = 0.
-            for k2 in range(1, k1 + 1):
-                temp += T[k - 1 - k1, k - 1 - k1 + k2] * y[k - 1 - k1 + k2]
-            y[k - 1 - k1] = ( d[k - 1 - k1] - temp ) / T[k - 1 - k1, k - 1 - k1]
-        
+        # Backward substitution with LAPACK. Assumes T is upper triangular
+        trtrs, = get_lapack_funcs(('trtrs',), (T,))
+        y, info = trtrs(T, d, lower=0)
+        assert info == 0, "singular upper triangular matrix in GMRES"
         return y
 
+    @staticmethod
+    def _store(vectors, i, v):
+        # Copy v into the i-th vector of a list, which grows on demand
+        if len(vectors) > i:
+            v.copy(out=vectors[i])
+        else:
+            vectors.append(v.copy())
+        return vectors[i]
+
     def arnoldi(self, k, p):
         h = self._H[:k+2, k]
-        self._A.dot( self._Q[k] , out=p) # Krylov vector
+        Q = self._Q[:k+1]
+        pc = self._options["pc"]
 
-        for i in range(k + 1): # Modified Gram-Schmidt, keeping Hessenberg matrix
-            h[i] = p.dot(self._Q[i])
-            p.mul_iadd(-h[i], self._Q[i])
-        
-        h[k+1] = sqrt(p.dot(p).real)
-        p /= h[k+1] # Normalize vector
-
-        if len(self._Q) > k + 1:
-            p.copy(out=self._Q[k+1])
+        # Krylov vector, preconditioned on the right
+        if isinstance(pc, IdentityOperator):
+            self._A.dot( Q[k] , out=p)
+        else:
+            z = self._store(self._Z, k, Q[k])
+            pc.dot( Q[k] , out=z)
+            self._A.dot( z , out=p)
+
+        # Classical Gram-Schmidt, keeping Hessenberg matrix
+        space = p.space
+        h[:k+1] = space.inner_products(Q, p)
+        for i in range(k + 1):
+            p.mul_iadd(-h[i], Q[i])
+
+        # Re-orthogonalization, with the squared norm of p in the same reduction
+        c = space.inner_products([*Q, p], p)
+        for i in range(k + 1):
+            p.mul_iadd(-c[i], Q[i])
+        h[:k+1] += c[:k+1]
+
+        # Norm of p after the second projection: since the correction is
+        # usually tiny, it follows from the Pythagorean theorem
+        correction = np.vdot(c[:k+1], c[:k+1]).real
+        if correction < 0.5 * c[k+1].real:
+            h[k+1] = sqrt(c[k+1].real - correction)
         else:
-            self._Q.append(p.copy())
+            h[k+1] = sqrt(p.dot(p).real)
+
+        if h[k+1] != 0:
+            p /= h[k+1] # Normalize vector
+
+        self._store(self._Q, k+1, p)
 
     def apply_givens_rotation(self, k, sn, cn):
         # Apply Givens rotation to last column of H
@@ -1884,18 +1956,17 @@ class GMRES(InverseLinearOperator):
         for i in range(k):
             h_i_prev = h[i]
 
-            h[i] *= cn[i]
-            h[i] += sn[i] * h[i+1]
+            h[i] *= np.conj(cn[i])
+            h[i] += np.conj(sn[i]) * h[i+1]
 
             h[i+1] *= cn[i]
             h[i+1] -= sn[i] * h_i_prev
         
-        mod = (h[k]**2 + h[k+1]**2)**0.5
+        mod = sqrt(abs(h[k])**2 + abs(h[k+1])**2)
         cn.append( h[k] / mod )
         sn.append( h[k+1] / mod )
 
-        h[k] *= cn[k]
-        h[k] += sn[k] * h[k+1]
+        h[k] = mod
         h[k+1] = 0. # becomes triangular
 
     def dot(self, b, out=None):
@@ -11,7 +11,7 @@ from types        import MappingProxyType
 from scipy.sparse import coo_matrix, diags as sp_diags
 from mpi4py       import MPI
 
-from psydac.linalg.basic  import VectorSpace, Vector, LinearOperator
+from psydac.linalg.basic  import VectorSpace, Vector, LinearOperator, ComposedLinearOperator
 from psydac.ddm.cart      import find_mpi_type, CartDecomposition, InterfaceCartDecomposition
 from psydac.ddm.utilities import get_data_exchanger
 from psydac.api.settings  import PSYDAC_BACKENDS
@@ -21,6 +21,9 @@ from .kernels.inner_kernels       import inner_1d, inner_2d, inner_3d
 from .kernels.matvec_kernels      import matvec_1d, matvec_2d, matvec_3d
 from .kernels.transpose_kernels   import transpose_1d, transpose_2d, transpose_3d
 from .kernels.transpose_kernels   import interface_transpose_1d, interface_transpose_2d, interface_transpose_3d
+from .kernels.transpose_kernels   import transpose_matvec_1d, transpose_matvec_2d, transpose_matvec_3d
+from .kernels.matmul_kernels      import matmul_1d, matmul_2d, matmul_3d
+from .kernels.block_matvec_kernels import block_matvec_1d, block_matvec_2d, block_matvec_3d
 from .kernels.stencil2coo_kernels import stencil2coo_1d_F, stencil2coo_2d_F, stencil2coo_3d_F
 from .kernels.stencil2coo_kernels import stencil2coo_1d_C, stencil2coo_2d_C, stencil2coo_3d_C
 
@@ -40,6 +43,9 @@ kernels = {
     'matvec': (None, matvec_1d, matvec_2d, matvec_3d),
     'transpose': (None, transpose_1d, transpose_2d, transpose_3d),
     'interface_transpose': (None, interface_transpose_1d, interface_transpose_2d, interface_transpose_3d),
+    'transpose_matvec': (None, transpose_matvec_1d, transpose_matvec_2d, transpose_matvec_3d),
+    'matmul': (None, matmul_1d, matmul_2d, matmul_3d),
+    'block_matvec': (None, block_matvec_1d, block_matvec_2d, block_matvec_3d),
     'stencil2coo': {'F': (None, stencil2coo_1d_F, stencil2coo_2d_F, stencil2coo_3d_F),
                     'C': (None, stencil2coo_1d_C, stencil2coo_2d_C, stencil2coo_3d_C)}
 }
@@ -252,6 +258,34 @@ class StencilVectorSpace(VectorSpace):
 
         x._sync = x._sync and y._sync
 
+    #...
+    def inner_products(self, vectors, v):
+        """
+        Evaluate the scalar products u.dot(v) of several vectors u with the
+        same vector v, with a single global reduction in the parallel case.
+
+        """
+        values = self._local_inner_products(vectors, v)
+        if self.parallel:
+            self.cart.global_comm.Allreduce(MPI.IN_PLACE, (values, self.mpi_type), op=MPI.SUM)
+        return values
+
+    #...
+    def _local_inner_products(self, vectors, v):
+        """ Contributions of the local data to the scalar products u.dot(v). """
+        assert isinstance(v, StencilVector)
+        assert v.space is self
+
+        values = np.zeros(len(vectors), dtype=self.dtype)
+
+        # Sometimes in the parallel case, we can get an empty vector that breaks our kernel
+        if v._data.shape[0] > 0:
+            for i, u in enumerate(vectors):
+                assert u.space is self
+                values[i] = self._inner_func(u._data, v._data, *self._inner_consts)
+
+        return values
+
     #--------------------------------------
     # Other properties/methods
     #--------------------------------------
@@ -385,28 +419,40 @@ class StencilVector(Vector):
     V : psydac.linalg.stencil.StencilVectorSpace
         Space to which the new vector belongs.
 
+    data : numpy.ndarray, optional
+        Storage of the local coefficients (including the ghost regions), with
+        shape V.shape and type V.dtype, which is used without any copy: e.g. a
+        numpy.memmap or a view on a shared-memory segment (see
+        psydac.linalg.storage). By default a new array of zeros is allocated.
+
     """
-    def __init__(self, V):
+    def __init__(self, V, *, data=None):
+
+        # Persistent communication requests, prepared on the first update of the
+        # ghost regions (set first, as __del__ reads them if the checks fail)
+        self._requests = None
 
         assert isinstance(V, StencilVectorSpace)
 
+        if data is None:
+            data = np.zeros(V.shape, dtype=V.dtype)
+        else:
+            assert isinstance(data, np.ndarray)
+            assert data.shape == V.shape
+            assert data.dtype == V.dtype
+
         self._space          = V
         self._sizes          = V.shape
         self._ndim           = len(V.npts)
-        self._data           = np.zeros(V.shape, dtype=V.dtype)
+        self._data           = data
         self._dot_send_data  = np.zeros((1,), dtype=V.dtype)
         self._dot_recv_data  = np.zeros((1,), dtype=V.dtype)
         self._interface_data = {}
-        self._requests       = None
 
         # allocate data for the boundary that shares an interface
         for axis, ext in V.interfaces:
             self._interface_data[axis, ext] = np.zeros(V.interfaces[axis, ext].shape, dtype=V.dtype)
 
-        #prepare communications
-        if V.cart.is_parallel and not V.cart.is_comm_null and isinstance(V.cart, CartDecomposition):
-            self._requests = V._synchronizer.prepare_communications(self._data)
-
         # TODO: distinguish between different directions
         self._sync = False
 
@@ -734,6 +780,10 @@ class StencilVector(Vector):
         # Update interior ghost regions
         if self.space.parallel:
             if not self.space.cart.is_comm_null:
+                # Temporaries which never exchange data do not need communication requests
+                if self._requests is None and isinstance(self.space.cart, CartDecomposition):
+                    self._requests = self.space._synchronizer.prepare_communications(self._data)
+
                 # PARALLEL CASE: fill in ghost regions with data from neighbors
                 self.space._synchronizer.start_update_ghost_regions(self._data, self._requests)
                 self.space._synchronizer.  end_update_ghost_regions(self._data, self._requests)
@@ -742,6 +792,14 @@ class StencilVector(Vector):
             self._update_ghost_regions_serial()
 
         # Update interface ghost regions
+        self._update_interface_data()
+
+        # Flag ghost regions as up-to-date
+        self._sync = True
+
+    # ...
+    def _update_interface_data(self):
+
         if self.space.parallel:
 
             for axis, ext in self.space.interfaces:
@@ -757,9 +815,6 @@ class StencilVector(Vector):
                 slices = [slice(s, e+2*m*p+1) for s,e,m,p in zip(V.starts, V.ends, V.shifts, V.pads)]
                 self._interface_data[axis, ext][...] = self._data[tuple(slices)]
 
-        # Flag ghost regions as up-to-date
-        self._sync = True
-
     # ...
     def _update_ghost_regions_serial(self):
 
@@ -872,8 +927,21 @@ class StencilMatrix(LinearOperator):
 
     W : psydac.linalg.stencil.StencilVectorSpace
         Codomain of the new linear operator.
+
+    pads : tuple of int, optional
+        Number of diagonals of the matrix on each side of the main one, which
+        cannot exceed the padding of V (default: V.pads).
+
+    backend : dict, optional
+        The backend used to accelerate the computing kernels.
+
+    data : numpy.ndarray, optional
+        Storage of the local entries, with shape `StencilMatrix.storage_shape(V, W, pads)`
+        and type W.dtype, which is used without any copy: e.g. a numpy.memmap or
+        a view on a shared-memory segment (see psydac.linalg.storage). By default
+        a new array of zeros is allocated.
     """
-    def __init__(self, V, W, pads=None, backend=None):
+    def __init__(self, V, W, pads=None, backend=None, *, data=None):
 
         assert isinstance(V, StencilVectorSpace)
         assert isinstance(W, StencilVectorSpace)
@@ -888,7 +956,15 @@ class StencilMatrix(LinearOperator):
         self._pads     = pads or tuple(V.pads)
         dims           = list(W.shape)
         diags          = [compute_diag_len(p, md, mc) for p,md,mc in zip(self._pads, V.shifts, W.shifts)]
-        self._data     = np.zeros(dims+diags, dtype=W.dtype)
+
+        if data is None:
+            data = np.zeros(dims+diags, dtype=W.dtype)
+        else:
+            assert isinstance(data, np.ndarray)
+            assert data.shape == StencilMatrix.storage_shape(V, W, self._pads)
+            assert data.dtype == W.dtype
+
+        self._data     = data
         self._domain   = V
         self._codomain = W
         self._ndim     = len(dims)
@@ -897,6 +973,9 @@ class StencilMatrix(LinearOperator):
         self._diag_indices = None
         self._requests = None
 
+        # Counter of the modifications of the matrix entries, used by the operators caching data derived from them
+        self._version  = 0
+
         # Parallel attributes
         if W.parallel:
             if W.cart.is_comm_null:return
@@ -937,8 +1016,23 @@ class StencilMatrix(LinearOperator):
         self._transpose_args = self._prepare_transpose_args()
         self._transpose_func = kernels['transpose'][self._ndim]
 
+        self._tdot_args = self._prepare_tdot_args()
+        self._tdot_func = kernels['transpose_matvec'][self._ndim]
+
         self.set_backend(backend)
 
+    #...
+    @staticmethod
+    def storage_shape(V, W, pads=None):
+        """
+        Shape of the array which stores the local entries of a stencil matrix from
+        V to W: the rows are the local coefficients of W (with their ghost regions),
+        and the columns are the diagonals.
+        """
+        pads  = pads or tuple(V.pads)
+        diags = [compute_diag_len(p, md, mc) for p,md,mc in zip(pads, V.shifts, W.shifts)]
+        return tuple(W.shape) + tuple(diags)
+
     #--------------------------------------
     # Abstract interface
     #--------------------------------------
@@ -1066,10 +1160,57 @@ class StencilMatrix(LinearOperator):
             out = StencilMatrix(M.codomain, M.domain, pads=self._pads, backend=self._backend)
 
         # Call low-level '_transpose' function (works on Numpy arrays directly)
-        if conjugate:
-            self._transpose_func(np.conjugate(M._data), out._data, **self._transpose_args)
+        # The complex conjugate, if needed, is taken inside the kernel
+        self._transpose_func(M._data, out._data, **self._transpose_args, conjugate=conjugate)
+        out._version += 1
+        return out
+
+    # ...
+    def tdot(self, v, out=None, *, conjugate=False):
+        """
+        Return the product between the transpose of self and v, without
+        forming the transposed matrix. If conjugate is True, the product
+        with the Hermitian transpose is computed instead.
+
+        Parameters
+        ----------
+        v : StencilVector
+            Vector of the codomain of self.
+
+        out : StencilVector
+            Vector of the domain of self (optional).
+
+        conjugate : bool
+            True to multiply v by the Hermitian adjoint of self.
+
+        Returns
+        -------
+        out : StencilVector
+            Vector of the domain of self, contain the result of the product.
+        """
+
+        assert isinstance(v, StencilVector)
+        assert v.space is self.codomain
+
+        if out is not None:
+            assert isinstance(out, StencilVector)
+            assert out.space is self.domain
         else:
-            self._transpose_func(M._data, out._data, **self._transpose_args)
+            out = StencilVector(self.domain)
+
+        # The rows of the transpose are the columns of self, which are read
+        # from the ghost regions of the matrix
+        if not self.ghost_regions_in_sync:
+            self.update_ghost_regions()
+
+        # Necessary if vector space is distributed across processes
+        if not v.ghost_regions_in_sync:
+            v.update_ghost_regions()
+
+        self._tdot_func(self._data, v._data, out._data, **self._tdot_args, conjugate=conjugate)
+
+        # IMPORTANT: flag that ghost regions are not up-to-date
+        out.ghost_regions_in_sync = False
         return out
 
     # ...
@@ -1160,6 +1301,109 @@ class StencilMatrix(LinearOperator):
     #--------------------------------------
     # New properties/methods
     #--------------------------------------
+    def matmul(self, B, out=None, *, accumulate=False):
+        """
+        Compute the product self @ B of two stencil matrices as a StencilMatrix,
+        whose pads are the sum of the pads of the two factors.
+
+        Unlike `self @ B`, which creates a ComposedLinearOperator applying the
+        two matrices in sequence, the product is formed explicitly. The rows
+        of B which are needed by the local rows of self are fetched from the
+        neighboring processes through the ghost regions of B.
+
+        If the pads of the product exceed the pads of the vector spaces, the
+        product cannot be stored as a StencilMatrix: the ComposedLinearOperator
+        `self @ B` is returned instead, unless out is given.
+
+        Parameters
+        ----------
+        B : StencilMatrix
+            Right factor, whose codomain is the domain of self.
+
+        out : StencilMatrix(optional)
+            Matrix from B.domain to self.codomain where the product is stored.
+            Its pads must be at least those of the product, which must fit in
+            the pads of the vector spaces.
+
+        accumulate : bool
+            If True, add the product to out instead of overwriting it.
+
+        Returns
+        -------
+        out : StencilMatrix | ComposedLinearOperator
+            Product of self and B.
+        """
+        assert isinstance(B, StencilMatrix)
+        assert B.codomain is self.domain
+
+        pads = self._matmul_pads(B)
+
+        if out is not None:
+            assert pads is not None
+            assert isinstance(out, StencilMatrix)
+            assert out.domain is B.domain
+            assert out.codomain is self.codomain
+            assert all(p <= q for p, q in zip(pads, out.pads))
+            if not accumulate:
+                out._data[...] = 0.
+        elif pads is None:
+            return ComposedLinearOperator(B.domain, self.codomain, self, B)
+        else:
+            out = StencilMatrix(B.domain, self.codomain, pads=pads, backend=self._backend)
+
+        self._matmul_into(B, out)
+
+        out.ghost_regions_in_sync = False
+        return out
+
+    # ...
+    def _matmul_pads(self, B):
+        """
+        Pads of the product self @ B, see matmul, which only depend on the
+        pads of the two factors. Return None if they exceed the pads of the
+        vector spaces.
+        """
+        if not all(m == 1 for V in (B.domain, self.domain, self.codomain) for m in V.shifts):
+            raise NotImplementedError('Product of stencil matrices only available for spaces with unit shifts')
+
+        pads = tuple(pa + pb for pa, pb in zip(self._pads, B._pads))
+        if any(p > gp for p, gp in zip(pads, B.domain.pads)):
+            return None
+
+        return pads
+
+    # ...
+    def _matmul_into(self, B, out):
+        """
+        Add the product self @ B to the StencilMatrix out, without any check.
+        """
+        V = self.domain
+        W = self.codomain
+
+        if W.parallel and W.cart.is_comm_null:
+            return
+
+        # Fetch the rows of B owned by the neighboring processes
+        if not B.ghost_regions_in_sync:
+            B.update_ghost_regions()
+
+        # Range of the rows of B which can be accessed, in local indices:
+        # the ghost rows are excluded at the boundary of a non-periodic domain
+        nr  = [e - s + 1 for s, e in zip(W.starts, W.ends)]
+        mlo = [-gp if P else max(-gp, -s) for gp, s, P in zip(V.pads, V.starts, V.periods)]
+        mhi = [e - s + 1 + gp if P else min(e - s + 1 + gp, n - s)
+               for gp, s, e, n, P in zip(V.pads, V.starts, V.ends, V.npts, V.periods)]
+
+        args = dict(nr  = np.int64(nr),
+                    gw  = np.int64(W.pads),
+                    gv  = np.int64(V.pads),
+                    pa  = np.int64(self._pads),
+                    pb  = np.int64(B._pads),
+                    pc  = np.int64(out._pads),
+                    mlo = np.int64(mlo),
+                    mhi = np.int64(mhi))
+
+        kernels['matmul'][self._ndim](self._data, B._data, out._data, **args)
 
     # TODO: check if this method is really needed!!
     def conjugate(self, out=None):
@@ -1172,6 +1416,7 @@ class StencilMatrix(LinearOperator):
             out._func    = self._func
             out._args    = self._args
         np.conjugate(self._data, out=out._data, casting='no')
+        out._version += 1
         return out
 
     # ...
@@ -1198,6 +1443,7 @@ class StencilMatrix(LinearOperator):
     def __setitem__(self, key, value):
         index = self._getindex( key )
         self._data[index] = value
+        self._version += 1
 
     #...
     def max(self):
@@ -1222,11 +1468,13 @@ class StencilMatrix(LinearOperator):
         out._data[:] = self._data[:]
         out._func    = self._func
         out._args    = self._args
+        out._version += 1
         return out
 
     #...
     def __imul__(self, a):
         self._data *= a
+        self._version += 1
         return self
 
     #...
@@ -1238,6 +1486,7 @@ class StencilMatrix(LinearOperator):
             assert m._pads     == self._pads
             self._data += m._data
             self._sync  = m._sync and self._sync
+            self._version += 1
             return self
         else:
             return LinearOperator.__add__(self, m)
@@ -1251,6 +1500,7 @@ class StencilMatrix(LinearOperator):
             assert m._pads     == self._pads
             self._data -= m._data
             self._sync  = m._sync and self._sync
+            self._version += 1
             return self
         else:
             return LinearOperator.__sub__(self, m)
@@ -1352,6 +1602,8 @@ class StencilMatrix(LinearOperator):
             idx_from = tuple( idx_front + [ slice(0,m*p)] + idx_back )
             self._data[idx_from] = 0.
 
+        self._version += 1
+
     # ...
     def _exchange_assembly_data_serial(self):
 
@@ -1656,6 +1908,10 @@ class StencilMatrix(LinearOperator):
         assert isinstance(value, bool)
         self._sync = value
 
+        # Matrix entries are flagged out-of-date after being modified directly
+        if not value:
+            self._version += 1
+
     # ...
     def _update_ghost_regions_serial(self):
 
@@ -1745,6 +2001,26 @@ class StencilMatrix(LinearOperator):
 
         return args
 
+    # ...
+    def _prepare_tdot_args(self):
+
+        # The product with the transpose uses the same index mapping as the
+        # transpose kernel, together with the arguments of the matrix-vector
+        # product of the transposed matrix (where V and W are swapped)
+        W     = self.codomain
+        args  = self._transpose_args.copy()
+
+        # Number of diagonals of the transposed matrix
+        ndiagsT = args['nd']
+
+        xm = [gp*m+gp+1-n-s%m+p-gp for gp,m,n,s,p in zip(W.pads, W.shifts, ndiagsT, W.starts, self._pads)]
+        xs = [s % m for s, m in zip(W.starts, W.shifts)]
+
+        args['xm'] = np.int64(xm)
+        args['xs'] = np.int64(xs)
+
+        return args
+
     # ...
     def set_backend(self, backend):
         from psydac.api.ast.linalg import LinearOperatorDot
@@ -1756,6 +2032,11 @@ class StencilMatrix(LinearOperator):
                 self._args[key] = np.int64(arg)
             self._func = self._dot
             self._args.pop('pads')
+        elif self._ndim <= 3:
+            # Precompiled kernel (parallelized with OpenMP) instead of
+            # generating and compiling code for this matrix
+            self._func = kernels['block_matvec'][self._ndim]
+            self._args = dict(self._block_matvec_args(), add=False)
         else:
             if self.domain.parallel:
                 comm = self.codomain.cart.comm
@@ -1844,6 +2125,18 @@ class StencilMatrix(LinearOperator):
             self._args.pop('ndiags')
             self._func = dot.func
 
+    # ...
+    def _block_matvec_args(self):
+        """
+        Arguments of the precompiled kernels of block_matvec_kernels for this
+        matrix, except the flag add.
+        """
+        args = {key: np.int64(self._dotargs_null[key])
+                for key in ('starts', 'nrows', 'nrows_extra', 'dm', 'cm', 'pad_imp', 'ndiags', 'gpads')}
+        args['flip']    = np.ones (self._ndim, dtype=np.int64)
+        args['c_start'] = np.zeros(self._ndim, dtype=np.int64)
+        return args
+
     # ...
     def _get_diagonal_indices(self):
         """
@@ -2311,10 +2604,8 @@ class StencilInterfaceMatrix(LinearOperator):
                                         flip=M.flip, pads=M.pads, backend=M.backend)
 
         # Call low-level '_transpose' function (works on Numpy arrays directly)
-        if conjugate:
-            M._transpose_func(np.conjugate(M._data), out._data, **M._transpose_args)
-        else:
-            M._transpose_func(M._data, out._data, **M._transpose_args)
+        # The complex conjugate, if needed, is taken inside the kernel
+        M._transpose_func(M._data, out._data, **M._transpose_args, conjugate=conjugate)
         return out
 
     def _prepare_transpose_args(self):
@@ -2712,6 +3003,11 @@ class StencilInterfaceMatrix(LinearOperator):
 
         if self._backend is None:
             self._func = self._dot
+        elif self._ndim <= 3 and tuple(self._permutation) == tuple(range(self._ndim)):
+            # Precompiled kernel (parallelized with OpenMP) instead of
+            # generating and compiling code for this matrix
+            self._func = kernels['block_matvec'][self._ndim]
+            self._args = dict(self._block_matvec_args(), add=False)
         else:
             if self.domain.parallel:
 
@@ -2802,5 +3098,25 @@ class StencilInterfaceMatrix(LinearOperator):
 
             self._func = dot.func
 
+    # ...
+    def _block_matvec_args(self):
+        """
+        Arguments of the precompiled kernels of block_matvec_kernels for this
+        matrix, except the flag add.
+        """
+        args = self._dotargs_null
+        ndiags, _ = zip(*[compute_diag_len(p, md, mc, return_padding=True)
+                          for p, md, mc in zip(args['pads'], args['dm'], args['cm'])])
+        pad_imp = [gp*m+gp+1-n-s%m+p-gp for gp, m, n, s, p in zip(args['gpads'], args['dm'], ndiags, args['starts'], args['pads'])]
+        c_start = [0] * self._ndim
+        c_start[self._codomain_axis] = self._codomain_start
+
+        kernel_args = {key: np.int64(args[key]) for key in ('starts', 'nrows', 'nrows_extra', 'dm', 'cm', 'gpads')}
+        kernel_args['pad_imp'] = np.int64(pad_imp)
+        kernel_args['ndiags']  = np.int64(ndiags)
+        kernel_args['flip']    = np.int64(self._flip)
+        kernel_args['c_start'] = np.int64(c_start)
+        return kernel_args
+
 #===============================================================================
 del VectorSpace, Vector
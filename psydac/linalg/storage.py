@@ -0,0 +1,171 @@
+# coding: utf-8
+"""
+Storage backends for stencil vectors and matrices.
+
+By default the local data of a StencilVector or a StencilMatrix (including the
+ghost regions) is a NumPy array in the memory of each process. The functions of
+this module create vectors and matrices whose data is instead:
+
+- a memory-mapped .npy file, for very large serial post-processing and for
+  out-of-core storage of operators (the operating system only keeps the pages
+  in use in memory);
+
+- a read-only array in the shared memory of the node (an MPI-3 window), for
+  replicated operators which would otherwise be stored once per process.
+
+"""
+import numpy as np
+
+from psydac.ddm.shared     import share_array
+from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
+
+__all__ = (
+    'memmap_vector',
+    'memmap_matrix',
+    'shared_vector',
+    'shared_matrix'
+)
+
+#===============================================================================
+def _open_memmap(filename, shape, dtype, mode, comm):
+
+    if comm is not None:
+        filename = filename.format(rank=comm.rank)
+
+    if mode == 'w+':
+        return np.lib.format.open_memmap(filename, mode=mode, shape=shape, dtype=dtype)
+
+    data = np.load(filename, mmap_mode=mode)
+    if data.shape != shape or data.dtype != dtype:
+        raise ValueError('The file {} does not contain an array of shape {} and type {}'.format(filename, shape, dtype))
+    return data
+
+#===============================================================================
+def memmap_vector(V, filename, mode='w+'):
+    """
+    Create a stencil vector whose local data is a memory-mapped .npy file.
+
+    Parameters
+    ----------
+    V : StencilVectorSpace
+        The space of the vector.
+
+    filename : str
+        The name of the file. In parallel each process needs its own file, and
+        the name can contain the placeholder '{rank}' for the rank of the process.
+
+    mode : {'w+', 'r+', 'r', 'c'}
+        If 'w+', a new file is created and the vector is zero. Otherwise the
+        existing data is mapped in read-write, read-only or copy-on-write mode,
+        as in numpy.memmap.
+
+    Returns
+    -------
+    StencilVector
+        The vector, with a numpy.memmap as data.
+
+    """
+    assert isinstance(V, StencilVectorSpace)
+    comm = V.cart.comm if V.parallel else None
+    data = _open_memmap(filename, V.shape, np.dtype(V.dtype), mode, comm)
+    return StencilVector(V, data=data)
+
+#===============================================================================
+def memmap_matrix(V, W, filename, mode='w+', *, pads=None, backend=None):
+    """
+    Create a stencil matrix whose local data is a memory-mapped .npy file.
+
+    Parameters
+    ----------
+    V : StencilVectorSpace
+        The domain of the matrix.
+
+    W : StencilVectorSpace
+        The codomain of the matrix.
+
+    filename : str
+        The name of the file. In parallel each process needs its own file, and
+        the name can contain the placeholder '{rank}' for the rank of the process.
+
+    mode : {'w+', 'r+', 'r', 'c'}
+        If 'w+', a new file is created and the matrix is zero. Otherwise the
+        existing data is mapped in read-write, read-only or copy-on-write mode,
+        as in numpy.memmap.
+
+    pads : tuple of int, optional
+        The pads of the matrix (default: V.pads).
+
+    backend : dict, optional
+        The backend used to accelerate the computing kernels.
+
+    Returns
+    -------
+    StencilMatrix
+        The matrix, with a numpy.memmap as data.
+
+    """
+    assert isinstance(V, StencilVectorSpace)
+    assert isinstance(W, StencilVectorSpace)
+    comm  = W.cart.comm if W.parallel else None
+    shape = StencilMatrix.storage_shape(V, W, pads)
+    data  = _open_memmap(filename, shape, np.dtype(W.dtype), mode, comm)
+    return StencilMatrix(V, W, pads=pads, backend=backend, data=data)
+
+#===============================================================================
+def shared_vector(v, comm):
+    """
+    Read-only copy of a replicated stencil vector (whose space is not
+    distributed) in the shared memory of each node: only the data of the first
+    process of each node is read. This is a collective operation. The shared
+    memory is released with psydac.ddm.shared.free_shared(comm).
+
+    Parameters
+    ----------
+    v : StencilVector
+        The vector, which is the same on all processes.
+
+    comm : mpi4py.MPI.Comm | None
+        The communicator of the processes which share the vector.
+
+    Returns
+    -------
+    StencilVector
+        The shared vector.
+
+    """
+    assert isinstance(v, StencilVector)
+    assert not v.space.parallel
+    w = StencilVector(v.space, data=share_array(v._data, comm))
+    w.ghost_regions_in_sync = v.ghost_regions_in_sync
+    return w
+
+#===============================================================================
+def shared_matrix(M, comm):
+    """
+    Read-only copy of a replicated stencil matrix (whose spaces are not
+    distributed) in the shared memory of each node, e.g. a 1D factor of a
+    KroneckerStencilMatrix: only the data of the first process of each node is
+    read. This is a collective operation. The shared memory is released with
+    psydac.ddm.shared.free_shared(comm).
+
+    Parameters
+    ----------
+    M : StencilMatrix
+        The matrix, which is the same on all processes.
+
+    comm : mpi4py.MPI.Comm | None
+        The communicator of the processes which share the matrix.
+
+    Returns
+    -------
+    StencilMatrix
+        The shared matrix.
+
+    """
+    assert isinstance(M, StencilMatrix)
+    assert not M.domain.parallel
+    assert not M.codomain.parallel
+    data = share_array(M._data, comm)
+    N = StencilMatrix(M.domain, M.codomain, pads=M.pads, backend=M.backend, data=data)
+    N.ghost_regions_in_sync = M.ghost_regions_in_sync
+    return N
@@ -727,6 +727,51 @@ def test_block_linear_operator_serial_dot( dtype, n1, n2, p1, p2, P1, P2  ):
 @pytest.mark.parametrize( 'dtype', [float, complex] )
 @pytest.mark.parametrize( 'n1', [8, 16] )
 @pytest.mark.parametrize( 'n2', [8, 12] )
+@pytest.mark.parametrize( 'p1', [2, 4] )
+@pytest.mark.parametrize( 'p2', [2] )
+@pytest.mark.parametrize( 'P1', [True, False] )
+@pytest.mark.parametrize( 'P2', [True] )
+
+def test_block_linear_operator_serial_matmul( dtype, n1, n2, p1, p2, P1, P2  ):
+
+    D = DomainDecomposition([n1,n2], periods=[P1,P2])
+
+    # Partition the points
+    npts = [n1,n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1,p2], shifts=[1,1])
+
+    # Create vector spaces and stencil matrices with half the pads of the spaces
+    V  = StencilVectorSpace( cart, dtype=dtype )
+    W  = BlockVectorSpace(V, V)
+    Ms = [StencilMatrix( V, V, pads=(p1//2, p2//2) ) for _ in range(4)]
+
+    rng = np.random.default_rng(n1*n2*p1*p2)
+    for M in Ms:
+        M._data[:] = rng.random(M._data.shape)
+        if dtype==complex:
+            M._data[:] += 1j * rng.random(M._data.shape)
+        M.remove_spurious_entries()
+
+    #     |M0  M1|       |M2  0 |
+    # A = |      |,  B = |      |
+    #     |0   M3|       |M1  M0|
+
+    A = BlockLinearOperator( W, W, blocks={(0,0):Ms[0], (0,1):Ms[1], (1,1):Ms[3]} )
+    B = BlockLinearOperator( W, W, blocks={(0,0):Ms[2], (1,0):Ms[1], (1,1):Ms[0]} )
+
+    # Compute explicit product of block operators
+    C = A.matmul(B)
+
+    assert isinstance(C, BlockLinearOperator)
+    assert all(isinstance(Cij, StencilMatrix) for Cij in C._blocks.values())
+    assert np.allclose( C.toarray(), (A.tosparse() @ B.tosparse()).toarray(), rtol=1e-13, atol=1e-13 )
+
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'n1', [8, 16] )
+@pytest.mark.parametrize( 'n2', [8, 12] )
 @pytest.mark.parametrize( 'p1', [1, 2] )
 @pytest.mark.parametrize( 'p2', [1, 3] )
 @pytest.mark.parametrize( 'P1', [True, False] )
@@ -779,6 +824,24 @@ def test_block_2d_serial_array_to_psydac( dtype, n1, n2, p1, p2, P1, P2 ):
     assert np.allclose( xa , v.toarray() )
     assert np.allclose( x2a , v2.toarray() )
 
+#===============================================================================
+def test_block_vector_invalid_blocks(monkeypatch):
+
+    D = DomainDecomposition([6, 5], periods=[False, True])
+    global_starts, global_ends = compute_global_starts_ends(D, [6, 5])
+    cart = CartDecomposition(D, [6, 5], global_starts, global_ends, pads=[2, 1], shifts=[1, 1])
+
+    V1 = StencilVectorSpace(cart)
+    V2 = StencilVectorSpace(cart)
+    W  = BlockVectorSpace(V1, V2)
+
+    # The failed check is reported, and not hidden by an error in __del__
+    errors = []
+    monkeypatch.setattr('sys.unraisablehook', errors.append)
+    with pytest.raises(AssertionError):
+        BlockVector(W, blocks=[V2.zeros(), V1.zeros()])
+    assert errors == []
+
 #===============================================================================
 @pytest.mark.parametrize( 'dtype', [float, complex] )
 @pytest.mark.parametrize( 'n1', [8, 16] )
@@ -987,6 +1050,66 @@ def test_block_linear_operator_dot_backend( dtype, n1, n2, p1, p2, P1, P2, backe
     # Check data in 1D array
     assert np.allclose( Y.blocks[0].toarray(), y1.toarray(), rtol=1e-13, atol=1e-13 )
     assert np.allclose( Y.blocks[1].toarray(), y2.toarray(), rtol=1e-13, atol=1e-13 )
+
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'ndim', [1, 2, 3] )
+@pytest.mark.parametrize( 'periodic', [True, False] )
+
+def test_block_linear_operator_dot_precompiled( dtype, ndim, periodic, monkeypatch ):
+
+    import psydac.api.ast.linalg as ast_linalg
+
+    # No code is generated for the matrix-vector products
+    def generate_dot(*args, **kwargs):
+        raise RuntimeError('Code generation of LinearOperatorDot')
+    monkeypatch.setattr(ast_linalg, 'LinearOperatorDot', generate_dot)
+
+    # Two spaces with a different number of points if the domain is not periodic
+    spaces = []
+    for n in ([6, 6] if periodic else [6, 7]):
+        npts = [n] * ndim
+        D    = DomainDecomposition(npts, periods=[periodic] * ndim)
+        cart = CartDecomposition(D, npts, *compute_global_starts_ends(D, npts), pads=[2] * ndim, shifts=[1] * ndim)
+        spaces.append(StencilVectorSpace(cart, dtype=dtype))
+
+    V = BlockVectorSpace(*spaces)
+    W = BlockVectorSpace(*spaces, spaces[0])
+
+    # The last row of blocks has no diagonal block
+    rng    = np.random.default_rng(ndim)
+    blocks = {}
+    for i, j in [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0)]:
+        M = StencilMatrix(V[j], W[i], pads=(2,) * ndim)
+        M._data[...] = rng.random(M._data.shape)
+        if dtype == complex:
+            M._data[...] += 1j * rng.random(M._data.shape)
+        M.remove_spurious_entries()
+        blocks[i, j] = M
+
+    L = BlockLinearOperator(V, W, blocks=blocks)
+    A = L.tosparse()
+
+    x = V.zeros()
+    for xi in x.blocks:
+        index = tuple(slice(s, e + 1) for s, e in zip(xi.starts, xi.ends))
+        xi[index] = rng.random(xi[index].shape)
+    x.update_ghost_regions()
+
+    # The precompiled kernels are used for block operators and stencil matrices
+    L.set_backend(PSYDAC_BACKEND_GPYCCEL)
+    assert np.allclose(L.dot(x).toarray(), A @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+    M = blocks[2, 0]
+    M.set_backend(PSYDAC_BACKEND_GPYCCEL)
+    assert np.allclose(M.dot(x[0]).toarray(), M.tosparse() @ x[0].toarray(), rtol=1e-13, atol=1e-13)
+
+    # Code is still generated for block operators with more than 3 x 3 blocks
+    U = BlockVectorSpace(*[spaces[0]] * 4)
+    L = BlockLinearOperator(U, U, blocks={(k, k): StencilMatrix(spaces[0], spaces[0]) for k in range(4)})
+    with pytest.raises(RuntimeError):
+        L.set_backend(PSYDAC_BACKEND_GPYCCEL)
+
 #===============================================================================
 # PARALLEL TESTS
 #===============================================================================
@@ -1125,6 +1248,93 @@ def test_block_linear_operator_parallel_dot( dtype, n1, n2, p1, p2, P1, P2 ):
     assert np.allclose( Z.blocks[0].toarray(), y1.toarray(), rtol=1e-14, atol=1e-14 )
     assert np.allclose( Z.blocks[1].toarray(), y2.toarray(), rtol=1e-14, atol=1e-14 )
 
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'npts', [[8, 12], [16, 9]] )
+@pytest.mark.parametrize( 'pads', [[1, 2], [3, 1]] )
+@pytest.mark.parallel
+
+def test_block_vector_parallel_inner_products( dtype, npts, pads ):
+
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    D = DomainDecomposition([n-1 for n in npts], periods=[True, False], comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1, 1])
+
+    V = StencilVectorSpace( cart, dtype=dtype )
+    W = BlockVectorSpace(V, BlockVectorSpace(V, V))
+
+    rng = np.random.default_rng(comm.rank)
+    def random_vector():
+        x = W.zeros()
+        for xi in [x[0], x[1][0], x[1][1]]:
+            xi._data[:] = rng.random(xi._data.shape)
+            if dtype == complex:
+                xi._data[:] += 1j * rng.random(xi._data.shape)
+        return x
+
+    U = [random_vector() for _ in range(4)]
+    v = random_vector()
+
+    # Stencil and nested block vectors: one reduction, same result as dot
+    assert np.allclose(V.inner_products([u[0] for u in U], v[0]), [u[0].dot(v[0]) for u in U], rtol=1e-14, atol=1e-14)
+    assert np.allclose(W.inner_products(U, v), [u.dot(v) for u in U], rtol=1e-14, atol=1e-14)
+
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'ncells', [[8, 12], [16, 9]] )
+@pytest.mark.parametrize( 'degree', [[1, 2], [3, 1]] )
+@pytest.mark.parametrize( 'periods', [[True, False], [False, True]] )
+@pytest.mark.parallel
+
+def test_block_vector_parallel_update_ghost_regions( dtype, ncells, degree, periods ):
+
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    D = DomainDecomposition(ncells, periods=periods, comm=comm)
+
+    # Three components with different sizes, as in H(curl)
+    spaces = []
+    for shift in [(1, 0), (0, 1), (0, 0)]:
+        npts = [n if P else n+p-s for n, p, s, P in zip(ncells, degree, shift, periods)]
+        global_starts, global_ends = compute_global_starts_ends(D, npts)
+        cart = CartDecomposition(D, npts, global_starts, global_ends, pads=degree, shifts=[1, 1])
+        spaces.append(StencilVectorSpace(cart, dtype=dtype))
+
+    W = BlockVectorSpace(*spaces)
+    assert W._synchronizer is not None
+
+    rng = np.random.default_rng(comm.rank)
+    x = W.zeros()
+    for xi in x.blocks:
+        xi._data[:] = rng.random(xi._data.shape)
+        if dtype == complex:
+            xi._data[:] += 1j * rng.random(xi._data.shape)
+
+    # Reference: independent update of the ghost regions of each block
+    y = x.copy()
+    for yi in y.blocks:
+        yi.update_ghost_regions()
+
+    # Single message per neighbour for all the blocks
+    x.update_ghost_regions()
+    assert x.ghost_regions_in_sync
+    for xi, yi in zip(x.blocks, y.blocks):
+        assert xi.ghost_regions_in_sync
+        assert np.array_equal(xi._data, yi._data)
+
+    # The communication requests follow the replacement of a block
+    z = spaces[1].zeros()
+    z._data[:] = rng.random(z._data.shape)
+    x[1] = z
+    x.update_ghost_regions()
+    z2 = z.copy()
+    z2.update_ghost_regions()
+    assert np.array_equal(x[1]._data, z2._data)
+
 #===============================================================================    
 @pytest.mark.parametrize( 'dtype', [float, complex] )
 @pytest.mark.parametrize( 'n1', [8, 16] )
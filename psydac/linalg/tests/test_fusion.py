@@ -0,0 +1,181 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+import numpy as np
+
+from sympde.calculus import dot
+from sympde.expr     import BilinearForm, integral
+from sympde.topology import Square, Derham, elements_of
+
+from psydac.api.discretization import discretize
+from psydac.linalg.basic   import (IdentityOperator, ScaledLinearOperator, SumLinearOperator,
+        ComposedLinearOperator, AdjointLinearOperator)
+from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.block   import BlockLinearOperator
+from psydac.linalg.fusion  import FusedLinearOperator, fuse
+from psydac.ddm.cart       import DomainDecomposition, CartDecomposition
+
+#===============================================================================
+def get_StencilVectorSpace(npts, pads, periods):
+    D = DomainDecomposition(npts, periods=periods)
+    global_starts = [np.array([0]) for n in npts]
+    global_ends   = [np.array([n-1]) for n in npts]
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1]*len(npts))
+    return StencilVectorSpace(C)
+
+def random_stencilmatrix(V, W, pads=None, seed=0):
+    rng = np.random.default_rng(seed)
+    M = StencilMatrix(V, W, pads=pads)
+    M._data[:] = rng.random(M._data.shape)
+    M.remove_spurious_entries()
+    return M
+
+#===============================================================================
+@pytest.mark.parametrize('npts', [(8, 5), (4, 7)])
+@pytest.mark.parametrize('pads', [(1, 2), (3, 1)])
+@pytest.mark.parametrize('periods', [(False, False), (True, False)])
+
+def test_fusion_sum(npts, pads, periods):
+
+    V = get_StencilVectorSpace(npts, pads, periods)
+    A = random_stencilmatrix(V, V, seed=1)
+    B = random_stencilmatrix(V, V, seed=2)
+    C = random_stencilmatrix(V, V, pads=(1, 1), seed=3)
+    I = IdentityOperator(V)
+
+    x = StencilVector(V)
+    x._data[:] = np.random.default_rng(4).random(x._data.shape)
+
+    # Stencil matrices with different pads cannot be added directly
+    E = 2 * A @ B + ScaledLinearOperator(V, V, 0.5, C) - B.T + AdjointLinearOperator(A) @ C + 3 * I
+    F = fuse(E)
+    assert isinstance(F, FusedLinearOperator)
+    assert fuse(F) is F
+
+    # The stencil terms and the identity are merged into one matrix
+    Fop = F.operator
+    assert isinstance(Fop, SumLinearOperator)
+    assert sum(isinstance(a, StencilMatrix) for a in Fop.addends) == 1
+    assert all(isinstance(a, (StencilMatrix, ComposedLinearOperator)) for a in Fop.addends)
+    assert F.operator is Fop
+
+    Ea = E.tosparse().toarray()
+    assert np.allclose(F.toarray(), Ea, rtol=1e-13, atol=1e-13)
+    assert np.allclose(F.dot(x).toarray(), Ea @ x.toarray(), rtol=1e-13, atol=1e-13)
+    assert np.allclose(F.T.dot(x).toarray(), Ea.T @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+    # The original matrices are not modified
+    assert np.allclose((A + B).toarray(), A.toarray() + B.toarray())
+
+    # Modifying a component invalidates the fused operator
+    C *= 2.0
+    assert F.operator is not Fop
+    Ea = E.tosparse().toarray()
+    assert np.allclose(F.dot(x).toarray(), Ea @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+    Fop = F.operator
+    B[:, :, 0, 0] = 1.0
+    assert F.operator is not Fop
+    assert np.allclose(F.toarray(), E.tosparse().toarray(), rtol=1e-13, atol=1e-13)
+
+#===============================================================================
+def test_fusion_scaled_composition():
+
+    V = get_StencilVectorSpace((6, 5), (2, 1), (False, True))
+    W = get_StencilVectorSpace((6, 5), (2, 1), (False, True))
+    D  = random_stencilmatrix(V, W, seed=1)
+    M1 = random_stencilmatrix(V, V, seed=2)
+    M2 = random_stencilmatrix(W, W, seed=3)
+
+    x = StencilVector(V)
+    x._data[:] = np.random.default_rng(4).random(x._data.shape)
+
+    # The scalar is folded into the first stencil matrix of the composition
+    dt = 0.1
+    E  = M1 + dt * D.T @ M2 @ D
+    F  = fuse(E)
+    assert isinstance(F.operator, SumLinearOperator)
+    assert all(not isinstance(a, ScaledLinearOperator) for a in F.operator.addends)
+
+    Ea = M1.toarray() + dt * D.toarray().T @ M2.toarray() @ D.toarray()
+    assert np.allclose(F.dot(x).toarray(), Ea @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+    # Assembly flags the matrix entries as modified
+    D._data[:] *= 2.0
+    D.ghost_regions_in_sync = False
+    Ea = E.tosparse().toarray()
+    assert np.allclose(F.dot(x).toarray(), Ea @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+#===============================================================================
+@pytest.mark.parametrize('periods', [(False, False), (True, False)])
+
+def test_fusion_stencil_products(periods):
+
+    V = get_StencilVectorSpace((7, 6), (2, 2), periods)
+    D = random_stencilmatrix(V, V, pads=(1, 1), seed=1)
+    M = random_stencilmatrix(V, V, pads=(0, 0), seed=2)
+    A = random_stencilmatrix(V, V, seed=3)
+
+    x = StencilVector(V)
+    x._data[:] = np.random.default_rng(4).random(x._data.shape)
+
+    # The product D.T @ M @ D fits in the pads, the whole expression is one matrix
+    E = A + 0.5 * D.T @ M @ D
+    F = fuse(E)
+    assert isinstance(F.operator, StencilMatrix)
+    assert F.operator.pads == (2, 2)
+
+    Ea = E.tosparse().toarray()
+    assert np.allclose(F.toarray(), Ea, rtol=1e-13, atol=1e-13)
+    assert np.allclose(F.dot(x).toarray(), Ea @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+    # The band of A @ D exceeds the pads, the composition is kept
+    F = fuse(A @ D + M)
+    assert isinstance(F.operator, SumLinearOperator)
+    assert np.allclose(F.dot(x).toarray(), (A @ D + M).tosparse() @ x.toarray(), rtol=1e-13, atol=1e-13)
+
+#===============================================================================
+@pytest.mark.parametrize('periodic', [(False, True), (True, False)])
+
+def test_fusion_derham_2d(periodic):
+
+    domain   = Square('Omega')
+    derham   = Derham(domain, ['H1', 'Hcurl', 'L2'])
+    domain_h = discretize(domain, ncells=[6, 5], periodic=list(periodic))
+    derham_h = discretize(derham, domain_h, degree=[2, 3])
+
+    V0, V1, V2 = derham.spaces
+    u1, v1 = elements_of(V1, names='u1, v1')
+    u2, v2 = elements_of(V2, names='u2, v2')
+    M1 = discretize(BilinearForm((u1, v1), integral(domain, dot(u1, v1))), domain_h, (derham_h.V1, derham_h.V1)).assemble()
+    M2 = discretize(BilinearForm((u2, v2), integral(domain, u2 * v2)), domain_h, (derham_h.V2, derham_h.V2)).assemble()
+    G, C = derham_h.derivatives_as_matrices
+
+    x = M1.domain.zeros()
+    for xi in x.blocks:
+        xi._data[:] = np.random.default_rng(4).random(xi._data.shape)
+    x.ghost_regions_in_sync = False
+
+    # The mass matrices are fused blockwise, the derivatives are converted to stencil matrices:
+    # M2 @ C is formed explicitly, but the pads of C.T @ M2 @ C exceed the pads of the spaces
+    E = M1 + 0.1 * C.T @ M2 @ C
+    F = fuse(E)
+    assert isinstance(F.operator, SumLinearOperator)
+    A, B = F.operator.addends
+    assert isinstance(B, ComposedLinearOperator)
+    for X in (A, *B.multiplicants):
+        assert isinstance(X, BlockLinearOperator)
+        assert all(isinstance(b, StencilMatrix) for row in X.blocks for b in row if b is not None)
+    assert np.allclose(F.dot(x).toarray(), E.dot(x).toarray(), rtol=1e-13, atol=1e-13)
+
+    # Multiples of the identity become diagonal stencil-matrix blocks
+    I = IdentityOperator(M1.domain)
+    E = 2 * I + C.T @ M2 @ C
+    F = fuse(E)
+    A, B = F.operator.addends
+    assert isinstance(A, BlockLinearOperator)
+    assert isinstance(B, ComposedLinearOperator)
+    assert np.allclose(F.dot(x).toarray(), E.dot(x).toarray(), rtol=1e-13, atol=1e-13)
+
+    # A single derivative is applied as it is
+    assert fuse(C).operator is C
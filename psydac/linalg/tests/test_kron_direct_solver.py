@@ -6,21 +6,25 @@ import numpy as np
 from mpi4py             import MPI
 
 
-from scipy.sparse               import csc_matrix, dia_matrix, kron
+from scipy.sparse               import csc_matrix, coo_matrix, dia_matrix, kron
 from scipy.sparse.linalg        import splu
 
-from sympde.calculus import dot
+from sympde.calculus import dot, grad
 from sympde.expr     import BilinearForm, integral
 from sympde.topology import Line
 from sympde.topology import Cube, Square
 from sympde.topology import Derham
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import CollelaMapping2D
 from sympde.topology import elements_of
 
 from psydac.api.discretization     import discretize
+from psydac.api.kronecker          import vector_space_1d, assemble_matrix_1d
 from psydac.ddm.cart               import DomainDecomposition, CartDecomposition
 from psydac.linalg.block           import BlockLinearOperator
-from psydac.linalg.direct_solvers  import SparseSolver, BandedSolver
-from psydac.linalg.kron            import KroneckerLinearSolver
+from psydac.linalg.direct_solvers  import SparseSolver, BandedSolver, CyclicBandedSolver, banded_solver
+from psydac.linalg.kron            import KroneckerLinearSolver, FastDiagonalizationSolver
+from psydac.linalg.kron            import KroneckerStencilMatrix, KroneckerStencilMatrixSum
 from psydac.linalg.solvers         import inverse
 from psydac.linalg.stencil         import StencilVectorSpace, StencilVector, StencilMatrix
 
@@ -79,6 +83,18 @@ def matrix_to_bandsolver(A):
     A_bnd, la, ua = to_bnd(A)
     return BandedSolver(ua, la, A_bnd)
 
+def matrix_to_cyclic_bandsolver(A):
+    A.remove_spurious_entries()
+    p = A.pads[0]
+    n = A.domain.npts[0]
+    B = A.tosparse().tocoo()
+
+    # cyclic band storage: A_cbnd[p+i-j, j] = A[i,j], with i-j taken modulo n in [-p, p]
+    A_cbnd = np.zeros((1+2*p, n), A.dtype)
+    A_cbnd[(B.row - B.col + p) % n, B.col] = B.data
+
+    return CyclicBandedSolver(p, p, A_cbnd)
+
 def matrix_to_sparse(A):
     A.remove_spurious_entries()
     return SparseSolver(A.tosparse())
@@ -359,7 +375,7 @@ def get_inverse_mass_matrices(derham_h, domain_h):
 @pytest.mark.parametrize( 'p', [1, 3] )
 @pytest.mark.parametrize( 'P', [True, False] )
 @pytest.mark.parametrize( 'nrhs', [1, 3] )
-@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_sparse] )
+@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_cyclic_bandsolver, matrix_to_sparse] )
 @pytest.mark.parametrize( 'transposed', [True, False] )
 def test_direct_solvers(dtype, seed, n, p, P, nrhs, direct_solver, transposed):
 
@@ -407,6 +423,36 @@ def test_direct_solvers(dtype, seed, n, p, P, nrhs, direct_solver, transposed):
     assert np.allclose( X_glob, X_glob3, rtol=1e-8, atol=1e-8 )
     assert np.allclose( X_glob, X_glob5, rtol=1e-8, atol=1e-8 )
 
+#===============================================================================
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'periodic', [True, False] )
+@pytest.mark.parametrize( 'transposed', [True, False] )
+def test_direct_solvers_unsymmetric_band(dtype, periodic, transposed):
+
+    # 2 upper and 1 lower diagonals, the dominant one being above the main one
+    n   = 11
+    rng = np.random.default_rng(0)
+    A   = np.zeros((n, n), dtype=dtype)
+    for d, scale in [(-1, 1), (0, 1), (1, 10), (2, 1)]:
+        i = np.arange(n) if periodic else np.arange(max(0, -d), min(n, n - d))
+        A[i, (i + d) % n] = scale * (1 + rng.random(len(i)))
+    if dtype == complex:
+        A *= 1 + 0.5j
+
+    solver = banded_solver(coo_matrix(A), periodic, dtype)
+    assert isinstance(solver, CyclicBandedSolver if periodic else BandedSolver)
+    if transposed:
+        solver = solver.T
+        A      = A.T
+
+    Y = rng.random((3, n)).astype(dtype)
+    X = np.linalg.solve(A, Y.T).T
+    assert np.allclose(solver.solve(Y), X, rtol=1e-10, atol=1e-10)
+
+    Z = Y.copy()
+    assert solver.solve(Z, out=Z) is Z
+    assert np.allclose(Z, X, rtol=1e-10, atol=1e-10)
+
 # right now, the maximum tested number for MPI_COMM_WORLD.size is 4; some test sizes failed with size 8 for now.
 
 #===============================================================================
@@ -414,7 +460,7 @@ def test_direct_solvers(dtype, seed, n, p, P, nrhs, direct_solver, transposed):
 @pytest.mark.parametrize( 'dtype', [float, complex] )
 @pytest.mark.parametrize( 'seed', [0, 2] )
 @pytest.mark.parametrize( 'params', [([8], [2], [False]), ([8,9], [2,3], [False,True])] )
-@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_sparse] )
+@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_cyclic_bandsolver, matrix_to_sparse] )
 def test_kron_solver_nompi(seed, params, direct_solver, dtype):
     compare_solve(seed, None, params[0], params[1], params[2], direct_solver, dtype=dtype, transposed=False, verbose=False)
 
@@ -430,7 +476,7 @@ def test_kron_solver_nompi(seed, params, direct_solver, dtype):
 @pytest.mark.parametrize( 'n1', [8, 17] )
 @pytest.mark.parametrize( 'p1', [1, 2, 3] )
 @pytest.mark.parametrize( 'P1', [True, False] )
-@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_sparse] )
+@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_cyclic_bandsolver, matrix_to_sparse] )
 def test_kron_solver_1d_ser(dtype, seed, n1, p1, P1, direct_solver):
     compare_solve(seed, MPI.COMM_SELF, [n1], [p1], [P1], direct_solver, dtype=dtype, transposed=False, verbose=False)
 #===============================================================================
@@ -769,6 +815,184 @@ def test_2d_mass_solver(ncells, degree, bounds, periodic):
     assert np.linalg.norm((rhs-rhs_iterative).toarray()) < tol
     assert np.linalg.norm((rhs-rhs_direct).toarray()) < tol
     
+#===============================================================================
+# test Kronecker solver whose 1D factorizations are in the shared memory of the nodes
+@pytest.mark.parametrize( 'dtype', [float, complex] )
+@pytest.mark.parametrize( 'direct_solver', [matrix_to_bandsolver, matrix_to_cyclic_bandsolver, matrix_to_sparse] )
+@pytest.mark.parametrize( 'transposed', [False, True] )
+@pytest.mark.parallel
+def test_kron_solver_shared_par(dtype, direct_solver, transposed, monkeypatch):
+
+    import psydac.ddm.shared as shared
+    from psydac.ddm.shared import node_communicator
+
+    # Count the shared arrays which are allocated
+    allocations     = []
+    shared_allocate = shared.allocate_shared
+    def allocate_shared(*args, **kwargs):
+        allocations.append(args)
+        return shared_allocate(*args, **kwargs)
+    monkeypatch.setattr(shared, 'allocate_shared', allocate_shared)
+
+    comm    = MPI.COMM_WORLD
+    npts    = [12, 9]
+    pads    = [2, 1]
+    periods = [True, False]
+
+    D    = DomainDecomposition(npts, periods=periods, comm=comm)
+    cart = CartDecomposition(D, npts, *compute_global_starts_ends(D, npts), pads=pads, shifts=[1, 1])
+    V    = StencilVectorSpace(cart, dtype=dtype)
+
+    Ds    = [DomainDecomposition([n], periods=[P]) for n, P in zip(npts, periods)]
+    carts = [CartDecomposition(Di, [n], *compute_global_starts_ends(Di, [n]), pads=[p], shifts=[1]) for Di, n, p in zip(Ds, npts, pads)]
+    Vs    = [StencilVectorSpace(carti, dtype=dtype) for carti in carts]
+    A     = [random_matrix(i + 1, Vi, Vi) for i, Vi in enumerate(Vs)]
+
+    solver        = KroneckerLinearSolver(V, V, [direct_solver(Ai) for Ai in A])
+    shared_solver = KroneckerLinearSolver(V, V, [direct_solver(Ai) for Ai in A], shared=True)
+    nalloc = len(allocations)
+    if transposed:
+        solver        = solver.T
+        shared_solver = shared_solver.T.T.T
+
+    # The transposed solvers use the same shared memory
+    assert len(allocations) == nalloc
+
+    # The factorizations of the first process of each node are used by all
+    if node_communicator(comm).size > 1:
+        for s in shared_solver.solvers:
+            if isinstance(s, BandedSolver):
+                assert not s._bmat.flags.writeable
+            elif isinstance(s, CyclicBandedSolver):
+                assert not s._band_solver._bmat.flags.writeable
+                assert not s._zmat.flags.writeable
+
+    Y = StencilVector(V)
+    localslice = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    Y[localslice] = random_vectordata(0, npts, dtype)[localslice]
+    Y.update_ghost_regions()
+
+    X_ref = kron_solve_seq_ref(random_vectordata(0, npts, dtype), A, transposed)
+    X     = shared_solver.solve(Y)
+    assert np.allclose(X[localslice], X_ref[localslice], rtol=1e-8, atol=1e-8)
+    assert np.allclose(X.toarray(), solver.solve(Y).toarray(), rtol=1e-12, atol=1e-12)
+
+    # The shared memory is released collectively
+    shared.free_shared(V.cart.comm)
+
+#===============================================================================
+# FAST DIAGONALIZATION
+#===============================================================================
+
+def random_stencil_vector(V):
+    x = StencilVector(V)
+    localslice = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    x[localslice] = np.random.default_rng(0).random(V.npts)[localslice]
+    x.update_ghost_regions()
+    return x
+
+def check_fast_diagonalization(comm, ncells, degree, periodic, c=1.):
+
+    dim    = len(ncells)
+    domain = [Line, Square, Cube][dim-1]()
+    V      = ScalarFunctionSpace('V', domain)
+    u, v   = elements_of(V, names='u, v')
+
+    domain_h = discretize(domain, ncells=ncells, periodic=periodic, comm=comm)
+    Vh       = discretize(V, domain_h, degree=degree)
+
+    # Shifted Laplace operator, as a sum of Kronecker products
+    a  = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + c*u*v))
+    ah = discretize(a, domain_h, [Vh, Vh])
+    A  = ah.assemble_kronecker()
+
+    solver = FastDiagonalizationSolver(A)
+
+    b = random_stencil_vector(Vh.vector_space)
+
+    x = solver.solve(b)
+    assert np.allclose(A.dot(x).toarray(), b.toarray(), rtol=1e-10, atol=1e-10)
+    assert solver.dtype == Vh.vector_space.dtype
+
+    # Repeated solves with an output vector reuse the same storage
+    out = solver.solve(b, out=Vh.vector_space.zeros())
+    assert solver.solve(b, out=out) is out
+    assert np.allclose(out.toarray(), x.toarray(), rtol=1e-14, atol=1e-14)
+
+    y = solver.T.dot(b)
+    assert np.allclose(A.T.dot(y).toarray(), b.toarray(), rtol=1e-10, atol=1e-10)
+
+@pytest.mark.parametrize( 'params', [([9], [3]), ([8, 7], [2, 3]), ([6, 5, 4], [2, 1, 3])] )
+@pytest.mark.parametrize( 'periodic', [True, False] )
+def test_fast_diagonalization_ser(params, periodic):
+    ncells, degree = params
+    check_fast_diagonalization(None, ncells, degree, [periodic]*len(ncells))
+
+@pytest.mark.parametrize( 'params', [([16, 12], [2, 3]), ([8, 8, 6], [2, 1, 2])] )
+@pytest.mark.parametrize( 'periodic', [True, False] )
+@pytest.mark.parallel
+def test_fast_diagonalization_par(params, periodic):
+    ncells, degree = params
+    check_fast_diagonalization(MPI.COMM_WORLD, ncells, degree, [periodic]*len(ncells))
+
+def test_fast_diagonalization_errors():
+
+    D    = DomainDecomposition([7], periods=[False])
+    cart = CartDecomposition(D, [8], *compute_global_starts_ends(D, [8]), pads=[1], shifts=[1])
+    V    = StencilVectorSpace(cart)
+
+    # Non-symmetric 1D factor
+    A = random_matrix(0, V, V)
+    A[:, 1] = 2
+    with pytest.raises(ValueError):
+        FastDiagonalizationSolver(KroneckerStencilMatrix(V, V, A))
+
+    # Three independent 1D factors
+    A, B, C = [StencilMatrix(V, V) for _ in range(3)]
+    A[:, 0] = 4; A[:, -1:0] = 1; A[:, 1] = 1
+    B[:, 0] = 2; B[:, -1:0] = -1; B[:, 1] = -1
+    C[0:8, 0] = np.arange(1, 9)
+    S = KroneckerStencilMatrixSum(V, V, *(KroneckerStencilMatrix(V, V, M) for M in (A, B, C)))
+    with pytest.raises(ValueError):
+        FastDiagonalizationSolver(S)
+
+@pytest.mark.parametrize( 'periodic', [True, False] )
+def test_fast_diagonalization_preconditioner(periodic):
+
+    # Shifted Laplace operator on a mapped domain
+    mapping = CollelaMapping2D('M', k1=1, k2=1, eps=0.1)
+    domain  = mapping(Square())
+    V       = ScalarFunctionSpace('V', domain)
+    u, v    = elements_of(V, names='u, v')
+
+    domain_h = discretize(domain, ncells=[16, 16], periodic=[periodic]*2)
+    Vh       = discretize(V, domain_h, degree=[3, 3])
+
+    a = BilinearForm((u, v), integral(domain, dot(grad(u), grad(v)) + u*v))
+    A = discretize(a, domain_h, [Vh, Vh]).assemble()
+
+    # Same operator on the logical domain, which the mapping scales by 2:
+    # Kronecker products of the 1D mass and stiffness matrices
+    W  = Vh.vector_space
+    Ws = [vector_space_1d(W, d) for d in range(2)]
+    M  = [assemble_matrix_1d(Vd, Vd, Wd, Wd, Vd.degree, q, 0, 0) for Vd, Wd, q in zip(Vh.spaces, Ws, Vh.nquads)]
+    K  = [assemble_matrix_1d(Vd, Vd, Wd, Wd, Vd.degree, q, 1, 1) for Vd, Wd, q in zip(Vh.spaces, Ws, Vh.nquads)]
+    L  = KroneckerStencilMatrixSum(W, W, KroneckerStencilMatrix(W, W, K[0], M[1]),
+                                         KroneckerStencilMatrix(W, W, M[0], K[1]),
+                                         KroneckerStencilMatrix(W, W, 4*M[0], M[1]))
+
+    b = A.dot(random_stencil_vector(W))
+
+    A_inv    = inverse(A, 'pcg', tol=1e-10, maxiter=1000)
+    A_inv_pc = inverse(A, 'pcg', pc=FastDiagonalizationSolver(L), tol=1e-10, maxiter=1000)
+
+    x    = A_inv.dot(b)
+    x_pc = A_inv_pc.dot(b)
+
+    assert A_inv_pc.get_info()['success']
+    assert A_inv_pc.get_info()['niter'] < A_inv.get_info()['niter'] / 2
+    assert np.allclose(x_pc.toarray(), x.toarray(), rtol=1e-6, atol=1e-6)
+
 #===============================================================================
 
 if __name__ == '__main__':
@@ -8,7 +8,7 @@ from psydac.ddm.cart       import DomainDecomposition, CartDecomposition
 from psydac.linalg.stencil import StencilVectorSpace
 from psydac.linalg.stencil import StencilVector
 from psydac.linalg.stencil import StencilMatrix
-from psydac.linalg.kron    import KroneckerStencilMatrix
+from psydac.linalg.kron    import KroneckerStencilMatrix, KroneckerStencilMatrixSum
 #===============================================================================
 def compute_global_starts_ends(domain_decomposition, npts):
     ndims         = len(npts)
@@ -112,3 +112,48 @@ def test_KroneckerStencilMatrix(dtype, npts, pads, periodic):
 
     # Test dot product
     assert np.array_equal(M_sp.dot(w.toarray()), M.dot(w).toarray())
+
+#==============================================================================
+@pytest.mark.parametrize('npts', [(6, 9)])
+@pytest.mark.parametrize('pads', [(2, 3)])
+@pytest.mark.parametrize('periodic', [(True, False), (False, True)])
+
+def test_KroneckerStencilMatrixSum(npts, pads, periodic):
+
+    rng = np.random.default_rng(0)
+
+    # 2D vector space
+    D = DomainDecomposition([n-1 for n in npts], periods=list(periodic))
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1, 1])
+    W = StencilVectorSpace(cart)
+
+    # 1D vector spaces
+    spaces = []
+    for n, p, P in zip(npts, pads, periodic):
+        D1 = DomainDecomposition([n-1], periods=[P])
+        starts1, ends1 = compute_global_starts_ends(D1, [n])
+        spaces.append(StencilVectorSpace(CartDecomposition(D1, [n], starts1, ends1, pads=[p], shifts=[1])))
+
+    # Random 1D stencil matrices, e.g. mass and stiffness matrices
+    def random_matrix(V):
+        M = StencilMatrix(V, V)
+        M._data[:] = rng.random(M._data.shape)
+        M.remove_spurious_entries()
+        return M
+
+    M1, K1 = [random_matrix(spaces[0]) for _ in range(2)]
+    M2, K2 = [random_matrix(spaces[1]) for _ in range(2)]
+
+    S = KroneckerStencilMatrixSum(W, W, KroneckerStencilMatrix(W, W, K1, M2),
+                                        KroneckerStencilMatrix(W, W, M1, K2))
+    S_sp = kron(K1.tosparse(), M2.tosparse()) + kron(M1.tosparse(), K2.tosparse())
+
+    w = StencilVector(W)
+    w[0:npts[0], 0:npts[1]] = rng.random(npts)
+
+    assert np.allclose(S.toarray(), S_sp.toarray(), rtol=1e-14, atol=1e-14)
+    assert np.allclose(S.tostencil().toarray(), S_sp.toarray(), rtol=1e-14, atol=1e-14)
+    assert np.allclose(S.dot(w).toarray(), S_sp.dot(w.toarray()), rtol=1e-14, atol=1e-14)
+    assert np.allclose(S.T.dot(w).toarray(), S_sp.T.dot(w.toarray()), rtol=1e-14, atol=1e-14)
+    assert np.allclose((2*S).dot(w).toarray(), 2*S_sp.dot(w.toarray()), rtol=1e-14, atol=1e-14)
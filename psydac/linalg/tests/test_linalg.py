@@ -3,6 +3,7 @@ import numpy as np
 
 from psydac.linalg.block import BlockLinearOperator, BlockVector, BlockVectorSpace
 from psydac.linalg.basic import LinearOperator, ZeroOperator, IdentityOperator, ComposedLinearOperator, SumLinearOperator, PowerLinearOperator, ScaledLinearOperator
+from psydac.linalg.basic import AdjointLinearOperator
 from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
 from psydac.linalg.solvers import ConjugateGradient, inverse
 from psydac.ddm.cart       import DomainDecomposition, CartDecomposition
@@ -946,9 +947,162 @@ def test_internal_storage():
     assert len(Z2_1.tmp_vectors) == 3
     assert len(Z2_2.tmp_vectors) == 3
     assert len(Z2_3.tmp_vectors) == 3
+    assert len(Z1_1.tmp_spaces) == 2
+    assert len(Z1_2.tmp_spaces) == 2
+    assert len(Z1_3.tmp_spaces) == 2
+    assert len(Z2_1.tmp_spaces) == 3
+    assert len(Z2_2.tmp_spaces) == 3
+    assert len(Z2_3.tmp_spaces) == 3
     assert np.array_equal( y1_1.toarray(), y1_2.toarray() ) & np.array_equal( y1_2.toarray(), y1_3.toarray() )
     assert np.array_equal( y2_1.toarray(), y2_2.toarray() ) & np.array_equal( y2_2.toarray(), y2_3.toarray() )
 
+#===============================================================================
+
+def test_scratch_pool():
+
+    V = get_StencilVectorSpace(7, 3, 2, 1, False, False)
+    W = BlockVectorSpace(V, V)
+
+    # The pool of a space is unique and initially empty
+    pool = V.scratch_pool
+    assert pool is V.scratch_pool
+    assert pool.space is V
+    assert len(pool) == 0
+
+    # Released vectors are recycled, up to the maximum size of the pool
+    x = pool.acquire()
+    assert x.space is V
+    pool.release(x)
+    pool.release(x)
+    assert len(pool) == 1
+    assert pool.acquire() is x
+    vectors = [pool.acquire() for _ in range(pool.maxsize + 2)]
+    pool.release(*vectors)
+    assert len(pool) == pool.maxsize
+    with pool.borrow() as y:
+        assert len(pool) == pool.maxsize - 1
+    assert len(pool) == pool.maxsize
+
+    # Repeated evaluations of operator expressions do not grow the pools
+    A = get_positive_definite_stencilmatrix(V)
+    B = BlockLinearOperator(W, W, blocks=[[A, A], [None, 2 * A]])
+    M = (B @ B + B) @ B**3
+
+    v = BlockVector(W, (V.zeros(), V.zeros()))
+    v[0][:, :] = 1.0
+    v[1][:, :] = 2.0
+    y1 = M.dot(v)
+    sizes = (len(V.scratch_pool), len(W.scratch_pool))
+    y2 = M.dot(v)
+    assert (len(V.scratch_pool), len(W.scratch_pool)) == sizes
+
+    Ma = B.toarray()
+    Ya = (Ma @ Ma + Ma) @ np.linalg.matrix_power(Ma, 3) @ v.toarray()
+    assert np.allclose(y1.toarray(), Ya, rtol=1e-12, atol=1e-12)
+    assert np.array_equal(y1.toarray(), y2.toarray())
+
+    # The temporaries are given back to the pools if an evaluation fails
+    class FailingOperator(LinearOperator):
+        domain = codomain = W
+        dtype = float
+        toarray = tosparse = None
+        def transpose(self, conjugate=False):
+            return self
+        def dot(self, v, out=None):
+            raise RuntimeError('dot failed')
+        def tdot(self, v, out=None, *, conjugate=False):
+            raise RuntimeError('tdot failed')
+
+    F = FailingOperator()
+    sizes = (len(V.scratch_pool), len(W.scratch_pool))
+    for N in (B @ F @ B, B @ B @ F, F @ B @ B, B @ F**2 @ B):
+        with pytest.raises(RuntimeError):
+            N.dot(v)
+        with pytest.raises(RuntimeError):
+            N.T.dot(v)
+        assert (len(V.scratch_pool), len(W.scratch_pool)) == sizes
+
+#===============================================================================
+@pytest.mark.parametrize('n1', n1array)
+@pytest.mark.parametrize('n2', n2array)
+@pytest.mark.parametrize('p1', p1array)
+@pytest.mark.parametrize('p2', p2array)
+
+def test_adjoint_operator(n1, n2, p1, p2, P1=False, P2=False):
+
+    V = get_StencilVectorSpace(n1, n2, p1, p2, P1, P2)
+
+    # Non-symmetric matrix with random entries
+    np.random.seed(3)
+    A = StencilMatrix(V, V)
+    A._data[:] = np.random.random(A._data.shape)
+    A.remove_spurious_entries()
+
+    x = StencilVector(V)
+    x._data[:] = np.random.random(x._data.shape)
+
+    # Lazy transpose and Hermitian transpose
+    At = AdjointLinearOperator(A, conjugate=False)
+    Ah = AdjointLinearOperator(A)
+
+    assert At.domain   is A.codomain
+    assert At.codomain is A.domain
+    assert array_equal(At, A.T)
+    assert array_equal(Ah, A.H)
+    assert sparse_equal(At, A.T)
+    assert At.transpose() is A
+    assert Ah.transpose(conjugate=True) is A
+
+    # Apply adjoint without forming the transposed matrix
+    y = StencilVector(V)
+    Ah.dot(x, out=y)
+    assert np.allclose(y.toarray(), A.H.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+    assert np.allclose(At.dot(x).toarray(), A.T.dot(x).toarray(), rtol=1e-14, atol=1e-14)
+
+#===============================================================================
+@pytest.mark.parametrize('n1', n1array)
+@pytest.mark.parametrize('n2', n2array)
+@pytest.mark.parametrize('p1', p1array)
+@pytest.mark.parametrize('p2', p2array)
+
+def test_composite_tdot(n1, n2, p1, p2, P1=False, P2=False):
+
+    V = get_StencilVectorSpace(n1, n2, p1, p2, P1, P2)
+    W = BlockVectorSpace(V, V)
+
+    np.random.seed(5)
+    A = StencilMatrix(V, V)
+    B = StencilMatrix(V, V)
+    A._data[:] = np.random.random(A._data.shape)
+    B._data[:] = np.random.random(B._data.shape)
+    A.remove_spurious_entries()
+    B.remove_spurious_entries()
+    I = IdentityOperator(V)
+    Z = ZeroOperator(V, V)
+
+    x = StencilVector(V)
+    x._data[:] = np.random.random(x._data.shape)
+    xb = BlockVector(W, (x, 2 * x))
+
+    # Sum, scaled and composed operators
+    for M in [A + B, 3 * A, A @ B, A @ (B - 2 * I) @ A, A + Z]:
+        y = M.tdot(x)
+        assert np.allclose(y.toarray(), M.tosparse().T.dot(x.toarray()), rtol=1e-12, atol=1e-12)
+        assert np.allclose(M.T.dot(x).toarray(), y.toarray(), rtol=1e-12, atol=1e-12)
+
+    # Lazy transpose of a composed operator
+    C = A @ B
+    assert isinstance(C.T, ComposedLinearOperator)
+    assert np.allclose(C.T.tosparse().toarray(), C.tosparse().toarray().T, rtol=1e-12, atol=1e-12)
+
+    # Block operator with empty blocks
+    L = BlockLinearOperator(W, W, blocks=[[A, None], [B, A]])
+    yb = L.tdot(xb)
+    assert np.allclose(yb.toarray(), L.tosparse().T.dot(xb.toarray()), rtol=1e-12, atol=1e-12)
+    yb2 = W.zeros()
+    AdjointLinearOperator(L, conjugate=False).dot(xb, out=yb2)
+    assert np.allclose(yb2.toarray(), yb.toarray(), rtol=1e-14, atol=1e-14)
+
 #===============================================================================
 @pytest.mark.parametrize('solver', ['cg', 'pcg', 'bicg', 'minres', 'lsmr'])
 
@@ -0,0 +1,286 @@
+# -*- coding: UTF-8 -*-
+
+import pytest
+import numpy as np
+from mpi4py import MPI
+
+from sympde.calculus import dot
+from sympde.expr     import BilinearForm, integral
+from sympde.topology import Square, Derham, CollelaMapping2D, elements_of
+
+from psydac.api.discretization     import discretize
+from psydac.ddm.cart               import DomainDecomposition, CartDecomposition
+from psydac.linalg.block           import BlockVectorSpace, BlockVector, BlockLinearOperator
+from psydac.linalg.kron            import KroneckerStencilMatrix
+from psydac.linalg.preconditioners import jacobi, block_jacobi, GaussSeidel, KroneckerMassPreconditioner
+from psydac.linalg.solvers         import inverse
+from psydac.linalg.stencil         import StencilVectorSpace, StencilVector, StencilMatrix
+
+#===============================================================================
+def define_space(npts, pads, periods, dtype=float, comm=None):
+
+    domain_decomposition = DomainDecomposition([n - 1 for n in npts], periods, comm=comm)
+    ndim = len(npts)
+    if comm is None:
+        global_starts = [np.array([0]) for n in npts]
+        global_ends   = [np.array([n-1]) for n in npts]
+    else:
+        global_starts = [None] * ndim
+        global_ends   = [None] * ndim
+        for axis in range(ndim):
+            ee = domain_decomposition.global_element_ends[axis]
+            global_ends  [axis]     = ee.copy()
+            global_ends  [axis][-1] = npts[axis] - 1
+            global_starts[axis]     = np.array([0] + (global_ends[axis][:-1] + 1).tolist())
+
+    cart = CartDecomposition(domain_decomposition, npts, global_starts, global_ends, pads, [1] * ndim)
+    return StencilVectorSpace(cart, dtype=dtype)
+
+#===============================================================================
+def define_laplacian(V):
+    """ Diagonally dominant matrix with the stencil of a (shifted) Laplacian.
+    """
+    A = StencilMatrix(V, V)
+    p = V.pads
+    for d in range(V.ndim):
+        k = [0] * V.ndim
+        index = [slice(None)] * V.ndim + [0] * V.ndim
+        for shift in (-1, 1):
+            k[d] = shift
+            index[V.ndim:] = k
+            A[tuple(index)] = -1
+    index = [slice(None)] * V.ndim + [0] * V.ndim
+    A[tuple(index)] = 2 * V.ndim + 0.1
+    A.remove_spurious_entries()
+    return A
+
+#===============================================================================
+def define_random_matrix(V, seed=0):
+    """ Random, diagonally dominant, non-symmetric stencil matrix.
+    """
+    rng = np.random.default_rng(seed)
+    A = StencilMatrix(V, V)
+    A._data[...] = rng.random(A._data.shape)
+    if V.dtype == complex:
+        A._data[...] += 1j * rng.random(A._data.shape)
+    index = [slice(None)] * V.ndim + [0] * V.ndim
+    A[tuple(index)] = 2 * np.prod([2*p+1 for p in V.pads])
+    A.remove_spurious_entries()
+    return A
+
+#===============================================================================
+def random_vector(V, seed=1):
+    rng = np.random.default_rng(seed)
+    x = StencilVector(V)
+    index = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+    x[index] = rng.random(x[index].shape)
+    x.update_ghost_regions()
+    return x
+
+#===============================================================================
+def pcg_iterations(A, b, pc=None):
+    solver = inverse(A, 'pcg', pc=pc, tol=1e-10, maxiter=1000)
+    x = solver @ b
+    info = solver.get_info()
+    assert info['success']
+    return x, info['niter']
+
+#===============================================================================
+# SERIAL TESTS
+#===============================================================================
+@pytest.mark.parametrize('npts', [(12,), (8, 7), (5, 6, 4)])
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_jacobi(npts, dtype):
+
+    V = define_space(npts, [1] * len(npts), [False] * len(npts), dtype=dtype)
+    A = define_random_matrix(V)
+    x = random_vector(V)
+
+    P = jacobi(A)
+    y = P @ x
+
+    d = np.diag(A.toarray())
+    assert np.allclose(y.toarray(), x.toarray() / d, rtol=1e-14, atol=1e-14)
+
+    # Block-Jacobi of a block-diagonal matrix with two blocks
+    W  = BlockVectorSpace(V, V)
+    B  = BlockLinearOperator(W, W, blocks={(0, 0): A, (1, 1): 2 * A})
+    xb = BlockVector(W, blocks=[x, x])
+    yb = block_jacobi(B, [None, GaussSeidel(2 * A)]) @ xb
+    assert np.allclose(yb[0].toarray(), y.toarray(), rtol=1e-14, atol=1e-14)
+
+#===============================================================================
+@pytest.mark.parametrize('npts', [(12,), (8, 7), (5, 6, 4)])
+@pytest.mark.parametrize('pads', [1, 2])
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('omega', [1.0, 1.3])
+@pytest.mark.parametrize('symmetric', [False, True])
+def test_gauss_seidel(npts, pads, dtype, omega, symmetric):
+
+    ndim = len(npts)
+    V = define_space(npts, [pads] * ndim, [False] * ndim, dtype=dtype)
+    A = define_random_matrix(V)
+    b = random_vector(V)
+
+    P = GaussSeidel(A, omega=omega, symmetric=symmetric)
+    x = P @ b
+
+    # Reference: dense SOR sweeps, starting from zero
+    Ad = A.toarray()
+    bd = b.toarray()
+    D  = np.diag(np.diag(Ad)) / omega
+    L  = np.tril(Ad, -1)
+    U  = np.triu(Ad, 1)
+    xd = np.linalg.solve(D + L, bd)
+    if symmetric:
+        xd += np.linalg.solve(D + U, bd - Ad @ xd)
+
+    assert np.allclose(x.toarray(), xd, rtol=1e-12, atol=1e-12)
+
+#===============================================================================
+@pytest.mark.parametrize('npts', [(40, 40), (12, 10, 8)])
+@pytest.mark.parametrize('periodic', [False, True])
+def test_pcg_iterations(npts, periodic):
+
+    ndim = len(npts)
+    V = define_space(npts, [1] * ndim, [periodic] * ndim)
+    A = define_laplacian(V)
+    b = random_vector(V)
+
+    x0, n0 = pcg_iterations(A, b)
+    x1, n1 = pcg_iterations(A, b, pc=jacobi(A))
+    x2, n2 = pcg_iterations(A, b, pc=GaussSeidel(A))
+    x3, n3 = pcg_iterations(A, b, pc=GaussSeidel(A, omega=1.5, sweeps=2))
+
+    assert n2 < n0
+    assert n3 < n2
+    assert np.allclose(x2.toarray(), x0.toarray(), rtol=1e-8, atol=1e-8)
+    assert np.allclose(x3.toarray(), x0.toarray(), rtol=1e-8, atol=1e-8)
+
+#===============================================================================
+@pytest.mark.parametrize('npts', [(10,), (8, 7), (6, 5, 5)])
+@pytest.mark.parametrize('periodic', [False, True])
+def test_kronecker_mass_preconditioner(npts, periodic):
+
+    ndim = len(npts)
+    V = define_space(npts, [2] * ndim, [periodic] * ndim)
+
+    # 1D symmetric positive definite matrices
+    mats = []
+    for n in npts:
+        Vd = define_space([n], [2], [periodic])
+        Ad = StencilMatrix(Vd, Vd)
+        Ad[:, -2] = 0.1
+        Ad[:, -1] = 0.5
+        Ad[:,  0] = 2.0
+        Ad[:,  1] = 0.5
+        Ad[:,  2] = 0.1
+        Ad.remove_spurious_entries()
+        mats.append(Ad)
+
+    M0 = KroneckerStencilMatrix(V, V, *mats).tostencil()
+
+    # Diagonal scaling S M0 S, whose inverse is computed exactly
+    rng = np.random.default_rng(2)
+    s   = rng.random(npts) + 0.5
+    M   = M0.copy()
+    for i in np.ndindex(*npts):
+        for k in np.ndindex(*[2*p+1 for p in M.pads]):
+            j = [id + kd - p for id, kd, p in zip(i, k, M.pads)]
+            if all(0 <= jd < n for jd, n in zip(j, npts)) or periodic:
+                j = tuple(jd % n for jd, n in zip(j, npts))
+                M._data[tuple(id + p for id, p in zip(i, V.pads)) + k] *= s[i] * s[j]
+
+    x = random_vector(V)
+
+    P0 = KroneckerMassPreconditioner(V, mats)
+    y  = P0 @ (M0 @ x)
+    assert np.allclose(y.toarray(), x.toarray(), rtol=1e-12, atol=1e-12)
+
+    P = KroneckerMassPreconditioner(V, mats, M)
+    y = P @ (M @ x)
+    assert np.allclose(y.toarray(), x.toarray(), rtol=1e-12, atol=1e-12)
+    assert P.T is P
+
+#===============================================================================
+def run_derham_mass_preconditioners(ncells, degree, comm=None):
+
+    domain  = Square('Omega', bounds1=(0, 1), bounds2=(0, 1))
+    mapping = CollelaMapping2D('M', k1=1, k2=1, eps=0.1)
+    domain  = mapping(domain)
+    derham  = Derham(domain, sequence=['h1', 'hcurl', 'l2'])
+
+    V0, V1, V2 = derham.spaces
+    u0, v0 = elements_of(V0, names='u0, v0')
+    u1, v1 = elements_of(V1, names='u1, v1')
+    u2, v2 = elements_of(V2, names='u2, v2')
+
+    a0 = BilinearForm((u0, v0), integral(domain, u0 * v0))
+    a1 = BilinearForm((u1, v1), integral(domain, dot(u1, v1)))
+    a2 = BilinearForm((u2, v2), integral(domain, u2 * v2))
+
+    domain_h = discretize(domain, ncells=ncells, periodic=[False, True], comm=comm)
+    derham_h = discretize(derham, domain_h, degree=degree)
+
+    masses = [discretize(a, domain_h, (V, V)).assemble() for a, V in zip([a0, a1, a2], derham_h.spaces)]
+    pcs    = derham_h.mass_preconditioners(masses)
+
+    for M, P in zip(masses, pcs):
+        assert P.domain is M.codomain
+        assert P.codomain is M.domain
+        b = M.codomain.zeros()
+        for bi in (b.blocks if isinstance(b, BlockVector) else [b]):
+            index = tuple(slice(s, e+1) for s, e in zip(bi.starts, bi.ends))
+            bi[index] = 1.0
+        x0, n0 = pcg_iterations(M, b)
+        x1, n1 = pcg_iterations(M, b, pc=P)
+        assert n1 < n0 // 2
+        assert np.allclose(x1.toarray(), x0.toarray(), rtol=1e-7, atol=1e-7)
+
+#-------------------------------------------------------------------------------
+def test_derham_mass_preconditioners():
+    run_derham_mass_preconditioners([10, 12], [2, 3])
+
+#===============================================================================
+# PARALLEL TESTS
+#===============================================================================
+@pytest.mark.parallel
+@pytest.mark.parametrize('npts', [(24, 20), (10, 9, 8)])
+def test_preconditioners_par(npts):
+
+    comm = MPI.COMM_WORLD
+    ndim = len(npts)
+    V = define_space(npts, [1] * ndim, [False] * ndim, comm=comm)
+    A = define_laplacian(V)
+    b = random_vector(V, seed=comm.rank)
+
+    x0, n0 = pcg_iterations(A, b)
+    x1, n1 = pcg_iterations(A, b, pc=GaussSeidel(A))
+    assert n1 < n0
+    assert np.allclose(x1.toarray(), x0.toarray(), rtol=1e-8, atol=1e-8)
+
+    # Exact inverse of a Kronecker product of 1D matrices
+    mats = []
+    for n in npts:
+        Vd = define_space([n], [1], [False])
+        Ad = StencilMatrix(Vd, Vd)
+        Ad[:, -1] = -1
+        Ad[:,  0] = 2.5
+        Ad[:,  1] = -1
+        Ad.remove_spurious_entries()
+        mats.append(Ad)
+    M = KroneckerStencilMatrix(V, V, *mats)
+    y = KroneckerMassPreconditioner(V, mats, M.tostencil()) @ (M @ b)
+    assert np.allclose(y.toarray(), b.toarray(), rtol=1e-12, atol=1e-12)
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parallel
+def test_derham_mass_preconditioners_par():
+    run_derham_mass_preconditioners([10, 12], [2, 3], comm=MPI.COMM_WORLD)
+
+#===============================================================================
+# SCRIPT FUNCTIONALITY
+#===============================================================================
+if __name__ == "__main__":
+    import sys
+    pytest.main( sys.argv )
@@ -204,6 +204,39 @@ def test_solver_tridiagonal(n, p, dtype, solver, verbose=False):
         assert errh_norm < tol
         assert solver == 'pcg' or errc_norm < tol
 
+# ===============================================================================
+@pytest.mark.parametrize('restart', [5, 20])
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('pc', [None, 'jacobi', 'gmres'])
+
+def test_restarted_gmres(restart, dtype, pc):
+
+    # Advection-dominated convection-diffusion operator: upwind discretization
+    n = 200
+    p = 1
+    factor = np.exp(0.25j*np.pi) if dtype == complex else 1
+    V, A, xe = define_data(n, p, [30*factor, 32, -1], dtype=dtype)
+
+    if pc == 'jacobi':
+        pc = A.diagonal(inverse=True)
+    elif pc == 'gmres':
+        # Flexible preconditioner: a few inner iterations, which depend on the residual
+        pc = inverse(A, 'gmres', tol=1e-2, maxiter=3)
+
+    b = A @ xe
+    solver = inverse(A, 'gmres', pc=pc, tol=1e-10, maxiter=1000, restart=restart)
+    x = solver @ b
+
+    info = solver.get_info()
+    assert info['success']
+    assert len(solver._Q) <= restart + 1
+    assert np.linalg.norm((A @ x - b).toarray()) < 1e-10
+
+    # Transposed system
+    bt = A.T @ xe
+    xt = solver.T @ bt
+    assert np.linalg.norm((A.T @ xt - bt).toarray()) < 1e-10
+
 # ===============================================================================
 # SCRIPT FUNCTIONALITY
 #===============================================================================
@@ -5,6 +5,7 @@ import numpy as np
 from random import random
 
 from psydac.linalg.stencil import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.basic   import ComposedLinearOperator
 from psydac.linalg.utilities import petsc_to_psydac
 from psydac.api.settings import PSYDAC_BACKENDS
 from psydac.ddm.cart import DomainDecomposition, CartDecomposition
@@ -1888,7 +1889,120 @@ def test_stencil_matrix_3d_serial_transpose_1(dtype, n1, n2, n3, p1, p2, p3, s1,
     assert abs(Ts - Ts_exact).max() < 1e-14
     assert abs(Mt - Mt_exact).max() < 1e-14
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('n1', [5, 12])
+@pytest.mark.parametrize('n2', [6, 8])
+@pytest.mark.parametrize('p1', [1, 3])
+@pytest.mark.parametrize('p2', [1, 2])
+@pytest.mark.parametrize('s1', [1, 2])
+@pytest.mark.parametrize('s2', [1])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.parametrize('P2', [True, False])
+@pytest.mark.parametrize('conjugate', [False, True])
+def test_stencil_matrix_2d_serial_tdot(dtype, n1, n2, p1, p2, s1, s2, P1, P2, conjugate):
+    # Create domain decomposition
+    D = DomainDecomposition([n1 - 1, n2 - 1], periods=[P1, P2])
+
+    # Partition the points
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[s1, s2])
+
+    # Create vector space, stencil matrix, and stencil vector
+    V = StencilVectorSpace(cart, dtype=dtype)
+    M = StencilMatrix(V, V)
+    x = StencilVector(V)
+
+    # Fill in matrix and vector values with random numbers between 0 and 1
+    M._data[:] = np.random.random(M._data.shape)
+    x._data[:] = np.random.random(x._data.shape)
+    if dtype == complex:
+        M._data[:] += 1j * np.random.random(M._data.shape)
+        x._data[:] += 1j * np.random.random(x._data.shape)
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    M.remove_spurious_entries()
+    x.update_ghost_regions()
+
+    # TEST: product with the transpose, without forming the transposed matrix
+    y  = M.tdot(x, conjugate=conjugate)
+    yt = M.transpose(conjugate=conjugate).dot(x)
+
+    # Same test using out
+    yo = StencilVector(V)
+    M.tdot(x, out=yo, conjugate=conjugate)
+
+    # Exact result using Numpy dot product
+    Ma = M.toarray()
+    ya_exact = np.dot(Ma.conj().T if conjugate else Ma.T, x.toarray())
+
+    # Check data
+    assert y.dtype == dtype
+    assert np.allclose(y.toarray(), yt.toarray(), rtol=1e-13, atol=1e-13)
+    assert np.allclose(yo.toarray(), yt.toarray(), rtol=1e-13, atol=1e-13)
+    if s1 == 1:
+        assert np.allclose(y.toarray(), ya_exact, rtol=1e-13, atol=1e-13)
+
 # TODO: verify for s>1
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('n1', [5, 12])
+@pytest.mark.parametrize('n2', [6, 8])
+@pytest.mark.parametrize('p1', [2, 4])
+@pytest.mark.parametrize('p2', [1, 3])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.parametrize('P2', [True, False])
+def test_stencil_matrix_2d_serial_matmul(dtype, n1, n2, p1, p2, P1, P2):
+    # Create domain decomposition
+    D = DomainDecomposition([n1 - 1, n2 - 1], periods=[P1, P2])
+
+    # Partition the points
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[1, 1])
+
+    # Create vector space and two stencil matrices whose product fits in the pads
+    V = StencilVectorSpace(cart, dtype=dtype)
+    A = StencilMatrix(V, V, pads=(p1 // 2, p2 - p2 // 2))
+    B = StencilMatrix(V, V, pads=(p1 - p1 // 2, p2 // 2))
+
+    # Fill in matrix values with random numbers between 0 and 1
+    A._data[:] = np.random.random(A._data.shape)
+    B._data[:] = np.random.random(B._data.shape)
+    if dtype == complex:
+        A._data[:] += 1j * np.random.random(A._data.shape)
+        B._data[:] += 1j * np.random.random(B._data.shape)
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    A.remove_spurious_entries()
+    B.remove_spurious_entries()
+
+    # TEST: explicit product of two stencil matrices
+    C = A.matmul(B)
+
+    # Same test using out, with larger pads
+    Co = StencilMatrix(V, V)
+    A.matmul(B, out=Co)
+
+    # Exact result using Scipy sparse matrix product
+    Ca_exact = (A.tosparse() @ B.tosparse()).toarray()
+
+    # Check data
+    assert C.dtype == dtype
+    assert C.pads == (p1, p2)
+    assert np.allclose(C.toarray(), Ca_exact, rtol=1e-13, atol=1e-13)
+    assert np.allclose(Co.toarray(), Ca_exact, rtol=1e-13, atol=1e-13)
+
+    # The product is not formed if its pads exceed the pads of the spaces
+    CB = C.matmul(B)
+    assert isinstance(CB, ComposedLinearOperator)
+    x = StencilVector(V)
+    x._data[:] = np.random.random(x._data.shape)
+    assert np.allclose(CB.dot(x).toarray(), Ca_exact @ B.toarray() @ x.toarray(), rtol=1e-13, atol=1e-13)
+
 # ===============================================================================
 # BACKENDS TESTS
 # ===============================================================================
@@ -2700,6 +2814,117 @@ def test_stencil_matrix_2d_parallel_transpose(dtype, n1, n2, p1, p2, sh1, sh2, P
     assert abs(Ts - Ts_exact).max() < 1e-14
     assert abs(Tos - Ts_exact).max() < 1e-14
 
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('n1', [20, 32])
+@pytest.mark.parametrize('n2', [24, 40])
+@pytest.mark.parametrize('p1', [1, 3])
+@pytest.mark.parametrize('p2', [1, 2])
+@pytest.mark.parametrize('sh1', [1])
+@pytest.mark.parametrize('sh2', [1])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.parametrize('P2', [True, False])
+@pytest.mark.parallel
+def test_stencil_matrix_2d_parallel_tdot(dtype, n1, n2, p1, p2, sh1, sh2, P1, P2):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    # Create domain decomposition
+    D = DomainDecomposition([n1, n2], periods=[P1, P2], comm=comm)
+
+    # Partition the points
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[sh1, sh2])
+
+    # Create vector space, stencil matrix, and stencil vector
+    V = StencilVectorSpace(cart, dtype=dtype)
+    M = StencilMatrix(V, V)
+    x = StencilVector(V)
+
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+
+    # Fill in matrix and vector values with numbers depending on global indices
+    for i1 in range(s1, e1 + 1):
+        for i2 in range(s2, e2 + 1):
+            x[i1, i2] = 2.0 * (i1 * n2 + i2) / (n1 * n2) - 1.0
+            for k1 in range(-p1, p1 + 1):
+                for k2 in range(-p2, p2 + 1):
+                    M[i1, i2, k1, k2] = 1.0 / (1 + i1 + k1 * k1) + i2 + k2
+                    if dtype == complex:
+                        M[i1, i2, k1, k2] += 1j * (k1 - k2)
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    M.remove_spurious_entries()
+
+    # TEST: compare product with the transpose to product with transposed matrix
+    for conjugate in [False, True]:
+        y  = M.tdot(x, conjugate=conjugate)
+        yt = M.transpose(conjugate=conjugate).dot(x)
+
+        assert y.dtype == dtype
+        assert np.allclose(y.toarray(), yt.toarray(), rtol=1e-13, atol=1e-13)
+
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+@pytest.mark.parametrize('n1', [20, 32])
+@pytest.mark.parametrize('n2', [24, 40])
+@pytest.mark.parametrize('p1', [2, 3])
+@pytest.mark.parametrize('p2', [1, 2])
+@pytest.mark.parametrize('P1', [True, False])
+@pytest.mark.parametrize('P2', [True, False])
+@pytest.mark.parallel
+def test_stencil_matrix_2d_parallel_matmul(dtype, n1, n2, p1, p2, P1, P2):
+    from mpi4py import MPI
+
+    comm = MPI.COMM_WORLD
+    # Create domain decomposition
+    D = DomainDecomposition([n1, n2], periods=[P1, P2], comm=comm)
+
+    # Partition the points
+    npts = [n1, n2]
+    global_starts, global_ends = compute_global_starts_ends(D, npts, [p1, p2])
+
+    cart = CartDecomposition(D, npts, global_starts, global_ends, pads=[p1, p2], shifts=[1, 1])
+
+    # Create vector space, two stencil matrices whose product fits in the pads, and stencil vector
+    V  = StencilVectorSpace(cart, dtype=dtype)
+    pa = (p1 // 2, p2 - p2 // 2)
+    pb = (p1 - p1 // 2, p2 // 2)
+    A  = StencilMatrix(V, V, pads=pa)
+    B  = StencilMatrix(V, V, pads=pb)
+    x  = StencilVector(V)
+
+    s1, s2 = V.starts
+    e1, e2 = V.ends
+
+    # Fill in matrix and vector values with numbers depending on global indices
+    for i1 in range(s1, e1 + 1):
+        for i2 in range(s2, e2 + 1):
+            x[i1, i2] = 2.0 * (i1 * n2 + i2) / (n1 * n2) - 1.0
+            for k1 in range(-pa[0], pa[0] + 1):
+                for k2 in range(-pa[1], pa[1] + 1):
+                    A[i1, i2, k1, k2] = 1.0 / (1 + i1 + k1 * k1) + i2 + k2
+            for k1 in range(-pb[0], pb[0] + 1):
+                for k2 in range(-pb[1], pb[1] + 1):
+                    B[i1, i2, k1, k2] = i1 - k2 + 0.5 * i2 * k1
+                    if dtype == complex:
+                        B[i1, i2, k1, k2] += 1j * (k1 - k2)
+
+    # If domain is not periodic, set corresponding periodic corners to zero
+    A.remove_spurious_entries()
+    B.remove_spurious_entries()
+
+    # TEST: compare product matrix to successive application of the factors
+    C = A.matmul(B)
+    y = C.dot(x)
+    z = A.dot(B.dot(x))
+
+    assert y.dtype == dtype
+    assert np.allclose(y.toarray(), z.toarray(), rtol=1e-12, atol=1e-10)
+
 # ===============================================================================
 @pytest.mark.parametrize('dtype', [float, complex])
 @pytest.mark.parametrize('n1', [7, 11])
@@ -0,0 +1,240 @@
+# coding: utf-8
+
+import pytest
+import numpy as np
+from mpi4py import MPI
+
+from psydac.ddm.cart        import DomainDecomposition, CartDecomposition
+from psydac.ddm.shared      import node_communicator, free_shared
+from psydac.linalg.stencil  import StencilVectorSpace, StencilVector, StencilMatrix
+from psydac.linalg.storage  import memmap_vector, memmap_matrix, shared_vector, shared_matrix
+
+# ===============================================================================
+def compute_global_starts_ends(domain_decomposition, npts):
+    ndims = len(npts)
+    global_starts = [None] * ndims
+    global_ends = [None] * ndims
+
+    for axis in range(ndims):
+        ee = domain_decomposition.global_element_ends[axis]
+
+        global_ends[axis] = ee.copy()
+        global_ends[axis][-1] = npts[axis] - 1
+        global_starts[axis] = np.array([0] + (global_ends[axis][:-1] + 1).tolist())
+
+    return global_starts, global_ends
+
+def define_space(npts, pads, periods, dtype=float, comm=None):
+    D = DomainDecomposition([n - 1 for n in npts], periods=periods, comm=comm)
+    global_starts, global_ends = compute_global_starts_ends(D, npts)
+    C = CartDecomposition(D, npts, global_starts, global_ends, pads=pads, shifts=[1] * len(npts))
+    return StencilVectorSpace(C, dtype=dtype)
+
+def random_matrix(V, seed=0):
+    rng = np.random.default_rng(seed)
+    M = StencilMatrix(V, V)
+    M._data[...] = rng.random(M._data.shape)
+    if V.dtype == complex:
+        M._data[...] += 1j * rng.random(M._data.shape)
+    M.remove_spurious_entries()
+    return M
+
+def random_vector(V, seed=1):
+    rng = np.random.default_rng(seed)
+    x = StencilVector(V)
+    x._data[...] = rng.random(x._data.shape)
+    x.update_ghost_regions()
+    return x
+
+# ===============================================================================
+# SERIAL TESTS
+# ===============================================================================
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_stencil_data_argument(dtype):
+
+    V = define_space([7, 6], [2, 1], [True, False], dtype=dtype)
+
+    # The given array is used without copy
+    data = np.zeros(V.shape, dtype=dtype)
+    x = StencilVector(V, data=data)
+    x[0, 0] = 3
+    assert x._data is data
+    assert data[2, 1] == 3
+
+    shape = StencilMatrix.storage_shape(V, V)
+    assert shape == StencilMatrix(V, V)._data.shape
+    data = np.zeros(shape, dtype=dtype)
+    M = StencilMatrix(V, V, data=data)
+    assert M._data is data
+
+    # Arrays of the wrong shape or type are rejected
+    with pytest.raises(AssertionError):
+        StencilVector(V, data=np.zeros((7, 6), dtype=dtype))
+    with pytest.raises(AssertionError):
+        StencilMatrix(V, V, data=np.zeros(shape, dtype=np.float32))
+
+# ===============================================================================
+@pytest.mark.parametrize('npts', [(11,), (7, 6), (5, 4, 6)])
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_memmap_storage(npts, dtype, tmp_path):
+
+    ndim = len(npts)
+    V = define_space(npts, [2] * ndim, [True] + [False] * (ndim - 1), dtype=dtype)
+    A = random_matrix(V)
+    x = random_vector(V)
+    y = A @ x
+
+    # Write the data to new files
+    xm = memmap_vector(V, str(tmp_path / 'x.npy'))
+    Am = memmap_matrix(V, V, str(tmp_path / 'A.npy'))
+    assert isinstance(xm._data, np.memmap)
+    assert isinstance(Am._data, np.memmap)
+    assert np.all(xm._data == 0)
+    assert np.all(Am._data == 0)
+
+    xm._data[...] = x._data
+    Am._data[...] = A._data
+    xm._data.flush()
+    Am._data.flush()
+    del xm, Am
+
+    # Map them in read-only mode, and use them
+    xr = memmap_vector(V, str(tmp_path / 'x.npy'), mode='r')
+    Ar = memmap_matrix(V, V, str(tmp_path / 'A.npy'), mode='r')
+    assert not Ar._data.flags.writeable
+
+    xr.ghost_regions_in_sync = True
+    yr = Ar @ xr
+    assert np.array_equal(yr.toarray(), y.toarray())
+    assert np.array_equal(Ar.toarray(), A.toarray())
+    assert xr.dot(x) == x.dot(x)
+
+    # A file with another shape is rejected
+    W = define_space([n + 1 for n in npts], [2] * ndim, [True] + [False] * (ndim - 1), dtype=dtype)
+    with pytest.raises(ValueError):
+        memmap_vector(W, str(tmp_path / 'x.npy'), mode='r')
+
+# ===============================================================================
+def test_shared_storage_serial():
+
+    V = define_space([9], [2], [False])
+    A = random_matrix(V)
+    x = random_vector(V)
+
+    # Without communicator the data is not copied
+    assert shared_matrix(A, None)._data is A._data
+    assert shared_vector(x, None)._data is x._data
+
+# ===============================================================================
+# PARALLEL TESTS
+# ===============================================================================
+@pytest.mark.parallel
+def test_memmap_storage_parallel(tmp_path):
+
+    comm = MPI.COMM_WORLD
+    path = comm.bcast(str(tmp_path) if comm.rank == 0 else None)
+
+    V = define_space([12, 10], [2, 1], [False, True], comm=comm)
+    A = random_matrix(V)
+    x = random_vector(V)
+    y = A @ x
+
+    Am = memmap_matrix(V, V, path + '/A.{rank}.npy')
+    Am._data[...] = A._data
+    Am._data.flush()
+    del Am
+
+    Ar = memmap_matrix(V, V, path + '/A.{rank}.npy', mode='r')
+    assert np.array_equal((Ar @ x).toarray(), y.toarray())
+
+# ===============================================================================
+@pytest.mark.parallel
+@pytest.mark.parametrize('dtype', [float, complex])
+def test_shared_storage_parallel(dtype):
+
+    comm = MPI.COMM_WORLD
+    node = node_communicator(comm)
+    assert node is node_communicator(comm)
+
+    # Replicated 1D matrix and vector, as the factors of a Kronecker product
+    V = define_space([9], [2], [True], dtype=dtype)
+    A = random_matrix(V)
+    x = random_vector(V)
+
+    # Only the data of the first process of each node is used
+    if node.rank > 0:
+        A._data[...] = 0
+        x._data[...] = 0
+
+    As = shared_matrix(A, comm)
+    xs = shared_vector(x, comm)
+    if node.size > 1:
+        assert not As._data.flags.writeable
+        assert not xs._data.flags.writeable
+
+    Ar = random_matrix(V)
+    xr = random_vector(V)
+    assert np.array_equal(As.toarray(), Ar.toarray())
+    assert np.array_equal((As @ xs).toarray(), (Ar @ xr).toarray())
+
+    free_shared(comm)
+
+# ===============================================================================
+@pytest.mark.parallel
+def test_node_communicator_freed_comm():
+
+    comm = MPI.COMM_WORLD
+    size = node_communicator(comm).size
+
+    # A new communicator which reuses the handle of a freed one gets its own
+    # node communicator
+    for _ in range(2):
+        half = comm.Split(comm.rank % 2, comm.rank)
+        assert node_communicator(half).size <= half.size
+        half.Free()
+
+        dup = comm.Dup()
+        assert node_communicator(dup).size == size
+        dup.Free()
+
+# ===============================================================================
+@pytest.mark.parallel
+def test_shared_window_free():
+
+    import gc
+    import psydac.ddm.shared as shared
+
+    comm = MPI.COMM_WORLD.Dup()
+    node = node_communicator(comm)
+    if node.size == 1:
+        comm.Free()
+        return
+
+    # The windows are not freed by the garbage collector
+    a = shared.share_array(np.arange(12.).reshape(3, 4), comm)
+    windows = comm.Get_attr(shared._node_keyval).windows
+    assert len(windows) == 1
+    win = windows[0]
+    del a
+    gc.collect()
+    assert win != MPI.WIN_NULL
+
+    # They are freed collectively, explicitly
+    shared.free_shared(comm)
+    assert win == MPI.WIN_NULL
+    assert windows == []
+
+    # or with their communicator, as well as the node communicator
+    b = shared.share_array(np.arange(12.).reshape(3, 4), comm)
+    assert b[2, 3] == 11
+    win = windows[0]
+    comm.Free()
+    assert win  == MPI.WIN_NULL
+    assert node == MPI.COMM_NULL
+
+#===============================================================================
+# SCRIPT FUNCTIONALITY
+#===============================================================================
+if __name__ == "__main__":
+    import sys
+    pytest.main( sys.argv )
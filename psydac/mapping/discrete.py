@@ -30,6 +30,33 @@ def random_string(n):
     selector = random.SystemRandom()
     return ''.join(selector.choice(chars) for _ in range(n))
 
+#==============================================================================
+def read_local_block(data, index):
+    """
+    Read the block data[index] of an array or of an HDF5 dataset. If the
+    dataset belongs to a file opened with the 'mpio' driver, the block is
+    read with collective MPI-IO: hence all the processes of the file's
+    communicator must call this function, each one with its own block.
+
+    Parameters
+    ----------
+    data : numpy.ndarray | h5py.Dataset
+        Global array.
+
+    index : tuple of slice
+        Hyperslab selection of the local block.
+
+    Returns
+    -------
+    numpy.ndarray
+        Local block.
+
+    """
+    if isinstance(data, h5py.Dataset) and data.file.driver == 'mpio':
+        with data.collective:
+            return data[index]
+    return data[index]
+
 #==============================================================================
 class SplineMapping(BasicCallableMapping):
 
@@ -79,22 +106,29 @@ class SplineMapping(BasicCallableMapping):
 
         V = tensor_space.vector_space
         values = [V.zeros() for d in range(mapping.pdim)]
-        ranges = [range(s, e+1) for s, e in zip(V.starts, V.ends)]
-        grids  = [space.greville for space in tensor_space.spaces]
+        index  = tuple(slice(s, e+1) for s, e in zip(V.starts, V.ends))
+        grids  = [space.greville[i] for space, i in zip(tensor_space.spaces, index)]
+        shape  = tuple(len(grid) for grid in grids)
 
         # Evaluate analytical mapping at Greville points (tensor-product grid)
-        # and store vector values in one separate scalar field for each
-        # physical dimension
+        # in one call, using NumPy broadcasting on the local grid
+        try:
+            u = [np.broadcast_to(ud, shape) for ud in mapping(*np.ix_(*grids))]
+        except (TypeError, ValueError):
+            # The mapping does not accept array arguments: evaluate it point-wise
+            u = [np.empty(shape) for d in range(mapping.pdim)]
+            for i in product(*[range(n) for n in shape]):
+                for d, ud in enumerate(mapping(*[grid[j] for grid, j in zip(grids, i)])):
+                    u[d][i] = ud
+
+        # Store vector values in one separate scalar field for each physical
+        # dimension
         # TODO: use one unique field belonging to VectorFemSpace
-        for index in product(*ranges):
-            x = [grid[i] for grid, i in zip(grids, index)]
-            u = mapping(*x)
-            for d, ud in enumerate(u):
-                values[d][index] = ud
+        for pvals, ud in zip(values, u):
+            pvals[index] = ud
 
         # Compute spline coefficients for each coordinate X_i
-        for pvals, field in zip(values, fields):
-            tensor_space.compute_interpolant(pvals, field)
+        tensor_space.compute_interpolants(values, fields)
 
         # Create SplineMapping object
         return cls(*fields)
@@ -103,7 +137,7 @@ class SplineMapping(BasicCallableMapping):
     # Option [2]: initialize from TensorFemSpace and spline control points
     #--------------------------------------------------------------------------
     @classmethod
-    def from_control_points(cls, tensor_space, control_points):
+    def from_control_points(cls, tensor_space, control_points, *, pdim=None):
 
         assert isinstance(tensor_space, TensorFemSpace)
         assert isinstance(control_points, (np.ndarray, h5py.Dataset))
@@ -112,18 +146,25 @@ class SplineMapping(BasicCallableMapping):
         assert control_points.shape[:-1] == tuple(V.nbasis for V in tensor_space.spaces)
         assert control_points.shape[ -1] >= tensor_space.ldim
 
+        # Only the first pdim components of the control points are used
+        if pdim is None:
+            pdim = control_points.shape[-1]
+        assert tensor_space.ldim <= pdim <= control_points.shape[-1]
+
         # Create one separate scalar field for each physical dimension
         # TODO: use one unique field belonging to VectorFemSpace
-        fields = [FemField(tensor_space) for d in range(control_points.shape[-1])]
+        fields = [FemField(tensor_space) for d in range(pdim)]
 
         # Get spline coefficients for each coordinate X_i
         starts = tensor_space.vector_space.starts
         ends   = tensor_space.vector_space.ends
 
+        # Read the local block of control points in one selection
         idx_to = tuple(slice(s, e+1) for s, e in zip(starts, ends))
+        local_points = read_local_block(control_points, (*idx_to, slice(0, pdim)))
+
         for i,field in enumerate(fields):
-            idx_from = (*idx_to, i)
-            field.coeffs[idx_to] = control_points[idx_from]
+            field.coeffs[idx_to] = local_points[..., i]
             field.coeffs.update_ghost_regions()
 
         # Create SplineMapping object
@@ -837,7 +878,7 @@ class NurbsMapping(SplineMapping):
     # Option [2]: initialize from TensorFemSpace and spline control points
     #--------------------------------------------------------------------------
     @classmethod
-    def from_control_points_weights(cls, tensor_space, control_points, weights):
+    def from_control_points_weights(cls, tensor_space, control_points, weights, *, pdim=None):
 
         assert isinstance(tensor_space, TensorFemSpace)
         assert isinstance(control_points, (np.ndarray, h5py.Dataset))
@@ -848,9 +889,14 @@ class NurbsMapping(SplineMapping):
         assert control_points.shape[ -1] >= tensor_space.ldim
         assert weights.shape == tuple(V.nbasis for V in tensor_space.spaces)
 
+        # Only the first pdim components of the control points are used
+        if pdim is None:
+            pdim = control_points.shape[-1]
+        assert tensor_space.ldim <= pdim <= control_points.shape[-1]
+
         # Create one separate scalar field for each physical dimension
         # TODO: use one unique field belonging to VectorFemSpace
-        fields  = [FemField(tensor_space) for d in range(control_points.shape[-1])]
+        fields  = [FemField(tensor_space) for d in range(pdim)]
         fields += [FemField(tensor_space)]
 
         # Get spline coefficients for each coordinate X_i
@@ -858,14 +904,12 @@ class NurbsMapping(SplineMapping):
         starts = tensor_space.vector_space.starts
         ends   = tensor_space.vector_space.ends
         idx_to = tuple(slice(s, e+1) for s,e in zip(starts, ends))
+        local_points = read_local_block(control_points, (*idx_to, slice(0, pdim)))
         for i, field in enumerate(fields[:-1]):
-            idx_from = (*idx_to, i)
-#            idw_from = tuple(idx_to)
-            field.coeffs[idx_to] = control_points[idx_from] #* weights[idw_from]
+            field.coeffs[idx_to] = local_points[..., i]
 
         # weights
-        idx_from = tuple(idx_to)
-        fields[-1].coeffs[idx_to] = weights[idx_from]
+        fields[-1].coeffs[idx_to] = read_local_block(weights, idx_to)
 
         # Create SplineMapping object
         return cls(*fields)
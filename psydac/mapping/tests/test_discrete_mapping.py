@@ -1,5 +1,6 @@
 import os
 import pytest
+from itertools import product
 
 import numpy as np
 import h5py as h5
@@ -306,3 +307,54 @@ def test_nurbs_circle():
             J_i = disk.gradient(u=x1, v=x2)
 
             assert np.allclose(J_i[:2], J_p, atol=ATOL, rtol=RTOL)
+
+
+@pytest.mark.parametrize('ncells', [[8, 6], [4, 5, 3]])
+def test_spline_mapping_from_mapping(ncells):
+    from sympde.topology.callable_mapping import BasicCallableMapping
+    from sympde.topology.analytical_mapping import PolarMapping, TorusMapping
+    from psydac.mapping.discrete import SplineMapping
+
+    ldim = len(ncells)
+    if ldim == 2:
+        F = PolarMapping('F', rmin=0.2, rmax=1.0, c1=0.0, c2=0.0).get_callable_mapping()
+        limits = [(0, 1), (0, 2*np.pi)]
+    else:
+        F = TorusMapping('F', R0=3.0).get_callable_mapping()
+        limits = [(0, 1), (0, 2*np.pi), (0, 2*np.pi)]
+
+    # Wrapper which only accepts scalar arguments
+    class ScalarMapping(BasicCallableMapping):
+        def __call__(self, *eta):
+            if not all(isinstance(e, float) for e in eta):
+                raise TypeError('Only scalar arguments are supported')
+            return tuple(float(x) for x in F(*eta))
+        def jacobian(self, *eta):
+            return F.jacobian(*eta)
+        def jacobian_inv(self, *eta):
+            return F.jacobian_inv(*eta)
+        def metric(self, *eta):
+            return F.metric(*eta)
+        def metric_det(self, *eta):
+            return F.metric_det(*eta)
+        @property
+        def ldim(self):
+            return F.ldim
+        @property
+        def pdim(self):
+            return F.pdim
+
+    spaces = [SplineSpace(degree=2, grid=np.linspace(*lims, num=nc+1), periodic=False)
+              for lims, nc in zip(limits, ncells)]
+    domain_decomposition = DomainDecomposition(ncells=ncells, periods=[False]*ldim, comm=None)
+    T = TensorFemSpace(domain_decomposition, *spaces)
+
+    # The vectorized and point-wise evaluations give the same spline mapping
+    mapping_vec = SplineMapping.from_mapping(T, F)
+    mapping_pts = SplineMapping.from_mapping(T, ScalarMapping())
+    for f_vec, f_pts in zip(mapping_vec.fields, mapping_pts.fields):
+        assert np.allclose(f_vec.coeffs.toarray(), f_pts.coeffs.toarray(), rtol=1e-14, atol=1e-14)
+
+    # The spline mapping interpolates the analytical one at the Greville points
+    for x in product(*[V.greville for V in spaces]):
+        assert np.allclose(mapping_vec(*x), F(*x), rtol=1e-12, atol=1e-12)
@@ -1,3 +1,7 @@
+from psydac.utilities.lazy_import import attach
+
 __all__ = ['quadratures']
 
-from psydac.utilities import quadratures
+# The submodules are imported on first access (PEP 562)
+_submodules = {'quadratures'}
+__getattr__, __dir__ = attach(__name__, _submodules)
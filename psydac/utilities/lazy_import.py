@@ -0,0 +1,50 @@
+# -*- coding: UTF-8 -*-
+#
+# Lazy import of the submodules of a package (PEP 562).
+#
+# This module must not import anything heavy: it is used by the __init__ files
+# of all the psydac packages.
+
+import sys
+from importlib import import_module
+
+__all__ = ('attach',)
+
+#==============================================================================
+def attach(package_name, submodules):
+    """
+    Make the submodules of a package importable on first attribute access.
+
+    Typical usage in the __init__.py file of a package:
+
+        __getattr__, __dir__ = attach(__name__, {'basic', 'stencil'})
+
+    Parameters
+    ----------
+    package_name : str
+        Full name of the package, i.e. its __name__.
+
+    submodules : iterable of str
+        Names of the submodules which are imported lazily.
+
+    Returns
+    -------
+    __getattr__ : callable
+        Module-level __getattr__, which imports a submodule when it is
+        accessed for the first time.
+
+    __dir__ : callable
+        Module-level __dir__, which lists the submodules along with the
+        attributes already defined in the package.
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(name):
+        if name in submodules:
+            return import_module(f'{package_name}.{name}')
+        raise AttributeError(f'module {package_name!r} has no attribute {name!r}')
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | submodules)
+
+    return __getattr__, __dir__